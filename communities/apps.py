@@ -4,3 +4,6 @@ class CommunitiesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'communities'
     verbose_name = 'المجتمعات السياحية'
+
+    def ready(self):
+        from .services import counter_signals  # noqa: F401
@@ -0,0 +1,81 @@
+"""
+Benchmark community feed latency on a community with N posts.
+
+Times the full detail page (first page and a deep "load more" page)
+through the test client, and compares fetching a deep page by keyset
+cursor with the same page by OFFSET and with the old unpaginated feed.
+
+Usage:
+    python manage.py benchmark_community_feed --posts 100000
+    python manage.py benchmark_community_feed --cleanup
+"""
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+SLUG = 'bench-feed'
+
+
+class Command(BaseCommand):
+    help = 'Time the community feed on a community with N posts: keyset pages vs OFFSET vs unpaginated'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=100000)
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--cleanup', action='store_true', help='Delete the seeded community and exit')
+
+    def handle(self, *args, **options):
+        from django.test import Client
+        from communities.models import Community
+        from communities.services.feed_service import PAGE_SIZE, encode_cursor, get_feed_page
+
+        if options['cleanup']:
+            Community.objects.filter(slug=SLUG).delete()
+            self.stdout.write(self.style.SUCCESS("Deleted seeded community."))
+            return
+
+        community = Community.objects.filter(slug=SLUG).first()
+        if community is None or community.posts.count() != options['posts']:
+            Community.objects.filter(slug=SLUG).delete()
+            community = self.seed(options['posts'])
+
+        repeat = options['repeat']
+        depth = options['posts'] * 9 // 10
+        anchor = community.posts.order_by('-created_at', '-id')[depth - 1]
+        cursor = encode_cursor(anchor)
+
+        client = Client(SERVER_NAME=(settings.ALLOWED_HOSTS or ['localhost'])[0].lstrip('.') or 'localhost')
+        url = f'/communities/{SLUG}/'
+        assert client.get(url).status_code == 200, 'feed page did not render'
+        self.report('page 1 (view)', repeat, lambda: client.get(url))
+        self.report(f'page at {depth} (view, HX)', repeat,
+                    lambda: client.get(url, {'before': cursor}, HTTP_HX_REQUEST='true'))
+
+        self.report(f'keyset page at {depth}', repeat, lambda: get_feed_page(community, cursor=cursor))
+        feed = community.posts.for_feed(None).order_by('-created_at', '-id')
+        self.report(f'OFFSET page at {depth}', repeat, lambda: list(feed[depth:depth + PAGE_SIZE]))
+        self.report('unpaginated (old feed)', 1, lambda: list(community.posts.for_feed(None)))
+
+    def report(self, label, repeat, fn):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            timings.append((time.perf_counter() - start) * 1000)
+        self.stdout.write(f"{label:<28} median {statistics.median(timings):8.1f} ms  max {max(timings):8.1f} ms")
+
+    def seed(self, count):
+        from django.contrib.auth import get_user_model
+        from communities.models import Community, CommunityPost
+
+        User = get_user_model()
+        author, _ = User.objects.get_or_create(username='bench_feed_author')
+        community = Community.objects.create(name='Bench feed', slug=SLUG, description='Benchmark')
+        # auto_now_add stamps each post as it is built, newest last
+        CommunityPost.objects.bulk_create([
+            CommunityPost(community=community, author=author, content=f'Post {i}')
+            for i in range(count)
+        ], batch_size=5000)
+        return community
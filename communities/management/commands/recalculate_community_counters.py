@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from communities.models import Community, CommunityPost
+from communities.services.counter_service import recalculate_member_counts, recalculate_post_counters
+
+
+class Command(BaseCommand):
+    help = ('Recalculates the stored counters of communities (members) and their posts '
+            '(likes/comments) from the membership, likes and comments tables.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--community', help='Only the community with this slug and its posts')
+
+    def handle(self, *args, **options):
+        communities = Community.objects.all()
+        posts = CommunityPost.objects.all()
+        if options['community']:
+            communities = communities.filter(slug=options['community'])
+            posts = posts.filter(community__slug=options['community'])
+
+        community_count = recalculate_member_counts(communities)
+        post_count = recalculate_post_counters(posts)
+        self.stdout.write(self.style.SUCCESS(
+            f"Successfully recalculated counters for {community_count} communities and {post_count} posts."
+        ))
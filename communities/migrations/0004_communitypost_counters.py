@@ -0,0 +1,41 @@
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    CommunityPost = apps.get_model('communities', 'CommunityPost')
+    PostComment = apps.get_model('communities', 'PostComment')
+    Like = CommunityPost.likes.through
+
+    CommunityPost.objects.update(
+        like_count=Coalesce(Subquery(
+            Like.objects.filter(communitypost_id=OuterRef('pk'))
+            .values('communitypost_id').annotate(n=Count('pk')).values('n')
+        ), Value(0)),
+        comment_count=Coalesce(Subquery(
+            PostComment.objects.filter(post_id=OuterRef('pk'))
+            .values('post_id').annotate(n=Count('pk')).values('n')
+        ), Value(0)),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communities', '0003_postcomment'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='communitypost',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='عدد التعليقات'),
+        ),
+        migrations.AddField(
+            model_name='communitypost',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='عدد الإعجابات'),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
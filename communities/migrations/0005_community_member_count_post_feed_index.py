@@ -0,0 +1,35 @@
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_member_counts(apps, schema_editor):
+    Community = apps.get_model('communities', 'Community')
+    CommunityMembership = apps.get_model('communities', 'CommunityMembership')
+
+    Community.objects.update(
+        member_count=Coalesce(Subquery(
+            CommunityMembership.objects.filter(community_id=OuterRef('pk'))
+            .values('community_id').annotate(n=Count('pk')).values('n')
+        ), Value(0)),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communities', '0004_communitypost_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='community',
+            name='member_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='عدد الأعضاء'),
+        ),
+        migrations.AddIndex(
+            model_name='communitypost',
+            index=models.Index(fields=['community', '-created_at', '-id'], name='community_post_feed_idx'),
+        ),
+        migrations.RunPython(backfill_member_counts, migrations.RunPython.noop),
+    ]
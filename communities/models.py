@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import BooleanField, Exists, OuterRef, Prefetch, Value
 from django.conf import settings
 from ibb_guide.base_models import TimeStampedModel
 
@@ -20,6 +21,9 @@ class Community(TimeStampedModel):
     )
     
     is_official = models.BooleanField(default=False, verbose_name="مجموعة رسمية")
+
+    # Denormalised, kept in sync by communities.services.counter_signals
+    member_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="عدد الأعضاء")
     
     members = models.ManyToManyField(
         settings.AUTH_USER_MODEL, 
@@ -60,6 +64,24 @@ class CommunityMembership(TimeStampedModel):
     def __str__(self):
         return f"{self.user} in {self.community}"
 
+class CommunityPostQuerySet(models.QuerySet):
+    def for_feed(self, user=None):
+        """
+        Everything a feed of posts renders, in a fixed number of queries:
+        authors and linked places joined, comments (with authors)
+        prefetched, and is_liked_by_me from a single EXISTS subquery.
+        """
+        if user is not None and user.is_authenticated:
+            liked = Exists(CommunityPost.likes.through.objects.filter(
+                communitypost_id=OuterRef('pk'), user_id=user.pk
+            ))
+        else:
+            liked = Value(False, output_field=BooleanField())
+        return self.select_related('author', 'linked_place').prefetch_related(
+            Prefetch('comments', queryset=PostComment.objects.select_related('author'))
+        ).annotate(is_liked_by_me=liked)
+
+
 class CommunityPost(TimeStampedModel):
     """
     A post within a community. Can be a text update, sharing a photo, etc.
@@ -109,22 +131,24 @@ class CommunityPost(TimeStampedModel):
         verbose_name="الإعجابات"
     )
 
+    # Denormalised counters, kept in sync by communities.services.counter_signals
+    like_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="عدد الإعجابات")
+    comment_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="عدد التعليقات")
+
+    objects = CommunityPostQuerySet.as_manager()
+
     class Meta:
         ordering = ['-created_at']
         verbose_name = "منشور مجتمعي"
         verbose_name_plural = "منشورات المجتمع"
+        indexes = [
+            # Keyset pagination of a community's feed on (created_at, id)
+            models.Index(fields=['community', '-created_at', '-id'], name='community_post_feed_idx'),
+        ]
 
     def __str__(self):
         return f"Post by {self.author} in {self.community}"
 
-    @property
-    def like_count(self):
-        return self.likes.count()
-    
-    @property
-    def comment_count(self):
-        return self.comments.count()
-
 
 class PostComment(TimeStampedModel):
     """
@@ -0,0 +1,73 @@
+"""
+Community Counter Service
+Keeps CommunityPost.like_count / comment_count and Community.member_count
+in step with the likes M2M table, PostComment and CommunityMembership
+rows, using single UPDATE statements so concurrent writers never lose
+an increment.
+"""
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+
+def _like_count_subquery():
+    from communities.models import CommunityPost
+
+    Like = CommunityPost.likes.through
+    return Coalesce(Subquery(
+        Like.objects.filter(communitypost_id=OuterRef('pk'))
+        .values('communitypost_id').annotate(n=Count('pk')).values('n')
+    ), Value(0))
+
+
+def _comment_count_subquery():
+    from communities.models import PostComment
+
+    return Coalesce(Subquery(
+        PostComment.objects.filter(post_id=OuterRef('pk'))
+        .values('post_id').annotate(n=Count('pk')).values('n')
+    ), Value(0))
+
+
+def refresh_like_counts(post_ids):
+    """Recount likes for the given posts from the M2M table (one UPDATE)."""
+    from communities.models import CommunityPost
+
+    if post_ids:
+        CommunityPost.objects.filter(pk__in=post_ids).update(like_count=_like_count_subquery())
+
+
+def adjust_comment_count(post_id, delta):
+    """Add delta to a post's comment_count (never below zero)."""
+    from communities.models import CommunityPost
+
+    CommunityPost.objects.filter(pk=post_id).update(
+        comment_count=Greatest(F('comment_count') + delta, 0)
+    )
+
+
+def adjust_member_count(community_id, delta):
+    """Add delta to a community's member_count (never below zero)."""
+    from communities.models import Community
+
+    Community.objects.filter(pk=community_id).update(
+        member_count=Greatest(F('member_count') + delta, 0)
+    )
+
+
+def recalculate_member_counts(queryset=None):
+    """Recompute member_count from memberships; returns the number of communities updated."""
+    from communities.models import Community, CommunityMembership
+
+    queryset = Community.objects.all() if queryset is None else queryset
+    return queryset.update(member_count=Coalesce(Subquery(
+        CommunityMembership.objects.filter(community_id=OuterRef('pk'))
+        .values('community_id').annotate(n=Count('pk')).values('n')
+    ), Value(0)))
+
+
+def recalculate_post_counters(queryset=None):
+    """Recompute both counters from source rows; returns the number of posts updated."""
+    from communities.models import CommunityPost
+
+    queryset = CommunityPost.objects.all() if queryset is None else queryset
+    return queryset.update(like_count=_like_count_subquery(), comment_count=_comment_count_subquery())
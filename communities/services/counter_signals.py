@@ -0,0 +1,62 @@
+"""
+Community Counter Signals
+Update stored counters when likes, comments or memberships change, and
+drop the member's cached community set.
+"""
+from django.db.models.signals import m2m_changed, post_save, post_delete
+from django.dispatch import receiver
+
+from communities.models import CommunityMembership, CommunityPost, PostComment
+from communities.services.counter_service import (
+    adjust_comment_count,
+    adjust_member_count,
+    refresh_like_counts,
+)
+from communities.services.membership_service import invalidate_user_memberships
+
+
+@receiver(m2m_changed, sender=CommunityPost.likes.through)
+def update_like_count(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Forward side (post.likes.add/remove/clear) touches one post; the
+    reverse side (user.liked_posts...) touches the posts in pk_set, or
+    for clear() the posts captured in pre_clear.
+    """
+    if action == 'pre_clear' and reverse:
+        instance._cleared_liked_post_ids = list(
+            sender.objects.filter(user_id=instance.pk).values_list('communitypost_id', flat=True)
+        )
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        refresh_like_counts([instance.pk])
+    elif action == 'post_clear':
+        refresh_like_counts(instance.__dict__.pop('_cleared_liked_post_ids', []))
+    else:
+        refresh_like_counts(list(pk_set or ()))
+
+
+@receiver(post_save, sender=PostComment)
+def increment_comment_count(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        adjust_comment_count(instance.post_id, 1)
+
+
+@receiver(post_delete, sender=PostComment)
+def decrement_comment_count(sender, instance, **kwargs):
+    adjust_comment_count(instance.post_id, -1)
+
+
+@receiver(post_save, sender=CommunityMembership)
+def increment_member_count(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        adjust_member_count(instance.community_id, 1)
+    invalidate_user_memberships(instance.user_id)
+
+
+@receiver(post_delete, sender=CommunityMembership)
+def decrement_member_count(sender, instance, **kwargs):
+    adjust_member_count(instance.community_id, -1)
+    invalidate_user_memberships(instance.user_id)
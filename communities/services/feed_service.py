@@ -0,0 +1,53 @@
+"""
+Community Feed Service
+Keyset pagination of a community's posts on (created_at, id), newest
+first. Each page is one indexed range scan however deep the reader has
+scrolled, unlike OFFSET which reads and discards every earlier row.
+"""
+import base64
+from datetime import datetime
+
+from django.conf import settings
+from django.db.models import Q
+
+PAGE_SIZE = 20
+
+
+def encode_cursor(post):
+    raw = f'{post.created_at.isoformat()}|{post.pk}'
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(value):
+    """(created_at, id) from a cursor, or None if it is missing or malformed."""
+    if not value:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(value + '=' * (-len(value) % 4)).decode()
+        created_at, pk = raw.rsplit('|', 1)
+        return datetime.fromisoformat(created_at), int(pk)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def get_feed_page(community, user=None, cursor=None, page_size=None):
+    """
+    Return (posts, next_cursor) for the page after ``cursor``.
+    next_cursor is None on the last page.
+    """
+    page_size = page_size or getattr(settings, 'COMMUNITY_FEED_PAGE_SIZE', PAGE_SIZE)
+    posts = community.posts.for_feed(user).order_by('-created_at', '-id')
+
+    position = decode_cursor(cursor)
+    if position is not None:
+        created_at, pk = position
+        # The redundant created_at <= bound lets the index seek straight to the cursor
+        posts = posts.filter(created_at__lte=created_at).filter(
+            Q(created_at__lt=created_at) | Q(id__lt=pk)
+        )
+
+    page = list(posts[:page_size + 1])
+    if len(page) > page_size:
+        page = page[:page_size]
+        return page, encode_cursor(page[-1])
+    return page, None
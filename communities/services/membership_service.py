@@ -0,0 +1,39 @@
+"""
+Membership Service
+Per-user cached set of community ids, for membership permission checks
+without a query on every page view or post.
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+CACHE_TTL = 60 * 60
+
+
+def _cache_key(user_id):
+    return f'communities:memberships:{user_id}'
+
+
+def get_user_community_ids(user):
+    """frozenset of the ids of communities the user belongs to (empty for guests)."""
+    from communities.models import CommunityMembership
+
+    if user is None or not user.is_authenticated:
+        return frozenset()
+    key = _cache_key(user.pk)
+    ids = cache.get(key)
+    if ids is None:
+        ids = frozenset(
+            CommunityMembership.objects.filter(user_id=user.pk).values_list('community_id', flat=True)
+        )
+        cache.set(key, ids, getattr(settings, 'COMMUNITY_MEMBERSHIP_CACHE_SECONDS', CACHE_TTL))
+    return ids
+
+
+def is_member(user, community):
+    return community.pk in get_user_community_ids(user)
+
+
+def invalidate_user_memberships(user_id):
+    """Drop a user's cached community set (joined, left or removed)."""
+    if user_id:
+        cache.delete(_cache_key(user_id))
@@ -1,3 +1,220 @@
-from django.test import TestCase
+"""
+Community Tests
+Stored like/comment/member counters, the keyset-paginated feed, cached
+memberships and feature toggles, and the repair command.
+"""
+from datetime import timedelta
+from io import StringIO
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from communities.models import Community, CommunityMembership, CommunityPost, PostComment
+from communities.services.feed_service import encode_cursor, get_feed_page
+from communities.services.membership_service import get_user_community_ids, is_member
+from management.models import FeatureToggle
+from management.services.feature_toggle_service import FeatureToggleService
+
+User = get_user_model()
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class CommunityPostTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        FeatureToggleService.invalidate()
+        self.author = User.objects.create_user(username='author', password='pw')
+        self.fans = [User.objects.create_user(username=f'fan{i}', password='pw') for i in range(3)]
+        self.community = Community.objects.create(name='Hikers', slug='hikers', description='Trails')
+        CommunityMembership.objects.create(user=self.author, community=self.community)
+        self.post = self._post()
+
+    def _post(self, content='Great trail'):
+        return CommunityPost.objects.create(community=self.community, author=self.author, content=content)
+
+    def _counts(self, post=None):
+        post = post or self.post
+        post.refresh_from_db(fields=['like_count', 'comment_count'])
+        return post.like_count, post.comment_count
+
+
+class PostCounterTest(CommunityPostTestCase):
+    def test_likes_update_counter_from_both_sides(self):
+        self.post.likes.add(*self.fans)
+        self.assertEqual(self._counts(), (3, 0))
+
+        self.post.likes.add(self.fans[0])  # already liked
+        self.post.likes.remove(self.fans[0], self.author)  # author never liked
+        self.assertEqual(self._counts(), (2, 0))
+
+        other = self._post('Second')
+        self.fans[1].liked_posts.add(other)
+        self.assertEqual(self._counts(other), (1, 0))
+        self.fans[1].liked_posts.clear()
+        self.assertEqual(self._counts(), (1, 0))
+        self.assertEqual(self._counts(other), (0, 0))
+
+        self.post.likes.clear()
+        self.assertEqual(self._counts(), (0, 0))
+
+    def test_comments_update_counter(self):
+        comment = PostComment.objects.create(post=self.post, author=self.fans[0], content='Agreed')
+        PostComment.objects.create(post=self.post, author=self.fans[1], content='Reply', parent=comment)
+        PostComment.objects.create(post=self.post, author=self.fans[2], content='Nice')
+        self.assertEqual(self._counts(), (0, 3))
+
+        comment.delete()  # cascades to its reply
+        self.assertEqual(self._counts(), (0, 1))
+
+    def test_like_view_toggles_and_returns_stored_count(self):
+        FeatureToggle.objects.create(key='enable_likes', is_enabled=True)
+        self.client.force_login(self.fans[0])
+        url = reverse('communities:like_post', args=[self.post.pk])
+        ajax = {'HTTP_X_REQUESTED_WITH': 'XMLHttpRequest'}
+
+        self.assertEqual(self.client.post(url, **ajax).json(), {'success': True, 'liked': True, 'count': 1})
+        self.assertEqual(self.client.post(url, **ajax).json(), {'success': True, 'liked': False, 'count': 0})
+
+    def test_recalculate_command_repairs_drift(self):
+        self.post.likes.add(*self.fans)
+        PostComment.objects.create(post=self.post, author=self.fans[0], content='Hi')
+        CommunityPost.objects.filter(pk=self.post.pk).update(like_count=99, comment_count=0)
+        Community.objects.filter(pk=self.community.pk).update(member_count=7)
+
+        out = StringIO()
+        call_command('recalculate_community_counters', stdout=out)
+        self.assertEqual(self._counts(), (3, 1))
+        self.community.refresh_from_db()
+        self.assertEqual(self.community.member_count, 1)
+        self.assertIn('1 communities and 1 posts', out.getvalue())
+
+    def test_membership_changes_update_member_count(self):
+        self.client.force_login(self.fans[0])
+        self.client.post(reverse('communities:join', args=[self.community.slug]))
+        self.client.post(reverse('communities:join', args=[self.community.slug]))  # already a member
+        CommunityMembership.objects.create(user=self.fans[1], community=self.community)
+        self.community.refresh_from_db()
+        self.assertEqual(self.community.member_count, 3)
+
+        self.client.post(reverse('communities:leave', args=[self.community.slug]))
+        self.community.refresh_from_db()
+        self.assertEqual(self.community.member_count, 2)
+
+
+class CommunityFeedTest(CommunityPostTestCase):
+    def _feed_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('communities:detail', args=[self.community.slug]))
+        self.assertEqual(response.status_code, 200)
+        return response, len(ctx.captured_queries)
+
+    def _add_posts(self, count):
+        for i in range(count):
+            post = self._post(f'Post {i}')
+            post.likes.add(*self.fans[:i % 3])
+            PostComment.objects.create(post=post, author=self.fans[i % 3], content='Comment')
+
+    def test_query_count_does_not_grow_with_posts(self):
+        self.client.force_login(self.fans[0])
+        self._add_posts(2)
+        self._feed_queries()  # warm the per-user and site-wide caches
+        _, few = self._feed_queries()
+        self._add_posts(40)
+        response, many = self._feed_queries()
+        self.assertEqual(few, many)
+        self.assertEqual(len(response.context['posts']), 20)
+        self.assertEqual(response.context['post_total'], 43)
+        self.assertIsNotNone(response.context['next_cursor'])
+
+    def test_is_liked_by_me(self):
+        liked = self._post('Liked')
+        liked.likes.add(self.fans[0], self.fans[1])
+        self.client.force_login(self.fans[0])
+        response, _ = self._feed_queries()
+        flags = {post.pk: post.is_liked_by_me for post in response.context['posts']}
+        self.assertEqual(flags, {liked.pk: True, self.post.pk: False})
+        self.assertContains(response, 'data-liked="true"', count=1)
+
+        self.client.logout()
+        response, _ = self._feed_queries()
+        self.assertFalse(any(post.is_liked_by_me for post in response.context['posts']))
+
+
+class FeedPaginationTest(CommunityPostTestCase):
+    def setUp(self):
+        super().setUp()
+        # Pairs of posts share a timestamp, so ties are broken on id
+        base = timezone.now()
+        CommunityPost.objects.filter(pk=self.post.pk).update(created_at=base)
+        for i in range(1, 12):
+            post = self._post(f'Post {i}')
+            CommunityPost.objects.filter(pk=post.pk).update(created_at=base - timedelta(minutes=i // 2))
+        self.expected = list(
+            CommunityPost.objects.filter(community=self.community).order_by('-created_at', '-id')
+            .values_list('pk', flat=True)
+        )
+
+    def test_cursor_walk_visits_every_post_once_in_order(self):
+        seen, cursor, pages = [], None, 0
+        while True:
+            posts, cursor = get_feed_page(self.community, cursor=cursor, page_size=5)
+            seen.extend(post.pk for post in posts)
+            pages += 1
+            if cursor is None:
+                break
+        self.assertEqual(seen, self.expected)
+        self.assertEqual(pages, 3)
+
+    def test_malformed_cursor_starts_from_the_top(self):
+        for cursor in ('', 'not-a-cursor', '!!!'):
+            posts, _ = get_feed_page(self.community, cursor=cursor, page_size=3)
+            self.assertEqual([p.pk for p in posts], self.expected[:3])
+
+    @override_settings(COMMUNITY_FEED_PAGE_SIZE=5)
+    def test_load_more_renders_next_page(self):
+        first = self.client.get(reverse('communities:detail', args=[self.community.slug]))
+        cursor = first.context['next_cursor']
+        self.assertContains(first, f'?before={cursor}')
+
+        response = self.client.get(
+            reverse('communities:detail', args=[self.community.slug]), {'before': cursor}, HTTP_HX_REQUEST='true'
+        )
+        self.assertTemplateUsed(response, 'communities/partials/post_page.html')
+        self.assertTemplateNotUsed(response, 'communities/community_detail.html')
+        self.assertEqual([p.pk for p in response.context['posts']], self.expected[5:10])
+
+    def test_cursor_round_trip(self):
+        post = CommunityPost.objects.get(pk=self.expected[4])
+        posts, _ = get_feed_page(self.community, cursor=encode_cursor(post), page_size=50)
+        self.assertEqual([p.pk for p in posts], self.expected[5:])
+
+
+class CachedLookupsTest(CommunityPostTestCase):
+    def test_memberships_are_cached_per_user(self):
+        fan = self.fans[0]
+        self.assertFalse(is_member(fan, self.community))
+        with self.assertNumQueries(0):
+            self.assertFalse(is_member(fan, self.community))
+
+        CommunityMembership.objects.create(user=fan, community=self.community)
+        self.assertTrue(is_member(fan, self.community))
+        CommunityMembership.objects.filter(user=fan).delete()
+        self.assertEqual(get_user_community_ids(fan), frozenset())
+
+    def test_feature_toggles_come_from_the_snapshot(self):
+        self.assertFalse(FeatureToggleService.is_enabled('enable_likes'))
+        with self.assertNumQueries(0):
+            self.assertFalse(FeatureToggleService.is_enabled('enable_likes'))
+            self.assertTrue(FeatureToggleService.is_enabled('missing', default=True))
+
+        toggle = FeatureToggle.objects.create(key='enable_likes', is_enabled=True)
+        self.assertTrue(FeatureToggleService.is_enabled('enable_likes'))
+        self.assertEqual(FeatureToggleService.enabled_keys(), {'enable_likes'})
+        toggle.delete()
+        self.assertFalse(FeatureToggleService.is_enabled('enable_likes'))
@@ -3,8 +3,10 @@ from django.views.generic import ListView, DetailView, CreateView, View
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.urls import reverse_lazy, reverse
 from django.contrib import messages
-from django.db.models import Count
 from .models import Community, CommunityPost, CommunityMembership
+from .services.feed_service import get_feed_page
+from .services.membership_service import is_member
+from management.services.feature_toggle_service import FeatureToggleService
 from django import forms
 
 class CommunityListView(ListView):
@@ -13,7 +15,8 @@ class CommunityListView(ListView):
     context_object_name = 'communities'
     
     def get_queryset(self):
-        return Community.objects.annotate(member_count=Count('members')).order_by('-is_official', '-member_count')
+        # member_count is stored on the community (membership signals)
+        return Community.objects.order_by('-is_official', '-member_count')
 
 class CommunityDetailView(DetailView):
     model = Community
@@ -22,18 +25,33 @@ class CommunityDetailView(DetailView):
     slug_field = 'slug'
     slug_url_kwarg = 'slug'
 
+    def get(self, request, *args, **kwargs):
+        self.object = self.get_object()
+        if request.headers.get('HX-Request') and 'before' in request.GET:
+            # "Load more": just the next page of posts
+            posts, next_cursor = get_feed_page(self.object, request.user, request.GET['before'])
+            return render(request, 'communities/partials/post_page.html', {
+                'community': self.object,
+                'posts': posts,
+                'next_cursor': next_cursor,
+            })
+        context = self.get_context_data(object=self.object)
+        return self.render_to_response(context)
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         user = self.request.user
-        if user.is_authenticated:
-            context['is_member'] = CommunityMembership.objects.filter(user=user, community=self.object).exists()
-        else:
-            context['is_member'] = False
+        context['is_member'] = is_member(user, self.object)
         
-        # Inject Feature Toggles
-        from management.models import FeatureToggle
-        toggles = FeatureToggle.objects.filter(is_enabled=True).values_list('key', flat=True)
-        context['toggles'] = {key: True for key in toggles}
+        # Inject Feature Toggles (cached snapshot)
+        context['toggles'] = {key: True for key in FeatureToggleService.enabled_keys()}
+
+        # Feed: one keyset page; counters are stored on the post, likes
+        # resolved in one subquery
+        context['posts'], context['next_cursor'] = get_feed_page(
+            self.object, user, self.request.GET.get('before')
+        )
+        context['post_total'] = self.object.posts.count()
 
         # Pass the form for the modal
         context['post_form'] = PostCreateForm()
@@ -63,7 +81,7 @@ class PostCreateView(LoginRequiredMixin, CreateView):
     def form_valid(self, form):
         community = get_object_or_404(Community, slug=self.kwargs['slug'])
         # Check membership
-        if not CommunityMembership.objects.filter(user=self.request.user, community=community).exists():
+        if not is_member(self.request.user, community):
              messages.error(self.request, "يجب أن تكون عضوًا في المجتمع لتتمكن من النشر")
              return redirect('communities:detail', slug=community.slug)
              
@@ -137,8 +155,7 @@ class AddCommentView(LoginRequiredMixin, View):
     """إضافة تعليق على منشور"""
     
     def post(self, request, post_id):
-        from management.models import FeatureToggle
-        if not FeatureToggle.objects.filter(key='enable_comments', is_enabled=True).exists():
+        if not FeatureToggleService.is_enabled('enable_comments'):
              if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
                 return JsonResponse({'error': 'التعليقات معطلة حالياً'}, status=403)
              messages.error(request, "التعليقات معطلة حالياً")
@@ -204,15 +221,14 @@ class LikePostView(LoginRequiredMixin, View):
     """الإعجاب أو إلغاء الإعجاب بمنشور"""
     
     def post(self, request, post_id):
-        from management.models import FeatureToggle
-        if not FeatureToggle.objects.filter(key='enable_likes', is_enabled=True).exists():
+        if not FeatureToggleService.is_enabled('enable_likes'):
              if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
                 return JsonResponse({'error': 'الإعجابات معطلة حالياً'}, status=403)
              return redirect(request.META.get('HTTP_REFERER', '/'))
 
-        post = get_object_or_404(CommunityPost, pk=post_id)
+        post = get_object_or_404(CommunityPost.objects.select_related('community'), pk=post_id)
         
-        if request.user in post.likes.all():
+        if post.likes.filter(pk=request.user.pk).exists():
             post.likes.remove(request.user)
             liked = False
         else:
@@ -220,6 +236,8 @@ class LikePostView(LoginRequiredMixin, View):
             liked = True
         
         if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+            # like_count was updated in the database by the m2m_changed handler
+            post.refresh_from_db(fields=['like_count'])
             return JsonResponse({
                 'success': True,
                 'liked': liked,
@@ -0,0 +1,110 @@
+"""
+Benchmark the event listing on N events.
+
+Times the listing page (default, searched, filtered) through the test
+client, event search through the full-text index vs icontains, and the
+season/featured queries vs their per-day cache.
+
+Usage:
+    python manage.py benchmark_event_listing --events 200000
+    python manage.py benchmark_event_listing --cleanup
+"""
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+
+PREFIX = 'bench_evt '
+WORDS = ['مهرجان', 'الربيع', 'سوق', 'القهوة', 'معرض', 'الكتاب', 'جولة', 'جبلية', 'حفلة', 'تراثية',
+         'festival', 'coffee', 'market', 'hiking', 'honey', 'crafts', 'music', 'night']
+PLACES = ['إب', 'جبلة', 'العدين', 'Old City', 'Jabal Ba\'dan', 'Mushanna']
+
+
+class Command(BaseCommand):
+    help = 'Time the event listing, search and sidebar queries on N events'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=200000)
+        parser.add_argument('--repeat', type=int, default=10)
+        parser.add_argument('--cleanup', action='store_true', help='Delete seeded events and exit')
+
+    def handle(self, *args, **options):
+        from django.test import Client
+        from events.models import Event, Season
+        from events.services.listing_service import (
+            get_current_season, get_featured_events, invalidate_event_listings,
+        )
+        from events.services.search_service import fts_available, search_events
+
+        seeded = Event.objects.filter(title__startswith=PREFIX)
+        if options['cleanup']:
+            seeded.delete()
+            self.stdout.write(self.style.SUCCESS("Deleted seeded events."))
+            return
+        if seeded.count() != options['events']:
+            seeded.delete()
+            self.seed(options['events'])
+
+        repeat = options['repeat']
+        now = timezone.now()
+        upcoming = Event.objects.filter(end_datetime__gte=now)
+        self.stdout.write(f"full-text index available: {fts_available()}")
+
+        for term in ('القهوة', 'honey crafts', 'ستيفال'):
+            self.report(f'search {term!r} icontains', repeat, lambda: list(upcoming.filter(
+                Q(title__icontains=term) | Q(description__icontains=term) | Q(location__icontains=term)
+            ).order_by('start_datetime')[:12]))
+            self.report(f'search {term!r} full-text', repeat,
+                        lambda: list(search_events(upcoming, term).order_by('start_datetime')[:12]))
+
+        self.report('season + featured (old queries)', repeat, lambda: (
+            Season.objects.filter(start_date__lte=now.date(), end_date__gte=now.date(), is_active=True).first(),
+            list(Event.objects.filter(is_featured=True, end_datetime__gte=now).order_by('start_datetime')[:5]),
+        ))
+        invalidate_event_listings()
+        self.report('season + featured (uncached)', 1, lambda: (get_current_season(now), get_featured_events(now)))
+        invalidate_event_listings()
+        self.report('season + featured (cached)', repeat,
+                    lambda: (get_current_season(now), get_featured_events(now)))
+
+        client = Client(SERVER_NAME=(settings.ALLOWED_HOSTS or ['localhost'])[0].lstrip('.') or 'localhost')
+        url = '/events/'
+        assert client.get(url).status_code == 200, 'event list did not render'
+        self.report('list page (view)', repeat, lambda: client.get(url))
+        self.report('list page, search (view)', repeat, lambda: client.get(url, {'search': 'القهوة'}))
+        self.report('list page, featured (view)', repeat, lambda: client.get(url, {'featured': '1'}))
+
+    def report(self, label, repeat, fn):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            timings.append((time.perf_counter() - start) * 1000)
+        self.stdout.write(f"{label:<36} median {statistics.median(timings):8.1f} ms  max {max(timings):8.1f} ms")
+
+    def seed(self, count):
+        from events.models import Event
+
+        rng = random.Random(5)
+        now = timezone.now()
+        batch = []
+        for i in range(count):
+            start = now + timedelta(hours=rng.randint(-24 * 365, 24 * 365))
+            batch.append(Event(
+                title=PREFIX + ' '.join(rng.sample(WORDS, 3)),
+                description=' '.join(rng.choice(WORDS) for _ in range(25)),
+                location=rng.choice(PLACES),
+                start_datetime=start,
+                end_datetime=start + timedelta(hours=rng.randint(1, 72)),
+                event_type=rng.choice(Event.EVENT_TYPES)[0],
+                is_featured=rng.random() < 0.01,
+            ))
+            if len(batch) == 5000:
+                Event.objects.bulk_create(batch)
+                batch = []
+        Event.objects.bulk_create(batch)
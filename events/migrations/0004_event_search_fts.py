@@ -0,0 +1,82 @@
+"""
+Full-text index for event search (SQLite FTS5, trigram tokenizer).
+
+The trigram tokenizer matches any substring of three or more characters,
+so search keeps the icontains semantics (including Arabic words with
+attached prefixes) while reading an index instead of scanning every row.
+Triggers keep the external-content table in step with events_event.
+Skipped on other databases and on SQLite builds without FTS5; search
+then falls back to icontains.
+"""
+import logging
+
+from django.db import migrations, OperationalError
+
+logger = logging.getLogger(__name__)
+
+CREATE_SQL = [
+    """
+    CREATE VIRTUAL TABLE events_event_fts USING fts5(
+        title, description, location,
+        content='events_event', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER events_event_fts_ai AFTER INSERT ON events_event BEGIN
+        INSERT INTO events_event_fts(rowid, title, description, location)
+        VALUES (new.id, new.title, new.description, new.location);
+    END
+    """,
+    """
+    CREATE TRIGGER events_event_fts_ad AFTER DELETE ON events_event BEGIN
+        INSERT INTO events_event_fts(events_event_fts, rowid, title, description, location)
+        VALUES ('delete', old.id, old.title, old.description, old.location);
+    END
+    """,
+    """
+    CREATE TRIGGER events_event_fts_au AFTER UPDATE OF title, description, location ON events_event BEGIN
+        INSERT INTO events_event_fts(events_event_fts, rowid, title, description, location)
+        VALUES ('delete', old.id, old.title, old.description, old.location);
+        INSERT INTO events_event_fts(rowid, title, description, location)
+        VALUES (new.id, new.title, new.description, new.location);
+    END
+    """,
+    "INSERT INTO events_event_fts(events_event_fts) VALUES ('rebuild')",
+]
+
+DROP_SQL = [
+    "DROP TRIGGER IF EXISTS events_event_fts_ai",
+    "DROP TRIGGER IF EXISTS events_event_fts_ad",
+    "DROP TRIGGER IF EXISTS events_event_fts_au",
+    "DROP TABLE IF EXISTS events_event_fts",
+]
+
+
+def create_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    try:
+        for sql in CREATE_SQL:
+            schema_editor.execute(sql)
+    except OperationalError as exc:
+        # SQLite built without FTS5 / trigram (< 3.34): search uses icontains
+        logger.warning("Event full-text index not created: %s", exc)
+        for sql in DROP_SQL:
+            schema_editor.execute(sql)
+
+
+def drop_fts(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        for sql in DROP_SQL:
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0003_event_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts, drop_fts),
+    ]
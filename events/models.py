@@ -38,5 +38,13 @@ class Event(TimeStampedModel):
     event_type = models.CharField(max_length=20, choices=EVENT_TYPES, default='other', verbose_name=_("نوع الفعالية"))
     is_featured = models.BooleanField(default=False, verbose_name=_("مميز"))
 
+    class Meta:
+        indexes = [
+            # Featured strip: featured, upcoming, soonest first
+            models.Index(fields=['is_featured', 'start_datetime'], name='event_featured_start_idx'),
+            # Listing: not yet ended, ordered by start
+            models.Index(fields=['end_datetime', 'start_datetime'], name='event_end_start_idx'),
+        ]
+
     def __str__(self):
         return self.title
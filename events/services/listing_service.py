@@ -0,0 +1,63 @@
+"""
+Event Listing Service
+The current season and the featured-events strip, cached per day under
+a version that Event and Season changes bump.
+"""
+from datetime import datetime, time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from ibb_guide.services.cache_service import bump_version, get_version
+
+CACHE_TTL = 60 * 60
+VERSION_KEY = 'events:listing:version'
+FEATURED_LIMIT = 5
+# Featured events are cached for the whole day and those that have
+# already ended are dropped on read, so keep a few spare candidates.
+FEATURED_CANDIDATES = 20
+# is_featured=True compiles to a bare boolean column, which SQLite cannot
+# match against the (is_featured, start_datetime) index; IN (1) can.
+FEATURED = [True]
+
+
+def invalidate_event_listings():
+    """Drop the cached season and featured strip (events or seasons changed)."""
+    bump_version(VERSION_KEY)
+
+
+def _cached(name, day, build):
+    key = f'events:{name}:{day.isoformat()}:{get_version(VERSION_KEY)}'
+    value = cache.get(key)
+    if value is None:
+        # Wrapped so a day without a season (None) is cached too
+        value = (build(),)
+        cache.set(key, value, getattr(settings, 'EVENT_LISTING_CACHE_SECONDS', CACHE_TTL))
+    return value[0]
+
+
+def get_current_season(now=None):
+    """The active season covering today, or None."""
+    from events.models import Season
+
+    today = timezone.localdate(now)
+    return _cached('season', today, lambda: Season.objects.filter(
+        start_date__lte=today, end_date__gte=today, is_active=True
+    ).first())
+
+
+def get_featured_events(now=None, limit=FEATURED_LIMIT):
+    """Up to ``limit`` featured events that have not ended, soonest first."""
+    from events.models import Event
+
+    now = now or timezone.now()
+    today = timezone.localdate(now)
+    day_start = datetime.combine(today, time.min)
+    if settings.USE_TZ:
+        day_start = timezone.make_aware(day_start)
+    candidates = _cached('featured', today, lambda: list(
+        Event.objects.filter(is_featured__in=FEATURED, end_datetime__gte=day_start)
+        .order_by('start_datetime')[:FEATURED_CANDIDATES]
+    ))
+    return [event for event in candidates if event.end_datetime >= now][:limit]
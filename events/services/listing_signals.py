@@ -0,0 +1,16 @@
+"""
+Event Listing Signals
+Invalidate the cached season and featured strip when events or seasons change.
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from events.services.listing_service import invalidate_event_listings
+
+
+@receiver(post_save, sender='events.Event')
+@receiver(post_delete, sender='events.Event')
+@receiver(post_save, sender='events.Season')
+@receiver(post_delete, sender='events.Season')
+def invalidate_listings_on_change(sender, instance, **kwargs):
+    invalidate_event_listings()
@@ -0,0 +1,51 @@
+"""
+Event Search Service
+Routes event search through the events_event_fts full-text index
+(SQLite FTS5, trigram tokenizer; see migration 0004) when it exists,
+falling back to icontains across title, description and location.
+"""
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'events_event_fts'
+# The trigram tokenizer cannot match terms shorter than three characters
+MIN_FTS_LENGTH = 3
+
+_fts_available = {}
+
+
+def fts_available():
+    """Whether the full-text table exists on this database (checked once per process)."""
+    alias = connection.alias
+    if alias not in _fts_available:
+        available = False
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE]
+                )
+                available = cursor.fetchone() is not None
+        _fts_available[alias] = available
+    return _fts_available[alias]
+
+
+def fts_phrase(query):
+    """The query as one FTS5 phrase (a substring match under the trigram tokenizer)."""
+    return '"' + query.replace('"', '""') + '"'
+
+
+def search_events(queryset, query):
+    """Filter an Event queryset to rows whose title, description or location contain query."""
+    query = query.strip()
+    if not query:
+        return queryset
+    if len(query) >= MIN_FTS_LENGTH and fts_available():
+        return queryset.filter(pk__in=RawSQL(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [fts_phrase(query)]
+        ))
+    return queryset.filter(
+        Q(title__icontains=query) |
+        Q(description__icontains=query) |
+        Q(location__icontains=query)
+    )
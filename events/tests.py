@@ -1,3 +1,116 @@
-from django.test import TestCase
+"""
+Event Listing Tests
+Full-text event search, cached season/featured strip and the listing view.
+"""
+from datetime import timedelta
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db.models import Q
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from events.models import Event, Season
+from events.services.listing_service import get_current_season, get_featured_events
+from events.services.search_service import fts_available, search_events
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class EventTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.now = timezone.now()
+
+    def _event(self, title, description='وصف', location='إب', start=1, end=2, **fields):
+        return Event.objects.create(
+            title=title, description=description, location=location,
+            start_datetime=self.now + timedelta(days=start), end_datetime=self.now + timedelta(days=end),
+            **fields
+        )
+
+
+class EventSearchTest(EventTestCase):
+    def setUp(self):
+        super().setUp()
+        self._event('مهرجان الربيع السنوي', 'عروض شعبية وأسواق', 'حديقة إب')
+        self._event('Coffee Festival', 'Yemeni coffee tasting', 'Old City')
+        self._event('معرض الكتاب', 'دور نشر "محلية" ودولية', 'قاعة المدينة')
+        self._event('Hiking tour', 'Mountain trail to Jabal Ba\'dan', 'Ba\'dan')
+
+    def _icontains(self, query):
+        return set(Event.objects.filter(
+            Q(title__icontains=query) | Q(description__icontains=query) | Q(location__icontains=query)
+        ).values_list('pk', flat=True))
+
+    def test_full_text_index_is_used_on_sqlite(self):
+        if not fts_available():
+            # pytest builds the test schema with --nomigrations
+            self.skipTest('events_event_fts is created by migration 0004')
+        sql = str(search_events(Event.objects.all(), 'coffee').query)
+        self.assertIn('MATCH', sql)
+
+    def test_matches_icontains(self):
+        for query in ('الربيع', 'رجان', 'coffee', 'FEST', 'إب', 'ba\'dan', '"محلية"', 'مدينة',
+                      'to Jabal', 'xyz', 'a', 'ق'):
+            with self.subTest(query=query):
+                found = set(search_events(Event.objects.all(), query).values_list('pk', flat=True))
+                self.assertEqual(found, self._icontains(query))
+
+    def test_index_follows_updates_and_deletes(self):
+        event = Event.objects.get(title='Coffee Festival')
+        event.title = 'Honey Market'
+        event.save()
+        self.assertFalse(search_events(Event.objects.all(), 'Coffee Festival').exists())
+        self.assertEqual(list(search_events(Event.objects.all(), 'honey')), [event])
+
+        event.delete()
+        self.assertFalse(search_events(Event.objects.all(), 'honey').exists())
+
+
+class ListingCacheTest(EventTestCase):
+    def test_current_season_is_cached_per_day(self):
+        today = timezone.localdate()
+        season = Season.objects.create(
+            name='Spring', start_date=today - timedelta(days=1), end_date=today + timedelta(days=30)
+        )
+        self.assertEqual(get_current_season(), season)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_current_season(), season)
+
+        season.is_active = False
+        season.save()
+        self.assertIsNone(get_current_season())
+        with self.assertNumQueries(0):
+            self.assertIsNone(get_current_season())
+
+    def test_featured_strip(self):
+        ending = self._event('Ends soon', start=-1, end=0, is_featured=True)
+        ending.end_datetime = self.now + timedelta(minutes=30)
+        ending.save()
+        later = [self._event(f'Featured {i}', start=i + 1, end=i + 2, is_featured=True) for i in range(6)]
+        self._event('Plain', is_featured=False)
+
+        self.assertEqual(get_featured_events(self.now), [ending] + later[:4])
+        with self.assertNumQueries(0):
+            # Ended since the strip was cached: dropped on read
+            featured = get_featured_events(self.now + timedelta(hours=1))
+        self.assertEqual(featured, later[:5])
+
+        later[0].is_featured = False
+        later[0].save()
+        self.assertEqual(get_featured_events(self.now + timedelta(hours=1)), later[1:6])
+
+
+class EventListViewTest(EventTestCase):
+    def test_paginates_and_keeps_filters(self):
+        for i in range(15):
+            self._event(f'Festival {i}', event_type='festival', start=i + 1, end=i + 2)
+        self._event('Past festival', start=-3, end=-2)
+
+        url = reverse('events:list')
+        self.client.get(url, {'search': 'warm'})  # warm caches
+        with self.assertNumQueries(2):  # page count + page rows
+            response = self.client.get(url, {'search': 'festival', 'type': 'festival'})
+        self.assertEqual(response.context['paginator'].count, 15)
+        self.assertEqual(len(response.context['events']), 12)
+        self.assertContains(response, 'href="?page=2&amp;search=festival&amp;type=festival"')
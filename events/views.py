@@ -1,13 +1,15 @@
 from django.views.generic import ListView, DetailView
 from django.utils import timezone
-from .models import Event, Season
-from django.db.models import Q
+from .models import Event
+from .services.listing_service import FEATURED, get_current_season, get_featured_events
+from .services.search_service import search_events
 
 class EventListView(ListView):
     model = Event
     template_name = 'events/list.html'
     context_object_name = 'events'
     ordering = ['start_datetime']
+    paginate_by = 12
 
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -19,11 +21,7 @@ class EventListView(ListView):
         # Search Filter
         search_query = self.request.GET.get('search', '')
         if search_query:
-            queryset = queryset.filter(
-                Q(title__icontains=search_query) | 
-                Q(description__icontains=search_query) |
-                Q(location__icontains=search_query)
-            )
+            queryset = search_events(queryset, search_query)
         
         # Type Filter (e.g., ?type=festival)
         event_type = self.request.GET.get('type')
@@ -46,7 +44,7 @@ class EventListView(ListView):
         # Featured Filter
         featured = self.request.GET.get('featured')
         if featured:
-            queryset = queryset.filter(is_featured=True)
+            queryset = queryset.filter(is_featured__in=FEATURED)
 
         return queryset
 
@@ -54,20 +52,27 @@ class EventListView(ListView):
         context = super().get_context_data(**kwargs)
         now = timezone.now()
         
+        # Season and featured strip are cached per day
         # Defensive: Season table might not exist
         try:
-            context['current_season'] = Season.objects.filter(
-                start_date__lte=now.date(), 
-                end_date__gte=now.date(), 
-                is_active=True
-            ).first()
+            context['current_season'] = get_current_season(now)
         except Exception:
             context['current_season'] = None
         
-        context['featured_events'] = Event.objects.filter(
-            is_featured=True, 
-            end_datetime__gte=now
-        ).order_by('start_datetime')[:5]
+        context['featured_events'] = get_featured_events(now)
+        
+        # Pagination window around the current page (the template used to
+        # walk every page number to pick these out)
+        page_obj = context.get('page_obj')
+        if page_obj is not None:
+            context['page_numbers'] = range(
+                max(1, page_obj.number - 2), min(page_obj.paginator.num_pages, page_obj.number + 2) + 1
+            )
+        
+        # Keep the active filters on pagination links
+        params = self.request.GET.copy()
+        params.pop('page', None)
+        context['filter_query'] = params.urlencode()
         
         return context
 
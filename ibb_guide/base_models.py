@@ -1,4 +1,7 @@
+import copy
+
 from django.db import models
+from django.db.models.fields.files import FieldFile
 from django.utils import timezone
 
 
@@ -86,3 +89,70 @@ class SoftDeleteMixin(models.Model):
         self.deleted_at = None
         self.deleted_by = None
         self.save(update_fields=['is_deleted', 'deleted_at', 'deleted_by'])
+
+
+class FieldTrackerMixin(models.Model):
+    """
+    Mixin that remembers the values of `tracked_fields` as they were loaded
+    from (or last saved to) the database, so pre/post_save handlers can diff
+    an instance without re-fetching it.
+
+    Usage:
+        class MyModel(FieldTrackerMixin, TimeStampedModel):
+            tracked_fields = ('status',)
+
+        old_status = instance.get_tracked_values().get('status')
+    """
+    tracked_fields = ()
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        loaded = dict(zip(field_names, values))
+        instance._tracked_snapshot = {
+            name: copy.deepcopy(loaded[attname])
+            for name, attname in cls._tracked_attnames()
+            if attname in loaded
+        }
+        return instance
+
+    @classmethod
+    def _tracked_attnames(cls):
+        return [(name, cls._meta.get_field(name).attname) for name in cls.tracked_fields]
+
+    def _current_tracked_value(self, attname):
+        value = getattr(self, attname)
+        if isinstance(value, FieldFile):
+            value = value.name
+        return copy.deepcopy(value)
+
+    def get_tracked_values(self):
+        """
+        Tracked field values as stored in the database ({} for unsaved rows).
+        Fields that were deferred or never loaded are fetched in one query.
+        """
+        if self._state.adding or self.pk is None:
+            return {}
+        snapshot = self.__dict__.setdefault('_tracked_snapshot', {})
+        missing = [name for name in self.tracked_fields if name not in snapshot]
+        if missing:
+            row = type(self)._base_manager.using(self._state.db).filter(pk=self.pk).values(*missing).first()
+            snapshot.update(row or {})
+        return snapshot
+
+    def has_changed(self, name):
+        tracked = self.get_tracked_values()
+        attname = self._meta.get_field(name).attname
+        return name not in tracked or tracked[name] != self._current_tracked_value(attname)
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # post_save handlers have seen the old values; now the saved ones are current
+        update_fields = kwargs.get('update_fields')
+        snapshot = self.__dict__.setdefault('_tracked_snapshot', {})
+        for name, attname in self._tracked_attnames():
+            if update_fields is None or name in update_fields or attname in update_fields:
+                snapshot[name] = self._current_tracked_value(attname)
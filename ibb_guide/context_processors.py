@@ -16,22 +16,16 @@ def system_settings(request):
 def notifications(request):
     """
     Inject unread notification count for the user.
-    Uses request-level reuse and short TTL (60s) caching.
+    Uses request-level reuse and the write-through unread counter.
     """
     if request.user.is_authenticated:
         # 1. Reuse computed value if already present in this request
         if hasattr(request, '_unread_notifications_count'):
             return {'unread_notifications_count': request._unread_notifications_count}
 
-        # 2. Check Cache
-        cache_key = f"notif_ctx:{request.user.id}"
-        count = cache.get(cache_key)
-        
-        if count is None:
-            from interactions.models import Notification
-            count = Notification.objects.filter(recipient=request.user, is_read=False).count()
-            # Cache for a short time to balance freshness and performance
-            cache.set(cache_key, count, 60)
+        # 2. Cached counter (loaded from the DB on first use)
+        from interactions.services.unread_service import UnreadCountService
+        count = UnreadCountService.get(request.user)
         
         # 3. Store on request for reuse in same cycle
         request._unread_notifications_count = count
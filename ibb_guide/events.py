@@ -7,11 +7,17 @@ from "what to do next". This enables:
 - Easy addition of new handlers (notifications, analytics, etc.)
 - Testable event-driven logic
 """
-from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Any, Dict, List, Callable, Type
+import json
+import logging
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Callable, Optional, Type
 from django.dispatch import Signal
 
+logger = logging.getLogger(__name__)
+
 # ============================================================================
 # Base Event Classes
 # ============================================================================
@@ -102,53 +108,272 @@ class WeatherAlertIssued(DomainEvent):
 
 
 # ============================================================================
-# Event Bus (simple in-process implementation using Django Signals)
+# Event Bus
 # ============================================================================
 
+def qualified_name(obj) -> str:
+    """Durable name of a handler or event class ('module.QualName')."""
+    return f'{obj.__module__}.{obj.__qualname__}'
+
+
 class EventBus:
     """
-    Simple event bus for publishing and subscribing to domain events.
-    Uses Django signals under the hood for synchronous in-process handling.
-    Can be extended for async/external message queues in the future.
+    Event bus for publishing and subscribing to domain events.
+
+    Two dispatch modes (settings.EVENT_BUS_MODE):
+    - 'sync': handlers run in-process during publish(). Each handler is
+      isolated: a failure is logged and the remaining handlers still run.
+    - 'async': publish() writes one DomainEventOutbox row per handler in
+      the caller's transaction and schedules process_queue() on commit.
+      Handlers run in a worker with per-handler retry, and handlers
+      subscribed with batch=True receive all queued events of a type in
+      one call.
+
+    Handler timings are recorded in the cache (see handler_stats()).
+    Django signal receivers are always notified synchronously.
     """
     _signal = Signal()
     _handlers: Dict[Type[DomainEvent], List[Callable]] = {}
-    
+    _by_name: Dict[str, Callable] = {}
+    _batch_handlers: set = set()
+
+    SCHEDULED_KEY = 'events:worker:scheduled'
+    STATS_KEY = 'events:handler:{name}:{field}'
+    STATS_FIELDS = ('calls', 'failures', 'total_us')
+
+    @staticmethod
+    def mode() -> str:
+        from django.conf import settings
+        return getattr(settings, 'EVENT_BUS_MODE', 'sync')
+
     @classmethod
-    def publish(cls, event: DomainEvent):
+    def publish(cls, event: DomainEvent, mode: str = None):
         """Publish an event to all registered handlers."""
-        event_type = type(event)
-        handlers = cls._handlers.get(event_type, [])
-        for handler in handlers:
-            try:
-                handler(event)
-            except Exception as e:
-                # Log error but don't break the chain
-                print(f"[EventBus] Error in handler {handler.__name__}: {e}")
-        
+        if (mode or cls.mode()) == 'async':
+            cls._enqueue(event)
+        else:
+            cls.dispatch(event)
+
         # Also send via Django signal for broader compatibility
-        cls._signal.send(sender=event_type, event=event)
-    
+        cls._signal.send(sender=type(event), event=event)
+
+    @classmethod
+    def dispatch(cls, event: DomainEvent):
+        """Run all handlers of the event now (synchronous mode)."""
+        for handler in cls._handlers.get(type(event), []):
+            arg = [event] if qualified_name(handler) in cls._batch_handlers else event
+            cls._run(handler, arg)
+
+    @classmethod
+    def _run(cls, handler: Callable, arg) -> Optional[Exception]:
+        """Call a handler in isolation; returns the exception it raised, if any."""
+        started = time.perf_counter()
+        error = None
+        try:
+            handler(arg)
+        except Exception as e:
+            # Log error but don't break the chain
+            logger.exception(f"[EventBus] Error in handler {qualified_name(handler)}")
+            error = e
+        cls._record(qualified_name(handler), time.perf_counter() - started, error is not None)
+        return error
+
     @classmethod
-    def subscribe(cls, event_type: Type[DomainEvent], handler: Callable):
-        """Subscribe a handler to a specific event type."""
+    def subscribe(cls, event_type: Type[DomainEvent], handler: Callable, batch: bool = False):
+        """
+        Subscribe a handler to a specific event type. A batch handler takes
+        a list of events instead of a single event.
+        """
         if event_type not in cls._handlers:
             cls._handlers[event_type] = []
         cls._handlers[event_type].append(handler)
-    
+        cls._by_name[qualified_name(handler)] = handler
+        if batch:
+            cls._batch_handlers.add(qualified_name(handler))
+
     @classmethod
     def clear(cls):
         """Clear all handlers (useful for testing)."""
         cls._handlers.clear()
+        cls._by_name.clear()
+        cls._batch_handlers.clear()
+
+    # ------------------------------------------------------------------
+    # Asynchronous mode
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def serialize(event: DomainEvent) -> dict:
+        # isoformat() keeps microseconds (DjangoJSONEncoder truncates them)
+        return json.loads(json.dumps(
+            asdict(event), default=lambda value: value.isoformat() if isinstance(value, datetime) else str(value)
+        ))
+
+    @staticmethod
+    def deserialize(event_type: str, payload: dict) -> DomainEvent:
+        from django.utils.module_loading import import_string
+        data = dict(payload)
+        if data.get('occurred_at'):
+            data['occurred_at'] = datetime.fromisoformat(data['occurred_at'])
+        return import_string(event_type)(**data)
+
+    @classmethod
+    def _enqueue(cls, event: DomainEvent):
+        from django.db import transaction
+        from management.models import DomainEventOutbox
+
+        handlers = cls._handlers.get(type(event), [])
+        if not handlers:
+            return
+        event_type = qualified_name(type(event))
+        payload = cls.serialize(event)
+        DomainEventOutbox.objects.bulk_create([
+            DomainEventOutbox(event_type=event_type, handler=qualified_name(handler), payload=payload)
+            for handler in handlers
+        ])
+        transaction.on_commit(cls.schedule_worker)
+
+    @classmethod
+    def schedule_worker(cls, countdown: int = 0):
+        """Queue one worker run; publishes before it starts share it."""
+        from django.core.cache import cache
+        from management.tasks import process_domain_events
+
+        if not cache.add(cls.SCHEDULED_KEY, 1, 5 * 60):
+            return
+        try:
+            process_domain_events.apply_async(countdown=countdown)
+        except Exception as e:
+            # Rows stay queued; the periodic run picks them up
+            cache.delete(cls.SCHEDULED_KEY)
+            logger.warning(f"[EventBus] Could not schedule worker: {e}")
+
+    @classmethod
+    def process_queue(cls, limit: int = None) -> Dict[str, int]:
+        """
+        Run due outbox rows (worker side). Returns counts of handler
+        deliveries that succeeded, failed (will retry) and went dead.
+        """
+        from django.conf import settings
+        from django.core.cache import cache
+        from django.db import connection, transaction
+        from django.db.models import F
+        from django.utils import timezone
+        from management.models import DomainEventOutbox
+
+        # New publishes from here on need a new run
+        cache.delete(cls.SCHEDULED_KEY)
+        limit = limit or getattr(settings, 'EVENT_BUS_BATCH_SIZE', 500)
+        lease = timedelta(seconds=getattr(settings, 'EVENT_BUS_LEASE_SECONDS', 300))
+        now = timezone.now()
+
+        # Claim rows by pushing scheduled_at forward: concurrent workers skip
+        # them, and rows of a crashed worker become due again after the lease.
+        with transaction.atomic():
+            due = DomainEventOutbox.objects.filter(
+                status__in=['queued', 'retrying'], scheduled_at__lte=now
+            ).order_by('id')
+            if connection.features.has_select_for_update_skip_locked:
+                due = due.select_for_update(skip_locked=True)
+            rows = list(due[:limit])
+            DomainEventOutbox.objects.filter(pk__in=[row.pk for row in rows]).update(
+                scheduled_at=now + lease, attempts=F('attempts') + 1
+            )
+
+        groups = defaultdict(list)
+        for row in rows:
+            row.attempts += 1
+            groups[(row.handler, row.event_type)].append(row)
+
+        done, failed = [], []
+        for (name, event_type), group in groups.items():
+            handler = cls._by_name.get(name)
+            try:
+                if handler is None:
+                    raise LookupError(f"Handler {name} is not subscribed")
+                events = [cls.deserialize(event_type, row.payload) for row in group]
+            except Exception as e:
+                failed.extend((row, str(e)) for row in group)
+                continue
+            if name in cls._batch_handlers:
+                calls = [(group, cls._run(handler, events))]
+            else:
+                calls = [([row], cls._run(handler, event)) for row, event in zip(group, events)]
+            for delivered, error in calls:
+                if error is None:
+                    done.extend(delivered)
+                else:
+                    failed.extend((row, str(error)) for row in delivered)
+
+        DomainEventOutbox.objects.filter(pk__in=[row.pk for row in done]).update(
+            status='done', processed_at=timezone.now(), last_error=None
+        )
+        dead = 0
+        for row, error in failed:
+            row.last_error = error
+            if row.attempts >= row.max_attempts:
+                row.status = 'dead'
+                dead += 1
+            else:
+                row.status = 'retrying'
+                row.scheduled_at = timezone.now() + timedelta(seconds=row.retry_countdown)
+            row.save(update_fields=['status', 'last_error', 'scheduled_at'])
+
+        if len(rows) == limit:
+            cls.schedule_worker()
+        return {'done': len(done), 'retrying': len(failed) - dead, 'dead': dead}
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def _record(cls, name: str, seconds: float, failed: bool):
+        from django.core.cache import cache
+
+        values = {'calls': 1, 'failures': int(failed), 'total_us': int(seconds * 1_000_000)}
+        try:
+            for field_name, value in values.items():
+                if not value:
+                    continue
+                key = cls.STATS_KEY.format(name=name, field=field_name)
+                cache.add(key, 0, None)
+                cache.incr(key, value)
+        except Exception as e:
+            # Metrics must never fail a handler
+            logger.debug(f"[EventBus] Could not record metrics for {name}: {e}")
+
+    @classmethod
+    def handler_stats(cls, names: List[str] = None) -> Dict[str, Dict[str, float]]:
+        """Calls, failures and mean duration (ms) per handler."""
+        from django.core.cache import cache
+
+        names = names or sorted(cls._by_name)
+        keys = {
+            (name, field_name): cls.STATS_KEY.format(name=name, field=field_name)
+            for name in names for field_name in cls.STATS_FIELDS
+        }
+        values = cache.get_many(list(keys.values()))
+        stats = {}
+        for name in names:
+            calls, failures, total_us = (
+                values.get(keys[(name, field_name)], 0) for field_name in cls.STATS_FIELDS
+            )
+            stats[name] = {
+                'calls': calls,
+                'failures': failures,
+                'avg_ms': round(total_us / calls / 1000, 3) if calls else 0.0,
+            }
+        return stats
 
 
 # ============================================================================
 # Decorator for easy handler registration
 # ============================================================================
 
-def handles(event_type: Type[DomainEvent]):
+def handles(event_type: Type[DomainEvent], batch: bool = False):
     """Decorator to register a function as a handler for an event type."""
     def decorator(func: Callable):
-        EventBus.subscribe(event_type, func)
+        EventBus.subscribe(event_type, func, batch=batch)
         return func
     return decorator
@@ -1,4 +1,3 @@
-import traceback
 import sys
 from urllib.parse import urlparse
 
@@ -8,9 +7,6 @@ from django.http.response import HttpResponseRedirectBase
 from django.shortcuts import resolve_url
 from django.utils.deprecation import MiddlewareMixin
 
-from management.models import ErrorLog
-from interactions.onesignal_service import send_onesignal_notification
-from django.contrib.auth import get_user_model
 from ibb_guide.utils.htmx import is_htmx, htmx_redirect
 
 class SystemMonitorMiddleware(MiddlewareMixin):
@@ -19,31 +15,14 @@ class SystemMonitorMiddleware(MiddlewareMixin):
         if isinstance(exception, Http404):
             return None
             
-        # Capture unhandled exceptions
-        exc_type, exc_value, exc_traceback = sys.exc_info()
-        tb_str = ''.join(traceback.format_exception(exc_type, exc_value, exc_traceback))
-        
-        # Log to DB
-        user = request.user if request.user.is_authenticated else None
-        ErrorLog.objects.create(
-            path=request.path,
-            method=request.method,
-            error_message=str(exception),
-            traceback=tb_str,
-            user=user
-        )
-        
-        # Send Alert to Superusers (Alerts on Crash)
+        # Count the occurrence; the ErrorLog write and admin alert are
+        # deduplicated per fingerprint and deferred off the request path
         try:
-            from management.services.notification_service import NotificationService
-            NotificationService.notify_admins(
-                title="⚠️ System Crash Alert",
-                message=f"Error at {request.path}: {str(exception)[:100]}",
-                notification_type='error'
-            )
+            from management.services.error_log_service import ErrorLogService
+            ErrorLogService.capture(request, exception)
         except Exception as e:
-            # Fallback if notification fails, print to stderr
-            print(f"Failed to send alert: {e}", file=sys.stderr)
+            # Never mask the original exception
+            print(f"Failed to record error: {e}", file=sys.stderr)
             
         return None # Let Django handle the 500 response
 
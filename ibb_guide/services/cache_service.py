@@ -3,6 +3,9 @@ Cache Service
 Centralized cache key generation and invalidation helpers.
 """
 import logging
+import threading
+import time
+import uuid
 from typing import Optional, List
 from django.core.cache import cache
 from django.conf import settings
@@ -146,6 +149,97 @@ def invalidate_all():
     logger.warning("All caches cleared!")
 
 
+# ==========================================
+# Version Keys
+# ==========================================
+# A version key holds an opaque token. Cache keys built from it, and
+# per-process snapshots stamped with it, go stale together when the token
+# is replaced, in every process at once.
+
+def get_version(key, timeout=None):
+    """The current token for a version key, created on first use."""
+    version = cache.get(key)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(key, version, timeout):
+            version = cache.get(key) or version
+    return version
+
+
+def bump_version(key, timeout=None):
+    """Replace the token, invalidating everything built under the old one."""
+    version = uuid.uuid4().hex
+    cache.set(key, version, timeout)
+    return version
+
+
+class VersionedSnapshot:
+    """
+    Per-process values built from the database, rebuilt when a version key
+    changes.
+
+    ``get(*args)`` returns the value ``load(version, *args)`` built under the
+    current version, building it on first use. The shared version is re-read
+    at most every ``check_setting`` seconds (``check_seconds`` when the
+    setting is absent), so a bump from another process is picked up within
+    that interval; ``invalidate()`` also applies at once in this process.
+    """
+
+    def __init__(self, key, load, check_setting=None, check_seconds=5, timeout=None):
+        self.key = key
+        self.load = load
+        self.check_setting = check_setting
+        self.check_seconds = check_seconds
+        self.timeout = timeout
+        self._values = {}
+        self._version = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def version(self):
+        now = time.monotonic()
+        interval = self.check_seconds
+        if self.check_setting:
+            interval = getattr(settings, self.check_setting, interval)
+        if self._version is not None and now - self._checked_at < interval:
+            return self._version
+
+        version = get_version(self.key, self.timeout)
+        self._version = version
+        self._checked_at = now
+        return version
+
+    def get(self, *args, stale=None):
+        """
+        The value for ``args``. ``stale(value)`` returning True forces a
+        rebuild even under the same version (e.g. a new day).
+        """
+        version = self.version()
+        entry = self._values.get(args)
+        if entry is None or entry[0] != version or (stale and stale(entry[1])):
+            with self._lock:
+                entry = self._values.get(args)
+                if entry is None or entry[0] != version or (stale and stale(entry[1])):
+                    entry = (version, self.load(version, *args))
+                    self._values[args] = entry
+        return entry[1]
+
+    def peek(self, *args):
+        """The last value built for ``args`` without checking the version, or None."""
+        entry = self._values.get(args)
+        return entry[1] if entry is not None else None
+
+    def invalidate(self):
+        """Bump the version so every process rebuilds its values."""
+        bump_version(self.key, self.timeout)
+        self.reset()
+
+    def reset(self):
+        """Drop this process's values; the next get() re-reads the version."""
+        self._values = {}
+        self._version = None
+
+
 # ==========================================
 # Cached Decorator
 # ==========================================
@@ -3,10 +3,10 @@ from .settings.base import *
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# The test runner creates its own (in-memory) database
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'test_db.sqlite3',
     }
 }
 
@@ -2,6 +2,7 @@
 Cache Tests
 Tests for cache functionality and invalidation.
 """
+from django.core.cache import cache
 from django.test import TestCase, override_settings
 from django.contrib.auth import get_user_model
 from unittest.mock import patch, MagicMock
@@ -16,6 +17,9 @@ from ibb_guide.services.cache_service import (
     invalidate_establishment,
     invalidate_home,
     TTL_MEDIUM,
+    VersionedSnapshot,
+    bump_version,
+    get_version,
 )
 
 User = get_user_model()
@@ -148,3 +152,62 @@ class CacheIntegrationTest(TestCase):
         
         self.assertEqual(value1, value2)
         self.assertEqual(value1, 'cached_value')
+
+
+@override_settings(
+    CACHES={
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'version-keys',
+        }
+    },
+    TEST_VERSION_CHECK_SECONDS=0,
+)
+class VersionKeyTest(TestCase):
+    """Test shared version keys and per-process snapshots."""
+
+    def setUp(self):
+        cache.clear()
+        self.loads = []
+        self.snapshot = VersionedSnapshot(
+            'test:version', self._load, check_setting='TEST_VERSION_CHECK_SECONDS'
+        )
+
+    def _load(self, version, *args):
+        self.loads.append(args)
+        return (version,) + args
+
+    def test_get_and_bump(self):
+        version = get_version('test:version')
+        self.assertEqual(get_version('test:version'), version)
+        self.assertNotEqual(bump_version('test:version'), version)
+
+    def test_snapshot_rebuilt_per_args_on_version_change(self):
+        self.assertEqual(self.snapshot.get('a')[1:], ('a',))
+        self.snapshot.get('a')
+        self.snapshot.get('b')
+        self.assertEqual(self.loads, [('a',), ('b',)])
+
+        # Another process bumps the version
+        bump_version('test:version')
+        self.snapshot.get('a')
+        self.assertEqual(self.loads[-1], ('a',))
+        self.assertEqual(len(self.loads), 3)
+
+    def test_version_checks_are_throttled(self):
+        self.snapshot.get()
+        with override_settings(TEST_VERSION_CHECK_SECONDS=60):
+            bump_version('test:version')
+            self.snapshot.get()
+            self.assertEqual(len(self.loads), 1)
+            # Local invalidation applies at once
+            self.snapshot.invalidate()
+            self.snapshot.get()
+            self.assertEqual(len(self.loads), 2)
+
+    def test_stale_values_are_rebuilt(self):
+        self.snapshot.get('a')
+        self.snapshot.get('a', stale=lambda value: True)
+        self.assertEqual(len(self.loads), 2)
+        self.assertEqual(self.snapshot.peek('a'), self.snapshot.get('a'))
+        self.assertIsNone(self.snapshot.peek('missing'))
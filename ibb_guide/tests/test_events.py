@@ -0,0 +1,172 @@
+"""
+EventBus Tests
+Synchronous and asynchronous (outbox) dispatch, retries, batching and metrics.
+"""
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from ibb_guide.events import EventBus, ReviewCreated, ReviewReported, qualified_name
+from management.models import DomainEventOutbox
+
+User = get_user_model()
+
+calls = []
+
+
+def record_review(event):
+    calls.append(('record', event.review_id))
+
+
+def failing_handler(event):
+    raise RuntimeError('handler down')
+
+
+def record_batch(events):
+    calls.append(('batch', [event.review_id for event in events]))
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class EventBusTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        calls.clear()
+        self._saved = (
+            {k: list(v) for k, v in EventBus._handlers.items()},
+            dict(EventBus._by_name), set(EventBus._batch_handlers),
+        )
+        EventBus.clear()
+
+    def tearDown(self):
+        EventBus.clear()
+        handlers, by_name, batch = self._saved
+        EventBus._handlers.update(handlers)
+        EventBus._by_name.update(by_name)
+        EventBus._batch_handlers.update(batch)
+
+
+class SyncDispatchTest(EventBusTestCase):
+    def test_failing_handler_is_isolated(self):
+        EventBus.subscribe(ReviewCreated, failing_handler)
+        EventBus.subscribe(ReviewCreated, record_review)
+        with self.assertLogs('ibb_guide.events', level='ERROR'):
+            EventBus.publish(ReviewCreated(review_id=1), mode='sync')
+        self.assertEqual(calls, [('record', 1)])
+        self.assertFalse(DomainEventOutbox.objects.exists())
+
+        stats = EventBus.handler_stats()
+        self.assertEqual(stats[qualified_name(failing_handler)]['failures'], 1)
+        self.assertEqual(stats[qualified_name(record_review)]['calls'], 1)
+        self.assertEqual(stats[qualified_name(record_review)]['failures'], 0)
+
+    def test_batch_handler_receives_list(self):
+        EventBus.subscribe(ReviewCreated, record_batch, batch=True)
+        EventBus.publish(ReviewCreated(review_id=7), mode='sync')
+        self.assertEqual(calls, [('batch', [7])])
+
+
+@override_settings(EVENT_BUS_MODE='async')
+class AsyncDispatchTest(EventBusTestCase):
+    @patch('management.tasks.process_domain_events.apply_async')
+    def test_publish_enqueues_and_schedules_one_worker(self, apply_async):
+        EventBus.subscribe(ReviewCreated, record_review)
+        EventBus.subscribe(ReviewReported, record_review)
+        with self.captureOnCommitCallbacks(execute=True):
+            EventBus.publish(ReviewCreated(review_id=3, rating=5))
+            EventBus.publish(ReviewReported(review_id=3))
+            self.assertEqual(apply_async.call_count, 0)
+        self.assertEqual(calls, [])
+        self.assertEqual(DomainEventOutbox.objects.filter(status='queued').count(), 2)
+        self.assertEqual(apply_async.call_count, 1)
+
+        EventBus.process_queue()
+        self.assertEqual(calls, [('record', 3), ('record', 3)])
+        self.assertFalse(DomainEventOutbox.objects.exclude(status='done').exists())
+
+    @patch('management.tasks.process_domain_events.apply_async', side_effect=OSError('broker down'))
+    def test_rows_survive_broker_failure(self, _apply_async):
+        EventBus.subscribe(ReviewCreated, record_review)
+        with self.assertLogs('ibb_guide.events', level='WARNING'):
+            with self.captureOnCommitCallbacks(execute=True):
+                EventBus.publish(ReviewCreated(review_id=3))
+        self.assertEqual(DomainEventOutbox.objects.filter(status='queued').count(), 1)
+
+        EventBus.process_queue()  # periodic run
+        self.assertEqual(calls, [('record', 3)])
+        row = DomainEventOutbox.objects.get()
+        self.assertEqual(row.status, 'done')
+        self.assertEqual(row.attempts, 1)
+        self.assertIsNotNone(row.processed_at)
+
+    def test_payload_round_trip(self):
+        event = ReviewCreated(review_id=4, place_id=2, user_id=9, rating=3, metadata={'source': 'api'})
+        restored = EventBus.deserialize(qualified_name(ReviewCreated), EventBus.serialize(event))
+        self.assertEqual(restored, event)
+
+    def test_failures_retry_per_handler(self):
+        EventBus.subscribe(ReviewCreated, failing_handler)
+        EventBus.subscribe(ReviewCreated, record_review)
+        EventBus.publish(ReviewCreated(review_id=5))
+
+        with self.assertLogs('ibb_guide.events', level='ERROR'):
+            report = EventBus.process_queue()
+        self.assertEqual(report, {'done': 1, 'retrying': 1, 'dead': 0})
+        failed = DomainEventOutbox.objects.get(handler=qualified_name(failing_handler))
+        self.assertEqual(failed.status, 'retrying')
+        self.assertGreater(failed.scheduled_at, timezone.now())
+        self.assertIn('handler down', failed.last_error)
+
+        # Not due yet: nothing runs, the successful handler is not repeated
+        self.assertEqual(EventBus.process_queue(), {'done': 0, 'retrying': 0, 'dead': 0})
+        self.assertEqual(calls, [('record', 5)])
+
+        DomainEventOutbox.objects.filter(pk=failed.pk).update(
+            attempts=failed.max_attempts - 1, scheduled_at=timezone.now() - timedelta(seconds=1)
+        )
+        with self.assertLogs('ibb_guide.events', level='ERROR'):
+            self.assertEqual(EventBus.process_queue(), {'done': 0, 'retrying': 0, 'dead': 1})
+        self.assertEqual(DomainEventOutbox.objects.get(pk=failed.pk).status, 'dead')
+
+    def test_batch_handler_gets_one_call_per_type(self):
+        EventBus.subscribe(ReviewCreated, record_batch, batch=True)
+        for review_id in range(1, 6):
+            EventBus.publish(ReviewCreated(review_id=review_id))
+
+        self.assertEqual(EventBus.process_queue(), {'done': 5, 'retrying': 0, 'dead': 0})
+        self.assertEqual(calls, [('batch', [1, 2, 3, 4, 5])])
+        self.assertEqual(EventBus.handler_stats()[qualified_name(record_batch)]['calls'], 1)
+
+    def test_claimed_rows_are_skipped_until_lease_expires(self):
+        EventBus.subscribe(ReviewCreated, record_review)
+        EventBus.publish(ReviewCreated(review_id=6))
+        DomainEventOutbox.objects.update(scheduled_at=timezone.now() + timedelta(minutes=5))
+        self.assertEqual(EventBus.process_queue(), {'done': 0, 'retrying': 0, 'dead': 0})
+        self.assertEqual(calls, [])
+
+
+class ReviewCreatedPublishTest(EventBusTestCase):
+    def test_create_review_publishes_event(self):
+        from interactions.services.review_service import ReviewService
+        from places.models import Category, Establishment
+
+        owner = User.objects.create_user(username='owner', password='p')
+        user = User.objects.create_user(username='reviewer', password='p')
+        place = Establishment.objects.create(
+            name='Cafe', category=Category.objects.create(name='Cafes'), owner=owner
+        )
+        EventBus.subscribe(ReviewCreated, record_review)
+
+        success, review = ReviewService.create_review(user, place, 5, 'Lovely coffee')
+        self.assertTrue(success)
+        self.assertEqual(calls, [('record', review.pk)])
+
+
+class StartupSubscriptionTest(TestCase):
+    def test_event_handlers_are_not_registered_at_startup(self):
+        # ibb_guide.event_handlers is opt-in; app loading must not subscribe it
+        registered = {qualified_name(h) for hs in EventBus._handlers.values() for h in hs}
+        self.assertFalse({name for name in registered if name.startswith('ibb_guide.event_handlers.')})
@@ -54,7 +54,8 @@ from interactions.views_public import (
     review_create, review_delete, report_place, add_reply,
     NotificationListView, mark_notification_read, mark_all_notifications_read, delete_notification, delete_all_notifications,
     toggle_favorite, FavoriteListView, toggle_comment_visibility, toggle_follow,
-    add_place_comment, reply_to_comment, unread_count, bulk_delete_favorites, notifications_snapshot
+    add_place_comment, reply_to_comment, unread_count, bulk_delete_favorites, notifications_snapshot,
+    notifications_poll
 )
 from interactions.views_preferences import (
     get_preferences as notification_get_preferences,
@@ -148,6 +149,7 @@ urlpatterns = [
     path('notifications/mark-all-read/', mark_all_notifications_read, name='mark_all_notifications_read'),
     path('notifications/api/unread-count/', unread_count, name='unread_count'),
     path('notifications/api/snapshot/', notifications_snapshot, name='notifications_snapshot'),
+    path('notifications/api/poll/', notifications_poll, name='notifications_poll'),
     path('notifications/api/preferences/', notification_get_preferences, name='notification_get_preferences'),
     path('notifications/api/preferences/update/', notification_update_preferences, name='notification_update_preferences'),
     
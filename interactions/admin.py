@@ -239,13 +239,21 @@ class NotificationAdmin(admin.ModelAdmin):
     @admin.action(description='✓ تحديد كمقروء')
     def mark_as_read(self, request, queryset):
         from django.utils import timezone
+        from interactions.services.realtime_service import RealtimeService
+        from interactions.services.unread_service import UnreadCountService
+        recipients = set(queryset.values_list('recipient_id', flat=True))
         count = queryset.update(is_read=True, read_at=timezone.now())
+        UnreadCountService.invalidate(*recipients)
+        RealtimeService.bump(*(RealtimeService.notifications_channel(uid) for uid in recipients))
         self.message_user(request, f"تم تحديد {count} كمقروء", messages.SUCCESS)
 
     @admin.action(description='🗑️ حذف الإشعارات')
     def delete_notifications(self, request, queryset):
+        from interactions.services.unread_service import UnreadCountService
         count = queryset.count()
+        recipients = set(queryset.values_list('recipient_id', flat=True))
         queryset.delete()
+        UnreadCountService.invalidate(*recipients)
         self.message_user(request, f"تم حذف {count} إشعار", messages.WARNING)
     
     def has_add_permission(self, request):
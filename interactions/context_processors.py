@@ -5,12 +5,13 @@ from django.core.cache import cache
 def notification_context(request):
     if request.user.is_authenticated:
         cache_key = f"notif_ctx:{request.user.id}:{1 if request.user.is_staff else 0}"
+        from interactions.services.unread_service import UnreadCountService
+        unread_count = UnreadCountService.get(request.user)
         cached = cache.get(cache_key)
         if cached:
-            request._unread_notifications_count = cached.get('unread_notifications_count', 0)
-            return cached
+            request._unread_notifications_count = unread_count
+            return {**cached, 'unread_notifications_count': unread_count}
 
-        unread_count = Notification.objects.filter(recipient=request.user, is_read=False).count()
         request._unread_notifications_count = unread_count
         # Fetch last 5 notifications for the dropdown (limit fields)
         latest_notifications = list(
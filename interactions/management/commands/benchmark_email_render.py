@@ -0,0 +1,67 @@
+"""
+Benchmark email rendering for a broadcast: full template render per
+recipient vs EmailProvider.render_batch (one shared shell + substitution).
+
+Recipients are unsaved User instances, so nothing touches the database.
+
+Usage:
+    python manage.py benchmark_email_render --recipients 10000
+    python manage.py benchmark_email_render --type partner_approved
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Time rendering N personalised notification emails, per-recipient vs shared shell'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recipients', type=int, default=10000)
+        parser.add_argument('--type', default='general', help='EmailProvider.TEMPLATES key')
+
+    def handle(self, *args, **options):
+        from django.contrib.auth import get_user_model
+        from interactions.notifications.providers import EmailProvider
+
+        User = get_user_model()
+        users = [
+            User(pk=i, username=f'bench_user_{i}', email=f'bench{i}@example.com')
+            for i in range(options['recipients'])
+        ]
+        provider = EmailProvider()
+        title, body = 'تحديث جديد', 'نص الإشعار\nسطر ثانٍ'
+
+        before, legacy = self.timed(lambda: self.render_each(provider, users, title, body, options['type']))
+        EmailProvider.clear_template_cache()
+        after, batch = self.timed(lambda: list(provider.render_batch(users, title, body, options['type'])))
+
+        mismatched = sum(1 for old, new in zip(legacy, batch) if old != new)
+        self.stdout.write(f"per-recipient render: {before:.2f}s ({before / len(users) * 1e6:.0f}us/email)")
+        self.stdout.write(f"shared shell render:  {after:.2f}s ({after / len(users) * 1e6:.0f}us/email)")
+        self.stdout.write(f"speedup {before / after:.1f}x, {mismatched} mismatched emails")
+
+    def render_each(self, provider, users, title, body, notification_type):
+        """The pre-batching path: render_to_string + strip_tags per recipient."""
+        from django.conf import settings
+        from django.template.loader import render_to_string
+        from django.utils.html import strip_tags
+
+        template_name = provider.TEMPLATES.get(notification_type, provider.DEFAULT_TEMPLATE)
+        rendered = []
+        for user in users:
+            context = {
+                'title': title,
+                'body': body,
+                'site_name': provider.site_name,
+                'site_url': getattr(settings, 'SITE_URL', 'https://ibbguide.com'),
+                **provider.personal_values(user),
+            }
+            html = render_to_string(template_name, context)
+            rendered.append((user.email, html, strip_tags(html)))
+        return rendered
+
+    def timed(self, fn):
+        start = time.perf_counter()
+        result = fn()
+        return time.perf_counter() - start, result
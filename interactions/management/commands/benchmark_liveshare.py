@@ -0,0 +1,147 @@
+"""
+Benchmark live share ingestion: N concurrent sharers pinging every few seconds.
+
+Compares the legacy path (one INSERT per ping) with LiveShareService
+(cached latest position + downsampled writes) on simulated traffic.
+
+Usage:
+    python manage.py benchmark_liveshare --sharers 1000 --minutes 5
+    python manage.py benchmark_liveshare --cleanup
+"""
+import math
+import random
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import override_settings
+from django.utils import timezone
+
+PREFIX = 'bench_live_'
+
+
+class QueryCounter:
+    """connection.execute_wrapper that counts queries (CaptureQueriesContext keeps only 9000)."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = 'Simulate concurrent live location sharers and time ping ingestion'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sharers', type=int, default=1000)
+        parser.add_argument('--minutes', type=int, default=5)
+        parser.add_argument('--interval', type=int, default=5, help='Seconds between pings')
+        parser.add_argument('--moving', type=float, default=0.3, help='Fraction of sharers that are moving')
+        parser.add_argument('--cleanup', action='store_true', help='Delete seeded rows and exit')
+
+    def handle(self, *args, **options):
+        from users.models import User
+
+        User.objects.filter(username__startswith=PREFIX).delete()
+        if options['cleanup']:
+            self.stdout.write(self.style.SUCCESS("Deleted seeded sharers."))
+            return
+
+        sessions = self.seed(options['sharers'])
+        rounds = options['minutes'] * 60 // options['interval']
+        tracks = self.simulate(sessions, rounds, options['interval'], options['moving'])
+
+        caches = settings.CACHES
+        if caches['default']['BACKEND'].endswith('LocMemCache'):
+            # The default 300-entry cap would evict per-session state mid-run
+            caches = {'default': {**caches['default'], 'OPTIONS': {'MAX_ENTRIES': 1_000_000}}}
+        with override_settings(CACHES=caches):
+            self.run('legacy (insert per ping)', self.legacy, tracks)
+            self.run('LiveShareService', self.service, tracks)
+            self.viewer_polls(sessions)
+
+        User.objects.filter(username__startswith=PREFIX).delete()
+
+    def seed(self, sharers):
+        from users.models import User
+        from interactions.models import LiveShareSession
+
+        User.objects.bulk_create([
+            User(username=f'{PREFIX}{i}', password='!') for i in range(sharers)
+        ], batch_size=1000)
+        users = User.objects.filter(username__startswith=PREFIX)
+        expires = timezone.now() + timedelta(hours=2)
+        LiveShareSession.objects.bulk_create([
+            LiveShareSession(user=user, expires_at=expires) for user in users
+        ], batch_size=1000)
+        return list(LiveShareSession.objects.filter(user__username__startswith=PREFIX))
+
+    def simulate(self, sessions, rounds, interval, moving):
+        """Return rounds of [(session, lat, lon, ts)] with stationary and moving sharers."""
+        start = timezone.now()
+        state = []
+        for session in sessions:
+            speed = random.choice((1.4, 12.0)) if random.random() < moving else 0.0  # m/s
+            state.append([session, random.uniform(13.5, 14.5), random.uniform(43.8, 44.8),
+                          speed, random.uniform(0, 2 * math.pi)])
+
+        tracks = []
+        for r in range(rounds):
+            ts = start + timedelta(seconds=r * interval)
+            batch = []
+            for s in state:
+                step = s[3] * interval / 111_320
+                s[4] += random.uniform(-0.3, 0.3)
+                # GPS jitter of a few metres even when standing still
+                s[1] += step * math.cos(s[4]) + random.gauss(0, 3 / 111_320)
+                s[2] += step * math.sin(s[4]) + random.gauss(0, 3 / 111_320)
+                batch.append((s[0], s[1], s[2], ts))
+            tracks.append(batch)
+        return tracks
+
+    def legacy(self, session, lat, lon, ts):
+        from interactions.models import LiveLocationPing
+        LiveLocationPing.objects.create(session=session, latitude=round(lat, 6), longitude=round(lon, 6))
+
+    def service(self, session, lat, lon, ts):
+        from interactions.services.liveshare_service import LiveShareService
+        LiveShareService.record(str(session.token), [(lat, lon, ts)], now=ts)
+
+    def run(self, label, fn, tracks):
+        from interactions.models import LiveLocationPing
+        from interactions.services.liveshare_service import LiveShareService
+
+        LiveLocationPing.objects.filter(session__user__username__startswith=PREFIX).delete()
+        for session, *_ in tracks[0]:
+            LiveShareService.forget(str(session.token))
+
+        pings = sum(len(batch) for batch in tracks)
+        queries = QueryCounter()
+        with connection.execute_wrapper(queries):
+            start = time.perf_counter()
+            for batch in tracks:
+                for session, lat, lon, ts in batch:
+                    fn(session, lat, lon, ts)
+            elapsed = time.perf_counter() - start
+        rows = LiveLocationPing.objects.filter(session__user__username__startswith=PREFIX).count()
+        self.stdout.write(
+            f"{label}: {pings} pings in {elapsed:.2f}s ({pings / elapsed:,.0f} pings/s), "
+            f"queries={queries.count} rows={rows} ({rows / pings:.0%} of pings)"
+        )
+
+    def viewer_polls(self, sessions):
+        from interactions.services.liveshare_service import LiveShareService
+
+        queries = QueryCounter()
+        with connection.execute_wrapper(queries):
+            start = time.perf_counter()
+            for session in sessions:
+                LiveShareService.get_latest(str(session.token))
+            elapsed = time.perf_counter() - start
+        self.stdout.write(
+            f"viewer polls: {len(sessions)} in {elapsed * 1000:.0f}ms, queries={queries.count}"
+        )
@@ -0,0 +1,91 @@
+"""
+Benchmark provider batching: one request per recipient vs send_batch.
+
+OneSignal, FCM and email are pointed at local stand-in servers
+(interactions.tests.local_servers), so the numbers measure request/connection
+overhead on our side rather than the real services. 1% of recipients are
+invalid to exercise per-recipient failure reporting.
+
+Usage:
+    python manage.py benchmark_notification_batch --recipients 10000
+    python manage.py benchmark_notification_batch --providers email
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+PROVIDERS = ('onesignal', 'fcm', 'email')
+
+
+class Command(BaseCommand):
+    help = 'Time sending one notification to N recipients per provider, single vs batch'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recipients', type=int, default=10000)
+        parser.add_argument('--providers', nargs='+', choices=PROVIDERS, default=list(PROVIDERS))
+
+    def handle(self, *args, **options):
+        from interactions.tests.local_servers import FakePushServer, FakeSMTPServer
+
+        count = options['recipients']
+        with FakePushServer() as push, FakeSMTPServer() as smtp, override_settings(
+            ONESIGNAL_APP_ID='bench', ONESIGNAL_REST_API_KEY='bench', FCM_SERVER_KEY='bench',
+            EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend',
+            EMAIL_HOST=smtp.host, EMAIL_PORT=smtp.port,
+            EMAIL_USE_TLS=False, EMAIL_USE_SSL=False, EMAIL_HOST_USER='', EMAIL_HOST_PASSWORD='',
+        ):
+            for name in options['providers']:
+                server = smtp if name == 'email' else push
+                provider = self.make_provider(name, push)
+                recipients = self.recipients(name, count)
+                self.run_case(name, 'single', server, lambda: self.send_single(provider, name, recipients))
+                self.run_case(name, 'batch', server, lambda: provider.send_batch(recipients, 'Benchmark', 'Body text'))
+
+    def make_provider(self, name, push):
+        from interactions.notifications.providers import get_provider
+
+        provider = get_provider(name)
+        if name == 'onesignal':
+            provider.API_URL = push.onesignal_url
+        elif name == 'fcm':
+            provider.API_URL = push.fcm_url
+        return provider
+
+    def recipients(self, name, count):
+        def address(i):
+            prefix = 'invalid' if i % 100 == 99 else 'ok'
+            return f'{prefix}-{i}@example.com' if name == 'email' else f'{prefix}-{name}-{i}'
+        return [address(i) for i in range(count)]
+
+    def send_single(self, provider, name, recipients):
+        from interactions.notifications.providers import ProviderError, SendResult
+
+        results = {}
+        for recipient in recipients:
+            try:
+                if name == 'email':
+                    results[recipient] = provider.send_email(recipient, 'Benchmark', 'Body text')
+                else:
+                    results[recipient] = provider.send_push(recipient, 'Benchmark', 'Body text')
+            except ProviderError as e:
+                results[recipient] = SendResult(success=False, error=e.message, retriable=e.retriable)
+        return results
+
+    def run_case(self, name, mode, server, send):
+        import logging
+
+        server.connections, server.requests = 0, []
+        logging.disable(logging.CRITICAL)  # per-recipient failures are expected
+        try:
+            start = time.perf_counter()
+            results = send()
+            elapsed = time.perf_counter() - start
+        finally:
+            logging.disable(logging.NOTSET)
+
+        sent = sum(1 for result in results.values() if result.success)
+        self.stdout.write(
+            f"{name:>9} {mode:>6}: {elapsed:7.2f}s, {len(server.requests):>5} requests, "
+            f"{server.connections:>5} connections, {sent}/{len(results)} delivered"
+        )
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.27 on 2026-10-19 05:30
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interactions', '0037_alter_notification_notification_type'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='livelocationping',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddIndex(
+            model_name='livelocationping',
+            index=models.Index(fields=['session', '-created_at'], name='interaction_session_9398a5_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.27 on 2026-10-19 05:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interactions', '0038_liveping_timestamps'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['created_at'], name='interaction_created_097a8a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notificationoutbox',
+            index=models.Index(fields=['status', 'sent_at'], name='interaction_status_a50cd0_idx'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 4.2.27 on 2026-10-19 06:11
+
+from django.db import migrations, models
+
+# Mask layout as of this migration (see NotificationPreference); set bits block delivery
+CATEGORIES = ['approvals', 'reviews', 'ads', 'system', 'weather', 'promotions']
+TYPES = [
+    'partner_approved', 'partner_rejected', 'partner_needs_info', 'establishment_approved',
+    'establishment_rejected', 'establishment_suspended', 'establishment_reactivated', 'ad_approved',
+    'ad_rejected', 'ad_payment_needed', 'ad_expiring_soon', 'ad_expired', 'new_review',
+    'new_report_on_establishment', 'pending_change_requested', 'pending_change_approved',
+    'pending_change_rejected', 'partner_field_update', 'new_partner_registration',
+    'partner_upgrade_request', 'new_establishment_request', 'establishment_update_request',
+    'new_ad_request', 'review_objection', 'new_user_report', 'review_reply', 'report_update',
+    'report_resolved', 'report_rejected', 'favorite_suspended', 'favorite_reactivated',
+    'favorite_new_offer', 'weather_alert', 'general',
+]
+CATEGORY_BITS = {key: 1 << (8 + i) for i, key in enumerate(CATEGORIES)}
+TYPE_BITS = {key: 1 << (16 + i) for i, key in enumerate(TYPES)}
+
+
+def compile_mask(prefs):
+    mask = 0
+    if not prefs.enable_all:
+        mask |= 1 << 0
+    for bit, enabled in ((1 << 1, prefs.enable_push), (1 << 2, prefs.enable_email), (1 << 3, prefs.enable_sms)):
+        if not enabled:
+            mask |= bit
+    if prefs.quiet_hours_enabled and prefs.quiet_start and prefs.quiet_end:
+        mask |= 1 << 4
+    for category in prefs.disabled_categories or ():
+        mask |= CATEGORY_BITS.get(category, 0)
+    for notification_type in prefs.disabled_types or ():
+        mask |= TYPE_BITS.get(notification_type, 0)
+    return mask
+
+
+def compile_masks(apps, schema_editor):
+    NotificationPreference = apps.get_model('interactions', 'NotificationPreference')
+    for prefs in NotificationPreference.objects.all().iterator():
+        NotificationPreference.objects.filter(pk=prefs.pk).update(compiled_mask=compile_mask(prefs))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interactions', '0039_retention_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notificationpreference',
+            name='compiled_mask',
+            field=models.BigIntegerField(default=12, editable=False),
+        ),
+        migrations.RunPython(compile_masks, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 from django.utils.crypto import get_random_string
 import uuid
 
@@ -20,11 +21,15 @@ class LiveLocationPing(models.Model):
     session = models.ForeignKey(LiveShareSession, on_delete=models.CASCADE, related_name='pings')
     latitude = models.DecimalField(max_digits=9, decimal_places=6)
     longitude = models.DecimalField(max_digits=9, decimal_places=6)
-    created_at = models.DateTimeField(auto_now_add=True)
+    # Not auto_now_add: batched uploads from offline clients carry their own timestamps
+    created_at = models.DateTimeField(default=timezone.now)
 
     class Meta:
         app_label = 'interactions'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['session', '-created_at']),
+        ]
 
     def __str__(self):
         return f"Ping {self.latitude},{self.longitude} @ {self.created_at}"
@@ -104,17 +104,33 @@ class Notification(TimeStampedModel):
         indexes = [
             models.Index(fields=['recipient', '-created_at']),
             models.Index(fields=['recipient', 'is_read']),
+            models.Index(fields=['created_at']),
         ]
 
     def __str__(self):
         return f"{self.get_notification_type_display()} - {self.recipient.username}"
     
     def mark_as_read(self):
-        if not self.is_read:
-            self.is_read = True
-            from django.utils import timezone
-            self.read_at = timezone.now()
-            self.save(update_fields=['is_read', 'read_at'])
+        """
+        Mark as read. The transition is a conditional UPDATE, so when two
+        requests race only the one that flipped the row decrements the
+        unread counter. Returns True if this call marked it.
+        """
+        if self.is_read:
+            return False
+        from django.utils import timezone
+        from interactions.services.realtime_service import RealtimeService
+        from interactions.services.unread_service import UnreadCountService
+
+        now = timezone.now()
+        updated = Notification.objects.filter(pk=self.pk, is_read=False).update(is_read=True, read_at=now)
+        self.is_read = True
+        if not updated:
+            return False
+        self.read_at = now
+        UnreadCountService.decr(self.recipient_id)
+        RealtimeService.bump(RealtimeService.notifications_channel(self.recipient_id))
+        return True
 
 
 class SystemAlert(TimeStampedModel):
@@ -160,7 +176,17 @@ class SystemAlert(TimeStampedModel):
 
 
 class NotificationPreference(TimeStampedModel):
-    """تفضيلات إشعارات المستخدم"""
+    """تفضيلات إشعارات المستخدم
+    
+    The editable fields are compiled into `compiled_mask` on save so checks
+    are a bit test. The mask holds what is switched off: flags and channels
+    in the low bits, then one bit per disabled category and one per
+    disabled Notification type, so types added later are allowed for
+    everyone until they turn them off. Users without a row get
+    DEFAULT_MASK; no row is created just to read preferences.
+    Append new categories/types at the end of their lists: bit positions
+    follow list order, and existing rows must be recompiled if it changes.
+    """
     
     CATEGORY_CHOICES = [
         ('approvals', 'الموافقات والقرارات'),
@@ -171,6 +197,27 @@ class NotificationPreference(TimeStampedModel):
         ('promotions', 'العروض والترويج'),
     ]
     
+    TYPE_TO_CATEGORY = {
+        'partner_approved': 'approvals', 'partner_rejected': 'approvals',
+        'establishment_approved': 'approvals', 'establishment_rejected': 'approvals',
+        'new_establishment_request': 'approvals', 'establishment_update_request': 'approvals',
+        'new_review': 'reviews', 'new_report_on_establishment': 'reviews',
+        'ad_approved': 'ads', 'ad_rejected': 'ads', 'ad_expiring_soon': 'ads',
+        'weather_alert': 'weather', 'system_update': 'system',
+    }
+    
+    # Compiled mask layout; a set bit blocks delivery
+    DISABLE_ALL_BIT = 1 << 0
+    CHANNEL_BITS = {'in_app': 0, 'push': 1 << 1, 'email': 1 << 2, 'sms': 1 << 3}
+    QUIET_HOURS_BIT = 1 << 4
+    CATEGORY_BITS = {key: 1 << (8 + i) for i, (key, _label) in enumerate(CATEGORY_CHOICES)}
+    TYPE_BITS = {key: 1 << (16 + i) for i, (key, _label) in enumerate(Notification.NOTIFICATION_TYPES)}
+    # Email and SMS are off by default
+    DEFAULT_MASK = CHANNEL_BITS['email'] | CHANNEL_BITS['sms']
+    
+    CACHE_KEY = 'notifications:prefs:{user_id}'
+    CACHE_TTL = 6 * 60 * 60
+    
     user = models.OneToOneField(
         settings.AUTH_USER_MODEL, 
         on_delete=models.CASCADE, 
@@ -189,6 +236,9 @@ class NotificationPreference(TimeStampedModel):
     quiet_start = models.TimeField(null=True, blank=True, verbose_name='بداية ساعات الهدوء')
     quiet_end = models.TimeField(null=True, blank=True, verbose_name='نهاية ساعات الهدوء')
     
+    # Derived from the fields above on save (see class docstring)
+    compiled_mask = models.BigIntegerField(default=DEFAULT_MASK, editable=False)
+    
     class Meta:
         app_label = 'interactions'
         verbose_name = 'تفضيلات الإشعارات'
@@ -197,6 +247,43 @@ class NotificationPreference(TimeStampedModel):
     def __str__(self):
         return f"Notification Preferences for {self.user.username}"
     
+    def save(self, *args, **kwargs):
+        from django.core.cache import cache
+        from django.db import transaction
+        
+        self.compiled_mask = self.compile_mask()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | {'compiled_mask'}
+        super().save(*args, **kwargs)
+        key = self.CACHE_KEY.format(user_id=self.user_id)
+        transaction.on_commit(lambda: cache.delete(key))
+    
+    def delete(self, *args, **kwargs):
+        from django.core.cache import cache
+        from django.db import transaction
+        
+        key = self.CACHE_KEY.format(user_id=self.user_id)
+        result = super().delete(*args, **kwargs)
+        transaction.on_commit(lambda: cache.delete(key))
+        return result
+    
+    def compile_mask(self) -> int:
+        """Fold the editable preference fields into a bitmask of what is switched off."""
+        mask = 0
+        if not self.enable_all:
+            mask |= self.DISABLE_ALL_BIT
+        for channel, enabled in (('push', self.enable_push), ('email', self.enable_email), ('sms', self.enable_sms)):
+            if not enabled:
+                mask |= self.CHANNEL_BITS[channel]
+        if self.quiet_hours_enabled and self.quiet_start and self.quiet_end:
+            mask |= self.QUIET_HOURS_BIT
+        for category in self.disabled_categories:
+            mask |= self.CATEGORY_BITS.get(category, 0)
+        for notification_type in self.disabled_types:
+            mask |= self.TYPE_BITS.get(notification_type, 0)
+        return mask
+    
     def is_notification_enabled(self, notification_type: str) -> bool:
         if not self.enable_all:
             return False
@@ -210,25 +297,100 @@ class NotificationPreference(TimeStampedModel):
         return True
     
     def _is_quiet_time(self) -> bool:
-        if not self.quiet_start or not self.quiet_end:
+        return self._in_quiet_hours(self.quiet_start, self.quiet_end)
+    
+    @staticmethod
+    def _in_quiet_hours(start, end) -> bool:
+        if not start or not end:
             return False
         from datetime import datetime
         now = datetime.now().time()
-        if self.quiet_start <= self.quiet_end:
-            return self.quiet_start <= now <= self.quiet_end
+        if start <= end:
+            return start <= now <= end
         else:
-            return now >= self.quiet_start or now <= self.quiet_end
+            return now >= start or now <= end
     
     def _get_category_for_type(self, notification_type: str) -> str:
-        type_to_category = {
-            'partner_approved': 'approvals', 'partner_rejected': 'approvals',
-            'establishment_approved': 'approvals', 'establishment_rejected': 'approvals',
-            'new_establishment_request': 'approvals', 'establishment_update_request': 'approvals',
-            'new_review': 'reviews', 'new_report_on_establishment': 'reviews',
-            'ad_approved': 'ads', 'ad_rejected': 'ads', 'ad_expiring_soon': 'ads',
-            'weather_alert': 'weather', 'system_update': 'system',
-        }
-        return type_to_category.get(notification_type, 'system')
+        return self.TYPE_TO_CATEGORY.get(notification_type, 'system')
+    
+    @classmethod
+    def blocking_bits(cls, notification_type: str, channel: str = 'in_app') -> int:
+        """Bits any of which in a compiled mask stop the type on the channel."""
+        # Types outside NOTIFICATION_TYPES are governed by their category only
+        return (
+            cls.DISABLE_ALL_BIT | cls.CHANNEL_BITS[channel]
+            | cls.CATEGORY_BITS[cls.TYPE_TO_CATEGORY.get(notification_type, 'system')]
+            | cls.TYPE_BITS.get(notification_type, 0)
+        )
+    
+    @classmethod
+    def get_compiled(cls, user_id):
+        """(mask, quiet_start, quiet_end) for a user, cached; defaults when there is no row."""
+        from django.core.cache import cache
+        
+        key = cls.CACHE_KEY.format(user_id=user_id)
+        compiled = cache.get(key)
+        if compiled is None:
+            row = cls.objects.filter(user_id=user_id).values_list(
+                'compiled_mask', 'quiet_start', 'quiet_end'
+            ).first()
+            compiled = row or (cls.DEFAULT_MASK, None, None)
+            cache.set(key, compiled, cls.CACHE_TTL)
+        return compiled
+    
+    @classmethod
+    def _allows(cls, compiled, blocking) -> bool:
+        mask, quiet_start, quiet_end = compiled
+        if mask & blocking:
+            return False
+        return not (mask & cls.QUIET_HOURS_BIT and cls._in_quiet_hours(quiet_start, quiet_end))
+    
+    @classmethod
+    def is_enabled_for(cls, user, notification_type: str, channel: str = 'in_app') -> bool:
+        """Preference check for one user (or user id) without creating a row."""
+        user_id = getattr(user, 'pk', user)
+        return cls._allows(cls.get_compiled(user_id), cls.blocking_bits(notification_type, channel))
+    
+    @classmethod
+    def filter_recipients(cls, user_ids, notification_type: str, channel: str = 'in_app', chunk_size: int = 500):
+        """
+        Ids from `user_ids` (order kept) whose preferences allow the type on
+        the channel. One query per chunk of `chunk_size` ids.
+        """
+        from django.db.models import F, Q
+        
+        user_ids = list(user_ids)
+        blocking = cls.blocking_bits(notification_type, channel)
+        default_allows = cls._allows((cls.DEFAULT_MASK, None, None), blocking)
+        eligible = set()
+        for start in range(0, len(user_ids), chunk_size):
+            chunk = user_ids[start:start + chunk_size]
+            rows = cls.objects.filter(user_id__in=chunk).annotate(
+                blocked=F('compiled_mask').bitand(blocking),
+                quiet=F('compiled_mask').bitand(cls.QUIET_HOURS_BIT),
+            )
+            if default_allows:
+                # Only rows that might block are fetched; users without a row pass
+                rows = rows.filter(~Q(blocked=0) | ~Q(quiet=0))
+                blocked = {
+                    user_id for user_id, mask, quiet_start, quiet_end
+                    in rows.values_list('user_id', 'compiled_mask', 'quiet_start', 'quiet_end')
+                    if not cls._allows((mask, quiet_start, quiet_end), blocking)
+                }
+                eligible.update(user_id for user_id in chunk if user_id not in blocked)
+            else:
+                # Only rows that opted in can pass
+                eligible.update(
+                    user_id for user_id, mask, quiet_start, quiet_end
+                    in rows.filter(blocked=0).values_list('user_id', 'compiled_mask', 'quiet_start', 'quiet_end')
+                    if cls._allows((mask, quiet_start, quiet_end), blocking)
+                )
+        return [user_id for user_id in user_ids if user_id in eligible]
+    
+    @classmethod
+    def get_for_user(cls, user):
+        """The user's preferences, or an unsaved instance holding the defaults."""
+        return cls.objects.filter(user=user).first() or cls(user=user)
     
     @classmethod
     def get_or_create_for_user(cls, user):
@@ -21,8 +21,7 @@ class NotificationBase:
         """
         # Check user preferences before creating notification
         try:
-            prefs = NotificationPreference.get_or_create_for_user(recipient)
-            if not prefs.is_notification_enabled(notification_type):
+            if not NotificationPreference.is_enabled_for(recipient, notification_type):
                 # User has disabled this notification type
                 return None
         except Exception:
@@ -46,16 +45,23 @@ class NotificationBase:
     @staticmethod
     def get_unread_count(user):
         """الحصول على عدد الإشعارات غير المقروءة"""
-        return Notification.objects.filter(recipient=user, is_read=False).count()
+        from interactions.services.unread_service import UnreadCountService
+        return UnreadCountService.get(user)
     
     @staticmethod
     def mark_all_as_read(user):
         """تعليم جميع إشعارات المستخدم كمقروءة"""
         from django.utils import timezone
-        return Notification.objects.filter(
+        from interactions.services.realtime_service import RealtimeService
+        from interactions.services.unread_service import UnreadCountService
+        updated = Notification.objects.filter(
             recipient=user, 
             is_read=False
         ).update(
             is_read=True, 
             read_at=timezone.now()
         )
+        UnreadCountService.reset(user.pk)
+        if updated:
+            RealtimeService.bump(RealtimeService.notifications_channel(user.pk))
+        return updated
@@ -21,6 +21,14 @@ class NotificationService:
     Uses transactional outbox pattern for reliable async delivery.
     """
 
+    PRIORITY_MAP = {
+        'critical': 'high',
+        'high': 'high',
+        'medium': 'normal',
+        'normal': 'normal',
+        'low': 'low',
+    }
+
     @staticmethod
     def emit_event(event_name, payload, audience_criteria=None, priority='medium', sender=None):
         """
@@ -219,6 +227,14 @@ class NotificationService:
                 (payload or {}).get('title', 'تنبيه الأحوال الجوية'),
                 lambda p: p.get('message', 'يرجى توخي الحذر.')
             ),
+            'AD_EXPIRED': (
+                "انتهى الإعلان",
+                lambda p: f"انتهت مدة عرض إعلانك '{p.get('ad_title')}'. يمكنك تجديده من لوحة الشريك."
+            ),
+            'AD_EXPIRING_SOON': (
+                "الإعلان قارب على الانتهاء",
+                lambda p: f"سينتهي إعلانك '{p.get('ad_title')}' خلال {p.get('days_remaining')} يوم ({p.get('end_date')})."
+            ),
         }
         
         if event_name in EVENT_TEMPLATES:
@@ -249,6 +265,8 @@ class NotificationService:
             'SYSTEM_ALERT': 'general',
             'STAFF_ALERT': 'general',
             'WEATHER_ALERT': 'weather_alert',
+            'AD_EXPIRED': 'ad_expired',
+            'AD_EXPIRING_SOON': 'ad_expiring_soon',
         }
         return mapping.get(event_type, 'general')
 
@@ -258,25 +276,25 @@ class NotificationService:
         # Respects NotificationPreference if present.
         from interactions.models import NotificationPreference
 
-        priority_map = {
-            'critical': 'high',
-            'high': 'high',
-            'medium': 'normal',
-            'normal': 'normal',
-            'low': 'low',
-        }
-        priority_db = priority_map.get(priority, 'normal')
+        priority_db = NotificationService.PRIORITY_MAP.get(priority, 'normal')
 
         notif_type = NotificationService._map_event_to_notification_type(event_type)
         notifications_to_create = []
 
+        # Eligible recipients per channel: one preferences query per chunk
+        recipient_ids = [user.pk for user in recipients]
+        try:
+            in_app_ids = set(NotificationPreference.filter_recipients(recipient_ids, notif_type))
+            push_ids = set(NotificationPreference.filter_recipients(in_app_ids, notif_type, 'push'))
+            email_ids = set(NotificationPreference.filter_recipients(in_app_ids, notif_type, 'email'))
+        except Exception:
+            # Fail open (push only), as when preferences cannot be read
+            in_app_ids = push_ids = set(recipient_ids)
+            email_ids = set()
+
         for user in recipients:
-            try:
-                prefs = NotificationPreference.get_or_create_for_user(user)
-                if not prefs.is_notification_enabled(notif_type):
-                    continue
-            except Exception:
-                prefs = None
+            if user.pk not in in_app_ids:
+                continue
 
             notifications_to_create.append(
                 Notification(
@@ -293,7 +311,7 @@ class NotificationService:
             )
 
             # Enqueue push notification only if enabled
-            if prefs is None or getattr(prefs, 'enable_push', True):
+            if user.pk in push_ids:
                 NotificationService.enqueue_notification(
                     recipient=user,
                     title=title,
@@ -305,7 +323,7 @@ class NotificationService:
                 )
             
             # Enqueue email notification if enabled
-            if prefs and getattr(prefs, 'enable_email', False):
+            if user.pk in email_ids:
                 NotificationService.enqueue_notification(
                     recipient=user,
                     title=title,
@@ -322,6 +340,86 @@ class NotificationService:
 
         if notifications_to_create:
             Notification.objects.bulk_create(notifications_to_create)
+            from interactions.services.realtime_service import RealtimeService
+            from interactions.services.unread_service import UnreadCountService
+            UnreadCountService.incr(n.recipient_id for n in notifications_to_create if not n.is_read)
+            RealtimeService.bump(*{
+                RealtimeService.notifications_channel(n.recipient_id) for n in notifications_to_create
+            })
+
+    @staticmethod
+    def emit_bulk(event_name, entries, priority='medium', batch_size=1000):
+        """
+        Fan out one event to many users, each with their own payload.
+        
+        entries is an iterable of (user_id, payload). Preferences are
+        checked per chunk of users, and in-app notifications plus push and
+        email outbox rows are written with bulk inserts instead of one
+        create per recipient. Unlike emit_event this raises on failure, so
+        callers can keep the fan-out in the same transaction as the state
+        change that caused it.
+        
+        Returns:
+            int: Number of in-app notifications created
+        """
+        from interactions.models import NotificationPreference
+        from interactions.notifications.outbox import NotificationOutbox
+
+        entries = list(entries)
+        if not entries:
+            return 0
+
+        notif_type = NotificationService._map_event_to_notification_type(event_name)
+        priority_db = NotificationService.PRIORITY_MAP.get(priority, 'normal')
+        user_ids = list(dict.fromkeys(user_id for user_id, _ in entries))
+        in_app_ids = set(NotificationPreference.filter_recipients(user_ids, notif_type))
+        push_ids = set(NotificationPreference.filter_recipients(in_app_ids, notif_type, 'push'))
+        email_ids = set(NotificationPreference.filter_recipients(in_app_ids, notif_type, 'email'))
+        if push_ids:
+            # Same rule as enqueue_notification: no device token, no push
+            push_ids = set(
+                User.objects.filter(pk__in=push_ids).exclude(fcm_token__isnull=True)
+                .exclude(fcm_token='').values_list('pk', flat=True)
+            )
+
+        notifications, outbox = [], []
+        for user_id, payload in entries:
+            if user_id not in in_app_ids:
+                continue
+            title, message, url = NotificationService._resolve_content(event_name, payload)
+            notifications.append(Notification(
+                recipient_id=user_id,
+                notification_type=notif_type,
+                title=title,
+                message=message,
+                action_url=url or '',
+                priority=priority_db,
+                event_type=event_name,
+                metadata=payload,
+            ))
+            if user_id in push_ids:
+                outbox.append(NotificationOutbox(
+                    recipient_id=user_id, channel='push', provider='fcm',
+                    title=title, body=message, payload=payload or {}, status='queued',
+                ))
+            if user_id in email_ids:
+                outbox.append(NotificationOutbox(
+                    recipient_id=user_id, channel='email', provider='email',
+                    title=title, body=message, status='queued',
+                    payload={**(payload or {}), 'notification_type': notif_type, 'action_url': url},
+                ))
+
+        Notification.objects.bulk_create(notifications, batch_size=batch_size)
+        NotificationOutbox.objects.bulk_create(outbox, batch_size=batch_size)
+        if notifications:
+            from interactions.services.realtime_service import RealtimeService
+            from interactions.services.unread_service import UnreadCountService
+            UnreadCountService.incr(n.recipient_id for n in notifications)
+            RealtimeService.bump(*{
+                RealtimeService.notifications_channel(n.recipient_id) for n in notifications
+            })
+        logger.info(f"Notification dispatched: {event_name} to {len(notifications)} recipients (bulk)")
+        return len(notifications)
 
     # ==========================================
     # Convenience Methods
@@ -356,20 +454,20 @@ class NotificationService:
 
     @staticmethod
     def mark_as_read(notification):
-        """Mark a single notification as read."""
-        from django.utils import timezone
-        if not notification.is_read:
-            notification.is_read = True
-            notification.read_at = timezone.now()
-            notification.save(update_fields=['is_read', 'read_at'])
-            return True
-        return False
+        """Mark a single notification as read (see Notification.mark_as_read)."""
+        return notification.mark_as_read()
 
     @staticmethod
     def mark_all_as_read(user):
         """Mark all unread notifications for a user as read."""
         from django.utils import timezone
-        return Notification.objects.filter(recipient=user, is_read=False).update(
+        from interactions.services.realtime_service import RealtimeService
+        from interactions.services.unread_service import UnreadCountService
+        updated = Notification.objects.filter(recipient=user, is_read=False).update(
             is_read=True,
             read_at=timezone.now()
         )
+        UnreadCountService.reset(user.pk)
+        if updated:
+            RealtimeService.bump(RealtimeService.notifications_channel(user.pk))
+        return updated
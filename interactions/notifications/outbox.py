@@ -101,6 +101,7 @@ class NotificationOutbox(TimeStampedModel):
         indexes = [
             models.Index(fields=['status', 'scheduled_at']),
             models.Index(fields=['recipient', 'status']),
+            models.Index(fields=['status', 'sent_at']),
         ]
     
     def __str__(self):
@@ -5,7 +5,7 @@ Base classes and common interfaces
 import logging
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable
 
 logger = logging.getLogger(__name__)
 
@@ -27,12 +27,14 @@ class SendResult:
     message_id: Optional[str] = None
     error: Optional[str] = None
     raw_response: Optional[Dict[str, Any]] = None
+    retriable: bool = False
 
 
 class BaseProvider(ABC):
     """Abstract base class for notification providers."""
     
     provider_name: str = "base"
+    BATCH_SIZE: int = 1  # recipients per provider request in send_batch
     
     @abstractmethod
     def send_push(
@@ -91,3 +93,42 @@ class BaseProvider(ABC):
             )
         
         return self.send_push(device_token, title, body, data, **kwargs)
+    
+    def send_batch(
+        self,
+        recipients: Iterable[str],
+        title: str,
+        body: str,
+        data: Optional[Dict[str, Any]] = None,
+        **kwargs
+    ) -> Dict[str, SendResult]:
+        """
+        Send the same notification to many recipients.
+        
+        Providers override this with a native multi-recipient request; the
+        default sends one push per recipient. A failure for one recipient
+        (or one provider request) is reported in its SendResult rather
+        than raised, so the rest of the batch still goes out.
+        
+        Args:
+            recipients: Device tokens / player IDs (duplicates are sent once)
+            title: Notification title
+            body: Notification body
+            data: Additional data payload
+            
+        Returns:
+            Dict mapping each recipient to its SendResult, in input order
+        """
+        results = {}
+        for recipient in dict.fromkeys(recipients):
+            try:
+                results[recipient] = self.send_push(recipient, title, body, data, **kwargs)
+            except ProviderError as e:
+                results[recipient] = SendResult(success=False, error=e.message, retriable=e.retriable)
+        return results
+    
+    @staticmethod
+    def chunked(items: list, size: int):
+        """Yield successive slices of at most `size` items."""
+        for start in range(0, len(items), size):
+            yield items[start:start + size]
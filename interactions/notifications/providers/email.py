@@ -3,17 +3,47 @@ Email Notification Provider
 مزود الإشعارات عبر البريد الإلكتروني
 """
 import logging
-from typing import Optional, Dict, Any
+import smtplib
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, Iterable
 from django.conf import settings
-from django.core.mail import send_mail, EmailMultiAlternatives
-from django.template.loader import render_to_string
-from django.utils.html import strip_tags
+from django.core.mail import send_mail, get_connection, EmailMessage, EmailMultiAlternatives
+from django.core.mail.message import make_msgid
+from django.core.mail.utils import DNS_NAME
+from django.template.loader import get_template
+from django.utils import translation
+from django.utils.html import escape, strip_tags
 
 from .base import BaseProvider, ProviderError, SendResult
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class EmailShell:
+    """
+    A template rendered once for a whole batch, with placeholder tokens
+    where per-recipient values go. Tokens are plain ASCII so they survive
+    autoescaping, linebreaks and strip_tags unchanged.
+    """
+    html: Optional[str]
+    text: str
+    
+    @staticmethod
+    def placeholder(name: str) -> str:
+        return f"[[ibb-email:{name}]]"
+    
+    def fill(self, values: Dict[str, Any]):
+        """Return (html, text) with each placeholder replaced by its escaped value."""
+        html, text = self.html, self.text
+        for name, value in values.items():
+            token, escaped = self.placeholder(name), escape(value)
+            if html is not None:
+                html = html.replace(token, escaped)
+            text = text.replace(token, escaped)
+        return html, text
+
+
 class EmailProvider(BaseProvider):
     """Email notification provider."""
     
@@ -33,6 +63,8 @@ class EmailProvider(BaseProvider):
     
     DEFAULT_TEMPLATE = 'notifications/email/general.html'
     
+    _compiled_templates: Dict[tuple, Any] = {}
+    
     def __init__(self):
         self.from_email = getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@ibbguide.com')
         self.site_name = getattr(settings, 'SITE_NAME', 'دليل إب السياحي')
@@ -89,14 +121,16 @@ class EmailProvider(BaseProvider):
             }
             
             # Get template
-            template_name = self.TEMPLATES.get(notification_type, self.DEFAULT_TEMPLATE)
+            template = self.get_compiled_template(notification_type)
             
             try:
-                html_content = render_to_string(template_name, context)
+                if template is None:
+                    raise ValueError("template unavailable")
+                html_content = template.render(context)
                 plain_content = strip_tags(html_content)
             except Exception as template_error:
                 # Fallback to simple email if template fails
-                logger.warning(f"Template {template_name} not found, using plain text: {template_error}")
+                logger.warning(f"Template for {notification_type} not rendered, using plain text: {template_error}")
                 html_content = None
                 plain_content = f"{title}\n\n{body}"
             
@@ -176,7 +210,7 @@ class EmailProvider(BaseProvider):
         # Add user context
         context = {
             'user': user,
-            'user_name': getattr(user, 'full_name', None) or getattr(user, 'username', 'مستخدم'),
+            **self.personal_values(user),
             **(data or {})
         }
         
@@ -189,6 +223,207 @@ class EmailProvider(BaseProvider):
             **kwargs
         )
     
+    def send_batch(
+        self,
+        recipients: Iterable,
+        title: str,
+        body: str,
+        data: Optional[Dict[str, Any]] = None,
+        *,
+        notification_type: str = 'general',
+        connection=None,
+        **kwargs
+    ) -> Dict[str, SendResult]:
+        """
+        Send one notification email to many recipients over one connection.
+        
+        Messages come from render_batch (one shared rendering, personalised
+        by substitution) and are sent back to back on a single open mail
+        connection instead of one connection per email. A refused
+        recipient fails only its own SendResult; if the server drops the
+        connection mid-batch it is reopened for the remaining messages.
+        
+        Args:
+            recipients: User objects or email strings (duplicates sent once)
+            title: Email subject
+            body: Email body
+            data: Additional context for template
+            notification_type: Type for template selection (keyword-only)
+            connection: Mail backend connection (default: get_connection())
+            
+        Returns:
+            Dict mapping email (or user pk without email) to SendResult
+        """
+        results = {}
+        messages = []
+        for key, html_content, plain_content in self.render_batch(
+            recipients, title, body, notification_type, data
+        ):
+            if plain_content is None:
+                results[key] = SendResult(success=False, error="No email address registered")
+                continue
+            results[key] = None  # keeps input order; filled in once sent
+            messages.append((key, self._build_message(key, title, html_content, plain_content)))
+        
+        if messages:
+            self._send_messages(connection or get_connection(fail_silently=False), messages, results)
+        
+        sent = sum(1 for result in results.values() if result.success)
+        logger.info(f"Email batch '{title}' sent to {sent}/{len(results)} recipients")
+        return results
+    
+    def render_batch(
+        self,
+        recipients: Iterable,
+        title: str,
+        body: str,
+        notification_type: str = 'general',
+        data: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Yield (email, html, plain_text) per unique recipient.
+        
+        The template is rendered once per shape of recipient (anonymous
+        address, or user with personal_values) with placeholders in place
+        of the personal values, then filled per recipient by string
+        replacement. Users without an email yield (str(pk), None, None).
+        html is None when the template is missing or fails to render.
+        """
+        template = self.get_compiled_template(notification_type)
+        context = {
+            'title': title,
+            'body': body,
+            'site_name': self.site_name,
+            'site_url': getattr(settings, 'SITE_URL', 'https://ibbguide.com'),
+            **(data or {})
+        }
+        shells = {}
+        seen = set()
+        
+        for recipient in recipients:
+            if isinstance(recipient, str):
+                to_email, personal = recipient, {}
+            else:
+                to_email = getattr(recipient, 'email', None)
+                if not to_email:
+                    yield str(recipient.pk), None, None
+                    continue
+                personal = self.personal_values(recipient)
+            if to_email in seen:
+                continue
+            seen.add(to_email)
+            
+            shape = tuple(personal)
+            if shape not in shells:
+                shells[shape] = self._render_shell(template, context, shape)
+            yield (to_email, *shells[shape].fill(personal))
+    
+    @staticmethod
+    def personal_values(user) -> Dict[str, str]:
+        """
+        Per-recipient context for a user. render_batch fills these into a
+        shared rendering, so templates may only print them or test them
+        for truthiness.
+        """
+        return {
+            'user_name': getattr(user, 'full_name', None) or getattr(user, 'username', 'مستخدم'),
+        }
+    
+    def _render_shell(self, template, context, fields) -> 'EmailShell':
+        """Render the template once with placeholders for `fields`."""
+        title, body = context['title'], context['body']
+        if template is not None:
+            placeholders = {name: EmailShell.placeholder(name) for name in fields}
+            try:
+                html_content = template.render({**context, **placeholders})
+            except Exception as template_error:
+                logger.warning(f"Template render failed, using plain text: {template_error}")
+            else:
+                return EmailShell(html_content, strip_tags(html_content))
+        return EmailShell(None, f"{title}\n\n{body}")
+    
+    @classmethod
+    def get_compiled_template(cls, notification_type: str):
+        """
+        Compiled template for a notification type, cached per
+        (template, language); None (also cached) if it cannot be loaded.
+        """
+        template_name = cls.TEMPLATES.get(notification_type, cls.DEFAULT_TEMPLATE)
+        key = (template_name, translation.get_language())
+        if key not in cls._compiled_templates:
+            try:
+                cls._compiled_templates[key] = get_template(template_name)
+            except Exception as template_error:
+                logger.warning(f"Template {template_name} not found, using plain text: {template_error}")
+                cls._compiled_templates[key] = None
+        return cls._compiled_templates[key]
+    
+    @classmethod
+    def clear_template_cache(cls):
+        cls._compiled_templates.clear()
+    
+    def _build_message(self, to_email, title, html_content, plain_content) -> EmailMessage:
+        """Build one recipient's message (multipart when there is HTML)."""
+        headers = {'Message-ID': make_msgid(domain=DNS_NAME)}
+        if html_content is not None:
+            message = EmailMultiAlternatives(
+                subject=title,
+                body=plain_content,
+                from_email=self.from_email,
+                to=[to_email],
+                headers=headers
+            )
+            message.attach_alternative(html_content, "text/html")
+            return message
+        return EmailMessage(
+            subject=title,
+            body=plain_content,
+            from_email=self.from_email,
+            to=[to_email],
+            headers=headers
+        )
+    
+    def _send_messages(self, connection, messages, results):
+        """Send (email, message) pairs on one open connection, recording results."""
+        try:
+            connection.open()
+        except Exception as e:
+            logger.error(f"Email batch could not connect: {e}", exc_info=True)
+            for to_email, _ in messages:
+                results[to_email] = SendResult(success=False, error=str(e), retriable=True)
+            return
+        
+        try:
+            for to_email, message in messages:
+                try:
+                    if connection.send_messages([message]):
+                        results[to_email] = SendResult(
+                            success=True,
+                            message_id=message.extra_headers['Message-ID']
+                        )
+                    else:
+                        results[to_email] = SendResult(
+                            success=False,
+                            error="Email send returned 0",
+                            retriable=True
+                        )
+                except smtplib.SMTPRecipientsRefused as e:
+                    results[to_email] = SendResult(success=False, error=str(e), retriable=False)
+                except Exception as e:
+                    logger.error(f"Email send failed to {to_email}: {e}")
+                    results[to_email] = SendResult(success=False, error=str(e), retriable=True)
+                    if isinstance(e, smtplib.SMTPServerDisconnected):
+                        connection.close()
+                        connection.open()
+        except Exception as e:
+            # Reconnect failed: the rest of the batch cannot be sent
+            logger.error(f"Email batch aborted: {e}", exc_info=True)
+            for to_email, result in results.items():
+                if result is None:
+                    results[to_email] = SendResult(success=False, error=str(e), retriable=True)
+        finally:
+            connection.close()
+    
     def send_bulk(
         self,
         recipients: list,
@@ -210,20 +445,4 @@ class EmailProvider(BaseProvider):
         Returns:
             Dict mapping recipient to SendResult
         """
-        results = {}
-        
-        for recipient in recipients:
-            try:
-                if isinstance(recipient, str):
-                    # Email string
-                    result = self.send_email(recipient, title, body, notification_type, data)
-                    results[recipient] = result
-                else:
-                    # User object
-                    result = self.send_to_user(recipient, title, body, notification_type, data)
-                    results[getattr(recipient, 'email', str(recipient.pk))] = result
-            except Exception as e:
-                logger.error(f"Bulk email failed for {recipient}: {e}")
-                results[str(recipient)] = SendResult(success=False, error=str(e))
-        
-        return results
+        return self.send_batch(recipients, title, body, data, notification_type=notification_type)
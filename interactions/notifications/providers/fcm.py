@@ -3,7 +3,7 @@ Firebase Cloud Messaging (FCM) Provider Adapter
 """
 import logging
 import requests
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, List
 from django.conf import settings
 
 from .base import BaseProvider, ProviderError, SendResult
@@ -17,6 +17,8 @@ class FCMProvider(BaseProvider):
     provider_name = "fcm"
     API_URL = "https://fcm.googleapis.com/fcm/send"
     TIMEOUT = 10  # seconds
+    BATCH_SIZE = 1000  # registration_ids limit per multicast request
+    NON_RETRIABLE_ERRORS = ("InvalidRegistration", "NotRegistered", "MismatchSenderId")
     
     def __init__(self):
         self.server_key = getattr(settings, 'FCM_SERVER_KEY', '')
@@ -86,8 +88,7 @@ class FCMProvider(BaseProvider):
                 logger.error(f"FCM error: {error}")
                 
                 # Check for non-retriable errors
-                non_retriable = ["InvalidRegistration", "NotRegistered", "MismatchSenderId"]
-                retriable = error not in non_retriable
+                retriable = error not in self.NON_RETRIABLE_ERRORS
                 
                 raise ProviderError(
                     error,
@@ -107,3 +108,95 @@ class FCMProvider(BaseProvider):
                 provider=self.provider_name,
                 retriable=True
             )
+    
+    def send_batch(
+        self,
+        recipients: Iterable[str],
+        title: str,
+        body: str,
+        data: Optional[Dict[str, Any]] = None,
+        **kwargs
+    ) -> Dict[str, SendResult]:
+        """
+        Send one notification to many registration tokens.
+        
+        Tokens go out BATCH_SIZE at a time as multicast (registration_ids)
+        requests over a single keep-alive session. FCM returns one result
+        per token, in order, which becomes that token's SendResult.
+        """
+        if not self.server_key:
+            raise ProviderError(
+                "FCM server key not configured",
+                provider=self.provider_name,
+                retriable=False
+            )
+        
+        tokens = list(dict.fromkeys(recipients))
+        results = {}
+        headers = {
+            "Authorization": f"key={self.server_key}",
+            "Content-Type": "application/json",
+        }
+        
+        with requests.Session() as session:
+            session.headers.update(headers)
+            for chunk in self.chunked(tokens, self.BATCH_SIZE):
+                results.update(self._send_chunk(session, chunk, title, body, data))
+        
+        sent = sum(1 for result in results.values() if result.success)
+        logger.info(f"FCM multicast sent to {sent}/{len(tokens)} tokens")
+        return results
+    
+    def _send_chunk(self, session, tokens: List[str], title, body, data) -> Dict[str, SendResult]:
+        """POST one multicast request and map its results list onto the tokens."""
+        payload = {
+            "registration_ids": tokens,
+            "notification": {
+                "title": title,
+                "body": body,
+                "sound": "default",
+            },
+        }
+        if data:
+            payload["data"] = data
+        
+        def fail_all(error, retriable, raw=None):
+            return {
+                token: SendResult(success=False, error=error, raw_response=raw, retriable=retriable)
+                for token in tokens
+            }
+        
+        try:
+            response = session.post(self.API_URL, json=payload, timeout=self.TIMEOUT)
+            response_data = response.json()
+        except requests.Timeout:
+            return fail_all("FCM request timed out", True)
+        except (requests.RequestException, ValueError) as e:
+            return fail_all(f"FCM request failed: {str(e)}", True)
+        
+        token_results = response_data.get("results") or []
+        if response.status_code != 200 or len(token_results) != len(tokens):
+            logger.error(f"FCM multicast error: HTTP {response.status_code}")
+            return fail_all(
+                f"FCM multicast failed: HTTP {response.status_code}",
+                response.status_code >= 500 or response.status_code == 429,
+                response_data,
+            )
+        
+        results = {}
+        for token, token_result in zip(tokens, token_results):
+            if token_result.get("message_id"):
+                results[token] = SendResult(
+                    success=True,
+                    message_id=token_result["message_id"],
+                    raw_response=token_result
+                )
+            else:
+                error = token_result.get("error", "Unknown error")
+                results[token] = SendResult(
+                    success=False,
+                    error=error,
+                    raw_response=token_result,
+                    retriable=error not in self.NON_RETRIABLE_ERRORS
+                )
+        return results
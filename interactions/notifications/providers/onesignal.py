@@ -3,7 +3,7 @@ OneSignal Provider Adapter
 """
 import logging
 import requests
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, List
 from django.conf import settings
 
 from .base import BaseProvider, ProviderError, SendResult
@@ -17,6 +17,7 @@ class OneSignalProvider(BaseProvider):
     provider_name = "onesignal"
     API_URL = "https://onesignal.com/api/v1/notifications"
     TIMEOUT = 10  # seconds
+    BATCH_SIZE = 2000  # include_player_ids limit per request
     
     def __init__(self):
         self.app_id = getattr(settings, 'ONESIGNAL_APP_ID', '')
@@ -100,3 +101,84 @@ class OneSignalProvider(BaseProvider):
                 provider=self.provider_name,
                 retriable=True
             )
+    
+    def send_batch(
+        self,
+        recipients: Iterable[str],
+        title: str,
+        body: str,
+        data: Optional[Dict[str, Any]] = None,
+        **kwargs
+    ) -> Dict[str, SendResult]:
+        """
+        Send one notification to many player IDs.
+        
+        Player IDs go out BATCH_SIZE at a time in include_player_ids over a
+        single keep-alive session. Every player in an accepted request gets
+        the notification id; players listed in errors.invalid_player_ids
+        and every player of a rejected request get a failed SendResult.
+        """
+        if not self.app_id or not self.api_key:
+            raise ProviderError(
+                "OneSignal credentials not configured",
+                provider=self.provider_name,
+                retriable=False
+            )
+        
+        player_ids = list(dict.fromkeys(recipients))
+        results = {}
+        headers = {
+            "Authorization": f"Basic {self.api_key}",
+            "Content-Type": "application/json",
+        }
+        
+        with requests.Session() as session:
+            session.headers.update(headers)
+            for chunk in self.chunked(player_ids, self.BATCH_SIZE):
+                results.update(self._send_chunk(session, chunk, title, body, data))
+        
+        sent = sum(1 for result in results.values() if result.success)
+        logger.info(f"OneSignal batch sent to {sent}/{len(player_ids)} players")
+        return results
+    
+    def _send_chunk(self, session, player_ids: List[str], title, body, data) -> Dict[str, SendResult]:
+        """POST one include_player_ids request and map the response per player."""
+        payload = {
+            "app_id": self.app_id,
+            "include_player_ids": player_ids,
+            "headings": {"en": title},
+            "contents": {"en": body},
+        }
+        if data:
+            payload["data"] = data
+        
+        def fail_all(error, retriable, raw=None):
+            return {
+                player_id: SendResult(success=False, error=error, raw_response=raw, retriable=retriable)
+                for player_id in player_ids
+            }
+        
+        try:
+            response = session.post(self.API_URL, json=payload, timeout=self.TIMEOUT)
+            response_data = response.json()
+        except requests.Timeout:
+            return fail_all("OneSignal request timed out", True)
+        except (requests.RequestException, ValueError) as e:
+            return fail_all(f"OneSignal request failed: {str(e)}", True)
+        
+        notification_id = response_data.get("id")
+        errors = response_data.get("errors")
+        if response.status_code != 200 or not notification_id:
+            error_msg = str(errors or ["Unknown error"])
+            logger.error(f"OneSignal batch error: {error_msg}")
+            return fail_all(error_msg, response.status_code >= 500 or response.status_code == 429, response_data)
+        
+        invalid = set(errors.get("invalid_player_ids", [])) if isinstance(errors, dict) else set()
+        return {
+            player_id: (
+                SendResult(success=False, error="Invalid player id", raw_response=response_data)
+                if player_id in invalid else
+                SendResult(success=True, message_id=notification_id, raw_response=response_data)
+            )
+            for player_id in player_ids
+        }
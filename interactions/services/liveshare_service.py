@@ -0,0 +1,262 @@
+"""
+Live Share Service
+Location ingestion for live location sharing.
+
+Viewers poll the latest position, which is served from the cache. Pings
+are only persisted when the sharer has moved at least
+LIVESHARE_MIN_DISTANCE_M metres or LIVESHARE_MAX_INTERVAL seconds have
+passed since the last stored point, so a stationary sharer writes one row
+a minute instead of one every few seconds. Offline clients may upload a
+batch of points; the batch is simplified with Douglas-Peucker and stored
+with a single bulk insert.
+"""
+import logging
+import math
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from interactions.models import LiveShareSession, LiveLocationPing
+from interactions.services.realtime_service import RealtimeService
+from places.services.geo_service import haversine_distance
+
+logger = logging.getLogger(__name__)
+
+# Mean metres per degree of latitude, used for the local planar projection
+METERS_PER_DEGREE = 111_320.0
+
+
+class LiveShareError(Exception):
+    """Raised for invalid sessions or payloads; the message is user facing."""
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _distance_m(a, b):
+    return haversine_distance(a[0], a[1], b[0], b[1]) * 1000
+
+
+def _perpendicular_m(point, start, end):
+    """Distance in metres from point to segment start-end (local planar approximation)."""
+    scale = math.cos(math.radians(start[0]))
+    px, py = (point[1] - start[1]) * scale, point[0] - start[0]
+    ex, ey = (end[1] - start[1]) * scale, end[0] - start[0]
+    length = ex * ex + ey * ey
+    if length == 0:
+        return math.hypot(px, py) * METERS_PER_DEGREE
+    t = max(0.0, min(1.0, (px * ex + py * ey) / length))
+    return math.hypot(px - t * ex, py - t * ey) * METERS_PER_DEGREE
+
+
+def simplify(points, tolerance_m):
+    """
+    Douglas-Peucker simplification of [(lat, lon, ts), ...].
+    Endpoints are always kept. Iterative to avoid recursion limits.
+    """
+    if len(points) < 3 or tolerance_m <= 0:
+        return list(points)
+
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        index, max_dist = None, tolerance_m
+        for i in range(first + 1, last):
+            dist = _perpendicular_m(points[i], points[first], points[last])
+            if dist > max_dist:
+                index, max_dist = i, dist
+        if index is not None:
+            keep[index] = True
+            stack.append((first, index))
+            stack.append((index, last))
+    return [point for point, kept in zip(points, keep) if kept]
+
+
+class LiveShareService:
+    """Cache-backed ingestion and retrieval of live share locations."""
+
+    SESSION_KEY = 'liveshare:{token}:session'
+    LATEST_KEY = 'liveshare:{token}:latest'
+    PERSISTED_KEY = 'liveshare:{token}:persisted'
+
+    # Session metadata is re-read from the database at least this often
+    SESSION_CACHE_TTL = 300
+
+    @staticmethod
+    def parse_point(lat, lon, ts=None, now=None):
+        """Validate a point; returns (lat, lon, datetime)."""
+        try:
+            lat, lon = float(lat), float(lon)
+        except (TypeError, ValueError):
+            raise LiveShareError('Invalid coordinates')
+        if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            raise LiveShareError('Invalid coordinates')
+
+        now = now or timezone.now()
+        if ts in (None, ''):
+            return lat, lon, now
+        try:
+            # Clients send epoch seconds or milliseconds
+            ts = float(ts)
+            if ts > 1e11:
+                ts /= 1000
+            when = datetime.fromtimestamp(ts, tz=dt_timezone.utc)
+        except (TypeError, ValueError, OverflowError, OSError):
+            raise LiveShareError('Invalid timestamp')
+        return lat, lon, min(when, now)
+
+    @staticmethod
+    def get_session(token, now=None):
+        """
+        Return cached session metadata {'id', 'expires_at', 'created_at'}
+        for an active session, deactivating it when it has expired.
+        """
+        now = now or timezone.now()
+        key = LiveShareService.SESSION_KEY.format(token=token)
+        meta = cache.get(key)
+        if meta is None:
+            session = LiveShareSession.objects.filter(token=token, is_active=True).only(
+                'id', 'expires_at', 'created_at'
+            ).first()
+            if session is None:
+                raise LiveShareError('Invalid Session')
+            meta = {'id': session.id, 'expires_at': session.expires_at, 'created_at': session.created_at}
+            ttl = min(LiveShareService.SESSION_CACHE_TTL, (meta['expires_at'] - now).total_seconds())
+            if ttl > 0:
+                cache.set(key, meta, int(ttl) + 1)
+
+        if now > meta['expires_at']:
+            LiveShareSession.objects.filter(pk=meta['id']).update(is_active=False)
+            LiveShareService.forget(token)
+            raise LiveShareError('Expired')
+        return meta
+
+    @staticmethod
+    def forget(token):
+        """Drop cached state for a session (on stop or expiry)."""
+        cache.delete_many([
+            LiveShareService.SESSION_KEY.format(token=token),
+            LiveShareService.LATEST_KEY.format(token=token),
+            LiveShareService.PERSISTED_KEY.format(token=token),
+        ])
+        RealtimeService.bump(RealtimeService.liveshare_channel(token))
+
+    @staticmethod
+    def record(token, points, now=None):
+        """
+        Ingest one or more (lat, lon, ts) points for a session.
+        Returns (accepted, stored).
+        """
+        now = now or timezone.now()
+        meta = LiveShareService.get_session(token, now)
+        if not points:
+            return 0, 0
+
+        max_points = _setting('LIVESHARE_MAX_BATCH_POINTS', 500)
+        if len(points) > max_points:
+            raise LiveShareError('Too many points')
+
+        points = sorted(
+            (p for p in points if p[2] >= meta['created_at']), key=lambda p: p[2]
+        )
+        if not points:
+            return 0, 0
+        accepted = len(points)
+
+        ttl = max(int((meta['expires_at'] - now).total_seconds()), 1)
+        latest_key = LiveShareService.LATEST_KEY.format(token=token)
+        newest = points[-1]
+        current = cache.get(latest_key)
+        if current is None or current['ts'] <= newest[2]:
+            cache.set(latest_key, {'lat': newest[0], 'lon': newest[1], 'ts': newest[2]}, ttl)
+            RealtimeService.bump(RealtimeService.liveshare_channel(token))
+
+        if len(points) > 2:
+            points = simplify(points, _setting('LIVESHARE_SIMPLIFY_TOLERANCE_M', 10))
+        to_store = LiveShareService._downsample(token, points, ttl)
+        rows = [
+            LiveLocationPing(session_id=meta['id'], latitude=round(lat, 6), longitude=round(lon, 6), created_at=ts)
+            for lat, lon, ts in to_store
+        ]
+        if len(rows) == 1:
+            # A lone INSERT avoids bulk_create's explicit transaction
+            rows[0].save(force_insert=True)
+        elif rows:
+            LiveLocationPing.objects.bulk_create(rows)
+        return accepted, len(rows)
+
+    @staticmethod
+    def _downsample(token, points, ttl):
+        """Keep points that moved far enough or waited long enough since the last stored one."""
+        min_distance = _setting('LIVESHARE_MIN_DISTANCE_M', 25)
+        max_interval = timedelta(seconds=_setting('LIVESHARE_MAX_INTERVAL', 60))
+        persisted_key = LiveShareService.PERSISTED_KEY.format(token=token)
+
+        last = cache.get(persisted_key)
+        kept = []
+        for point in points:
+            if last is not None:
+                if point[2] <= last[2]:
+                    # Older than what is stored (late offline upload): keep as history
+                    kept.append(point)
+                    continue
+                if point[2] - last[2] < max_interval and _distance_m(point, last) < min_distance:
+                    continue
+            kept.append(point)
+            last = point
+
+        if kept:
+            cache.set(persisted_key, last, ttl)
+        return kept
+
+    @staticmethod
+    def get_latest(token):
+        """
+        Latest known position {'lat', 'lon', 'ts'} or None.
+        Served from the cache; falls back to the newest stored ping.
+        """
+        latest = cache.get(LiveShareService.LATEST_KEY.format(token=token))
+        if latest is not None:
+            return latest
+        ping = LiveLocationPing.objects.filter(session__token=token).order_by('-created_at').first()
+        if ping is None:
+            return None
+        return {'lat': float(ping.latitude), 'lon': float(ping.longitude), 'ts': ping.created_at}
+
+    @staticmethod
+    def purge_expired(retention_hours=None, batch_size=5000):
+        """
+        Deactivate expired sessions and bulk-delete pings of sessions that
+        expired more than LIVESHARE_PING_RETENTION_HOURS ago.
+        Returns (sessions_deactivated, pings_deleted).
+        """
+        if retention_hours is None:
+            retention_hours = _setting('LIVESHARE_PING_RETENTION_HOURS', 24)
+        now = timezone.now()
+
+        deactivated = LiveShareSession.objects.filter(
+            is_active=True, expires_at__lt=now
+        ).update(is_active=False)
+
+        session_ids = LiveShareSession.objects.filter(
+            expires_at__lt=now - timedelta(hours=retention_hours)
+        ).values('id')
+        deleted = 0
+        while True:
+            ids = list(
+                LiveLocationPing.objects.filter(session_id__in=session_ids)
+                .values_list('id', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            with transaction.atomic():
+                deleted += LiveLocationPing.objects.filter(id__in=ids).delete()[0]
+
+        logger.info(f"[LiveShare] Deactivated {deactivated} sessions, purged {deleted} pings")
+        return deactivated, deleted
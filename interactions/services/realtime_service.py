@@ -0,0 +1,118 @@
+"""
+Realtime Service
+Versioned channels and bounded long-polling.
+
+Writers bump a per-channel version counter in the cache whenever the data
+behind a channel changes (a user's notifications, a live share position).
+Pollers send the version they last saw and wait, checking only the cache,
+until it changes or a timeout elapses; the database is queried only when
+the version has moved.
+
+Parking a request ties up its worker, so waiting only happens when
+REALTIME_LONGPOLL_ENABLED is set (deployments with async workers, e.g.
+gevent). Otherwise, as on the default gunicorn sync workers, wait()
+answers at once and clients short-poll with a `retry` delay
+(REALTIME_RETRY_SECONDS, default 30s, the badge's old polling interval;
+live share viewers use LIVESHARE_RETRY_SECONDS, default 5s). With long-polling on, at most
+REALTIME_MAX_WAITERS requests wait at once in each process; requests
+over the cap also get a `retry` delay.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+class RealtimeService:
+    VERSION_KEY = 'realtime:{channel}:version'
+
+    # Requests parked in this process
+    _waiters = 0
+    _waiters_lock = threading.Lock()
+
+    @staticmethod
+    def notifications_channel(user_id):
+        return f'notifications:{user_id}'
+
+    @staticmethod
+    def liveshare_channel(token):
+        return f'liveshare:{token}'
+
+    @staticmethod
+    def version(channel):
+        return cache.get(RealtimeService.VERSION_KEY.format(channel=channel), 0)
+
+    @staticmethod
+    def bump(*channels):
+        """Advance the version of each channel, waking its waiters."""
+        for channel in channels:
+            key = RealtimeService.VERSION_KEY.format(channel=channel)
+            try:
+                cache.incr(key)
+            except ValueError:
+                if not cache.add(key, 1, None):
+                    cache.incr(key)
+
+    @staticmethod
+    def _acquire_slot():
+        with RealtimeService._waiters_lock:
+            if RealtimeService._waiters >= _setting('REALTIME_MAX_WAITERS', 8):
+                return False
+            RealtimeService._waiters += 1
+            return True
+
+    @staticmethod
+    def _release_slot():
+        with RealtimeService._waiters_lock:
+            RealtimeService._waiters -= 1
+
+    @staticmethod
+    def wait(channel, since, timeout=None):
+        """
+        Block until the channel version differs from `since` or the timeout
+        passes. Returns (version, waited) where waited is False when no
+        slot was free (or long-polling is off) and the caller should ask the
+        client to retry later.
+        """
+        current = RealtimeService.version(channel)
+        if since is None or current != since:
+            return current, True
+
+        if timeout is None:
+            timeout = _setting('REALTIME_LONGPOLL_TIMEOUT', 20)
+        if timeout <= 0 or not _setting('REALTIME_LONGPOLL_ENABLED', False):
+            return current, False
+        if not RealtimeService._acquire_slot():
+            return current, False
+
+        interval = _setting('REALTIME_POLL_INTERVAL', 0.5)
+        deadline = time.monotonic() + timeout
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return current, True
+                time.sleep(min(interval, remaining))
+                current = RealtimeService.version(channel)
+                if current != since:
+                    return current, True
+        finally:
+            RealtimeService._release_slot()
+
+    @staticmethod
+    def parse_version(value):
+        """Parse the client's `v` parameter; None means 'no version yet'."""
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def retry_ms(waited, setting='REALTIME_RETRY_SECONDS', default=30):
+        """Client back-off before the next poll, from `setting` (seconds)."""
+        return 0 if waited else int(_setting(setting, default) * 1000)
@@ -71,6 +71,11 @@ class ReviewService:
                 # Notify
                 ReviewService._notify_establishment_owner(place, review)
                 
+                from ibb_guide.events import EventBus, ReviewCreated
+                EventBus.publish(ReviewCreated(
+                    review_id=review.pk, place_id=place.pk, user_id=user.pk, rating=rating
+                ))
+                
                 return True, review
         except Exception as e:
             return False, f"Error: {str(e)}"
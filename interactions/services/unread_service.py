@@ -0,0 +1,108 @@
+"""
+Unread Count Service
+Per-user unread notification counters kept in the cache.
+
+Counters are loaded from the database on first read and then maintained
+write-through: fan-out (bulk_create) and single creates increment them,
+per-item reads and deletes decrement them, and mark-all-read resets them
+to zero. Writes that cannot be tracked precisely invalidate the counter so
+the next read recounts. A periodic task (reconcile_unread_counters)
+recounts users with recent activity to correct any drift from races
+between a recount and a concurrent increment.
+"""
+from collections import Counter
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+
+COUNTER_TTL = 6 * 60 * 60
+
+
+class UnreadCountService:
+    KEY = 'notifications:unread:{user_id}'
+
+    @staticmethod
+    def _key(user_id):
+        return UnreadCountService.KEY.format(user_id=user_id)
+
+    @staticmethod
+    def get(user):
+        """Unread notification count for a user (or user id)."""
+        user_id = getattr(user, 'pk', user)
+        count = cache.get(UnreadCountService._key(user_id))
+        if count is None:
+            from interactions.models import Notification
+            count = Notification.objects.filter(recipient_id=user_id, is_read=False).count()
+            # add(): never overwrite a counter another process loaded meanwhile
+            cache.add(UnreadCountService._key(user_id), count, COUNTER_TTL)
+        return count
+
+    @staticmethod
+    def _apply(deltas):
+        for user_id, delta in deltas.items():
+            if not delta:
+                continue
+            key = UnreadCountService._key(user_id)
+            try:
+                value = cache.incr(key, delta) if delta > 0 else cache.decr(key, -delta)
+            except ValueError:
+                # Not loaded: the next read counts from the database
+                continue
+            if value < 0:
+                cache.delete(key)
+
+    @staticmethod
+    def incr(user_ids):
+        """
+        Increment counters after the current transaction commits.
+        `user_ids` is an iterable of recipient ids, one entry per notification.
+        """
+        deltas = Counter(user_ids)
+        transaction.on_commit(lambda: UnreadCountService._apply(deltas))
+
+    @staticmethod
+    def decr(user_id, amount=1):
+        deltas = {user_id: -amount}
+        transaction.on_commit(lambda: UnreadCountService._apply(deltas))
+
+    @staticmethod
+    def reset(user_id):
+        """All of the user's notifications were marked read (or deleted)."""
+        transaction.on_commit(lambda: cache.set(UnreadCountService._key(user_id), 0, COUNTER_TTL))
+
+    @staticmethod
+    def invalidate(*user_ids):
+        """Drop counters so the next read recounts."""
+        keys = [UnreadCountService._key(user_id) for user_id in user_ids]
+        if keys:
+            transaction.on_commit(lambda: cache.delete_many(keys))
+
+    @staticmethod
+    def reconcile(since):
+        """
+        Recount users whose notifications were created or read since
+        `since` and overwrite their counters. Returns the number of users.
+        """
+        from interactions.models import Notification
+
+        user_ids = set(
+            Notification.objects.filter(Q(created_at__gte=since) | Q(read_at__gte=since))
+            .values_list('recipient_id', flat=True)
+            .distinct()
+            .order_by()
+        )
+        if not user_ids:
+            return 0
+
+        counts = dict(
+            Notification.objects.filter(recipient_id__in=user_ids, is_read=False)
+            .values_list('recipient_id')
+            .annotate(count=Count('id'))
+            .order_by()
+        )
+        cache.set_many(
+            {UnreadCountService._key(user_id): counts.get(user_id, 0) for user_id in user_ids},
+            COUNTER_TTL,
+        )
+        return len(user_ids)
@@ -1,3 +1,5 @@
+from functools import partial
+
 from django.db.models.signals import post_save, pre_save, post_delete
 from django.dispatch import receiver
 from django.db import transaction
@@ -9,34 +11,34 @@ from .notifications import NotificationService
 from management.models import Request, Advertisement
 from django.urls import reverse
 
+def _emit_on_commit(*args, **kwargs):
+    """Emit a notification event once the surrounding transaction commits."""
+    transaction.on_commit(partial(NotificationService.emit_event, *args, **kwargs))
+
+
 # ==========================================
 # Partner Profile Signals
 # ==========================================
+# PartnerProfile, Establishment and Advertisement use FieldTrackerMixin:
+# the values they were loaded with are diffed without re-fetching the row.
 
 @receiver(pre_save, sender=PartnerProfile)
 def track_partner_status_change(sender, instance, **kwargs):
-    if instance.pk:
-        try:
-            old_instance = PartnerProfile.objects.get(pk=instance.pk)
-            instance._old_status = old_instance.status
-        except PartnerProfile.DoesNotExist:
-            instance._old_status = None
-    else:
-        instance._old_status = None
+    instance._old_status = instance.get_tracked_values().get('status')
 
 @receiver(post_save, sender=PartnerProfile)
 def notify_partner_status_change(sender, instance, created, **kwargs):
     if created:
-        NotificationService.emit_event(
+        _emit_on_commit(
             'NEW_PARTNER_REGISTRATION', 
             {'partner_name': instance.user.username, 'url': reverse('admin:users_partnerprofile_change', args=[instance.pk])},
             {'role': 'staff'},
             priority='medium'
         )
-        NotificationService.emit_event(
+        _emit_on_commit(
             'PARTNER_REQUEST_RECEIVED',
             {'url': reverse('partner_dashboard')},
-            {'user_id': instance.user.id},
+            {'user_id': instance.user_id},
             priority='low'
         )
     else:
@@ -49,43 +51,33 @@ def notify_partner_status_change(sender, instance, created, **kwargs):
             if new_status == 'approved':
                 pass
             else:
-                NotificationService.emit_event(
+                _emit_on_commit(
                     'PARTNER_STATUS_CHANGE',
                     {'status': new_status, 'reason': getattr(instance, 'rejection_reason', '') or getattr(instance, 'info_request_message', ''), 'url': reverse('partner_dashboard')},
-                    {'user_id': instance.user.id},
+                    {'user_id': instance.user_id},
                     priority='high'
                 )
 
 @receiver(pre_save, sender=Establishment)
 def track_establishment_changes(sender, instance, **kwargs):
-    if instance.pk:
-        try:
-            old_instance = Establishment.objects.get(pk=instance.pk)
-            instance._old_license_status = old_instance.license_status
-            instance._old_is_active = old_instance.is_active
-            instance._old_pending_updates = old_instance.pending_updates
-        except Establishment.DoesNotExist:
-            instance._old_license_status = None
-            instance._old_is_active = None
-            instance._old_pending_updates = {}
-    else:
-        instance._old_license_status = None
-        instance._old_is_active = None
-        instance._old_pending_updates = {}
+    old_values = instance.get_tracked_values()
+    instance._old_license_status = old_values.get('license_status')
+    instance._old_is_active = old_values.get('is_active')
+    instance._old_pending_updates = old_values.get('pending_updates') or {}
 
 @receiver(post_save, sender=Establishment)
 def notify_establishment_changes(sender, instance, created, **kwargs):
     if created:
-        NotificationService.emit_event(
+        _emit_on_commit(
             'NEW_ESTABLISHMENT_REQUEST',
             {'place_name': instance.name, 'owner': instance.owner.username, 'url': reverse('admin:places_establishment_change', args=[instance.pk])},
             {'role': 'staff'},
             priority='medium'
         )
-        NotificationService.emit_event(
+        _emit_on_commit(
             'ESTABLISHMENT_REQUEST_RECEIVED',
             {'place_name': instance.name, 'url': reverse('partner_establishment_list')},
-            {'user_id': instance.owner.id},
+            {'user_id': instance.owner_id},
             priority='low'
         )
     else:
@@ -94,10 +86,10 @@ def notify_establishment_changes(sender, instance, created, **kwargs):
         new_license = instance.license_status
         
         if old_license != new_license:
-            NotificationService.emit_event(
+            _emit_on_commit(
                 'ESTABLISHMENT_LICENSE_CHANGE',
                 {'place_name': instance.name, 'status': new_license, 'url': reverse('partner_place_dashboard', args=[instance.pk])},
-                {'user_id': instance.owner.id},
+                {'user_id': instance.owner_id},
                 priority='high'
             )
         
@@ -107,10 +99,10 @@ def notify_establishment_changes(sender, instance, created, **kwargs):
         
         if old_active is not None and old_active != new_active:
             event = 'ESTABLISHMENT_SUSPENDED' if not new_active else 'ESTABLISHMENT_REACTIVATED'
-            NotificationService.emit_event(
+            _emit_on_commit(
                 event,
                 {'place_name': instance.name, 'url': reverse('partner_place_dashboard', args=[instance.pk])},
-                {'user_id': instance.owner.id},
+                {'user_id': instance.owner_id},
                 priority='high'
             )
         
@@ -119,7 +111,7 @@ def notify_establishment_changes(sender, instance, created, **kwargs):
         new_updates = instance.pending_updates
         
         if not old_updates and new_updates:
-            NotificationService.emit_event(
+            _emit_on_commit(
                 'REQUEST_UPDATE',
                 {'target': instance.name, 'url': reverse('admin:places_establishment_change', args=[instance.pk])},
                 {'role': 'staff'}
@@ -212,34 +204,26 @@ def notify_report_events(sender, instance, created, **kwargs):
 
 @receiver(pre_save, sender=Advertisement)
 def track_ad_status_change(sender, instance, **kwargs):
-    if instance.pk:
-        try:
-            old_instance = Advertisement.objects.get(pk=instance.pk)
-            instance._old_status = old_instance.status
-            instance._old_receipt = old_instance.receipt_image
-        except Advertisement.DoesNotExist:
-            instance._old_status = None
-            instance._old_receipt = None
-    else:
-        instance._old_status = None
-        instance._old_receipt = None
+    old_values = instance.get_tracked_values()
+    instance._old_status = old_values.get('status')
+    instance._old_receipt = old_values.get('receipt_image')
 
 @receiver(post_save, sender=Advertisement)
 def notify_ad_events(sender, instance, created, **kwargs):
     if created:
-        NotificationService.emit_event('NEW_AD_REQUEST', {'title': instance.title, 'url': reverse('admin:management_advertisement_change', args=[instance.pk])}, {'role': 'staff'})
-        if not instance.receipt_image and instance.owner:
-             NotificationService.emit_event('AD_PAYMENT_NEEDED', {'title': instance.title, 'url': f"{reverse('partner_ads')}#ad-{instance.pk}"}, {'user_id': instance.owner.id})
+        _emit_on_commit('NEW_AD_REQUEST', {'title': instance.title, 'url': reverse('admin:management_advertisement_change', args=[instance.pk])}, {'role': 'staff'})
+        if not instance.receipt_image and instance.owner_id:
+             _emit_on_commit('AD_PAYMENT_NEEDED', {'title': instance.title, 'url': f"{reverse('partner_ads')}#ad-{instance.pk}"}, {'user_id': instance.owner_id})
     else:
-        if instance.owner:
+        if instance.owner_id:
             old_status = getattr(instance, '_old_status', None)
             new_status = instance.status
 
             if old_status != new_status:
-                NotificationService.emit_event(
+                _emit_on_commit(
                     'AD_STATUS_CHANGE', 
                     {'title': instance.title, 'status': new_status, 'note': getattr(instance, 'admin_notes', ''), 'url': f"{reverse('partner_ads')}#ad-{instance.pk}", 'image': instance.banner_image.url if instance.banner_image else None},
-                    {'user_id': instance.owner.id}
+                    {'user_id': instance.owner_id}
                 )
                 if new_status == 'active':
                     # Notify Favorites logic (skipped for now)
@@ -249,7 +233,7 @@ def notify_ad_events(sender, instance, created, **kwargs):
             new_receipt = instance.receipt_image
             # Check if receipt is NEWLY uploaded (was None/empty, now has value)
             if not old_receipt and new_receipt:
-                 NotificationService.emit_event('AD_PAYMENT_UPLOADED', {'title': instance.title, 'url': reverse('admin:management_advertisement_change', args=[instance.pk]), 'image': instance.receipt_image.url if instance.receipt_image else None}, {'role': 'staff'})
+                 _emit_on_commit('AD_PAYMENT_UPLOADED', {'title': instance.title, 'url': reverse('admin:management_advertisement_change', args=[instance.pk]), 'image': instance.receipt_image.url if instance.receipt_image else None}, {'role': 'staff'})
 
 @receiver(post_save, sender=Request)
 def notify_request_events(sender, instance, created, **kwargs):
@@ -295,3 +279,17 @@ def process_system_alert(sender, instance, created, **kwargs):
             instance.is_sent = True
             instance.sent_at = timezone.now()
             instance.save(update_fields=['is_sent', 'sent_at'])
+
+
+# ==========================================
+# Realtime Channels
+# ==========================================
+
+@receiver(post_save, sender=Notification)
+def bump_notification_channel(sender, instance, created, **kwargs):
+    """Wake long-polling clients of the recipient (bulk paths bump explicitly)."""
+    from interactions.services.realtime_service import RealtimeService
+    from interactions.services.unread_service import UnreadCountService
+    if created and not instance.is_read:
+        UnreadCountService.incr([instance.recipient_id])
+    RealtimeService.bump(RealtimeService.notifications_channel(instance.recipient_id))
@@ -5,10 +5,14 @@ from .notifications import (
     send_outbox_notification,
     process_pending_notifications,
     cleanup_old_notifications,
+    reconcile_unread_counters,
 )
+from .liveshare_tasks import purge_live_share_pings
 
 __all__ = [
     'send_outbox_notification',
     'process_pending_notifications',
     'cleanup_old_notifications',
+    'reconcile_unread_counters',
+    'purge_live_share_pings',
 ]
@@ -0,0 +1,24 @@
+"""
+Celery Tasks for Live Location Sharing
+"""
+from celery import shared_task
+
+
+@shared_task(name='interactions.purge_live_share_pings')
+def purge_live_share_pings(retention_hours=None):
+    """
+    Deactivate expired live share sessions and bulk-delete their pings
+    once LIVESHARE_PING_RETENTION_HOURS have passed.
+
+    Schedule in settings.py:
+    CELERY_BEAT_SCHEDULE = {
+        'purge-live-share-pings-hourly': {
+            'task': 'interactions.purge_live_share_pings',
+            'schedule': crontab(minute=15),  # Every hour
+        },
+    }
+    """
+    from interactions.services.liveshare_service import LiveShareService
+
+    deactivated, deleted = LiveShareService.purge_expired(retention_hours)
+    return {'deactivated': deactivated, 'deleted': deleted}
@@ -115,30 +115,37 @@ def cleanup_old_notifications():
     """
     Periodic task to cleanup old sent notifications.
     Reads retention_days from NotificationSetting (defaults to 30 if not set).
-    Cleans both NotificationOutbox and Notification records.
+    Cleans both NotificationOutbox and Notification records, in short
+    primary-key chunks via the retention engine.
     """
-    from interactions.notifications.outbox import NotificationOutbox
-    from interactions.models import Notification
-    from management.models import NotificationSetting
-    from datetime import timedelta
-    
-    # P1 Fix G-07: Read from DB setting
-    settings = NotificationSetting.objects.first()
-    days = settings.retention_days if settings else 30
-    
-    cutoff = timezone.now() - timedelta(days=days)
+    from management.services.retention_service import RetentionService
     
-    # Cleanup Outbox
-    deleted_outbox, _ = NotificationOutbox.objects.filter(
-        status='sent',
-        sent_at__lt=cutoff
-    ).delete()
-    
-    # Cleanup read Notifications
-    deleted_notif, _ = Notification.objects.filter(
-        created_at__lt=cutoff,
-        is_read=True
-    ).delete()
-    
-    logger.info(f"Cleaned up {deleted_outbox} outbox, {deleted_notif} notifications (retention: {days} days)")
+    report = RetentionService.run(['notifications.outbox_sent', 'notifications.read'])
+    logger.info(
+        f"Cleaned up {report['notifications.outbox_sent']} outbox, "
+        f"{report['notifications.read']} notifications"
+    )
+    return report
+
+
+@shared_task(name='interactions.reconcile_unread_counters')
+def reconcile_unread_counters(window_minutes=20):
+    """
+    Recount cached unread counters for users with recent notification
+    activity, correcting drift from concurrent increments and recounts.
+
+    Schedule in settings.py:
+    CELERY_BEAT_SCHEDULE = {
+        'reconcile-unread-counters': {
+            'task': 'interactions.reconcile_unread_counters',
+            'schedule': crontab(minute='*/15'),
+        },
+    }
+    """
+    from datetime import timedelta
+    from interactions.services.unread_service import UnreadCountService
 
+    since = timezone.now() - timedelta(minutes=window_minutes)
+    reconciled = UnreadCountService.reconcile(since)
+    logger.info(f"Reconciled unread counters for {reconciled} users")
+    return reconciled
@@ -0,0 +1,172 @@
+"""
+Local Provider Endpoints
+In-process stand-ins for the OneSignal/FCM HTTP APIs and an SMTP server,
+used by the provider tests and benchmark_notification_batch.
+
+Recipients (player ids, tokens, addresses) starting with "invalid" are
+rejected the way the real service would reject them.
+"""
+import json
+import socketserver
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+INVALID_PREFIX = 'invalid'
+
+
+class _ServerThread:
+    """Run a socketserver in a daemon thread for the duration of a with block."""
+
+    server_class = None
+    handler_class = None
+
+    def __init__(self):
+        self.connections = 0
+        self.requests = []
+        self._lock = threading.Lock()
+        self.server = self.server_class(('127.0.0.1', 0), self.handler_class)
+        self.server.daemon_threads = True
+        self.server.owner = self
+        self.host, self.port = self.server.server_address[:2]
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+        self._thread.join()
+
+    def record(self, item=None, connection=False):
+        with self._lock:
+            if connection:
+                self.connections += 1
+            if item is not None:
+                self.requests.append(item)
+
+
+class _PushHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, like the real APIs
+
+    def setup(self):
+        super().setup()
+        self.server.owner.record(connection=True)
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        self.server.owner.record((self.path, payload))
+        if self.path.startswith('/onesignal'):
+            status, response = self._onesignal(payload)
+        else:
+            status, response = self._fcm(payload)
+
+        raw = json.dumps(response).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def _onesignal(self, payload):
+        player_ids = payload.get('include_player_ids') or []
+        invalid = [p for p in player_ids if p.startswith(INVALID_PREFIX)]
+        if len(invalid) == len(player_ids):
+            return 200, {'id': '', 'recipients': 0, 'errors': ['All included players are not subscribed']}
+        response = {'id': str(uuid.uuid4()), 'recipients': len(player_ids) - len(invalid)}
+        if invalid:
+            response['errors'] = {'invalid_player_ids': invalid}
+        return 200, response
+
+    def _fcm(self, payload):
+        tokens = payload.get('registration_ids') or [payload.get('to')]
+        results = [
+            {'error': 'NotRegistered'} if token.startswith(INVALID_PREFIX)
+            else {'message_id': f'0:{uuid.uuid4().hex}'}
+            for token in tokens
+        ]
+        failure = sum(1 for result in results if 'error' in result)
+        return 200, {
+            'multicast_id': uuid.uuid4().int >> 64,
+            'success': len(results) - failure,
+            'failure': failure,
+            'results': results,
+        }
+
+
+class FakePushServer(_ServerThread):
+    """OneSignal (POST /onesignal) and FCM legacy (POST /fcm) endpoints."""
+
+    server_class = ThreadingHTTPServer
+    handler_class = _PushHandler
+
+    @property
+    def onesignal_url(self):
+        return f'http://{self.host}:{self.port}/onesignal'
+
+    @property
+    def fcm_url(self):
+        return f'http://{self.host}:{self.port}/fcm'
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP for smtplib: EHLO, MAIL, RCPT, DATA, RSET, NOOP, QUIT."""
+
+    def reply(self, line):
+        self.wfile.write(f'{line}\r\n'.encode())
+
+    def handle(self):
+        owner = self.server.owner
+        owner.record(connection=True)
+        self.reply('220 localhost ESMTP')
+        recipients = []
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode('utf-8', 'replace').strip()
+            verb = command[:4].upper()
+            if verb in ('EHLO', 'HELO'):
+                self.reply('250 localhost')
+            elif verb == 'MAIL':
+                recipients = []
+                self.reply('250 OK')
+            elif verb == 'RCPT':
+                address = command.split(':', 1)[1].strip().strip('<>')
+                if address.startswith(INVALID_PREFIX):
+                    self.reply('550 No such user')
+                else:
+                    recipients.append(address)
+                    self.reply('250 OK')
+            elif verb == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                chunks = []
+                while True:
+                    data = self.rfile.readline()
+                    if not data or data == b'.\r\n':
+                        break
+                    chunks.append(data)
+                owner.record((recipients, b''.join(chunks)))
+                self.reply('250 OK queued')
+            elif verb == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:  # RSET, NOOP
+                recipients = []
+                self.reply('250 OK')
+
+
+class _SMTPServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+
+
+class FakeSMTPServer(_ServerThread):
+    """SMTP server that records (recipients, raw message) per DATA."""
+
+    server_class = _SMTPServer
+    handler_class = _SMTPHandler
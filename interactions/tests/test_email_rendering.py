@@ -0,0 +1,77 @@
+"""
+Email Rendering Tests
+Compiled template cache and shared-shell personalisation in EmailProvider.
+"""
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.template.loader import get_template, render_to_string
+from django.test import SimpleTestCase
+from django.utils import translation
+from django.utils.html import strip_tags
+
+from interactions.notifications.providers import EmailProvider
+
+User = get_user_model()
+
+
+class EmailRenderTest(SimpleTestCase):
+    def setUp(self):
+        EmailProvider.clear_template_cache()
+        self.addCleanup(EmailProvider.clear_template_cache)
+        self.provider = EmailProvider()
+
+    def _legacy(self, notification_type, title, body, user=None):
+        context = {
+            'title': title,
+            'body': body,
+            'site_name': self.provider.site_name,
+            'site_url': 'https://ibbguide.com',
+        }
+        if user is not None:
+            context.update(self.provider.personal_values(user))
+        html = render_to_string(EmailProvider.TEMPLATES[notification_type], context)
+        return html, strip_tags(html)
+
+    def test_personalised_output_matches_full_render(self):
+        users = [
+            User(pk=1, username='sara', email='sara@example.com'),
+            User(pk=2, username='<b>Tom & "Jerry"</b>', email='tom@example.com'),
+        ]
+        rendered = list(self.provider.render_batch(
+            users + ['guest@example.com'], 'Approved', 'Line one\nLine two', 'partner_approved'
+        ))
+
+        self.assertEqual([email for email, _, _ in rendered], ['sara@example.com', 'tom@example.com', 'guest@example.com'])
+        for user, (_, html, text) in zip(users, rendered):
+            self.assertEqual((html, text), self._legacy('partner_approved', 'Approved', 'Line one\nLine two', user))
+        self.assertEqual(rendered[2][1:], self._legacy('partner_approved', 'Approved', 'Line one\nLine two'))
+        self.assertNotIn('[[ibb-email:', rendered[1][1])
+
+    def test_template_rendered_once_per_recipient_shape(self):
+        template = EmailProvider.get_compiled_template('general')
+        recipients = [User(pk=i, username=f'user{i}', email=f'u{i}@example.com') for i in range(50)]
+        recipients += [f'guest{i}@example.com' for i in range(50)]
+        with patch.object(template, 'render', wraps=template.render) as render:
+            rendered = list(self.provider.render_batch(recipients, 'Hi', 'Body'))
+        self.assertEqual(len(rendered), 100)
+        self.assertEqual(render.call_count, 2)
+        self.assertIn('user7', rendered[7][1])
+
+    def test_compiled_templates_cached_per_language(self):
+        with patch('interactions.notifications.providers.email.get_template', wraps=get_template) as loader:
+            for language in ('ar', 'en', 'ar'):
+                with translation.override(language):
+                    EmailProvider.get_compiled_template('general')
+                    EmailProvider.get_compiled_template('partner_approved')
+        self.assertEqual(loader.call_count, 4)
+
+    def test_missing_template_falls_back_to_plain_text(self):
+        rendered = list(self.provider.render_batch(
+            [User(pk=1, username='sara', email='sara@example.com'), User(pk=2, username='nomail')],
+            'New review', 'Five stars', 'new_review'
+        ))
+        self.assertEqual(rendered, [
+            ('sara@example.com', None, 'New review\n\nFive stars'),
+            ('2', None, None),
+        ])
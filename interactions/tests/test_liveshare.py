@@ -0,0 +1,145 @@
+"""
+Tests for live location sharing ingestion
+اختبارات مشاركة الموقع المباشر
+"""
+import json
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from interactions.models import LiveShareSession, LiveLocationPing
+from interactions.services.liveshare_service import LiveShareService, LiveShareError, simplify
+
+User = get_user_model()
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    LIVESHARE_MIN_DISTANCE_M=25,
+    LIVESHARE_MAX_INTERVAL=60,
+)
+class LiveShareServiceTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='sharer', password='p')
+        self.session = LiveShareSession.objects.create(
+            user=self.user, expires_at=timezone.now() + timedelta(hours=2)
+        )
+        self.token = str(self.session.token)
+        self.start = timezone.now()
+
+    def _ping(self, lat, lon, seconds):
+        return LiveShareService.record(self.token, [(lat, lon, self.start + timedelta(seconds=seconds))],
+                                       now=self.start + timedelta(seconds=seconds))
+
+    def test_stationary_sharer_is_downsampled(self):
+        for i in range(24):  # two minutes of pings every 5s
+            self._ping(13.97, 44.17, i * 5)
+        self.assertEqual(LiveLocationPing.objects.filter(session=self.session).count(), 2)
+        self.assertEqual(LiveShareService.get_latest(self.token)['ts'], self.start + timedelta(seconds=115))
+
+    def test_moving_sharer_is_stored(self):
+        for i in range(5):
+            self._ping(13.97 + i * 0.001, 44.17, i * 5)  # ~111m per step
+        self.assertEqual(LiveLocationPing.objects.filter(session=self.session).count(), 5)
+
+    def test_repeat_pings_need_no_queries(self):
+        self._ping(13.97, 44.17, 0)
+        with CaptureQueriesContext(connection) as ctx:
+            for i in range(1, 10):
+                self._ping(13.97, 44.17, i * 5)
+                LiveShareService.get_latest(self.token)
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_offline_batch_is_simplified_and_bulk_inserted(self):
+        # Straight line north, one point per 5s, with a detour in the middle
+        points = [
+            (13.97 + i * 0.001, 44.17 + (0.002 if i == 10 else 0), self.start + timedelta(seconds=i * 5))
+            for i in range(21)
+        ]
+        with CaptureQueriesContext(connection) as ctx:
+            accepted, stored = LiveShareService.record(self.token, points, now=self.start + timedelta(minutes=5))
+        inserts = [q for q in ctx.captured_queries if q['sql'].startswith('INSERT')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(stored, 5)
+        self.assertEqual(
+            list(LiveLocationPing.objects.filter(session=self.session).order_by('created_at')
+                 .values_list('created_at', flat=True)),
+            [points[i][2] for i in (0, 9, 10, 11, 20)],
+        )
+
+    def test_simplify_keeps_endpoints(self):
+        line = [(0.0, i * 0.001, i) for i in range(50)]
+        self.assertEqual(simplify(line, 5), [line[0], line[-1]])
+
+    def test_expired_session_rejected(self):
+        LiveShareSession.objects.filter(pk=self.session.pk).update(expires_at=timezone.now() - timedelta(minutes=1))
+        with self.assertRaisesMessage(LiveShareError, 'Expired'):
+            self._ping(13.97, 44.17, 0)
+        self.session.refresh_from_db()
+        self.assertFalse(self.session.is_active)
+
+    def test_purge_expired(self):
+        self._ping(13.97, 44.17, 0)
+        old = LiveShareSession.objects.create(user=self.user, expires_at=timezone.now() - timedelta(days=2))
+        LiveLocationPing.objects.bulk_create([
+            LiveLocationPing(session=old, latitude=13.9, longitude=44.1) for _ in range(30)
+        ])
+        deactivated, deleted = LiveShareService.purge_expired(retention_hours=24, batch_size=7)
+        self.assertEqual((deactivated, deleted), (1, 30))
+        self.assertEqual(LiveLocationPing.objects.filter(session=self.session).count(), 1)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class LiveShareViewsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='sharer', password='p')
+        self.session = LiveShareSession.objects.create(
+            user=self.user, expires_at=timezone.now() + timedelta(hours=2)
+        )
+        self.token = str(self.session.token)
+
+    def test_form_ping_and_latest(self):
+        response = self.client.post(reverse('live_share_ping'), {'token': self.token, 'lat': '13.97', 'lon': '44.17'})
+        self.assertTrue(response.json()['success'])
+        latest = self.client.get(reverse('live_share_latest', args=[self.token])).json()
+        self.assertEqual((latest['lat'], latest['lon']), (13.97, 44.17))
+
+    def test_json_batch(self):
+        LiveShareSession.objects.filter(pk=self.session.pk).update(created_at=timezone.now() - timedelta(minutes=5))
+        now_ms = timezone.now().timestamp() * 1000
+        payload = {'token': self.token, 'points': [
+            {'lat': 13.97, 'lon': 44.17, 'ts': now_ms - 10000},
+            {'lat': 13.98, 'lon': 44.17, 'ts': now_ms},
+        ]}
+        response = self.client.post(reverse('live_share_ping'), json.dumps(payload), content_type='application/json')
+        self.assertEqual(response.json()['stored'], 2)
+
+    def test_invalid_input(self):
+        response = self.client.post(reverse('live_share_ping'), {'token': self.token, 'lat': 'x', 'lon': '44'})
+        self.assertFalse(response.json()['success'])
+        response = self.client.post(reverse('live_share_ping'), {'token': 'nope', 'lat': '1', 'lon': '2'})
+        self.assertEqual(response.json()['error'], 'Invalid Session')
+        self.assertEqual(self.client.get(reverse('live_share_latest', args=['nope'])).status_code, 404)
+
+    def test_malformed_batch_is_rejected(self):
+        for points in ({'lat': 1, 'lon': 2}, 42, 'abc', [1, 2]):
+            with self.subTest(points=points):
+                response = self.client.post(
+                    reverse('live_share_ping'), json.dumps({'token': self.token, 'points': points}),
+                    content_type='application/json',
+                )
+                self.assertEqual(response.status_code, 400)
+
+    def test_stop_clears_latest(self):
+        self.client.post(reverse('live_share_ping'), {'token': self.token, 'lat': '13.97', 'lon': '44.17'})
+        self.client.force_login(self.user)
+        self.client.post(reverse('live_share_stop', args=[self.token]))
+        self.assertIsNone(cache.get(LiveShareService.LATEST_KEY.format(token=self.token)))
@@ -0,0 +1,157 @@
+"""
+Notification Preference Tests
+Compiled bitmask, default resolution without rows and chunked recipient filtering.
+"""
+from datetime import datetime, timedelta
+from importlib import import_module
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from interactions.models import Notification, NotificationPreference
+from interactions.notifications.notification_service import NotificationService
+
+User = get_user_model()
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class NotificationPreferenceMaskTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.users = User.objects.bulk_create([User(username=f'u{i}') for i in range(6)])
+        self.ids = [user.pk for user in self.users]
+
+    def _prefs(self, user, **fields):
+        return NotificationPreference.objects.create(user=user, **fields)
+
+    def test_compiled_mask_matches_field_checks(self):
+        cases = [
+            {},
+            {'enable_all': False},
+            {'disabled_types': ['new_review']},
+            {'disabled_categories': ['ads', 'reviews']},
+            {'enable_push': False, 'enable_email': True},
+        ]
+        types = ['new_review', 'ad_approved', 'weather_alert', 'general', 'APPROVAL']
+        for user, fields in zip(self.users, cases):
+            prefs = self._prefs(user, **fields)
+            for notification_type in types:
+                with self.subTest(fields=fields, type=notification_type):
+                    self.assertEqual(
+                        NotificationPreference.is_enabled_for(user, notification_type),
+                        prefs.is_notification_enabled(notification_type),
+                    )
+
+    def test_missing_preferences_use_defaults_without_rows(self):
+        user = self.users[0]
+        self.assertTrue(NotificationPreference.is_enabled_for(user, 'new_review'))
+        self.assertTrue(NotificationPreference.is_enabled_for(user, 'new_review', 'push'))
+        self.assertFalse(NotificationPreference.is_enabled_for(user, 'new_review', 'email'))
+        self.assertFalse(NotificationPreference.get_for_user(user).pk)
+        self.assertFalse(NotificationPreference.objects.exists())
+
+        # Cached per user, including the defaults
+        with self.assertNumQueries(0):
+            NotificationPreference.is_enabled_for(user, 'ad_approved')
+
+    def test_save_refreshes_cache(self):
+        user = self.users[0]
+        self.assertTrue(NotificationPreference.is_enabled_for(user, 'new_review'))
+        with self.captureOnCommitCallbacks(execute=True):
+            prefs = NotificationPreference.get_for_user(user)
+            prefs.disabled_types = ['new_review']
+            prefs.save()
+        self.assertFalse(NotificationPreference.is_enabled_for(user, 'new_review'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            prefs.disabled_types = []
+            prefs.save(update_fields=['disabled_types'])
+        prefs.refresh_from_db()
+        self.assertEqual(prefs.compiled_mask, NotificationPreference.DEFAULT_MASK)
+        self.assertTrue(NotificationPreference.is_enabled_for(user, 'new_review'))
+
+    def test_types_added_later_are_allowed(self):
+        prefs = self._prefs(self.users[0], disabled_types=['new_review'], enable_email=True)
+        appended = dict(NotificationPreference.TYPE_BITS, new_type=1 << 62)
+        with patch.object(NotificationPreference, 'TYPE_BITS', appended):
+            self.assertTrue(NotificationPreference.is_enabled_for(self.users[0], 'new_type'))
+            self.assertTrue(NotificationPreference.is_enabled_for(self.users[0], 'new_type', 'email'))
+            self.assertEqual(
+                NotificationPreference.filter_recipients(self.ids[:2], 'new_type'), self.ids[:2]
+            )
+        self.assertFalse(NotificationPreference.is_enabled_for(prefs.user, 'new_review'))
+
+    def test_migration_compiles_the_same_mask(self):
+        migration = import_module('interactions.migrations.0040_notification_preference_mask')
+        cases = [
+            {},
+            {'enable_all': False, 'enable_sms': True},
+            {'disabled_types': ['new_review', 'general'], 'disabled_categories': {'ads': True}},
+            {'quiet_hours_enabled': True, 'quiet_start': datetime.now().time(),
+             'quiet_end': datetime.now().time()},
+        ]
+        for user, fields in zip(self.users, cases):
+            with self.subTest(fields=fields):
+                prefs = self._prefs(user, **fields)
+                self.assertEqual(migration.compile_mask(prefs), prefs.compiled_mask)
+
+    def test_filter_recipients(self):
+        self._prefs(self.users[1], enable_all=False)
+        self._prefs(self.users[2], disabled_categories=['reviews'])
+        self._prefs(self.users[3], enable_push=False, enable_email=True)
+        self._prefs(self.users[4], enable_email=True)
+
+        with self.assertNumQueries(1):
+            in_app = NotificationPreference.filter_recipients(self.ids, 'new_review')
+        self.assertEqual(in_app, [self.ids[0], self.ids[3], self.ids[4], self.ids[5]])
+        self.assertEqual(
+            NotificationPreference.filter_recipients(self.ids, 'new_review', 'push'),
+            [self.ids[0], self.ids[4], self.ids[5]],
+        )
+        self.assertEqual(
+            NotificationPreference.filter_recipients(self.ids, 'new_review', 'email'),
+            [self.ids[3], self.ids[4]],
+        )
+        # Other categories are unaffected by user 2's setting
+        self.assertIn(self.ids[2], NotificationPreference.filter_recipients(self.ids, 'ad_approved'))
+
+    def test_filter_recipients_quiet_hours(self):
+        now = datetime.now()
+        self._prefs(
+            self.users[0], quiet_hours_enabled=True,
+            quiet_start=(now - timedelta(hours=1)).time(), quiet_end=(now + timedelta(hours=1)).time(),
+        )
+        self._prefs(
+            self.users[1], quiet_hours_enabled=True,
+            quiet_start=(now + timedelta(hours=2)).time(), quiet_end=(now + timedelta(hours=3)).time(),
+        )
+        # Windows crossing midnight are handled by _in_quiet_hours
+        eligible = NotificationPreference.filter_recipients(self.ids[:2], 'general')
+        self.assertEqual(eligible, [self.ids[1]])
+
+    def test_filter_recipients_chunks(self):
+        self._prefs(self.users[5], enable_all=False)
+        with CaptureQueriesContext(connection) as ctx:
+            eligible = NotificationPreference.filter_recipients(self.ids, 'general', chunk_size=2)
+        self.assertEqual(len(ctx.captured_queries), 3)
+        self.assertEqual(eligible, self.ids[:5])
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class DispatchPreferenceTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.users = User.objects.bulk_create([User(username=f'd{i}') for i in range(50)])
+        NotificationPreference.objects.create(user=self.users[0], enable_all=False)
+
+    def test_dispatch_checks_preferences_without_creating_rows(self):
+        NotificationService._dispatch(
+            self.users, 'Title', 'Message', '/', 'medium', 'WEATHER_ALERT', {}
+        )
+        self.assertEqual(Notification.objects.count(), 49)
+        self.assertFalse(Notification.objects.filter(recipient=self.users[0]).exists())
+        self.assertEqual(NotificationPreference.objects.count(), 1)
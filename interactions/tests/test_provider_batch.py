@@ -0,0 +1,138 @@
+"""
+Provider Batch Sending Tests
+send_batch against local OneSignal/FCM HTTP and SMTP servers.
+"""
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from interactions.notifications.providers import (
+    EmailProvider, FCMProvider, OneSignalProvider, ProviderError,
+)
+from interactions.tests.local_servers import FakePushServer, FakeSMTPServer
+
+User = get_user_model()
+
+
+@override_settings(ONESIGNAL_APP_ID='app', ONESIGNAL_REST_API_KEY='key', FCM_SERVER_KEY='key')
+class PushBatchTest(SimpleTestCase):
+    def setUp(self):
+        self.server = FakePushServer().__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+
+    def _onesignal(self, batch_size=2000):
+        provider = OneSignalProvider()
+        provider.API_URL = self.server.onesignal_url
+        provider.BATCH_SIZE = batch_size
+        return provider
+
+    def _fcm(self, batch_size=1000):
+        provider = FCMProvider()
+        provider.API_URL = self.server.fcm_url
+        provider.BATCH_SIZE = batch_size
+        return provider
+
+    def test_onesignal_chunks_player_ids(self):
+        players = [f'player-{i}' for i in range(5)] + ['invalid-1', 'player-0']
+        results = self._onesignal(batch_size=2).send_batch(players, 'Hi', 'Body', {'url': '/x'})
+
+        self.assertEqual(list(results), players[:6])
+        self.assertEqual(len(self.server.requests), 3)
+        self.assertEqual(self.server.connections, 1)
+        path, payload = self.server.requests[0]
+        self.assertEqual(payload['include_player_ids'], ['player-0', 'player-1'])
+        self.assertEqual(payload['data'], {'url': '/x'})
+
+        self.assertTrue(all(results[p].success for p in players[:5]))
+        # One notification id per request
+        self.assertEqual(results['player-0'].message_id, results['player-1'].message_id)
+        self.assertNotEqual(results['player-1'].message_id, results['player-2'].message_id)
+        self.assertFalse(results['invalid-1'].success)
+        self.assertFalse(results['invalid-1'].retriable)
+
+    def test_onesignal_rejected_request_fails_its_chunk_only(self):
+        results = self._onesignal(batch_size=2).send_batch(
+            ['invalid-1', 'invalid-2', 'player-1'], 'Hi', 'Body'
+        )
+        self.assertFalse(results['invalid-1'].success)
+        self.assertIn('not subscribed', results['invalid-2'].error)
+        self.assertTrue(results['player-1'].success)
+
+    def test_fcm_multicast_maps_results_per_token(self):
+        tokens = ['token-a', 'invalid-b', 'token-c']
+        results = self._fcm(batch_size=2).send_batch(tokens, 'Hi', 'Body')
+
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual(self.server.requests[0][1]['registration_ids'], ['token-a', 'invalid-b'])
+        self.assertTrue(results['token-a'].success)
+        self.assertTrue(results['token-a'].message_id.startswith('0:'))
+        self.assertEqual(results['invalid-b'].error, 'NotRegistered')
+        self.assertFalse(results['invalid-b'].retriable)
+        self.assertTrue(results['token-c'].success)
+
+    def test_unreachable_endpoint_is_reported_per_recipient(self):
+        provider = self._fcm()
+        provider.API_URL = 'http://127.0.0.1:9/fcm'
+        results = provider.send_batch(['token-a', 'token-b'], 'Hi', 'Body')
+        self.assertFalse(any(result.success for result in results.values()))
+        self.assertTrue(all(result.retriable for result in results.values()))
+
+    @override_settings(FCM_SERVER_KEY='')
+    def test_missing_credentials_raise(self):
+        with self.assertRaises(ProviderError):
+            self._fcm().send_batch(['token-a'], 'Hi', 'Body')
+
+
+class EmailBatchTest(TestCase):
+    def setUp(self):
+        self.server = FakeSMTPServer().__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+        self.smtp = override_settings(
+            EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend',
+            EMAIL_HOST=self.server.host, EMAIL_PORT=self.server.port,
+            EMAIL_USE_TLS=False, EMAIL_USE_SSL=False, EMAIL_HOST_USER='', EMAIL_HOST_PASSWORD='',
+        )
+
+    def test_single_connection_per_recipient_results(self):
+        user = User.objects.create_user(username='sara', email='sara@example.com', password='p')
+        no_email = User.objects.create_user(username='noemail', password='p')
+        recipients = ['a@example.com', user, 'invalid@example.com', no_email, 'a@example.com']
+
+        with self.smtp:
+            results = EmailProvider().send_batch(
+                recipients, 'Welcome', 'Hello there', notification_type='partner_approved'
+            )
+
+        self.assertEqual(self.server.connections, 1)
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual(list(results), ['a@example.com', 'sara@example.com', 'invalid@example.com', str(no_email.pk)])
+        self.assertTrue(results['a@example.com'].success)
+        self.assertTrue(results['sara@example.com'].message_id.startswith('<'))
+        self.assertFalse(results['invalid@example.com'].success)
+        self.assertFalse(results['invalid@example.com'].retriable)
+        self.assertEqual(results[str(no_email.pk)].error, 'No email address registered')
+
+        delivered = dict((rcpts[0], raw) for rcpts, raw in self.server.requests)
+        self.assertIn(b'text/html', delivered['sara@example.com'])
+
+    def test_personalised_context_with_locmem_backend(self):
+        user = User.objects.create_user(username='sara', email='sara@example.com', password='p')
+        results = EmailProvider().send_bulk([user, 'b@example.com'], 'Update', 'Body text')
+
+        self.assertTrue(all(result.success for result in results.values()))
+        self.assertEqual(len(mail.outbox), 2)
+        html = {m.to[0]: m.alternatives[0][0] for m in mail.outbox}
+        self.assertIn('sara', html['sara@example.com'])
+        self.assertNotIn('sara', html['b@example.com'])
+
+    def test_base_signature_passes_data_positionally(self):
+        # Callers written against BaseProvider.send_batch pass data fourth
+        results = EmailProvider().send_batch(['a@example.com'], 'Hi', 'Body', {'url': '/x'})
+        self.assertTrue(results['a@example.com'].success)
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_unreachable_server_fails_every_recipient(self):
+        with self.smtp, override_settings(EMAIL_PORT=9):
+            results = EmailProvider().send_batch(['a@example.com', 'b@example.com'], 'Hi', 'Body')
+        self.assertEqual(len(results), 2)
+        self.assertTrue(all(not r.success and r.retriable for r in results.values()))
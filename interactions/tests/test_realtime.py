@@ -0,0 +1,172 @@
+"""
+Tests for versioned channels and long-polling
+اختبارات قنوات التحديث الفوري
+"""
+import threading
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from interactions.models import Notification, LiveShareSession
+from interactions.services.realtime_service import RealtimeService
+from interactions.services.liveshare_service import LiveShareService
+
+User = get_user_model()
+
+REALTIME = dict(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    REALTIME_LONGPOLL_ENABLED=True,
+    REALTIME_LONGPOLL_TIMEOUT=0.05,
+    REALTIME_POLL_INTERVAL=0.01,
+)
+
+
+@override_settings(**REALTIME)
+class RealtimeServiceTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_returns_immediately_when_version_differs(self):
+        RealtimeService.bump('chan')
+        self.assertEqual(RealtimeService.wait('chan', None), (1, True))
+        self.assertEqual(RealtimeService.wait('chan', 0), (1, True))
+
+    def test_times_out_when_unchanged(self):
+        start = time.monotonic()
+        self.assertEqual(RealtimeService.wait('chan', 0), (0, True))
+        self.assertGreaterEqual(time.monotonic() - start, 0.05)
+        self.assertEqual(RealtimeService._waiters, 0)
+
+    def test_wakes_on_bump(self):
+        timer = threading.Timer(0.05, RealtimeService.bump, args=['chan'])
+        timer.start()
+        start = time.monotonic()
+        version, waited = RealtimeService.wait('chan', 0, timeout=5)
+        timer.join()
+        self.assertEqual((version, waited), (1, True))
+        self.assertLess(time.monotonic() - start, 2)
+
+    @override_settings(REALTIME_MAX_WAITERS=1)
+    def test_waiters_are_capped_per_process(self):
+        waiter = threading.Thread(target=RealtimeService.wait, args=['chan', 0], kwargs={'timeout': 0.5})
+        waiter.start()
+        time.sleep(0.1)
+        start = time.monotonic()
+        self.assertEqual(RealtimeService.wait('chan', 0, timeout=5), (0, False))
+        self.assertLess(time.monotonic() - start, 0.2)
+        waiter.join()
+        self.assertEqual(RealtimeService._waiters, 0)
+        self.assertGreater(RealtimeService.retry_ms(False), 0)
+
+    @override_settings(REALTIME_LONGPOLL_ENABLED=False)
+    def test_sync_workers_short_poll(self):
+        start = time.monotonic()
+        self.assertEqual(RealtimeService.wait('chan', 0, timeout=5), (0, False))
+        self.assertLess(time.monotonic() - start, 0.1)
+        RealtimeService.bump('chan')
+        self.assertEqual(RealtimeService.wait('chan', 0), (1, True))
+
+
+@override_settings(**REALTIME)
+class NotificationPollTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='viewer', password='p')
+        self.client.force_login(self.user)
+
+    def _notification_queries(self, ctx):
+        return [q for q in ctx.captured_queries if 'interactions_notification' in q['sql']]
+
+    def test_idle_clients_do_not_query_notifications(self):
+        version = self.client.get(reverse('notifications_poll')).json()['v']
+
+        with CaptureQueriesContext(connection) as legacy:
+            for _ in range(10):
+                self.client.get(reverse('notifications_snapshot'))
+        with CaptureQueriesContext(connection) as polling:
+            for _ in range(10):
+                data = self.client.get(reverse('notifications_poll'), {'v': version}).json()
+                self.assertFalse(data['changed'])
+
+        self.assertGreaterEqual(len(self._notification_queries(legacy)), 10)
+        self.assertEqual(len(self._notification_queries(polling)), 0)
+        self.assertLess(len(polling.captured_queries), len(legacy.captured_queries))
+
+    def test_new_notification_changes_version(self):
+        version = self.client.get(reverse('notifications_poll')).json()['v']
+        Notification.objects.create(recipient=self.user, notification_type='general', title='t', message='m')
+        data = self.client.get(reverse('notifications_poll'), {'v': version}).json()
+        self.assertTrue(data['changed'])
+        self.assertEqual(data['retry'], 0)
+
+    def test_mark_all_read_changes_version(self):
+        from interactions.notifications import NotificationService
+        Notification.objects.create(recipient=self.user, notification_type='general', title='t', message='m')
+        version = RealtimeService.version(RealtimeService.notifications_channel(self.user.pk))
+        NotificationService.mark_all_as_read(self.user)
+        self.assertNotEqual(RealtimeService.version(RealtimeService.notifications_channel(self.user.pk)), version)
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    SESSION_ENGINE='django.contrib.sessions.backends.db',
+)
+class IdleClientCostTest(TestCase):
+    """Default (short-poll) configuration, with database sessions as in production."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='idle', password='p')
+        self.client.force_login(self.user)
+
+    def _queries(self, name, params=None):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse(name), params or {})
+        return len(ctx.captured_queries), response
+
+    def test_idle_client_queries_per_minute(self):
+        version = self.client.get(reverse('notifications_poll')).json()['v']
+        queries, response = self._queries('notifications_poll', {'v': version})
+        data = response.json()
+        self.assertFalse(data['changed'])
+        self.assertGreaterEqual(data['retry'], 30000)
+        polling_per_minute = queries * 60000 / data['retry']
+
+        # Before: the badge fetched an uncached unread count every 30s
+        cache.clear()
+        legacy_queries, _ = self._queries('unread_count')
+        legacy_per_minute = legacy_queries * 60000 / 30000
+
+        self.assertLess(polling_per_minute, legacy_per_minute)
+
+
+@override_settings(**REALTIME)
+class LatestLocationPollTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create_user(username='sharer', password='p')
+        self.session = LiveShareSession.objects.create(user=user, expires_at=timezone.now() + timedelta(hours=1))
+        self.token = str(self.session.token)
+        self.url = reverse('live_share_latest', args=[self.token])
+
+    def test_idle_viewers_make_no_queries(self):
+        LiveShareService.record(self.token, [(13.97, 44.17, timezone.now())])
+        version = self.client.get(self.url).json()['v']
+        with CaptureQueriesContext(connection) as ctx:
+            for _ in range(10):
+                self.assertEqual(self.client.get(self.url, {'v': version}).json()['v'], version)
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_movement_changes_version(self):
+        version = self.client.get(self.url).json()['v']
+        LiveShareService.record(self.token, [(13.97, 44.17, timezone.now())])
+        data = self.client.get(self.url, {'v': version}).json()
+        self.assertNotEqual(data['v'], version)
+        self.assertEqual(data['lat'], 13.97)
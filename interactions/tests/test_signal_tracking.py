@@ -0,0 +1,187 @@
+"""
+Signal Field-Tracking Tests
+Diffs in interactions.signals use FieldTrackerMixin snapshots (no re-fetch)
+and notification side effects run on commit.
+"""
+from functools import partial
+from unittest.mock import patch
+
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.test import RequestFactory, TestCase
+
+from interactions.models import Notification
+from places.admin import EstablishmentAdmin
+from places.models import Category, Establishment
+from places.services.establishment_service import EstablishmentService
+from users.models import PartnerProfile
+
+User = get_user_model()
+
+
+class QueryCounter:
+    """Count queries without CaptureQueriesContext's 9000-query cap."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def _emitted(callbacks):
+    """Event names of deferred NotificationService.emit_event callbacks."""
+    return [callback.args[0] for callback in callbacks if isinstance(callback, partial)]
+
+
+def count_queries(fn):
+    counter = QueryCounter()
+    with connection.execute_wrapper(counter):
+        fn()
+    return counter.count
+
+
+class FieldTrackerTest(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='p')
+        self.category = Category.objects.create(name='Hotels')
+        self.place = Establishment.objects.create(
+            name='Grand Hotel', category=self.category, owner=self.owner, approval_status='pending'
+        )
+
+    def test_snapshot_from_db_and_after_save(self):
+        place = Establishment.objects.get(pk=self.place.pk)
+        self.assertEqual(place.get_tracked_values()['license_status'], 'Pending')
+        place.license_status = 'Valid'
+        self.assertTrue(place.has_changed('license_status'))
+        place.save()
+        self.assertFalse(place.has_changed('license_status'))
+        self.assertEqual(place.get_tracked_values()['license_status'], 'Valid')
+
+    def test_in_place_json_mutation_is_detected(self):
+        place = Establishment.objects.get(pk=self.place.pk)
+        place.pending_updates['name'] = 'New name'
+        self.assertTrue(place.has_changed('pending_updates'))
+        self.assertEqual(place.get_tracked_values()['pending_updates'], {})
+
+    def test_deferred_fields_are_fetched_once(self):
+        place = Establishment.objects.only('pk', 'name').get(pk=self.place.pk)
+        self.assertEqual(count_queries(place.get_tracked_values), 1)
+        self.assertEqual(count_queries(place.get_tracked_values), 0)
+
+    def test_loaded_instance_saves_without_refetch(self):
+        loaded = Establishment.objects.get(pk=self.place.pk)
+        untracked = Establishment.objects.get(pk=self.place.pk)
+        del untracked._tracked_snapshot  # e.g. an instance built by hand
+
+        loaded.license_status = untracked.license_status = 'Valid'
+        tracked_queries = count_queries(loaded.save)
+        with transaction.atomic():
+            fallback_queries = count_queries(untracked.save)
+            transaction.set_rollback(True)
+        self.assertEqual(fallback_queries - tracked_queries, 1)
+
+
+class DeferredSideEffectsTest(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username='admin', password='p', email='a@example.com')
+        self.owner = User.objects.create_user(username='owner', password='p')
+        self.place = Establishment.objects.create(
+            name='Grand Hotel', category=Category.objects.create(name='Hotels'),
+            owner=self.owner, approval_status='pending'
+        )
+
+    def _owner_notifications(self):
+        return Notification.objects.filter(recipient=self.owner)
+
+    def test_license_change_notifies_after_commit(self):
+        place = Establishment.objects.get(pk=self.place.pk)
+        with self.captureOnCommitCallbacks() as callbacks:
+            place.license_status = 'Valid'
+            place.save()
+            self.assertFalse(self._owner_notifications().exists())
+        self.assertTrue(callbacks)
+
+        for callback in callbacks:
+            callback()
+        self.assertTrue(self._owner_notifications().exists())
+
+    def test_rolled_back_change_sends_nothing(self):
+        place = Establishment.objects.get(pk=self.place.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                place.is_active = False
+                place.save()
+                transaction.set_rollback(True)
+        self.assertFalse(self._owner_notifications().exists())
+
+    def test_suspend(self):
+        place = Establishment.objects.get(pk=self.place.pk)
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            EstablishmentService.suspend(place, self.admin, 'Inspection')
+        self.assertIn('ESTABLISHMENT_SUSPENDED', _emitted(callbacks))
+        self.assertTrue(self._owner_notifications().exists())
+
+    @patch('users.models.Role.objects.get_or_create')
+    def test_partner_status_change(self, _role):
+        profile = PartnerProfile.objects.create(user=self.owner, status='pending')
+        profile = PartnerProfile.objects.get(pk=profile.pk)
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            profile.status = 'needs_info'
+            queries = count_queries(profile.save)
+        self.assertEqual(_emitted(callbacks), ['PARTNER_STATUS_CHANGE'])
+        self.assertTrue(self._owner_notifications().exists())
+
+        # Saving again without a status change re-fetches nothing and emits nothing
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.assertLessEqual(count_queries(profile.save), queries)
+        self.assertEqual(_emitted(callbacks), [])
+
+
+class BulkAdminActionQueryTest(TestCase):
+    """Per-row query cost of admin bulk actions does not include a re-fetch."""
+
+    ROWS = 1000
+
+    def setUp(self):
+        self.admin_user = User.objects.create_superuser(username='admin', password='p', email='a@example.com')
+        owner = User.objects.create_user(username='owner', password='p')
+        category = Category.objects.create(name='Hotels')
+        with transaction.atomic():
+            for i in range(self.ROWS):
+                Establishment.objects.create(
+                    name=f'Place {i}', category=category, owner=owner, approval_status='pending'
+                )
+        self.model_admin = EstablishmentAdmin(Establishment, admin.site)
+        self.request = RequestFactory().post('/admin/places/establishment/')
+        self.request.user = self.admin_user
+
+    def _run_action(self, action, pks):
+        queryset = Establishment.objects.filter(pk__in=pks)
+        with patch.object(self.model_admin, 'message_user'):
+            return count_queries(lambda: getattr(self.model_admin, action)(self.request, queryset))
+
+    def test_bulk_approve_and_reject_scale_linearly(self):
+        pks = list(Establishment.objects.order_by('pk').values_list('pk', flat=True))
+        self._run_action('approve_establishments', pks[:1])  # warm per-process caches
+        single = self._run_action('approve_establishments', pks[1:2])
+        per_row = single - 1  # one query selects the rows
+        bulk = self._run_action('approve_establishments', pks[2:])
+        self.assertEqual(bulk, 1 + per_row * (self.ROWS - 2))
+
+        # Rejecting an instance without a snapshot costs exactly one more query
+        def reject_cost(instance):
+            with transaction.atomic():
+                cost = count_queries(lambda: instance.reject(by_admin=self.admin_user, reason='x'))
+                transaction.set_rollback(True)
+            return cost
+
+        tracked = reject_cost(Establishment.objects.get(pk=pks[0]))
+        untracked = Establishment.objects.get(pk=pks[0])
+        del untracked._tracked_snapshot
+        self.assertEqual(reject_cost(untracked) - tracked, 1)
+
+        rejected = self._run_action('reject_establishments', pks)
+        self.assertEqual(rejected, 1 + tracked * self.ROWS)
@@ -0,0 +1,131 @@
+"""
+Tests for the cached unread notification counter
+اختبارات عداد الإشعارات غير المقروءة
+"""
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from interactions.models import Notification
+from interactions.services.unread_service import UnreadCountService
+
+User = get_user_model()
+
+
+def make_notification(user, **kwargs):
+    return Notification.objects.create(
+        recipient=user, notification_type='general', title='t', message='m', **kwargs
+    )
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class UnreadCountServiceTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='reader', password='p')
+        for _ in range(3):
+            make_notification(self.user)
+        make_notification(self.user, is_read=True)
+
+    def test_loaded_once_then_served_from_cache(self):
+        self.assertEqual(UnreadCountService.get(self.user), 3)
+        with CaptureQueriesContext(connection) as ctx:
+            for _ in range(10):
+                self.assertEqual(UnreadCountService.get(self.user.pk), 3)
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_create_increments(self):
+        UnreadCountService.get(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            make_notification(self.user)
+        self.assertEqual(cache.get(UnreadCountService.KEY.format(user_id=self.user.pk)), 4)
+
+    @patch('interactions.notifications.notification_service.NotificationService.enqueue_notification')
+    def test_fan_out_increments_each_recipient(self, _enqueue):
+        from interactions.notifications.notification_service import NotificationService
+        staff = [User.objects.create_user(username=f'staff{i}', password='p', is_staff=True) for i in range(3)]
+        for member in staff:
+            UnreadCountService.get(member)
+        with self.captureOnCommitCallbacks(execute=True):
+            NotificationService.emit_event('STAFF_ALERT', {'title': 't', 'message': 'm'}, {'role': 'staff'})
+        for member in staff:
+            self.assertEqual(cache.get(UnreadCountService.KEY.format(user_id=member.pk)), 1)
+
+    def test_per_item_read_decrements(self):
+        UnreadCountService.get(self.user)
+        notification = Notification.objects.filter(recipient=self.user, is_read=False).first()
+        with self.captureOnCommitCallbacks(execute=True):
+            notification.mark_as_read()
+            notification.mark_as_read()  # already read: no second decrement
+        self.assertEqual(UnreadCountService.get(self.user), 2)
+
+    def test_mark_all_resets(self):
+        from interactions.notifications.notification_service import NotificationService
+        UnreadCountService.get(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            NotificationService.mark_all_as_read(self.user)
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(UnreadCountService.get(self.user), 0)
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_counter_never_goes_negative(self):
+        cache.set(UnreadCountService.KEY.format(user_id=self.user.pk), 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            UnreadCountService.decr(self.user.pk)
+        # Dropped and recounted from the database
+        self.assertEqual(UnreadCountService.get(self.user), 3)
+
+    def test_reconcile_fixes_drift(self):
+        cache.set(UnreadCountService.KEY.format(user_id=self.user.pk), 42)
+        self.assertEqual(UnreadCountService.reconcile(timezone.now() - timedelta(minutes=5)), 1)
+        self.assertEqual(UnreadCountService.get(self.user), 3)
+
+    def test_concurrent_reads_and_marks(self):
+        """Two requests marking the same notification decrement the counter once."""
+        from interactions.notifications.notification_service import NotificationService
+        UnreadCountService.get(self.user)
+        unread = list(Notification.objects.filter(recipient=self.user, is_read=False).values_list('pk', flat=True))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            for pk in unread[:2]:
+                # Both requests loaded the row while it was still unread
+                first, second = Notification.objects.get(pk=pk), Notification.objects.get(pk=pk)
+                self.assertTrue(first.mark_as_read())
+                self.assertFalse(NotificationService.mark_as_read(second))
+        self.assertEqual(UnreadCountService.get(self.user), 1)
+        self.assertEqual(UnreadCountService.get(self.user), Notification.objects.filter(
+            recipient=self.user, is_read=False
+        ).count())
+
+    def test_mark_all_racing_with_recount_is_reconciled(self):
+        """A recount that started before mark-all can't leave a stale counter past reconciliation."""
+        key = UnreadCountService.KEY.format(user_id=self.user.pk)
+        stale = Notification.objects.filter(recipient=self.user, is_read=False).count()
+        with self.captureOnCommitCallbacks(execute=True):
+            Notification.objects.filter(recipient=self.user).update(is_read=True, read_at=timezone.now())
+            UnreadCountService.reset(self.user.pk)
+        cache.set(key, stale)  # the slow reader's write lands last
+        UnreadCountService.reconcile(timezone.now() - timedelta(minutes=5))
+        self.assertEqual(UnreadCountService.get(self.user), 0)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class UnreadCountViewTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='reader', password='p')
+        make_notification(self.user)
+        self.client.force_login(self.user)
+
+    def test_unread_count_view_uses_counter(self):
+        self.assertEqual(self.client.get(reverse('unread_count')).json()['count'], 1)
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.client.get(reverse('unread_count')).json()['count'], 1)
+        self.assertFalse([q for q in ctx.captured_queries if 'interactions_notification' in q['sql']])
@@ -7,6 +7,9 @@ from datetime import timedelta
 from .models import LiveShareSession, LiveLocationPing
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
+from .services.liveshare_service import LiveShareService, LiveShareError
+from .services.realtime_service import RealtimeService
+import json
 
 class StartShareView(LoginRequiredMixin, View):
     def post(self, request):
@@ -27,30 +30,42 @@ class StopShareView(LoginRequiredMixin, View):
         session = get_object_or_404(LiveShareSession, token=token, user=request.user)
         session.is_active = False
         session.save()
+        LiveShareService.forget(session.token)
         return JsonResponse({'success': True})
 
 @method_decorator(csrf_exempt, name='dispatch')
 class PingView(View):
+    """
+    Accepts a single point as form data (token, lat, lon[, ts]) or a JSON
+    batch from clients that were offline:
+    {"token": "...", "points": [{"lat": .., "lon": .., "ts": ..}, ...]}
+    """
     def post(self, request):
-        token = request.POST.get('token')
-        lat = request.POST.get('lat')
-        lon = request.POST.get('lon')
-
         try:
-            session = LiveShareSession.objects.get(token=token, is_active=True)
-            if timezone.now() > session.expires_at:
-                session.is_active = False
-                session.save()
-                return JsonResponse({'success': False, 'error': 'Expired'})
-            
-            LiveLocationPing.objects.create(
-                session=session,
-                latitude=lat,
-                longitude=lon
-            )
-            return JsonResponse({'success': True})
-        except LiveShareSession.DoesNotExist:
-            return JsonResponse({'success': False, 'error': 'Invalid Session'})
+            if request.content_type == 'application/json':
+                try:
+                    payload = json.loads(request.body)
+                    token = payload.get('token')
+                    raw_points = payload.get('points') or []
+                    if not isinstance(raw_points, list):
+                        raise ValueError('points must be a list')
+                    now = timezone.now()
+                    points = [
+                        LiveShareService.parse_point(p.get('lat'), p.get('lon'), p.get('ts'), now)
+                        for p in raw_points
+                    ]
+                except (ValueError, AttributeError):
+                    return JsonResponse({'success': False, 'error': 'Invalid payload'}, status=400)
+            else:
+                token = request.POST.get('token')
+                points = [LiveShareService.parse_point(
+                    request.POST.get('lat'), request.POST.get('lon'), request.POST.get('ts')
+                )]
+
+            accepted, stored = LiveShareService.record(token, points)
+            return JsonResponse({'success': True, 'accepted': accepted, 'stored': stored})
+        except LiveShareError as e:
+            return JsonResponse({'success': False, 'error': str(e)})
 
 class ControlPanelView(LoginRequiredMixin, View):
     def get(self, request, token):
@@ -66,14 +81,24 @@ class PublicShareView(View):
         return render(request, 'interactions/live_share/public.html', {'session': session})
 
 class LatestLocationAPI(View):
+    """
+    Latest position of a live share. Viewers may pass the last seen
+    version as ?v=; the response is held until the sharer moves when
+    long-polling is enabled (see RealtimeService).
+    """
     def get(self, request, token):
-        session = get_object_or_404(LiveShareSession, token=token)
-        ping = session.pings.first() # Ordered by -created_at
-        
-        if ping:
-            return JsonResponse({
-                'lat': float(ping.latitude),
-                'lon': float(ping.longitude),
-                'ts': ping.created_at.isoformat()
-            })
-        return JsonResponse({'lat': None})
+        since = RealtimeService.parse_version(request.GET.get('v'))
+        version, waited = RealtimeService.wait(RealtimeService.liveshare_channel(token), since)
+        meta = {'v': version, 'retry': RealtimeService.retry_ms(waited, 'LIVESHARE_RETRY_SECONDS', 5)}
+
+        latest = LiveShareService.get_latest(token)
+        if latest is None:
+            get_object_or_404(LiveShareSession, token=token)
+            return JsonResponse({'lat': None, **meta})
+
+        return JsonResponse({
+            'lat': latest['lat'],
+            'lon': latest['lon'],
+            'ts': latest['ts'].isoformat(),
+            **meta
+        })
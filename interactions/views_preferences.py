@@ -17,7 +17,7 @@ def get_preferences(request):
     """
     from interactions.models import NotificationPreference
     
-    prefs = NotificationPreference.get_or_create_for_user(request.user)
+    prefs = NotificationPreference.get_for_user(request.user)
     
     return JsonResponse({
         'enable_all': prefs.enable_all,
@@ -66,7 +66,7 @@ def update_preferences(request):
     except json.JSONDecodeError:
         return JsonResponse({'status': 'error', 'message': 'Invalid JSON'}, status=400)
     
-    prefs = NotificationPreference.get_or_create_for_user(request.user)
+    prefs = NotificationPreference.get_for_user(request.user)
     
     def parse_bool(v):
         if isinstance(v, str):
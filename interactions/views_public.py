@@ -493,9 +493,7 @@ def mark_notification_read(request, pk):
 
     from django.utils import timezone
     notification = get_object_or_404(Notification, pk=pk, recipient=request.user)
-    notification.is_read = True
-    notification.read_at = timezone.now()
-    notification.save()
+    notification.mark_as_read()
     
     if request.headers.get('HX-Request'):
         from django.shortcuts import render
@@ -525,10 +523,14 @@ def mark_all_notifications_read(request):
          return JsonResponse({'status': 'error', 'message': 'not_allowed'}, status=403)
 
     from django.utils import timezone
+    from interactions.services.realtime_service import RealtimeService
+    from interactions.services.unread_service import UnreadCountService
     Notification.objects.filter(recipient=request.user, is_read=False).update(
         is_read=True,
         read_at=timezone.now()
     )
+    UnreadCountService.reset(request.user.pk)
+    RealtimeService.bump(RealtimeService.notifications_channel(request.user.pk))
     
     if request.headers.get('HX-Request'):
         from django.http import HttpResponse
@@ -556,6 +558,11 @@ def delete_notification(request, pk):
         
     notification = get_object_or_404(Notification, pk=pk, recipient=request.user)
     notification.delete()
+    from interactions.services.realtime_service import RealtimeService
+    from interactions.services.unread_service import UnreadCountService
+    if not notification.is_read:
+        UnreadCountService.decr(request.user.pk)
+    RealtimeService.bump(RealtimeService.notifications_channel(request.user.pk))
     
     if request.headers.get('HX-Request'):
         from django.http import HttpResponse
@@ -581,6 +588,10 @@ def delete_all_notifications(request):
     # So we proceed.
         
     Notification.objects.filter(recipient=request.user).delete()
+    from interactions.services.realtime_service import RealtimeService
+    from interactions.services.unread_service import UnreadCountService
+    UnreadCountService.reset(request.user.pk)
+    RealtimeService.bump(RealtimeService.notifications_channel(request.user.pk))
     
     if request.headers.get('HX-Request'):
         from django.http import HttpResponse
@@ -594,10 +605,8 @@ def delete_all_notifications(request):
 @login_required
 def unread_count(request):
     """Return count of unread notifications for live badge updates."""
-    count = Notification.objects.filter(
-        recipient=request.user, 
-        is_read=False
-    ).count()
+    from interactions.services.unread_service import UnreadCountService
+    count = UnreadCountService.get(request.user)
 
     if request.headers.get('HX-Request'):
         from django.template import Context, Template
@@ -616,6 +625,29 @@ def unread_count(request):
 
     return JsonResponse({'count': count})
 
+
+@login_required
+def notifications_poll(request):
+    """
+    Poll for notification changes.
+    Pass the last seen version as ?v=; reads only the cache. With
+    REALTIME_LONGPOLL_ENABLED the response waits until the user's
+    notifications change or REALTIME_LONGPOLL_TIMEOUT passes; otherwise it
+    answers at once with `retry` set to REALTIME_RETRY_SECONDS (30s).
+    Clients refresh the badge when `changed` is true and wait `retry` ms
+    before polling again.
+    """
+    from interactions.services.realtime_service import RealtimeService
+
+    since = RealtimeService.parse_version(request.GET.get('v'))
+    channel = RealtimeService.notifications_channel(request.user.pk)
+    version, waited = RealtimeService.wait(channel, since)
+    return JsonResponse({
+        'v': version,
+        'changed': version != since,
+        'retry': RealtimeService.retry_ms(waited),
+    })
+
 class FavoriteListView(LoginRequiredMixin, ListView):
     model = Favorite
     template_name = 'interactions/favorite_list.html'
@@ -709,13 +741,15 @@ def stream_notifications(request):
     SSE stream for real-time notifications.
     Yields unread count (badge) and latest notifications (dropdown).
     """
+    from interactions.services.unread_service import UnreadCountService
+
     def event_stream():
         last_notif_id = None
         first_run = True
         
         while True:
             # 1. Fetch unread count
-            unread_count = Notification.objects.filter(recipient=request.user, is_read=False).count()
+            unread_count = UnreadCountService.get(request.user)
             
             # 2. Fetch latest notifications
             latest_notifs = Notification.objects.filter(recipient=request.user).order_by('-created_at')[:5]
@@ -755,7 +789,8 @@ def notifications_snapshot(request):
     Lightweight snapshot for initial notifications badge + dropdown.
     Intended for HTMX/AJAX on page load.
     """
-    unread_count = Notification.objects.filter(recipient=request.user, is_read=False).count()
+    from interactions.services.unread_service import UnreadCountService
+    unread_count = UnreadCountService.get(request.user)
     latest_notifications = Notification.objects.filter(recipient=request.user).order_by('-created_at')[:5]
 
     badge_html = render_to_string('partials/notifications_badge.html', {
@@ -153,7 +153,7 @@ class AdvertisementAdmin(admin.ModelAdmin):
             'fields': ('title', 'placement', 'place', 'target_url', 'owner', 'description'),
         }),
         ('التواريخ والمدة', {
-            'fields': (('start_date', 'duration_days'), 'status'),
+            'fields': (('start_date', 'duration_days'), 'status', 'priority'),
         }),
         ('التسعير', {
             'fields': (('price', 'discount_price'),),
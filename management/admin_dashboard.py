@@ -1,5 +1,6 @@
 from django.utils.translation import gettext_lazy as _
 from django.db.models import Count, Sum, Avg, Q
+from django.db.models.functions import TruncMonth
 from django.utils import timezone
 from datetime import timedelta
 from users.models import User, UserRegistrationLog
@@ -8,6 +9,7 @@ from interactions.models import Review, Report
 from management.models import Request, AuditLog, Advertisement, Invoice
 from django.db import connection
 from django.core.cache import cache
+import random
 import time
 
 
@@ -54,73 +56,123 @@ class AdminDashboardService:
             
         return health
 
+    # Cache settings: values are recomputed after a jittered soft TTL by a
+    # single caller while the others keep serving the previous value.
+    CACHE_TTL = 120
+    CACHE_JITTER = 30
+    CACHE_LOCK_TIMEOUT = 30
+
+    @staticmethod
+    def _cached(key, builder, ttl=None):
+        """Return a cached value, refreshing it in a staggered fashion."""
+        ttl = ttl or AdminDashboardService.CACHE_TTL
+        now = time.time()
+        entry = cache.get(key)
+
+        if entry is not None:
+            if now < entry['refresh_at']:
+                return entry['value']
+            # Stale: only the lock holder recomputes, others serve stale data
+            if not cache.add(f"{key}:lock", 1, AdminDashboardService.CACHE_LOCK_TIMEOUT):
+                return entry['value']
+
+        value = builder()
+        refresh_at = now + ttl + random.uniform(0, AdminDashboardService.CACHE_JITTER)
+        cache.set(key, {'value': value, 'refresh_at': refresh_at}, ttl * 3)
+        cache.delete(f"{key}:lock")
+        return value
+
+    @staticmethod
+    def invalidate_cache():
+        """Drop cached dashboard statistics."""
+        cache.delete_many(['admin_dashboard:kpi', 'admin_dashboard:charts'])
+
     @staticmethod
     def get_kpi_stats():
-        """Get key performance indicators"""
+        """Get key performance indicators (cached)"""
+        return AdminDashboardService._cached(
+            'admin_dashboard:kpi', AdminDashboardService._compute_kpi_stats
+        )
+
+    @staticmethod
+    def _compute_kpi_stats():
+        """Compute KPIs with one conditional aggregate per table"""
         now = timezone.now()
         today = now.date()
         last_week = now - timedelta(days=7)
         last_month = now - timedelta(days=30)
+        month_start = today.replace(day=1)
         
         # Users
-        total_users = User.objects.count()
-        new_users_today = User.objects.filter(date_joined__date=today).count()
-        new_users_week = User.objects.filter(date_joined__gte=last_week).count()
-        new_users_month = User.objects.filter(date_joined__gte=last_month).count()
+        users = User.objects.aggregate(
+            total=Count('id'),
+            today=Count('id', filter=Q(date_joined__date=today)),
+            week=Count('id', filter=Q(date_joined__gte=last_week)),
+            month=Count('id', filter=Q(date_joined__gte=last_month)),
+        )
         
         # Places
-        total_places = Place.objects.count()
-        active_places = Place.objects.filter(is_active=True).count()
+        places = Place.objects.aggregate(
+            total=Count('id'),
+            active=Count('id', filter=Q(is_active=True)),
+        )
         
         # Establishments
-        total_establishments = Establishment.objects.count()
-        pending_establishments = Establishment.objects.filter(approval_status='pending').count()
-        approved_establishments = Establishment.objects.filter(approval_status='approved').count()
+        establishments = Establishment.objects.aggregate(
+            total=Count('pk'),
+            pending=Count('pk', filter=Q(approval_status='pending')),
+            approved=Count('pk', filter=Q(approval_status='approved')),
+        )
         
         # Requests
-        pending_requests = Request.objects.filter(status='pending').count()
-        resolved_today = Request.objects.filter(
-            status__in=['approved', 'rejected'],
-            updated_at__date=today
-        ).count()
+        requests = Request.objects.aggregate(
+            pending=Count('id', filter=Q(status='pending')),
+            resolved_today=Count('id', filter=Q(
+                status__in=['approved', 'rejected'],
+                updated_at__date=today
+            )),
+        )
         
         # Reviews
-        total_reviews = Review.objects.count()
-        reviews_today = Review.objects.filter(created_at__date=today).count()
-        avg_rating = Review.objects.aggregate(avg=Avg('rating'))['avg'] or 0
+        reviews = Review.objects.aggregate(
+            total=Count('id'),
+            today=Count('id', filter=Q(created_at__date=today)),
+            avg=Avg('rating'),
+        )
         
         # Reports
         pending_reports = Report.objects.filter(status='pending').count()
         
-        # Ads & Revenue
-        active_ads = Advertisement.objects.filter(status='active').count()
-        pending_ads = Advertisement.objects.filter(status='pending').count()
+        # Ads
+        ads = Advertisement.objects.aggregate(
+            active=Count('id', filter=Q(status='active')),
+            pending=Count('id', filter=Q(status='pending')),
+        )
         
         # Revenue (this month)
-        month_start = today.replace(day=1)
         revenue_month = Invoice.objects.filter(
             is_paid=True,
             issue_date__gte=month_start
         ).aggregate(total=Sum('amount'))['total'] or 0
         
         return {
-            'total_users': total_users,
-            'new_users_today': new_users_today,
-            'new_users_week': new_users_week,
-            'new_users_month': new_users_month,
-            'total_places': total_places,
-            'active_places': active_places,
-            'total_establishments': total_establishments,
-            'pending_establishments': pending_establishments,
-            'approved_establishments': approved_establishments,
-            'pending_requests': pending_requests,
-            'resolved_today': resolved_today,
-            'total_reviews': total_reviews,
-            'reviews_today': reviews_today,
-            'avg_rating': round(avg_rating, 1),
+            'total_users': users['total'],
+            'new_users_today': users['today'],
+            'new_users_week': users['week'],
+            'new_users_month': users['month'],
+            'total_places': places['total'],
+            'active_places': places['active'],
+            'total_establishments': establishments['total'],
+            'pending_establishments': establishments['pending'],
+            'approved_establishments': establishments['approved'],
+            'pending_requests': requests['pending'],
+            'resolved_today': requests['resolved_today'],
+            'total_reviews': reviews['total'],
+            'reviews_today': reviews['today'],
+            'avg_rating': round(reviews['avg'] or 0, 1),
             'pending_reports': pending_reports,
-            'active_ads': active_ads,
-            'pending_ads': pending_ads,
+            'active_ads': ads['active'],
+            'pending_ads': ads['pending'],
             'revenue_month': revenue_month,
         }
 
@@ -132,29 +184,40 @@ class AdminDashboardService:
 
     @staticmethod
     def get_pending_items():
-        """Get counts of all pending items for quick action"""
+        """Get counts of all pending items for quick action (shares the KPI cache)"""
+        stats = AdminDashboardService.get_kpi_stats()
         return {
-            'requests': Request.objects.filter(status='pending').count(),
-            'establishments': Establishment.objects.filter(approval_status='pending').count(),
-            'ads': Advertisement.objects.filter(status='pending').count(),
-            'reports': Report.objects.filter(status='pending').count(),
+            'requests': stats['pending_requests'],
+            'establishments': stats['pending_establishments'],
+            'ads': stats['pending_ads'],
+            'reports': stats['pending_reports'],
         }
 
     @staticmethod
     def get_chart_data():
-        """Get data for Chart.js visualizations"""
+        """Get data for Chart.js visualizations (cached)"""
+        return AdminDashboardService._cached(
+            'admin_dashboard:charts', AdminDashboardService._compute_chart_data
+        )
+
+    @staticmethod
+    def _compute_chart_data():
+        """Compute chart series with one grouped query per series"""
         now = timezone.now()
         
-        # 1. User Growth (Last 7 days)
-        user_growth = []
-        for i in range(6, -1, -1):
-            day = (now - timedelta(days=i)).date()
-            count = User.objects.filter(date_joined__date=day).count()
-            user_growth.append({
+        # 1. User Growth (Last 7 days, from the DailyMetric rollup)
+        from management.services.metrics_service import MetricsService
+        today = timezone.localdate()
+        days = [today - timedelta(days=i) for i in range(6, -1, -1)]
+        growth_counts = MetricsService.series(['users.new'], days[0], today)['users.new']
+        user_growth = [
+            {
                 'day': day.strftime('%a'),
                 'date': day.strftime('%m/%d'),
                 'count': count
-            })
+            }
+            for day, count in zip(days, growth_counts)
+        ]
         
         # 2. Places by Category
         places_by_category = list(
@@ -164,46 +227,61 @@ class AdminDashboardService:
         )
         
         # 3. Request Status Distribution
+        request_counts = dict(
+            Request.objects.filter(status__in=['pending', 'approved', 'rejected'])
+            .values_list('status')
+            .annotate(count=Count('id'))
+            .order_by()
+        )
         request_status = {
-            'pending': Request.objects.filter(status='pending').count(),
-            'approved': Request.objects.filter(status='approved').count(),
-            'rejected': Request.objects.filter(status='rejected').count(),
+            status: request_counts.get(status, 0)
+            for status in ('pending', 'approved', 'rejected')
         }
         
         # 4. Establishment Approval Status
+        establishment_counts = dict(
+            Establishment.objects.values_list('approval_status')
+            .annotate(count=Count('pk'))
+            .order_by()
+        )
         establishment_status = {
-            'draft': Establishment.objects.filter(approval_status='draft').count(),
-            'pending': Establishment.objects.filter(approval_status='pending').count(),
-            'approved': Establishment.objects.filter(approval_status='approved').count(),
-            'rejected': Establishment.objects.filter(approval_status='rejected').count(),
+            status: establishment_counts.get(status, 0)
+            for status in ('draft', 'pending', 'approved', 'rejected')
         }
         
         # 5. Reviews by Rating
-        reviews_by_rating = []
-        for rating in range(1, 6):
-            count = Review.objects.filter(rating=rating).count()
-            reviews_by_rating.append({'rating': rating, 'count': count})
+        rating_counts = dict(
+            Review.objects.filter(rating__range=(1, 5))
+            .values_list('rating')
+            .annotate(count=Count('id'))
+            .order_by()
+        )
+        reviews_by_rating = [
+            {'rating': rating, 'count': rating_counts.get(rating, 0)}
+            for rating in range(1, 6)
+        ]
         
-        # 6. Revenue Trend (Last 6 months)
-        revenue_trend = []
-        for i in range(5, -1, -1):
-            month_date = now - timedelta(days=i*30)
-            month_start = month_date.replace(day=1).date()
-            if month_date.month == 12:
-                month_end = month_start.replace(year=month_start.year + 1, month=1)
-            else:
-                month_end = month_start.replace(month=month_start.month + 1)
-            
-            revenue = Invoice.objects.filter(
-                is_paid=True,
-                issue_date__gte=month_start,
-                issue_date__lt=month_end
-            ).aggregate(total=Sum('amount'))['total'] or 0
-            
-            revenue_trend.append({
-                'month': month_start.strftime('%b'),
-                'revenue': float(revenue)
-            })
+        # 6. Revenue Trend (Last 6 calendar months)
+        months = []
+        month_start = now.date().replace(day=1)
+        for _ in range(6):
+            months.insert(0, month_start)
+            month_start = (month_start - timedelta(days=1)).replace(day=1)
+        revenue_by_month = {
+            row['month']: row['total']
+            for row in Invoice.objects.filter(is_paid=True, issue_date__gte=months[0])
+            .annotate(month=TruncMonth('issue_date'))
+            .values('month')
+            .annotate(total=Sum('amount'))
+            .order_by()
+        }
+        revenue_trend = [
+            {
+                'month': month.strftime('%b'),
+                'revenue': float(revenue_by_month.get(month) or 0)
+            }
+            for month in months
+        ]
         
         return {
             'user_growth': user_growth,
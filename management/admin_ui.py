@@ -10,6 +10,7 @@ from .models import (
     HomePageSection, HeroSlide,
     FeatureToggle, NotificationSetting,
 )
+from .services.feature_toggle_service import FeatureToggleService
 
 
 @admin.register(SiteSetting)
@@ -381,11 +382,13 @@ class FeatureToggleAdmin(admin.ModelAdmin):
     @admin.action(description='✅ تفعيل الميزات المحددة')
     def enable_features(self, request, queryset):
         count = queryset.update(is_enabled=True)
+        FeatureToggleService.invalidate()
         self.message_user(request, f"تم تفعيل {count} ميزة", messages.SUCCESS)
 
     @admin.action(description='❌ تعطيل الميزات المحددة')
     def disable_features(self, request, queryset):
         count = queryset.update(is_enabled=False)
+        FeatureToggleService.invalidate()
         self.message_user(request, f"تم تعطيل {count} ميزة", messages.WARNING)
 
 
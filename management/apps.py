@@ -8,3 +8,9 @@ class ManagementConfig(AppConfig):
 
     def ready(self):
         import management.services.moderation_signals
+        import management.services.settings_signals
+        import management.services.geo_signals
+        import management.services.ad_slot_signals
+        import management.services.ad_stats_signals
+        import management.services.feature_toggle_signals
+        import management.services.error_log_signals
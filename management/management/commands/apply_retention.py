@@ -0,0 +1,33 @@
+"""
+Delete expired log rows according to the retention policies.
+
+Usage:
+    python manage.py apply_retention --dry-run
+    python manage.py apply_retention --policy management.error_logs --chunk-size 10000 --sleep 0
+"""
+from django.core.management.base import BaseCommand
+
+from management.services.retention_service import POLICIES, RetentionService
+
+
+class Command(BaseCommand):
+    help = 'Apply log retention policies in primary-key chunks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--policy', action='append', choices=[p.name for p in POLICIES],
+                            help='Limit to policy(ies)')
+        parser.add_argument('--chunk-size', type=int, help='Primary-key range per transaction')
+        parser.add_argument('--sleep', type=float, help='Seconds to pause between chunks')
+        parser.add_argument('--dry-run', action='store_true', help='Only count expired rows')
+
+    def handle(self, *args, **options):
+        report = RetentionService.run(
+            options['policy'], options['chunk_size'], options['sleep'], options['dry_run']
+        )
+        verb = 'would remove' if options['dry_run'] else 'removed'
+        for name, count in report.items():
+            if count is None:
+                self.stdout.write(self.style.ERROR(f"  {name}: failed (see logs)"))
+            else:
+                self.stdout.write(f"  {name}: {verb} {count} rows")
+        self.stdout.write(self.style.SUCCESS('Retention completed.'))
@@ -0,0 +1,111 @@
+"""
+Benchmark ad expiration: per-ad save loop vs AdService.check_expirations.
+
+Seeds N active ads past their end date spread over owners, then expires
+them with the legacy loop (ad.save() per ad, notifications through the
+post_save signal) on a sample and with the set-based path on all of them.
+
+Usage:
+    python manage.py benchmark_ad_expirations --ads 50000
+    python manage.py benchmark_ad_expirations --cleanup
+"""
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+PREFIX = 'bench_exp_'
+
+
+class QueryCounter:
+    """connection.execute_wrapper that counts queries (CaptureQueriesContext keeps only 9000)."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = 'Time expiring N ads: per-ad saves vs set-based UPDATE + bulk notifications'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ads', type=int, default=50000)
+        parser.add_argument('--owners', type=int, default=500)
+        parser.add_argument('--legacy-sample', type=int, default=2000,
+                            help='Ads expired with the legacy loop (extrapolated to --ads)')
+        parser.add_argument('--cleanup', action='store_true', help='Delete seeded rows and exit')
+
+    def handle(self, *args, **options):
+        from django.contrib.auth import get_user_model
+        from management.models import Advertisement
+
+        User = get_user_model()
+        Advertisement.objects.filter(title__startswith=PREFIX).delete()
+        User.objects.filter(username__startswith=PREFIX).delete()
+        if options['cleanup']:
+            self.stdout.write(self.style.SUCCESS("Deleted seeded ads and owners."))
+            return
+
+        self.seed(options['ads'], options['owners'])
+        sample = min(options['legacy_sample'], options['ads'])
+
+        elapsed, queries = self.measure(lambda: self.legacy(sample))
+        self.stdout.write(
+            f"legacy loop: {sample} ads in {elapsed:.2f}s, {queries} queries "
+            f"(~{elapsed / sample * options['ads']:.0f}s / ~{queries // sample * options['ads']} queries "
+            f"for {options['ads']})"
+        )
+
+        self.reset()
+        from management.services.ad_service import AdService
+        result = {}
+        elapsed, queries = self.measure(lambda: result.setdefault('count', AdService.check_expirations()))
+        self.stdout.write(f"set-based:   {result['count']} ads in {elapsed:.2f}s, {queries} queries")
+
+        rerun_elapsed, rerun_queries = self.measure(AdService.check_expirations)
+        self.stdout.write(f"re-run:      0 ads in {rerun_elapsed:.2f}s, {rerun_queries} queries")
+
+    def seed(self, count, owners):
+        from django.contrib.auth import get_user_model
+        from management.models import Advertisement
+
+        User = get_user_model()
+        users = User.objects.bulk_create([User(username=f'{PREFIX}{i}') for i in range(owners)])
+        today = timezone.now().date()
+        Advertisement.objects.bulk_create([
+            Advertisement(
+                title=f'{PREFIX}{i}', status='active', owner=users[i % owners],
+                start_date=today - timedelta(days=14), end_date=today - timedelta(days=1 + i % 5),
+            )
+            for i in range(count)
+        ], batch_size=2000)
+
+    def reset(self):
+        from interactions.models import Notification
+        from management.models import Advertisement
+
+        Advertisement.objects.filter(title__startswith=PREFIX).update(status='active')
+        Notification.objects.filter(recipient__username__startswith=PREFIX).delete()
+
+    def legacy(self, limit):
+        """The pre-change loop: one save (and signal fan-out) per ad."""
+        from management.models import Advertisement
+
+        today = timezone.now().date()
+        for ad in Advertisement.objects.filter(status='active', end_date__lt=today)[:limit]:
+            ad.status = 'expired'
+            ad.save()
+
+    def measure(self, fn):
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            start = time.perf_counter()
+            with transaction.atomic():
+                fn()
+            elapsed = time.perf_counter() - start
+        return elapsed, counter.count
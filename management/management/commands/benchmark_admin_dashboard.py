@@ -0,0 +1,117 @@
+"""
+Benchmark AdminDashboardService KPI and chart aggregates on a seeded dataset.
+
+Usage:
+    python manage.py benchmark_admin_dashboard --rows 1000000
+    python manage.py benchmark_admin_dashboard --cleanup
+"""
+import random
+import time
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection, reset_queries
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+PREFIX = 'bench_dash_'
+
+
+class Command(BaseCommand):
+    help = 'Seed users/reviews and time the admin dashboard aggregates'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1_000_000, help='Total rows to seed (users + reviews)')
+        parser.add_argument('--batch', type=int, default=5000)
+        parser.add_argument('--runs', type=int, default=5)
+        parser.add_argument('--cleanup', action='store_true', help='Delete seeded rows and exit')
+
+    def handle(self, *args, **options):
+        from users.models import User
+
+        if options['cleanup']:
+            deleted, _ = User.objects.filter(username__startswith=PREFIX).delete()
+            self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} seeded rows."))
+            return
+
+        existing = User.objects.filter(username__startswith=PREFIX).count()
+        if existing == 0:
+            self.seed(options['rows'], options['batch'])
+        else:
+            self.stdout.write(f"Reusing {existing} seeded users (run --cleanup to reseed).")
+
+        self.run_benchmark(options['runs'])
+
+    def seed(self, rows, batch):
+        from users.models import User
+        from places.models import Category, Place
+        from interactions.models import Review
+
+        n_users = rows // 2
+        n_reviews = rows - n_users
+        now = timezone.now()
+        self.stdout.write(f"Seeding {n_users} users and {n_reviews} reviews...")
+
+        start = time.perf_counter()
+        for offset in range(0, n_users, batch):
+            User.objects.bulk_create([
+                User(
+                    username=f'{PREFIX}{i}',
+                    password='!',
+                    date_joined=now - timedelta(days=random.randint(0, 365)),
+                )
+                for i in range(offset, min(offset + batch, n_users))
+            ], batch_size=batch)
+
+        category, _ = Category.objects.get_or_create(name=f'{PREFIX}category')
+        places = [
+            Place.objects.create(name=f'{PREFIX}place_{i}', category=category)
+            for i in range(max(1, n_reviews // n_users + 1))
+        ]
+        user_ids = list(
+            User.objects.filter(username__startswith=PREFIX).values_list('id', flat=True)
+        )
+        reviews = (
+            Review(user_id=user_ids[i % len(user_ids)], place=places[i // len(user_ids)],
+                   rating=random.randint(1, 5), comment='')
+            for i in range(n_reviews)
+        )
+        buf = []
+        for review in reviews:
+            buf.append(review)
+            if len(buf) >= batch:
+                Review.objects.bulk_create(buf, batch_size=batch)
+                buf = []
+        if buf:
+            Review.objects.bulk_create(buf, batch_size=batch)
+
+        self.stdout.write(f"Seeded in {time.perf_counter() - start:.1f}s")
+
+    def run_benchmark(self, runs):
+        from management.admin_dashboard import AdminDashboardService
+
+        for label, fn in (
+            ('get_kpi_stats', AdminDashboardService._compute_kpi_stats),
+            ('get_chart_data', AdminDashboardService._compute_chart_data),
+        ):
+            timings = []
+            for _ in range(runs):
+                reset_queries()
+                with CaptureQueriesContext(connection) as ctx:
+                    start = time.perf_counter()
+                    fn()
+                    timings.append(time.perf_counter() - start)
+            timings.sort()
+            self.stdout.write(
+                f"{label}: queries={len(ctx.captured_queries)} "
+                f"median={timings[len(timings) // 2] * 1000:.1f}ms max={timings[-1] * 1000:.1f}ms"
+            )
+
+        cache.delete_many(['admin_dashboard:kpi', 'admin_dashboard:charts'])
+        AdminDashboardService.get_kpi_stats()
+        start = time.perf_counter()
+        for _ in range(1000):
+            AdminDashboardService.get_kpi_stats()
+            AdminDashboardService.get_chart_data()
+        self.stdout.write(f"cached: {(time.perf_counter() - start):.3f}ms per dashboard render (x1000)")
@@ -0,0 +1,124 @@
+"""
+Benchmark review creation latency with EventBus subscribers, sync vs async.
+
+Five ReviewCreated subscribers each write an AuditLog row and sleep
+--handler-ms to stand in for an external call. In sync mode they run inside
+ReviewService.create_review; in async mode the request only writes outbox
+rows and the worker (timed separately) runs them.
+
+Usage:
+    python manage.py benchmark_event_bus --reviews 200 --handler-ms 20
+    python manage.py benchmark_event_bus --cleanup
+"""
+import statistics
+import time
+from unittest import mock
+
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+PREFIX = 'bench_ev_'
+SUBSCRIBERS = 5
+
+
+class Command(BaseCommand):
+    help = 'Time review creation with 5 EventBus subscribers (sync vs async dispatch)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reviews', type=int, default=200)
+        parser.add_argument('--handler-ms', type=float, default=20.0,
+                            help='Simulated external work per handler call')
+        parser.add_argument('--cleanup', action='store_true', help='Delete seeded data and exit')
+
+    def handle(self, *args, **options):
+        from django.contrib.auth import get_user_model
+        from management.models import AuditLog, DomainEventOutbox
+        from places.models import Category, Establishment
+
+        User = get_user_model()
+        if options['cleanup']:
+            Establishment.objects.filter(name__startswith=PREFIX).delete()
+            Category.objects.filter(name__startswith=PREFIX).delete()
+            deleted, _ = User.objects.filter(username__startswith=PREFIX).delete()
+            DomainEventOutbox.objects.filter(event_type__endswith='.ReviewCreated').delete()
+            AuditLog.objects.filter(action='BENCH_EVENT').delete()
+            self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} seeded rows."))
+            return
+
+        reviews = options['reviews']
+        owner, _ = User.objects.get_or_create(username=f'{PREFIX}owner')
+        category, _ = Category.objects.get_or_create(name=f'{PREFIX}category')
+        place, _ = Establishment.objects.get_or_create(
+            name=f'{PREFIX}place', defaults={'category': category, 'owner': owner}
+        )
+        existing = set(User.objects.filter(username__startswith=f'{PREFIX}user').values_list('username', flat=True))
+        User.objects.bulk_create([
+            User(username=f'{PREFIX}user{i}') for i in range(reviews)
+            if f'{PREFIX}user{i}' not in existing
+        ])
+        users = list(User.objects.filter(username__startswith=f'{PREFIX}user').order_by('pk')[:reviews])
+
+        with self._subscribers(options['handler_ms'] / 1000):
+            self.run_mode('sync', place, users)
+            self.run_mode('async', place, users)
+
+    def _subscribers(self, delay):
+        from ibb_guide.events import EventBus, ReviewCreated
+        from management.models import AuditLog
+
+        def make_handler(index):
+            def handler(event):
+                AuditLog.objects.create(
+                    user_id=event.user_id, action='BENCH_EVENT', table_name='interactions_review',
+                    record_id=str(event.review_id), new_values={'subscriber': index},
+                )
+                time.sleep(delay)
+            handler.__qualname__ = f'bench_subscriber_{index}'
+            return handler
+
+        handlers = {ReviewCreated: [make_handler(i) for i in range(SUBSCRIBERS)]}
+        by_name = {f'{__name__}.bench_subscriber_{i}': h for i, h in enumerate(handlers[ReviewCreated])}
+        return mock.patch.multiple(EventBus, _handlers=handlers, _by_name=by_name, _batch_handlers=set())
+
+    def run_mode(self, mode, place, users):
+        from ibb_guide.events import EventBus
+        from interactions.models import Review
+        from interactions.services.review_service import ReviewService
+
+        Review.objects.filter(place=place).delete()
+        latencies = []
+        # Owner notifications are excluded; the async worker is timed separately
+        with override_settings(EVENT_BUS_MODE=mode), \
+                mock.patch.object(ReviewService, '_notify_establishment_owner'), \
+                mock.patch.object(EventBus, 'schedule_worker'):
+            for user in users:
+                start = time.perf_counter()
+                success, result = ReviewService.create_review(user, place, 4, 'Benchmark review')
+                latencies.append(time.perf_counter() - start)
+                if not success:
+                    raise RuntimeError(f"Review creation failed: {result}")
+
+            latencies.sort()
+            p95 = latencies[int(len(latencies) * 0.95) - 1]
+            self.stdout.write(
+                f"{mode:>5}: mean {statistics.mean(latencies) * 1000:.1f}ms, "
+                f"p95 {p95 * 1000:.1f}ms per review ({len(latencies)} reviews, {SUBSCRIBERS} subscribers)"
+            )
+            if mode == 'async':
+                self.run_worker()
+
+    def run_worker(self):
+        from ibb_guide.events import EventBus
+
+        start = time.perf_counter()
+        totals = {'done': 0, 'retrying': 0, 'dead': 0}
+        while True:
+            report = EventBus.process_queue()
+            for key, value in report.items():
+                totals[key] += value
+            if not any(report.values()):
+                break
+        elapsed = time.perf_counter() - start
+        self.stdout.write(f"worker: {totals['done']} deliveries in {elapsed:.2f}s ({totals})")
+        for name, stats in EventBus.handler_stats().items():
+            self.stdout.write(f"  {name}: {stats}")
@@ -0,0 +1,104 @@
+"""
+Benchmark GeoService zone lookups against a seeded set of polygons.
+
+Usage:
+    python manage.py benchmark_geo_zones --zones 5000 --vertices 200 --checks 10000
+    python manage.py benchmark_geo_zones --cleanup
+"""
+import math
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+PREFIX = 'bench_geo_'
+
+# Rough bounding box of Yemen
+LAT_RANGE = (12.5, 17.5)
+LON_RANGE = (42.5, 52.0)
+
+
+class Command(BaseCommand):
+    help = 'Seed geo zones and time point-in-zone checks (linear scan vs index)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--zones', type=int, default=5000)
+        parser.add_argument('--vertices', type=int, default=200)
+        parser.add_argument('--checks', type=int, default=10000)
+        parser.add_argument('--radius', type=float, default=0.03, help='Zone radius in degrees')
+        parser.add_argument('--linear-checks', type=int, default=200,
+                            help='Checks to run for the linear-scan baseline (it is slow)')
+        parser.add_argument('--cleanup', action='store_true', help='Delete seeded zones and exit')
+
+    def handle(self, *args, **options):
+        from management.models import GeoZone
+
+        if options['cleanup']:
+            deleted, _ = GeoZone.objects.filter(name__startswith=PREFIX).delete()
+            self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} seeded zones."))
+            return
+
+        existing = GeoZone.objects.filter(name__startswith=PREFIX).count()
+        if existing == 0:
+            self.seed(options['zones'], options['vertices'], options['radius'])
+        else:
+            self.stdout.write(f"Reusing {existing} seeded zones (run --cleanup to reseed).")
+
+        self.run_benchmark(options['checks'], options['linear_checks'])
+
+    def seed(self, zones, vertices, radius):
+        from management.models import GeoZone
+
+        self.stdout.write(f"Seeding {zones} zones with {vertices} vertices...")
+        rows = []
+        for i in range(zones):
+            lat, lon = random.uniform(*LAT_RANGE), random.uniform(*LON_RANGE)
+            polygon = [
+                [
+                    round(lat + radius * random.uniform(0.6, 1.0) * math.sin(2 * math.pi * k / vertices), 6),
+                    round(lon + radius * random.uniform(0.6, 1.0) * math.cos(2 * math.pi * k / vertices), 6),
+                ]
+                for k in range(vertices)
+            ]
+            zone = GeoZone(
+                name=f'{PREFIX}{i}', zone_type='FLOOD', risk_level='LOW', polygon=polygon,
+            )
+            zone.min_lat, zone.max_lat, zone.min_lon, zone.max_lon = GeoZone.compute_bbox(polygon)
+            rows.append(zone)
+        GeoZone.objects.bulk_create(rows, batch_size=500)
+
+        from management.services.geo_service import GeoService
+        GeoService.invalidate_zone_index()
+
+    def _time(self, label, fn, points):
+        start = time.perf_counter()
+        hits = sum(len(fn(lat, lon)) for lat, lon in points)
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            f"{label}: {len(points) / elapsed:,.0f} checks/s "
+            f"({elapsed / len(points) * 1e6:.1f}us/check, {hits} hits)"
+        )
+
+    def run_benchmark(self, checks, linear_checks):
+        from management.models import GeoZone
+        from management.services.geo_service import GeoService
+
+        points = [(random.uniform(*LAT_RANGE), random.uniform(*LON_RANGE)) for _ in range(checks)]
+
+        def linear(lat, lon):
+            return [
+                zone.pk for zone in GeoZone.objects.filter(is_active=True)
+                if GeoService._is_point_in_polygon(lat, lon, zone.polygon)
+            ]
+
+        self._time('linear scan', linear, points[:linear_checks])
+
+        with override_settings(GEO_ZONE_INDEX_ENABLED=False):
+            self._time('sql bbox', GeoService.find_zone_ids, points)
+
+        start = time.perf_counter()
+        GeoService._zone_index.reset()
+        GeoService.get_zone_index()
+        self.stdout.write(f"index build: {(time.perf_counter() - start) * 1000:.0f}ms")
+        self._time('grid index', GeoService.find_zone_ids, points)
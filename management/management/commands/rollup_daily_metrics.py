@@ -0,0 +1,37 @@
+"""
+Rebuild or backfill the DailyMetric rollup.
+
+Usage:
+    python manage.py rollup_daily_metrics              # yesterday + today
+    python manage.py rollup_daily_metrics --days 365   # backfill last year
+    python manage.py rollup_daily_metrics --start 2025-01-01 --end 2025-06-30 --metric place.views
+"""
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from management.services.metrics_service import METRICS, MetricsService
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the daily metrics rollup for a date range (idempotent)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=2, help='Number of days ending today')
+        parser.add_argument('--start', type=date.fromisoformat, help='Start date (YYYY-MM-DD)')
+        parser.add_argument('--end', type=date.fromisoformat, help='End date (YYYY-MM-DD), defaults to today')
+        parser.add_argument('--metric', action='append', choices=sorted(METRICS), help='Limit to metric(s)')
+        parser.add_argument('--chunk-days', type=int, default=31)
+
+    def handle(self, *args, **options):
+        end = options['end'] or timezone.localdate()
+        start = options['start'] or end - timedelta(days=options['days'] - 1)
+        if start > end:
+            raise CommandError('--start must not be after --end')
+
+        self.stdout.write(f"Rolling up {start} .. {end}")
+        totals = MetricsService.backfill(start, end, options['chunk_days'], options['metric'])
+        for metric, count in sorted(totals.items()):
+            self.stdout.write(f"  {metric}: {count} rows")
+        self.stdout.write(self.style.SUCCESS('Daily metrics rollup completed.'))
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.27 on 2026-10-19 05:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('management', '0050_add_indices_and_outbox_checks'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyMetric',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(max_length=50)),
+                ('dimension', models.CharField(blank=True, default='', max_length=100)),
+                ('date', models.DateField()),
+                ('value', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'مقياس يومي',
+                'verbose_name_plural': 'المقاييس اليومية',
+                'ordering': ['-date'],
+                'indexes': [models.Index(fields=['metric', 'dimension', 'date'], name='management__metric_3bcfa8_idx'), models.Index(fields=['metric', 'date'], name='management__metric_27c60b_idx')],
+                'unique_together': {('metric', 'dimension', 'date')},
+            },
+        ),
+    ]
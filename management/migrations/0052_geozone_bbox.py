@@ -0,0 +1,57 @@
+# Generated by Django 4.2.27 on 2026-10-19 05:25
+
+from django.db import migrations, models
+
+
+def backfill_bbox(apps, schema_editor):
+    GeoZone = apps.get_model('management', 'GeoZone')
+    for zone in GeoZone.objects.all().iterator():
+        try:
+            lats = [float(p[0]) for p in zone.polygon]
+            lons = [float(p[1]) for p in zone.polygon]
+        except (TypeError, ValueError, IndexError):
+            continue
+        if not lats:
+            continue
+        GeoZone.objects.filter(pk=zone.pk).update(
+            min_lat=min(lats), max_lat=max(lats), min_lon=min(lons), max_lon=max(lons)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('management', '0051_daily_metric'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='geozone',
+            name='max_lat',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='geozone',
+            name='max_lon',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='geozone',
+            name='min_lat',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='geozone',
+            name='min_lon',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='geozone',
+            index=models.Index(fields=['is_active', 'min_lat', 'max_lat'], name='management__is_acti_508b8e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='geozone',
+            index=models.Index(fields=['min_lon', 'max_lon'], name='management__min_lon_323c15_idx'),
+        ),
+        migrations.RunPython(backfill_bbox, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.27 on 2026-10-19 05:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('management', '0052_geozone_bbox'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['timestamp'], name='management__timesta_01b51c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='errorlog',
+            index=models.Index(fields=['timestamp'], name='management__timesta_bf9c52_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='routelog',
+            index=models.Index(fields=['created_at'], name='management__created_5a286a_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.27 on 2026-10-19 05:50
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+def backfill_last_seen(apps, schema_editor):
+    ErrorLog = apps.get_model('management', 'ErrorLog')
+    ErrorLog.objects.update(last_seen=models.F('timestamp'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('management', '0053_retention_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='errorlog',
+            name='fingerprint',
+            field=models.CharField(blank=True, max_length=40, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='errorlog',
+            name='last_seen',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='errorlog',
+            name='occurrences',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.RunPython(backfill_last_seen, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.27 on 2026-10-19 05:54
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('management', '0054_errorlog_fingerprint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DomainEventOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_type', models.CharField(max_length=255)),
+                ('handler', models.CharField(max_length=255)),
+                ('payload', models.JSONField(default=dict)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('retrying', 'Retrying'), ('done', 'Done'), ('dead', 'Dead Letter')], default='queued', max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('max_attempts', models.PositiveIntegerField(default=5)),
+                ('last_error', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('scheduled_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Domain Event Outbox',
+                'verbose_name_plural': 'Domain Event Outbox',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['status', 'scheduled_at'], name='management__status_f55148_idx'), models.Index(fields=['status', 'processed_at'], name='management__status_567c0a_idx')],
+            },
+        ),
+    ]
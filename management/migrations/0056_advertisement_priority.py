@@ -0,0 +1,18 @@
+# Generated by Django 4.2.27 on 2026-10-19 06:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('management', '0055_domain_event_outbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='advertisement',
+            name='priority',
+            field=models.PositiveSmallIntegerField(default=1, help_text='Relative rotation weight within a placement (0 = never shown)', verbose_name='أولوية العرض'),
+        ),
+    ]
@@ -49,6 +49,7 @@ from .audit import (
     ErrorLog,
     EntityVersion,
 )
+from .event_outbox import DomainEventOutbox
 
 # Pending Changes Models
 from .pending_changes import (
@@ -86,7 +87,7 @@ from .content import (
 from .settings import SystemSetting
 
 # Analytics
-from .analytics import AdDailyStats
+from .analytics import AdDailyStats, DailyMetric
 
 __all__ = [
     # Requests
@@ -99,6 +100,7 @@ __all__ = [
     'InvestmentOpportunity',
     'Invoice',
     'AdDailyStats',
+    'DailyMetric',
     # Alerts
     'WeatherAlert',
     'EmergencyAlert',
@@ -113,6 +115,7 @@ __all__ = [
     'GeneralGuideline',
     'ErrorLog',
     'EntityVersion',
+    'DomainEventOutbox',
     # Pending Changes
     'PendingChange',
     # Content
@@ -4,10 +4,10 @@ Advertisement Models
 """
 from django.db import models
 from django.conf import settings
-from ibb_guide.base_models import TimeStampedModel
+from ibb_guide.base_models import FieldTrackerMixin, TimeStampedModel
 
 
-class Advertisement(models.Model):
+class Advertisement(FieldTrackerMixin, models.Model):
     """
     Advertisement Lifecycle States:
     - DRAFT: Partner is preparing the ad (not submitted)
@@ -28,6 +28,9 @@ class Advertisement(models.Model):
         ('payment_issue', 'مشكلة في الدفع'),
     )
 
+    # Diffed by interactions.signals on save
+    tracked_fields = ('status', 'receipt_image')
+
     PLACEMENT_CHOICES = (
         ('banner', 'بانر رئيسي (Homepage)'),
         ('sidebar', 'شريط جانبي (Sidebar)'),
@@ -56,6 +59,11 @@ class Advertisement(models.Model):
     discount_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, help_text="Discounted price (optional)")
     
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='draft')  # Step 8-أ: Start as draft
+    priority = models.PositiveSmallIntegerField(
+        default=1,
+        verbose_name='أولوية العرض',
+        help_text="Relative rotation weight within a placement (0 = never shown)"
+    )
     
     # Payment Proof
     receipt_image = models.ImageField(upload_to='ads/receipts/', blank=True, null=True)
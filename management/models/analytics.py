@@ -26,3 +26,32 @@ class AdDailyStats(models.Model):
 
     def __str__(self):
         return f"{self.advertisement} - {self.date}: {self.clicks}/{self.views}"
+
+
+class DailyMetric(models.Model):
+    """
+    Materialised daily rollup of a dashboard metric.
+
+    ``dimension`` is '' for the site-wide value or a scope such as
+    ``owner:<user_id>``. Rows are rebuilt idempotently by
+    ``MetricsService.rollup`` so dashboards read O(days) rows instead of
+    scanning raw tables.
+    """
+    metric = models.CharField(max_length=50)
+    dimension = models.CharField(max_length=100, blank=True, default='')
+    date = models.DateField()
+    value = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('metric', 'dimension', 'date')
+        ordering = ['-date']
+        indexes = [
+            models.Index(fields=['metric', 'dimension', 'date']),
+            models.Index(fields=['metric', 'date']),
+        ]
+        verbose_name = 'مقياس يومي'
+        verbose_name_plural = 'المقاييس اليومية'
+
+    def __str__(self):
+        return f"{self.metric}[{self.dimension or '*'}] {self.date}: {self.value}"
@@ -4,6 +4,7 @@ Audit & Versioning Models
 """
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from ibb_guide.base_models import TimeStampedModel
@@ -33,6 +34,7 @@ class AuditLog(models.Model):
             models.Index(fields=['table_name', 'record_id']),
             models.Index(fields=['user']),
             models.Index(fields=['action']),
+            models.Index(fields=['timestamp']),
         ]
 
     def __str__(self):
@@ -49,6 +51,7 @@ class GeneralGuideline(TimeStampedModel):
 
 
 class ErrorLog(models.Model):
+    # One row per exception fingerprint; timestamp is the first occurrence
     timestamp = models.DateTimeField(auto_now_add=True)
     path = models.CharField(max_length=255)
     method = models.CharField(max_length=10)
@@ -56,6 +59,15 @@ class ErrorLog(models.Model):
     traceback = models.TextField()
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
     
+    fingerprint = models.CharField(max_length=40, unique=True, null=True, blank=True)
+    occurrences = models.PositiveIntegerField(default=1)
+    last_seen = models.DateTimeField(default=timezone.now, db_index=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['timestamp']),
+        ]
+    
     def __str__(self):
         return f"Error at {self.path} ({self.timestamp})"
 
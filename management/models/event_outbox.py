@@ -0,0 +1,53 @@
+"""
+Domain Event Outbox
+Durable queue for asynchronous EventBus dispatch (one row per event and handler).
+"""
+from django.db import models
+from django.utils import timezone
+
+
+class DomainEventOutbox(models.Model):
+    """
+    A pending delivery of a domain event to one handler.
+    Rows are written in the publisher's transaction and processed by the
+    management.process_domain_events task; each handler is retried
+    independently with exponential backoff.
+    """
+
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('retrying', 'Retrying'),
+        ('done', 'Done'),
+        ('dead', 'Dead Letter'),
+    ]
+
+    event_type = models.CharField(max_length=255)
+    handler = models.CharField(max_length=255)
+    payload = models.JSONField(default=dict)
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    last_error = models.TextField(blank=True, null=True)
+
+    created_at = models.DateTimeField(default=timezone.now)
+    # Next time the row may be picked up (also the lease of a claimed row)
+    scheduled_at = models.DateTimeField(default=timezone.now)
+    processed_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['status', 'scheduled_at']),
+            models.Index(fields=['status', 'processed_at']),
+        ]
+        verbose_name = 'Domain Event Outbox'
+        verbose_name_plural = 'Domain Event Outbox'
+
+    def __str__(self):
+        return f"[{self.status}] {self.event_type} → {self.handler}"
+
+    @property
+    def retry_countdown(self) -> int:
+        """Exponential backoff (30s to 1h max), as for NotificationOutbox."""
+        return min(2 ** self.attempts * 30, 3600)
@@ -27,6 +27,11 @@ class RouteLog(TimeStampedModel):
     safety_status = models.CharField(max_length=20)  # Safe, Warning, Danger
     warnings = models.JSONField(default=list)
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at']),
+        ]
+    
     def __str__(self):
         return f"Route to {self.destination_place} ({self.safety_status})"
 
@@ -51,8 +56,41 @@ class GeoZone(TimeStampedModel):
     polygon = models.JSONField(help_text="List of [lat, lon] points defining the zone")
     is_active = models.BooleanField(default=True)
     
+    # Bounding box, derived from polygon on save (used to pre-filter zones in SQL)
+    min_lat = models.FloatField(null=True, blank=True, editable=False)
+    max_lat = models.FloatField(null=True, blank=True, editable=False)
+    min_lon = models.FloatField(null=True, blank=True, editable=False)
+    max_lon = models.FloatField(null=True, blank=True, editable=False)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['is_active', 'min_lat', 'max_lat']),
+            models.Index(fields=['min_lon', 'max_lon']),
+        ]
+    
     def __str__(self):
         return f"{self.name} ({self.get_zone_type_display()})"
+    
+    @staticmethod
+    def compute_bbox(polygon):
+        """Return (min_lat, max_lat, min_lon, max_lon) or None for an invalid polygon."""
+        if not polygon or not isinstance(polygon, list):
+            return None
+        try:
+            lats = [float(p[0]) for p in polygon]
+            lons = [float(p[1]) for p in polygon]
+        except (TypeError, ValueError, IndexError):
+            return None
+        return min(lats), max(lats), min(lons), max(lons)
+    
+    def save(self, *args, **kwargs):
+        self.min_lat, self.max_lat, self.min_lon, self.max_lon = (
+            self.compute_bbox(self.polygon) or (None, None, None, None)
+        )
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'polygon' in update_fields:
+            kwargs['update_fields'] = set(update_fields) | {'min_lat', 'max_lat', 'min_lon', 'max_lon'}
+        super().save(*args, **kwargs)
 
 
 class UserLocation(models.Model):
@@ -3,6 +3,7 @@ from datetime import timedelta
 from django.db import transaction
 from django.core.exceptions import ValidationError
 from django.conf import settings
+from ibb_guide.services.cache_service import bump_version, get_version
 from management.models import Advertisement, Invoice
 
 
@@ -213,38 +214,158 @@ class AdService:
         return True, f"تم تمديد الإعلان {extra_days} أيام. الرجاء سداد رسوم التمديد.", extension_cost
 
     @staticmethod
-    def check_expirations():
+    def check_expirations(today=None, batch_size=None):
         """
         Background task to expire ads.
         Should be called by Celery Beat daily.
         
+        Ads past their end_date are moved to 'expired' with one
+        UPDATE ... WHERE status = 'active' per chunk. The rows that
+        statement actually changed drive the bulk AD_EXPIRED fan-out, in
+        the same transaction, so overlapping runs never expire or notify
+        the same ad twice, and a failed fan-out leaves its chunk active
+        for the next run.
+        
         Returns:
             int: Number of expired ads
         """
-        today = timezone.now().date()
-        expired_ads = Advertisement.objects.filter(
-            status='active',
-            end_date__lt=today
-        )
-        
+        from interactions.notifications.notification_service import NotificationService
+        from management.services.ad_slot_service import AdSlotService
+
+        today = today or timezone.now().date()
+        batch_size = batch_size or getattr(settings, 'AD_EXPIRY_BATCH_SIZE', 1000)
+        partner_ads_url = AdService._partner_ads_url()
         count = 0
-        for ad in expired_ads:
-            ad.status = 'expired'
-            ad.save()
-            count += 1
-            
-            # Notify Partner
-            try:
-                from interactions.notifications.notification_service import NotificationService
-                NotificationService.notify(
-                    event='AD_EXPIRED',
-                    user=ad.owner,
-                    metadata={'ad_id': ad.pk, 'ad_title': ad.title}
+        last_pk = 0
+        owners = set()
+
+        while True:
+            ids = list(
+                Advertisement.objects.filter(status='active', end_date__lt=today, pk__gt=last_pk)
+                .order_by('pk').values_list('pk', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            last_pk = ids[-1]
+
+            with transaction.atomic():
+                expired = AdService._transition(ids, 'active', 'expired')
+                NotificationService.emit_bulk('AD_EXPIRED', [
+                    (owner_id, {
+                        'ad_id': pk, 'ad_title': title,
+                        'url': f"{partner_ads_url}#ad-{pk}",
+                    })
+                    for pk, owner_id, title, _ in expired if owner_id
+                ])
+            count += len(expired)
+            owners.update(owner_id for _, owner_id, _, _ in expired)
+
+        if count:
+            transaction.on_commit(AdSlotService.invalidate)
+        for owner_id in owners:
+            AdService.invalidate_partner_stats(owner_id)
+        return count
+
+    @staticmethod
+    def send_expiration_warnings(today=None, days=3, batch_size=None):
+        """
+        Warn owners of active ads ending within `days` days (AD_EXPIRING_SOON).
+        
+        Runs at most once per day: a cache lock keeps overlapping runs out,
+        and a per-day cursor (last ad pk warned) lets a run that died half
+        way resume without re-warning the ads it already covered.
+        
+        Returns:
+            int: Number of warnings sent, or None if another run holds the lock
+        """
+        from django.core.cache import cache
+        from interactions.notifications.notification_service import NotificationService
+
+        today = today or timezone.now().date()
+        batch_size = batch_size or getattr(settings, 'AD_EXPIRY_BATCH_SIZE', 1000)
+        cursor_key = f"ads:expiry_warnings:{today}"
+        lock_key = f"{cursor_key}:lock"
+        if not cache.add(lock_key, True, getattr(settings, 'AD_EXPIRY_LOCK_SECONDS', 600)):
+            return None
+
+        partner_ads_url = AdService._partner_ads_url()
+        warned = 0
+        try:
+            last_pk = cache.get(cursor_key, 0)
+            while True:
+                ads = list(
+                    Advertisement.objects.filter(
+                        status='active',
+                        end_date__gte=today,
+                        end_date__lte=today + timedelta(days=days),
+                        owner__isnull=False,
+                        pk__gt=last_pk,
+                    ).order_by('pk').values_list('pk', 'owner_id', 'title', 'end_date')[:batch_size]
                 )
-            except Exception:
-                pass  # Don't break loop for notification errors
+                if not ads:
+                    break
+                with transaction.atomic():
+                    warned += NotificationService.emit_bulk('AD_EXPIRING_SOON', [
+                        (owner_id, {
+                            'ad_id': pk, 'ad_title': title,
+                            'days_remaining': (end_date - today).days,
+                            'end_date': str(end_date),
+                            'url': f"{partner_ads_url}#ad-{pk}",
+                        })
+                        for pk, owner_id, title, end_date in ads
+                    ])
+                last_pk = ads[-1][0]
+                cache.set(cursor_key, last_pk, 2 * 86400)
+        finally:
+            cache.delete(lock_key)
+        return warned
+
+    @staticmethod
+    def _transition(ids, from_status, to_status):
+        """
+        Set status on the given ads that are still in from_status and return
+        (pk, owner_id, title, end_date) of exactly the rows this call changed.
         
-        return count
+        Uses UPDATE ... RETURNING where the backend has it (PostgreSQL,
+        SQLite >= 3.35); elsewhere rows are claimed with SELECT ... FOR
+        UPDATE SKIP LOCKED first. Call inside a transaction.
+        """
+        from django.db import connection
+
+        if not ids:
+            return []
+        if connection.vendor in ('postgresql', 'sqlite') and connection.features.can_return_columns_from_insert:
+            qn = connection.ops.quote_name
+            opts = Advertisement._meta
+            columns = ', '.join(
+                qn(opts.get_field(name).column) for name in ('id', 'owner', 'title', 'end_date')
+            )
+            status = qn(opts.get_field('status').column)
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"UPDATE {qn(opts.db_table)} SET {status} = %s "
+                    f"WHERE {qn(opts.pk.column)} IN ({', '.join(['%s'] * len(ids))}) AND {status} = %s "
+                    f"RETURNING {columns}",
+                    [to_status, *ids, from_status],
+                )
+                rows = cursor.fetchall()
+            # SQLite returns dates as text from raw cursors
+            field = opts.get_field('end_date')
+            return sorted(
+                (pk, owner_id, title, field.to_python(end_date)) for pk, owner_id, title, end_date in rows
+            )
+
+        claimed = Advertisement.objects.filter(pk__in=ids, status=from_status).order_by('pk')
+        if connection.features.has_select_for_update_skip_locked:
+            claimed = claimed.select_for_update(skip_locked=True)
+        rows = list(claimed.values_list('pk', 'owner_id', 'title', 'end_date'))
+        Advertisement.objects.filter(pk__in=[row[0] for row in rows]).update(status=to_status)
+        return rows
+
+    @staticmethod
+    def _partner_ads_url():
+        from django.urls import reverse
+        return reverse('partner_ads')
 
     @staticmethod
     def expire_ads():
@@ -252,27 +373,107 @@ class AdService:
         return AdService.check_expirations()
 
     @staticmethod
-    def get_partner_stats(user):
+    def get_partner_stats(user, start_date=None, end_date=None, use_cache=True):
         """
         Get advertisement statistics for a partner.
         
+        Totals, the per-ad breakdown and the daily series for
+        [start_date, end_date] (default: the last 30 days) are grouped
+        aggregates in SQL. Results are cached per partner until an ad or
+        invoice of theirs changes (invalidate_partner_stats) or
+        AD_PARTNER_STATS_CACHE_SECONDS pass; tracked views and clicks show
+        up when the entry expires.
+        
         Returns:
-            dict: Statistics including counts and totals
+            dict: Statistics including counts and totals, plus
+            'range', 'daily' and 'per_ad' breakdowns
         """
-        ads = Advertisement.objects.filter(owner=user)
-        
+        from django.core.cache import cache
+
+        end_date = end_date or timezone.localdate()
+        start_date = start_date or end_date - timedelta(days=29)
+        if not use_cache:
+            return AdService._compute_partner_stats(user.pk, start_date, end_date)
+
+        version = get_version(AdService._partner_stats_version_key(user.pk))
+        cache_key = f"ads:partner_stats:{user.pk}:{version}:{start_date}:{end_date}"
+        stats = cache.get(cache_key)
+        if stats is None:
+            stats = AdService._compute_partner_stats(user.pk, start_date, end_date)
+            cache.set(cache_key, stats, getattr(settings, 'AD_PARTNER_STATS_CACHE_SECONDS', 300))
+        return stats
+
+    @staticmethod
+    def invalidate_partner_stats(owner_id):
+        """Drop every cached get_partner_stats result for a partner."""
+        if owner_id:
+            bump_version(AdService._partner_stats_version_key(owner_id))
+
+    @staticmethod
+    def _partner_stats_version_key(owner_id):
+        return f"ads:partner_stats:{owner_id}:version"
+
+    @staticmethod
+    def _compute_partner_stats(owner_id, start_date, end_date):
+        from django.db.models import Count, DecimalField, IntegerField, OuterRef, Q, Subquery, Sum, Value
+        from django.db.models.functions import Coalesce
+        from management.models import AdDailyStats
+
+        ads = Advertisement.objects.filter(owner_id=owner_id)
+        totals = ads.aggregate(
+            total_ads=Count('id'),
+            active_ads=Count('id', filter=Q(status='active')),
+            pending_ads=Count('id', filter=Q(status='pending')),
+            expired_ads=Count('id', filter=Q(status='expired')),
+            total_views=Coalesce(Sum('views'), 0),
+            total_clicks=Coalesce(Sum('clicks'), 0),
+        )
+        totals['total_spent'] = Invoice.objects.filter(partner_id=owner_id, is_paid=True).aggregate(
+            total=Coalesce(Sum('total_amount'), Value(0), output_field=DecimalField())
+        )['total']
+
+        in_range = AdDailyStats.objects.filter(
+            advertisement__owner_id=owner_id, date__gte=start_date, date__lte=end_date
+        )
+        daily = list(
+            in_range.values('date').annotate(views=Sum('views'), clicks=Sum('clicks')).order_by('date')
+        )
+
+        def ad_range_sum(field):
+            return Coalesce(Subquery(
+                AdDailyStats.objects.filter(
+                    advertisement=OuterRef('pk'), date__gte=start_date, date__lte=end_date
+                ).values('advertisement').annotate(total=Sum(field)).values('total'),
+                output_field=IntegerField(),
+            ), 0)
+
+        per_ad = list(
+            ads.annotate(
+                range_views=ad_range_sum('views'),
+                range_clicks=ad_range_sum('clicks'),
+                spent=Coalesce(Subquery(
+                    Invoice.objects.filter(advertisement=OuterRef('pk'), is_paid=True)
+                    .values('advertisement').annotate(total=Sum('total_amount')).values('total'),
+                    output_field=DecimalField(),
+                ), Value(0), output_field=DecimalField()),
+            ).values(
+                'id', 'title', 'status', 'views', 'clicks', 'range_views', 'range_clicks', 'spent'
+            ).order_by('-range_views', 'id')
+        )
+
+        range_views = sum(row['views'] for row in daily)
+        range_clicks = sum(row['clicks'] for row in daily)
         return {
-            'total_ads': ads.count(),
-            'active_ads': ads.filter(status='active').count(),
-            'pending_ads': ads.filter(status='pending').count(),
-            'expired_ads': ads.filter(status='expired').count(),
-            'total_views': sum(ad.views for ad in ads),
-            'total_clicks': sum(ad.clicks for ad in ads),
-            'total_spent': sum(
-                inv.total_amount for inv in Invoice.objects.filter(
-                    partner=user, is_paid=True
-                )
-            ),
+            **totals,
+            'range': {
+                'start_date': start_date,
+                'end_date': end_date,
+                'views': range_views,
+                'clicks': range_clicks,
+                'ctr': round(range_clicks * 100 / range_views, 2) if range_views else 0,
+            },
+            'daily': daily,
+            'per_ad': per_ad,
         }
 
     @staticmethod
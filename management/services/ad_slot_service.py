@@ -0,0 +1,132 @@
+"""
+Ad Slot Service
+Per-placement tables of eligible ads with render-ready payloads, sampled
+in memory (weighted by Advertisement.priority) without a database query.
+"""
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Optional
+from django.db.models import Q
+from django.utils import timezone
+from ibb_guide.services.cache_service import VersionedSnapshot
+import random
+
+AD_SLOT_VERSION_KEY = 'ad_slots:version'
+
+
+@dataclass(frozen=True)
+class AdPayload:
+    """What the ad slot templates need, captured when the table is built."""
+    pk: int
+    title: str
+    description: str
+    image_url: str
+    has_link: bool
+    price: Optional[Decimal]
+    discount_price: Optional[Decimal]
+    weight: int
+
+
+class AliasSampler:
+    """
+    Vose's alias method: O(n) setup, then O(1) weighted draws using two
+    random numbers (a column and a coin flip).
+    """
+
+    def __init__(self, weights):
+        n = len(weights)
+        total = float(sum(weights))
+        scaled = [w * n / total for w in weights]
+        self.prob = [1.0] * n
+        self.alias = list(range(n))
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        # Whatever is left is 1.0 up to rounding error
+
+    def draw(self, rng=random):
+        column = rng.randrange(len(self.prob))
+        return column if rng.random() < self.prob[column] else self.alias[column]
+
+
+class AdSlotTable:
+    """Eligible ads for one placement on one day."""
+
+    def __init__(self, placement, day, payloads, version=None):
+        self.placement = placement
+        self.day = day
+        self.version = version
+        self.payloads = tuple(payloads)
+        self.sampler = AliasSampler([p.weight for p in self.payloads]) if self.payloads else None
+
+    def pick(self, rng=random):
+        if not self.payloads:
+            return None
+        return self.payloads[self.sampler.draw(rng)]
+
+
+class AdSlotService:
+    _tables = VersionedSnapshot(
+        AD_SLOT_VERSION_KEY,
+        lambda version, placement: AdSlotService.build_table(placement, timezone.localdate(), version),
+        check_setting='AD_SLOT_VERSION_CHECK_SECONDS',
+    )
+
+    @staticmethod
+    def pick(placement, rng=random):
+        """Weighted random AdPayload for a placement, or None."""
+        return AdSlotService.get_table(placement).pick(rng)
+
+    @staticmethod
+    def get_table(placement):
+        """
+        Return the process-wide table for a placement, rebuilding it when the
+        shared ad version changes or the day rolls over. The version is
+        re-read at most every AD_SLOT_VERSION_CHECK_SECONDS (default 5s).
+        """
+        today = timezone.localdate()
+        return AdSlotService._tables.get(placement, stale=lambda table: table.day != today)
+
+    @staticmethod
+    def build_table(placement, day=None, version=None):
+        """One query: active, in-date ads with a positive priority."""
+        from management.models import Advertisement
+
+        day = day or timezone.localdate()
+        storage = Advertisement._meta.get_field('banner_image').storage
+        rows = Advertisement.objects.filter(
+            status='active',
+            placement=placement,
+            start_date__lte=day,
+            priority__gt=0,
+        ).filter(
+            Q(end_date__gte=day) | Q(end_date__isnull=True)
+        ).order_by('pk').values_list(
+            'pk', 'title', 'description', 'banner_image', 'target_url', 'place_id',
+            'price', 'discount_price', 'priority',
+        )
+        payloads = [
+            AdPayload(
+                pk=pk,
+                title=title,
+                description=description,
+                image_url=storage.url(image) if image else '',
+                has_link=bool(place_id or target_url),
+                price=price,
+                discount_price=discount_price,
+                weight=priority,
+            )
+            for pk, title, description, image, target_url, place_id, price, discount_price, priority in rows
+        ]
+        return AdSlotTable(placement, day, payloads, version=version)
+
+    @staticmethod
+    def invalidate():
+        """Bump the ad version so every process rebuilds its tables."""
+        AdSlotService._tables.invalidate()
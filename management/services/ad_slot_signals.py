@@ -0,0 +1,15 @@
+"""
+Ad Slot Signals
+Rebuild the in-process ad slot tables when ads change.
+"""
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from management.models.advertisements import Advertisement
+from management.services.ad_slot_service import AdSlotService
+
+
+@receiver(post_save, sender=Advertisement)
+@receiver(post_delete, sender=Advertisement)
+def on_advertisement_change(sender, instance, **kwargs):
+    transaction.on_commit(AdSlotService.invalidate)
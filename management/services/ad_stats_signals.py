@@ -0,0 +1,22 @@
+"""
+Ad Stats Signals
+Invalidate cached partner ad statistics when ads or invoices change.
+"""
+from functools import partial
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from management.models.advertisements import Advertisement, Invoice
+from management.services.ad_service import AdService
+
+
+@receiver(post_save, sender=Advertisement)
+@receiver(post_delete, sender=Advertisement)
+def on_advertisement_change(sender, instance, **kwargs):
+    transaction.on_commit(partial(AdService.invalidate_partner_stats, instance.owner_id))
+
+
+@receiver(post_save, sender=Invoice)
+@receiver(post_delete, sender=Invoice)
+def on_invoice_change(sender, instance, **kwargs):
+    transaction.on_commit(partial(AdService.invalidate_partner_stats, instance.partner_id))
@@ -0,0 +1,215 @@
+"""
+Error Log Service
+Deduplicated, deferred recording of unhandled exceptions.
+
+Exceptions are grouped by a fingerprint (exception type + innermost
+frames). On the request path an occurrence only increments a counter in
+the cache; the first occurrence of a fingerprint in each
+ERROR_LOG_FLUSH_SECONDS window schedules a flush task, which folds the
+accumulated count into a single ErrorLog row per fingerprint. Admin alerts
+are sent at most once per fingerprint every ERROR_ALERT_THROTTLE_SECONDS.
+An error storm therefore costs one write and at most one alert per
+fingerprint per window instead of one of each per request. Occurrences
+arriving after a window's flush ran (at once under eager Celery) are
+remembered by the process that counted them and folded in when its first
+request finishes after the window closes (see error_log_signals); the
+flush_pending_error_logs task does the same wherever beat runs.
+"""
+import hashlib
+import logging
+import os
+import threading
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from management.models import ErrorLog
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINT_FRAMES = 5
+PENDING_TTL = 24 * 60 * 60
+
+
+def fingerprint(exception, frames=FINGERPRINT_FRAMES):
+    """Stable id for an exception: its type and innermost frames (file, function)."""
+    exc_type = type(exception)
+    parts = [f'{exc_type.__module__}.{exc_type.__qualname__}']
+    for frame in traceback.extract_tb(exception.__traceback__)[-frames:]:
+        parts.append(f'{os.path.basename(frame.filename)}:{frame.name}')
+    return hashlib.sha1('|'.join(parts).encode()).hexdigest()
+
+
+class ErrorLogService:
+    PENDING_KEY = 'errorlog:{fp}:pending'
+    SAMPLE_KEY = 'errorlog:{fp}:sample'
+    SCHEDULED_KEY = 'errorlog:{fp}:scheduled'
+    ALERTED_KEY = 'errorlog:{fp}:alerted'
+
+    # Fingerprints this process counted without scheduling a flush -> when
+    _unflushed = {}
+    _unflushed_lock = threading.Lock()
+
+    @staticmethod
+    def _flush_seconds():
+        return getattr(settings, 'ERROR_LOG_FLUSH_SECONDS', 10)
+
+    @staticmethod
+    def capture(request, exception):
+        """
+        Record an occurrence of an unhandled exception (request path).
+        Touches only the cache unless a flush has to be scheduled.
+        """
+        fp = fingerprint(exception)
+        pending_key = ErrorLogService.PENDING_KEY.format(fp=fp)
+        cache.add(pending_key, 0, PENDING_TTL)
+        try:
+            cache.incr(pending_key)
+        except ValueError:
+            cache.set(pending_key, 1, PENDING_TTL)
+
+        delay = ErrorLogService._flush_seconds()
+        if not cache.add(ErrorLogService.SCHEDULED_KEY.format(fp=fp), 1, delay):
+            # This window's flush may already have run; see flush_unflushed
+            with ErrorLogService._unflushed_lock:
+                ErrorLogService._unflushed.setdefault(fp, time.monotonic())
+            return fp
+
+        user = getattr(request, 'user', None)
+        cache.set(ErrorLogService.SAMPLE_KEY.format(fp=fp), {
+            'path': request.path[:255],
+            'method': request.method,
+            'error_message': str(exception),
+            'traceback': ''.join(traceback.format_exception(type(exception), exception, exception.__traceback__)),
+            'user_id': user.pk if user is not None and user.is_authenticated else None,
+        }, PENDING_TTL)
+
+        from management.tasks import flush_error_log
+        try:
+            flush_error_log.apply_async(args=[fp], countdown=delay)
+        except Exception as e:
+            # Broker unavailable: write now (still at most once per window)
+            logger.warning(f"[ErrorLog] Could not defer flush: {e}")
+            ErrorLogService.flush(fp)
+        return fp
+
+    @staticmethod
+    def flush(fp):
+        """
+        Fold pending occurrences of a fingerprint into its ErrorLog row.
+        Returns the row, or None when nothing was pending.
+        """
+        pending_key = ErrorLogService.PENDING_KEY.format(fp=fp)
+        count = cache.get(pending_key) or 0
+        if count:
+            # decr rather than delete: occurrences arriving meanwhile are kept
+            try:
+                cache.decr(pending_key, count)
+            except ValueError:
+                pass
+        sample = cache.get(ErrorLogService.SAMPLE_KEY.format(fp=fp))
+        if not count or not sample:
+            return None
+
+        now = timezone.now()
+        fields = {
+            'path': sample['path'],
+            'method': sample['method'],
+            'error_message': sample['error_message'],
+            'traceback': sample['traceback'],
+            'user_id': sample['user_id'],
+        }
+        created = False
+        if not ErrorLog.objects.filter(fingerprint=fp).update(
+            occurrences=F('occurrences') + count, last_seen=now, **fields
+        ):
+            try:
+                with transaction.atomic():
+                    ErrorLog.objects.create(fingerprint=fp, occurrences=count, last_seen=now, **fields)
+                created = True
+            except IntegrityError:
+                # Another worker created the row first
+                ErrorLog.objects.filter(fingerprint=fp).update(
+                    occurrences=F('occurrences') + count, last_seen=now, **fields
+                )
+
+        ErrorLogService._alert(fp, sample, count, created)
+        return ErrorLog.objects.filter(fingerprint=fp).first()
+
+    @staticmethod
+    def flush_unflushed(**kwargs):
+        """
+        request_finished receiver: flush fingerprints this process counted
+        more than ERROR_LOG_FLUSH_SECONDS ago without scheduling a flush.
+        Costs nothing when there are none.
+        """
+        if not ErrorLogService._unflushed:
+            return 0
+        cutoff = time.monotonic() - ErrorLogService._flush_seconds()
+        with ErrorLogService._unflushed_lock:
+            due = [fp for fp, since in ErrorLogService._unflushed.items() if since <= cutoff]
+            for fp in due:
+                del ErrorLogService._unflushed[fp]
+        flushed = 0
+        for fp in due:
+            try:
+                if ErrorLogService.flush(fp) is not None:
+                    flushed += 1
+            except Exception as e:
+                logger.warning(f"[ErrorLog] Could not flush pending occurrences: {e}")
+        return flushed
+
+    @staticmethod
+    def flush_pending(batch_size=500):
+        """
+        Flush every fingerprint that still has pending occurrences.
+        Pending counters outlive their window's flush by at most
+        PENDING_TTL, so only rows seen within that time are checked.
+        Returns the number of fingerprints flushed.
+        """
+        cutoff = timezone.now() - timedelta(seconds=PENDING_TTL)
+        fingerprints = ErrorLog.objects.filter(
+            last_seen__gte=cutoff, fingerprint__isnull=False
+        ).values_list('fingerprint', flat=True)
+
+        flushed = 0
+        batch = []
+        for fp in fingerprints.iterator():
+            batch.append(fp)
+            if len(batch) >= batch_size:
+                flushed += ErrorLogService._flush_batch(batch)
+                batch = []
+        if batch:
+            flushed += ErrorLogService._flush_batch(batch)
+        return flushed
+
+    @staticmethod
+    def _flush_batch(fingerprints):
+        keys = {ErrorLogService.PENDING_KEY.format(fp=fp): fp for fp in fingerprints}
+        flushed = 0
+        for key, count in cache.get_many(list(keys)).items():
+            if count and ErrorLogService.flush(keys[key]) is not None:
+                flushed += 1
+        return flushed
+
+    @staticmethod
+    def _alert(fp, sample, count, created):
+        throttle = getattr(settings, 'ERROR_ALERT_THROTTLE_SECONDS', 15 * 60)
+        if not cache.add(ErrorLogService.ALERTED_KEY.format(fp=fp), 1, throttle):
+            return
+        try:
+            from management.services.notification_service import NotificationService
+            suffix = '' if count == 1 else f" (x{count})"
+            NotificationService.notify_admins(
+                title="⚠️ System Crash Alert" if created else "⚠️ Recurring System Error",
+                message=f"Error at {sample['path']}: {sample['error_message'][:100]}{suffix}",
+                notification_type='error'
+            )
+        except Exception as e:
+            logger.error(f"[ErrorLog] Failed to send alert: {e}")
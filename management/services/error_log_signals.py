@@ -0,0 +1,10 @@
+"""
+Error Log Signals
+Fold occurrences counted after their window's flush into ErrorLog once the
+window has closed, without relying on a periodic task.
+"""
+from django.core.signals import request_finished
+
+from management.services.error_log_service import ErrorLogService
+
+request_finished.connect(ErrorLogService.flush_unflushed, dispatch_uid='error_log_flush_unflushed')
@@ -0,0 +1,43 @@
+"""
+Feature Toggle Service
+Feature toggles from a per-process snapshot (one query to build),
+revalidated against a shared version key at most every
+FEATURE_TOGGLE_VERSION_CHECK_SECONDS. Saving a toggle bumps the version.
+"""
+from ibb_guide.services.cache_service import VersionedSnapshot
+
+
+class FeatureToggleService:
+    VERSION_KEY = 'feature_toggles:version'
+
+    _snapshot = VersionedSnapshot(
+        VERSION_KEY,
+        lambda version: FeatureToggleService._load(version),
+        check_setting='FEATURE_TOGGLE_VERSION_CHECK_SECONDS',
+    )
+
+    @classmethod
+    def is_enabled(cls, key, default=False):
+        """Whether a toggle is on; ``default`` when no such toggle exists."""
+        return cls._snapshot.get()['toggles'].get(key, default)
+
+    @classmethod
+    def enabled_keys(cls):
+        """frozenset of the keys of all enabled toggles."""
+        return cls._snapshot.get()['enabled']
+
+    @classmethod
+    def invalidate(cls):
+        """Bump the shared version so every process reloads its snapshot."""
+        cls._snapshot.invalidate()
+
+    @staticmethod
+    def _load(version):
+        from management.models import FeatureToggle
+
+        toggles = dict(FeatureToggle.objects.values_list('key', 'is_enabled'))
+        return {
+            'version': version,
+            'toggles': toggles,
+            'enabled': frozenset(key for key, enabled in toggles.items() if enabled),
+        }
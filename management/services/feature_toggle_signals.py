@@ -0,0 +1,15 @@
+"""
+Feature Toggle Signals
+Bump the feature toggle snapshot version when toggles change.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from management.models import FeatureToggle
+from management.services.feature_toggle_service import FeatureToggleService
+
+
+@receiver(post_save, sender=FeatureToggle)
+@receiver(post_delete, sender=FeatureToggle)
+def on_feature_toggle_change(sender, instance, **kwargs):
+    FeatureToggleService.invalidate()
@@ -1,6 +1,88 @@
 from management.models import GeoZone, UserLocation
+from django.conf import settings
 from django.db.models import Q
+from ibb_guide.services.cache_service import VersionedSnapshot
 import json
+import math
+
+ZONE_VERSION_KEY = 'geo_zones:version'
+
+
+def _point_in_ring(x, y, xs, ys):
+    """
+    Ray casting over pre-compiled coordinate tuples.
+    Same edge semantics as GeoService._is_point_in_polygon.
+    """
+    inside = False
+    n = len(xs)
+    p1x, p1y = xs[0], ys[0]
+    for i in range(1, n + 1):
+        p2x, p2y = xs[i % n], ys[i % n]
+        if p1y < p2y:
+            lo, hi = p1y, p2y
+        else:
+            lo, hi = p2y, p1y
+        if lo < y <= hi and x <= (p1x if p1x > p2x else p2x):
+            if p1x == p2x or x <= (y - p1y) * (p2x - p1x) / (p2y - p1y) + p1x:
+                inside = not inside
+        p1x, p1y = p2x, p2y
+    return inside
+
+
+class ZoneIndex:
+    """
+    In-process uniform grid over compiled zone polygons.
+
+    Each zone is stored as (id, min_lat, max_lat, min_lon, max_lon, lats, lons)
+    with coordinates as float tuples, and registered in every grid cell its
+    bounding box overlaps. Zones spanning too many cells go to a small list
+    that is scanned by bounding box.
+    """
+    MAX_CELLS_PER_ZONE = 256
+
+    def __init__(self, rows, version=None, cell_size=0.05):
+        self.version = version
+        self.cell_size = cell_size
+        self.grid = {}
+        self.large = []
+        self.size = 0
+        for zone_id, polygon in rows:
+            self.add(zone_id, polygon)
+
+    def _cell(self, value):
+        return math.floor(value / self.cell_size)
+
+    def add(self, zone_id, polygon):
+        bbox = GeoZone.compute_bbox(polygon)
+        if bbox is None:
+            return
+        min_lat, max_lat, min_lon, max_lon = bbox
+        entry = (
+            zone_id, min_lat, max_lat, min_lon, max_lon,
+            tuple(float(p[0]) for p in polygon),
+            tuple(float(p[1]) for p in polygon),
+        )
+        i0, i1 = self._cell(min_lat), self._cell(max_lat)
+        j0, j1 = self._cell(min_lon), self._cell(max_lon)
+        self.size += 1
+        if (i1 - i0 + 1) * (j1 - j0 + 1) > self.MAX_CELLS_PER_ZONE:
+            self.large.append(entry)
+            return
+        for i in range(i0, i1 + 1):
+            for j in range(j0, j1 + 1):
+                self.grid.setdefault((i, j), []).append(entry)
+
+    def query(self, lat, lon):
+        """Return ids of zones containing the point."""
+        x, y = float(lat), float(lon)
+        candidates = self.grid.get((self._cell(x), self._cell(y)), ())
+        hits = []
+        for entries in (candidates, self.large):
+            for zone_id, min_lat, max_lat, min_lon, max_lon, lats, lons in entries:
+                if min_lat <= x <= max_lat and min_lon <= y <= max_lon and _point_in_ring(x, y, lats, lons):
+                    hits.append(zone_id)
+        return hits
+
 
 class GeoService:
     """
@@ -19,26 +101,74 @@ class GeoService:
         GeoService.check_user_safety(user, lat, lon)
         return loc
 
+    _zone_index = VersionedSnapshot(
+        ZONE_VERSION_KEY,
+        lambda version: GeoService.build_zone_index(version),
+        check_setting='GEO_ZONE_VERSION_CHECK_SECONDS',
+    )
+
     @staticmethod
     def check_user_safety(user, lat, lon):
         """
         Check if user is inside any high-risk zone.
         Triggers alerts if true.
         """
-        # Fetch active zones - optimization: filter by bounding box first in real PostGIS
-        # Here we iterate (assuming low number of zones for MVP)
-        zones = GeoZone.objects.filter(is_active=True)
-        
-        alerts = []
-        for zone in zones:
-            if GeoService._is_point_in_polygon(lat, lon, zone.polygon):
-                alerts.append(zone)
-                
+        zone_ids = GeoService.find_zone_ids(lat, lon)
+        if not zone_ids:
+            return []
+
+        alerts = list(GeoZone.objects.filter(pk__in=zone_ids, is_active=True))
         if alerts:
             GeoService._trigger_zone_alerts(user, alerts)
             
         return alerts
 
+    @staticmethod
+    def find_zone_ids(lat, lon):
+        """
+        Ids of active zones containing (lat, lon).
+        Uses the in-process grid index unless GEO_ZONE_INDEX_ENABLED is False,
+        in which case zones are pre-filtered by bounding box in SQL.
+        """
+        if not getattr(settings, 'GEO_ZONE_INDEX_ENABLED', True):
+            return GeoService._find_zone_ids_db(lat, lon)
+        return GeoService.get_zone_index().query(lat, lon)
+
+    @staticmethod
+    def _find_zone_ids_db(lat, lon):
+        """Bounding-box rejection in SQL, exact test in Python."""
+        x, y = float(lat), float(lon)
+        rows = GeoZone.objects.filter(
+            is_active=True,
+            min_lat__lte=x, max_lat__gte=x,
+            min_lon__lte=y, max_lon__gte=y,
+        ).values_list('pk', 'polygon')
+        return ZoneIndex(rows).query(x, y)
+
+    @staticmethod
+    def get_zone_index():
+        """
+        Return the process-wide zone index, rebuilding it when the shared zone
+        version changes. The version is re-read at most every
+        GEO_ZONE_VERSION_CHECK_SECONDS (default 5s).
+        """
+        return GeoService._zone_index.get()
+
+    @staticmethod
+    def build_zone_index(version=None):
+        """One query: active zones, bucketed into the grid."""
+        rows = GeoZone.objects.filter(is_active=True).values_list('pk', 'polygon')
+        return ZoneIndex(
+            rows.iterator(),
+            version=version,
+            cell_size=getattr(settings, 'GEO_ZONE_GRID_CELL_DEGREES', 0.05),
+        )
+
+    @staticmethod
+    def invalidate_zone_index():
+        """Bump the zone version so every process rebuilds its index."""
+        GeoService._zone_index.invalidate()
+
     @staticmethod
     def _is_point_in_polygon(lat, lon, polygon):
         """
@@ -0,0 +1,14 @@
+"""
+Geo Signals
+Rebuild the in-process zone index when zones change.
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from management.models.geo import GeoZone
+from management.services.geo_service import GeoService
+
+
+@receiver(post_save, sender=GeoZone)
+@receiver(post_delete, sender=GeoZone)
+def on_geo_zone_change(sender, instance, **kwargs):
+    GeoService.invalidate_zone_index()
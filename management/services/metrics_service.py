@@ -0,0 +1,213 @@
+"""
+Metrics Service
+Daily metric rollups for the admin and partner dashboards.
+
+Raw tables (users, reviews, places, PlaceDailyView, AdDailyStats) are
+aggregated once per day into ``DailyMetric`` rows. Dashboards read the
+rollup so a historical range costs O(days) rather than O(rows).
+
+Rollups are idempotent: a run upserts the rows of the requested range
+and deletes the ones it no longer produces, so overlapping or repeated
+runs converge to the same result. A site-wide ('' dimension) row is
+always written for every day, which lets the rollup task find gaps.
+Reads never write: they serve the rows that exist, zero-filled, and count
+today live from the raw tables.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from management.models import DailyMetric
+
+logger = logging.getLogger(__name__)
+
+GLOBAL = ''
+ROLLUP_LOCK_KEY = 'metrics_rollup:lock'
+ROLLUP_LOCK_TIMEOUT = 600
+
+
+def owner_dimension(user_id):
+    """Dimension key for per-owner (partner) metrics."""
+    return f'owner:{user_id}'
+
+
+def _days(start, end):
+    return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+def _count_created(queryset, field, owner_field=None):
+    """Build a rollup for 'rows created per day', optionally per owner."""
+    def build(start, end):
+        qs = queryset().filter(**{f'{field}__date__range': (start, end)}).annotate(
+            day=TruncDate(field)
+        ).order_by()
+        values = {
+            (GLOBAL, row['day']): row['value']
+            for row in qs.values('day').annotate(value=Count('pk'))
+        }
+        if owner_field:
+            for row in qs.filter(**{f'{owner_field}__isnull': False}).values(
+                'day', owner_field
+            ).annotate(value=Count('pk')):
+                values[(owner_dimension(row[owner_field]), row['day'])] = row['value']
+        return values
+    return build
+
+
+def _sum_daily(queryset, field, owner_field=None):
+    """Build a rollup summing a column of a table that is already per-day."""
+    def build(start, end):
+        qs = queryset().filter(date__range=(start, end)).order_by()
+        values = {
+            (GLOBAL, row['date']): row['value'] or 0
+            for row in qs.values('date').annotate(value=Sum(field))
+        }
+        if owner_field:
+            for row in qs.filter(**{f'{owner_field}__isnull': False}).values(
+                'date', owner_field
+            ).annotate(value=Sum(field)):
+                values[(owner_dimension(row[owner_field]), row['date'])] = row['value'] or 0
+        return values
+    return build
+
+
+def _users():
+    from users.models import User
+    return User.objects.all()
+
+
+def _reviews():
+    from interactions.models import Review
+    return Review.objects.all()
+
+
+def _places():
+    from places.models import Place
+    return Place.objects.all()
+
+
+def _place_daily_views():
+    from places.models import PlaceDailyView
+    return PlaceDailyView.objects.all()
+
+
+def _ad_daily_stats():
+    from management.models import AdDailyStats
+    return AdDailyStats.objects.all()
+
+
+# metric name -> builder(start, end) returning {(dimension, date): value}
+METRICS = {
+    'users.new': _count_created(_users, 'date_joined'),
+    'reviews.new': _count_created(_reviews, 'created_at', 'place__establishment__owner'),
+    'places.new': _count_created(_places, 'created_at', 'establishment__owner'),
+    'place.views': _sum_daily(_place_daily_views, 'views', 'place__establishment__owner'),
+    'place.contact_clicks': _sum_daily(_place_daily_views, 'contact_clicks', 'place__establishment__owner'),
+    'ad.views': _sum_daily(_ad_daily_stats, 'views', 'advertisement__owner'),
+    'ad.clicks': _sum_daily(_ad_daily_stats, 'clicks', 'advertisement__owner'),
+}
+
+
+class MetricsService:
+    """Build and read the DailyMetric rollup."""
+
+    @staticmethod
+    def rollup(start, end=None, metrics=None):
+        """
+        Rebuild rollup rows for [start, end] (inclusive).
+        Returns {metric: rows_written}.
+        """
+        end = end or start
+        days = _days(start, end)
+        written = {}
+
+        for name in metrics or METRICS:
+            values = METRICS[name](start, end)
+            rows = [
+                DailyMetric(metric=name, dimension=GLOBAL, date=day, value=values.pop((GLOBAL, day), 0))
+                for day in days
+            ]
+            rows.extend(
+                DailyMetric(metric=name, dimension=dimension, date=day, value=value)
+                for (dimension, day), value in values.items()
+                if value
+            )
+            started = timezone.now()
+            with transaction.atomic():
+                # Upsert: a concurrent run writing the same keys cannot collide
+                DailyMetric.objects.bulk_create(
+                    rows, batch_size=1000, update_conflicts=True,
+                    unique_fields=['metric', 'dimension', 'date'], update_fields=['value', 'updated_at'],
+                )
+                # Dimensions that no longer have activity in the range
+                DailyMetric.objects.filter(
+                    metric=name, date__range=(start, end), updated_at__lt=started
+                ).delete()
+            written[name] = len(rows)
+
+        logger.info(f"[Metrics] Rolled up {start}..{end}: {written}")
+        return written
+
+    @staticmethod
+    def backfill(start, end, chunk_days=31, metrics=None):
+        """Roll up a long range in chunks so each transaction stays short."""
+        totals = {}
+        chunk_start = start
+        while chunk_start <= end:
+            chunk_end = min(chunk_start + timedelta(days=chunk_days - 1), end)
+            for name, count in MetricsService.rollup(chunk_start, chunk_end, metrics).items():
+                totals[name] = totals.get(name, 0) + count
+            chunk_start = chunk_end + timedelta(days=1)
+        return totals
+
+    @staticmethod
+    def fill_gaps(start, end, metrics=None):
+        """
+        Roll up the days in [start, end] that have no site-wide row yet.
+        Costs one indexed query when the rollup is complete.
+        Returns {metric: (first_gap, last_gap)}.
+        """
+        metrics = list(metrics or METRICS)
+        present = {}
+        for metric, day in DailyMetric.objects.filter(
+            metric__in=metrics, dimension=GLOBAL, date__range=(start, end)
+        ).values_list('metric', 'date'):
+            present.setdefault(metric, set()).add(day)
+
+        gaps = {}
+        for metric in metrics:
+            missing = [day for day in _days(start, end) if day not in present.get(metric, ())]
+            if missing:
+                gaps[metric] = (missing[0], missing[-1])
+                MetricsService.rollup(missing[0], missing[-1], [metric])
+        return gaps
+
+    @staticmethod
+    def series(metrics, start, end, dimension=GLOBAL):
+        """
+        Return {metric: [value per day]} for [start, end], zero-filled.
+        Days before today come from the rollup only; today is counted live.
+        """
+        today = timezone.localdate()
+        values = {
+            (metric, day): value
+            for metric, day, value in DailyMetric.objects.filter(
+                metric__in=metrics, dimension=dimension, date__range=(start, min(end, today - timedelta(days=1)))
+            ).values_list('metric', 'date', 'value')
+        }
+        if start <= today <= end:
+            for metric in metrics:
+                values[(metric, today)] = METRICS[metric](today, today).get((dimension, today), 0)
+        days = _days(start, end)
+        return {metric: [values.get((metric, day), 0) for day in days] for metric in metrics}
+
+    @staticmethod
+    def total(metric, start, end, dimension=GLOBAL):
+        """Sum of a metric over [start, end]."""
+        return sum(MetricsService.series([metric], start, end, dimension)[metric])
@@ -241,6 +241,11 @@ class NotificationService:
         ]
         Notification.objects.bulk_create(notifications)
         
+        from interactions.services.realtime_service import RealtimeService
+        from interactions.services.unread_service import UnreadCountService
+        UnreadCountService.incr(admin_ids)
+        RealtimeService.bump(*(RealtimeService.notifications_channel(admin_id) for admin_id in admin_ids))
+        
         # 2. Send Push
         return send_onesignal_notification(
             title=title,
@@ -0,0 +1,170 @@
+"""
+Retention Service
+Chunked deletion of expired log and notification rows.
+
+Each policy names a model, the timestamp column that ages its rows and a
+retention period. Expired rows are deleted in primary-key ranges, one short
+transaction per range with an optional pause in between, so a large purge
+never holds the database (SQLite in particular) locked for long and each
+DELETE can use the primary key index.
+
+Policies without a default period (audit and login logs) are opt-in:
+they only run once RETENTION_DAYS gives them a period.
+"""
+import logging
+import time
+import dataclasses
+from datetime import timedelta
+from typing import Callable, Optional, Union
+
+from django.apps import apps
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+def _notification_retention_days():
+    from management.models import NotificationSetting
+    notification_settings = NotificationSetting.objects.first()
+    return notification_settings.retention_days if notification_settings else 30
+
+
+@dataclasses.dataclass(frozen=True)
+class RetentionPolicy:
+    """
+    Rows of `model` whose `field` is older than `days` are deleted.
+    `days=None` disables the policy unless RETENTION_DAYS sets a period.
+    """
+    name: str
+    model: str  # 'app_label.ModelName'
+    field: str
+    days: Union[int, Callable[[], int], None]
+    filters: dict = dataclasses.field(default_factory=dict)
+
+    def get_model(self):
+        return apps.get_model(self.model)
+
+    def get_days(self) -> Optional[int]:
+        overrides = getattr(settings, 'RETENTION_DAYS', {})
+        if self.name in overrides:
+            return overrides[self.name]
+        return self.days() if callable(self.days) else self.days
+
+    @property
+    def enabled(self):
+        return self.get_days() is not None
+
+    def expired(self, now=None):
+        cutoff = (now or timezone.now()) - timedelta(days=self.get_days())
+        return self.get_model()._default_manager.filter(
+            **{f'{self.field}__lt': cutoff}, **self.filters
+        )
+
+
+POLICIES = [
+    RetentionPolicy('notifications.read', 'interactions.Notification', 'created_at',
+                    _notification_retention_days, {'is_read': True}),
+    RetentionPolicy('notifications.outbox_sent', 'interactions.NotificationOutbox', 'sent_at',
+                    _notification_retention_days, {'status': 'sent'}),
+    RetentionPolicy('places.view_logs', 'places.PlaceViewLog', 'viewed_at', 180),
+    # Opt-in: audit trails and login history may have to be kept
+    RetentionPolicy('users.login_logs', 'users.UserLoginLog', 'created_at', None),
+    RetentionPolicy('management.error_logs', 'management.ErrorLog', 'last_seen', 30),
+    RetentionPolicy('management.audit_logs', 'management.AuditLog', 'timestamp', None),
+    RetentionPolicy('management.route_logs', 'management.RouteLog', 'created_at', 90),
+    RetentionPolicy('management.domain_events', 'management.DomainEventOutbox', 'processed_at', 7,
+                    {'status': 'done'}),
+]
+
+
+class RetentionService:
+    """Apply retention policies in primary-key chunks."""
+
+    @staticmethod
+    def get_policies(names=None):
+        if not names:
+            return list(POLICIES)
+        by_name = {policy.name: policy for policy in POLICIES}
+        unknown = set(names) - set(by_name)
+        if unknown:
+            raise ValueError(f"Unknown retention policies: {', '.join(sorted(unknown))}")
+        return [by_name[name] for name in names]
+
+    @staticmethod
+    def purge(policy, chunk_size=None, sleep=None, dry_run=False, now=None):
+        """
+        Delete the expired rows of one policy. Returns the number of rows
+        removed (or that would be removed, for a dry run).
+        """
+        chunk_size = chunk_size or getattr(settings, 'RETENTION_CHUNK_SIZE', 5000)
+        if sleep is None:
+            sleep = getattr(settings, 'RETENTION_CHUNK_SLEEP', 0.05)
+
+        expired = policy.expired(now)
+        if dry_run:
+            return expired.count()
+
+        model = policy.get_model()
+        label = model._meta.label
+        if not isinstance(model._meta.pk, (models.AutoField, models.BigAutoField, models.IntegerField)):
+            return RetentionService._purge_batches(expired, label, chunk_size, sleep)
+
+        # Bounds: the oldest row overall and the largest expired pk (pk order
+        # need not follow the timestamp, e.g. ErrorLog.last_seen)
+        low = model._default_manager.order_by('pk').values_list('pk', flat=True).first()
+        high = expired.aggregate(high=Max('pk'))['high']
+        if low is None or high is None:
+            return 0
+
+        removed = 0
+        start = low
+        while start <= high:
+            end = start + chunk_size
+            with transaction.atomic():
+                # delete() also counts cascaded rows; report this model only
+                removed += expired.filter(pk__gte=start, pk__lt=end, pk__lte=high).delete()[1].get(label, 0)
+            start = end
+            if sleep and start <= high:
+                time.sleep(sleep)
+        return removed
+
+    @staticmethod
+    def _purge_batches(expired, label, chunk_size, sleep):
+        """Fallback for non-integer primary keys (e.g. UUIDs): delete by batches of pks."""
+        removed = 0
+        while True:
+            with transaction.atomic():
+                pks = list(expired.order_by().values_list('pk', flat=True)[:chunk_size])
+                if not pks:
+                    return removed
+                removed += expired.model._default_manager.filter(pk__in=pks).delete()[1].get(label, 0)
+            if sleep:
+                time.sleep(sleep)
+
+    @staticmethod
+    def run(names=None, chunk_size=None, sleep=None, dry_run=False):
+        """
+        Apply the given (or all) enabled policies.
+        Returns {policy name: rows removed}; disabled policies are left out.
+        """
+        report = {}
+        now = timezone.now()
+        for policy in RetentionService.get_policies(names):
+            if not policy.enabled:
+                logger.info(f"[Retention] {policy.name}: disabled (set RETENTION_DAYS to enable)")
+                continue
+            started = time.monotonic()
+            try:
+                report[policy.name] = RetentionService.purge(policy, chunk_size, sleep, dry_run, now)
+            except Exception as e:
+                logger.error(f"[Retention] {policy.name} failed: {e}", exc_info=True)
+                report[policy.name] = None
+                continue
+            logger.info(
+                f"[Retention] {policy.name}: {'would remove' if dry_run else 'removed'} "
+                f"{report[policy.name]} rows in {time.monotonic() - started:.1f}s"
+            )
+        return report
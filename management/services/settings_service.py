@@ -1,33 +1,50 @@
-from django.core.cache import cache
+import threading
+
+from django.db import transaction
+from django.utils import timezone
+from ibb_guide.services.cache_service import VersionedSnapshot
 from management.models import SystemSetting
 
+# Per-thread marker: set once the snapshot has been revalidated for the
+# current request (reset by request_started/request_finished).
+_request_state = threading.local()
+
+
 class SettingsService:
-    CACHE_KEY_PREFIX = 'system_setting_'
+    """
+    System settings backed by a versioned, per-process snapshot.
+
+    All settings are loaded in one query and held in process memory. The
+    snapshot is checked against a single version key in the shared cache at
+    most once per request; writers bump that key so every process reloads.
+    """
+    VERSION_KEY = 'system_settings:version'
     CACHE_TIMEOUT = 60 * 60 * 24  # 24 hours
 
+    # The version is read on every access; _get_snapshot limits that to once per request
+    _snapshot = VersionedSnapshot(
+        VERSION_KEY, lambda version: SettingsService._load(version), check_seconds=0, timeout=CACHE_TIMEOUT
+    )
+
     @classmethod
     def get(cls, key, default=None):
         """
-        Get a setting value by key, checking cache first.
+        Get a setting value by key from the in-process snapshot.
         """
-        cache_key = f"{cls.CACHE_KEY_PREFIX}{key}"
-        cached_value = cache.get(cache_key)
+        return cls._get_snapshot()['values'].get(key, default)
 
-        if cached_value is not None:
-            return cached_value
-
-        try:
-            setting = SystemSetting.objects.get(key=key)
-            value = cls._cast_value(setting.value, setting.data_type)
-            cache.set(cache_key, value, cls.CACHE_TIMEOUT)
-            return value
-        except SystemSetting.DoesNotExist:
-            return default
+    @classmethod
+    def get_many(cls, keys, default=None):
+        """
+        Get several settings at once as a {key: value} dict.
+        """
+        values = cls._get_snapshot()['values']
+        return {key: values.get(key, default) for key in keys}
 
     @classmethod
     def set(cls, key, value, data_type='string', description=''):
         """
-        Set a setting value and update cache.
+        Set a setting value and bump the snapshot version once committed.
         """
         setting, created = SystemSetting.objects.update_or_create(
             key=key,
@@ -37,30 +54,112 @@ class SettingsService:
                 'description': description
             }
         )
-        
-        # Update cache
-        cache_key = f"{cls.CACHE_KEY_PREFIX}{key}"
-        cache.set(cache_key, value, cls.CACHE_TIMEOUT)
-        
-        # Invalidate global public settings cache
-        cache.delete("system_settings:public")
+        transaction.on_commit(cls.invalidate)
         return setting
 
+    @classmethod
+    def set_many(cls, items):
+        """
+        Set several settings in one transaction and bump the version once.
+
+        ``items`` is an iterable of ``(key, value, data_type, description)``
+        tuples; ``data_type`` and ``description`` may be omitted.
+        Returns the number of settings written.
+        """
+        rows = {}
+        for item in items:
+            key, value, data_type, description = (tuple(item) + ('string', ''))[:4]
+            rows[key] = (str(value), data_type, description)
+
+        if not rows:
+            return 0
+
+        now = timezone.now()
+        with transaction.atomic():
+            existing = {
+                s.key: s for s in SystemSetting.objects.select_for_update().filter(key__in=rows)
+            }
+            to_update, to_create = [], []
+            for key, (value, data_type, description) in rows.items():
+                setting = existing.get(key)
+                if setting is None:
+                    to_create.append(SystemSetting(
+                        key=key, value=value, data_type=data_type, description=description
+                    ))
+                    continue
+                if (setting.value, setting.data_type, setting.description) == (value, data_type, description):
+                    continue
+                setting.value = value
+                setting.data_type = data_type
+                setting.description = description
+                setting.updated_at = now
+                to_update.append(setting)
+
+            if to_update:
+                SystemSetting.objects.bulk_update(
+                    to_update, ['value', 'data_type', 'description', 'updated_at']
+                )
+            if to_create:
+                SystemSetting.objects.bulk_create(to_create)
+
+        if to_update or to_create:
+            transaction.on_commit(cls.invalidate)
+        return len(to_update) + len(to_create)
+
     @classmethod
     def get_all_public(cls):
         """
-        Get all public settings as a dictionary. Cached for 1 hour.
+        Get all public settings as a dictionary.
+        """
+        return dict(cls._get_snapshot()['public'])
+
+    @classmethod
+    def invalidate(cls):
         """
-        cache_key = "system_settings:public"
-        cached_settings = cache.get(cache_key)
-        if cached_settings is not None:
-            return cached_settings
-
-        settings_qs = SystemSetting.objects.filter(is_public=True)
-        public_settings = {s.key: cls._cast_value(s.value, s.data_type) for s in settings_qs}
-        
-        cache.set(cache_key, public_settings, 3600)
-        return public_settings
+        Bump the shared version so every process reloads its snapshot.
+        """
+        cls._snapshot.invalidate()
+
+    # ------------------------------------------------------------------
+    # Request lifecycle hooks (connected in management.services.settings_signals)
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def begin_request(**kwargs):
+        _request_state.in_request = True
+        _request_state.validated = False
+
+    @staticmethod
+    def end_request(**kwargs):
+        _request_state.in_request = False
+        _request_state.validated = False
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def _get_snapshot(cls):
+        if getattr(_request_state, 'validated', False):
+            snapshot = cls._snapshot.peek()
+            if snapshot is not None:
+                return snapshot
+
+        snapshot = cls._snapshot.get()
+        # Outside a request (tasks, shell) revalidate on every access.
+        if getattr(_request_state, 'in_request', False):
+            _request_state.validated = True
+        return snapshot
+
+    @classmethod
+    def _load(cls, version):
+        values, public = {}, {}
+        for s in SystemSetting.objects.only('key', 'value', 'data_type', 'is_public'):
+            value = cls._cast_value(s.value, s.data_type)
+            values[s.key] = value
+            if s.is_public:
+                public[s.key] = value
+        return {'version': version, 'values': values, 'public': public}
 
     @staticmethod
     def _cast_value(value, data_type):
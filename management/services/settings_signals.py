@@ -0,0 +1,23 @@
+"""
+Settings Signals
+Bump the settings snapshot version when SystemSetting rows change, and
+scope snapshot revalidation to one check per request.
+"""
+from django.core.signals import request_finished, request_started
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from management.models.settings import SystemSetting
+from management.services.settings_service import SettingsService
+
+
+@receiver(post_save, sender=SystemSetting)
+@receiver(post_delete, sender=SystemSetting)
+def on_system_setting_change(sender, instance, **kwargs):
+    # After commit: a reload before then would cache the old values under the new version
+    transaction.on_commit(SettingsService.invalidate)
+
+
+request_started.connect(SettingsService.begin_request, dispatch_uid='settings_snapshot_begin')
+request_finished.connect(SettingsService.end_request, dispatch_uid='settings_snapshot_end')
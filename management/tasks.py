@@ -38,6 +38,8 @@ def check_ad_expirations():
 def send_ad_expiration_warnings():
     """
     Daily task to warn partners about ads expiring soon (within 3 days).
+    Safe to re-run: each day's warnings go out once (see
+    AdService.send_expiration_warnings).
     
     Schedule in settings.py:
     CELERY_BEAT_SCHEDULE = {
@@ -47,37 +49,12 @@ def send_ad_expiration_warnings():
         },
     }
     """
-    from datetime import timedelta
-    from management.models import Advertisement
-    from interactions.notifications.notification_service import NotificationService
-    
-    today = timezone.now().date()
-    warning_date = today + timedelta(days=3)
-    
-    # Find ads expiring within 3 days
-    expiring_ads = Advertisement.objects.filter(
-        status='active',
-        end_date__gte=today,
-        end_date__lte=warning_date
-    )
+    from management.services.ad_service import AdService
     
-    warned_count = 0
-    for ad in expiring_ads:
-        try:
-            days_remaining = (ad.end_date - today).days
-            NotificationService.notify(
-                event='AD_EXPIRING_SOON',
-                user=ad.owner,
-                metadata={
-                    'ad_id': ad.pk,
-                    'ad_title': ad.title,
-                    'days_remaining': days_remaining,
-                    'end_date': str(ad.end_date)
-                }
-            )
-            warned_count += 1
-        except Exception as e:
-            logger.error(f"[AdWarning] Failed to warn for ad {ad.pk}: {e}")
+    warned_count = AdService.send_expiration_warnings()
+    if warned_count is None:
+        logger.info("[AdWarning] Another run is in progress, skipping")
+        return {'status': 'skipped'}
     
     logger.info(f"[AdWarning] Sent {warned_count} expiration warnings")
     return {'status': 'success', 'warned_count': warned_count}
@@ -103,3 +80,136 @@ def cleanup_expired_invoices():
     
     logger.info(f"[InvoiceCleanup] Marked {count} old unpaid invoices")
     return {'status': 'success', 'marked_count': count}
+
+
+@shared_task(name='management.rollup_daily_metrics')
+def rollup_daily_metrics(days=2):
+    """
+    Nightly task to rebuild the DailyMetric rollup for the last ``days`` days
+    (closing yesterday and starting today), then fill any missing days in the
+    METRICS_FILL_GAP_DAYS (default 31) before them. Idempotent.
+    
+    Schedule in settings.py:
+    CELERY_BEAT_SCHEDULE = {
+        'rollup-daily-metrics-nightly': {
+            'task': 'management.rollup_daily_metrics',
+            'schedule': crontab(hour=0, minute=15),  # Daily at 00:15
+        },
+    }
+    """
+    from datetime import timedelta
+    from django.conf import settings
+    from django.core.cache import cache
+    from management.services.metrics_service import ROLLUP_LOCK_KEY, ROLLUP_LOCK_TIMEOUT, MetricsService
+    
+    # Skip if another run is still in progress
+    if not cache.add(ROLLUP_LOCK_KEY, 1, ROLLUP_LOCK_TIMEOUT):
+        logger.info("[Metrics] Rollup already running, skipping")
+        return {'status': 'skipped'}
+    try:
+        today = timezone.localdate()
+        start = today - timedelta(days=days - 1)
+        written = MetricsService.rollup(start, today)
+        gap_days = getattr(settings, 'METRICS_FILL_GAP_DAYS', 31)
+        filled = MetricsService.fill_gaps(start - timedelta(days=gap_days), start - timedelta(days=1))
+    finally:
+        cache.delete(ROLLUP_LOCK_KEY)
+    return {'status': 'success', 'written': written, 'filled': filled}
+
+
+@shared_task(name='management.rollup_daily_metrics_intraday')
+def rollup_daily_metrics_intraday():
+    """
+    Intra-day task to refresh today's DailyMetric rows.
+    
+    Schedule in settings.py:
+    CELERY_BEAT_SCHEDULE = {
+        'rollup-daily-metrics-intraday': {
+            'task': 'management.rollup_daily_metrics_intraday',
+            'schedule': crontab(minute='*/15'),
+        },
+    }
+    """
+    return rollup_daily_metrics(days=1)
+
+
+@shared_task(name='management.apply_retention_policies')
+def apply_retention_policies(policies=None):
+    """
+    Nightly task deleting expired log rows in short chunks
+    (see management.services.retention_service.POLICIES).
+    
+    Schedule in settings.py:
+    CELERY_BEAT_SCHEDULE = {
+        'apply-retention-policies-nightly': {
+            'task': 'management.apply_retention_policies',
+            'schedule': crontab(hour=3, minute=30),  # Daily at 03:30
+        },
+    }
+    """
+    from django.core.cache import cache
+    from management.services.error_log_service import ErrorLogService
+    from management.services.retention_service import RetentionService
+    
+    # Skip if another run is still in progress
+    if not cache.add('retention:lock', 1, 3600):
+        logger.info("[Retention] Already running, skipping")
+        return {'status': 'skipped'}
+    try:
+        # ErrorLog ages by last_seen: fold pending occurrences in first
+        ErrorLogService.flush_pending()
+        report = RetentionService.run(policies)
+    finally:
+        cache.delete('retention:lock')
+    return {'status': 'success', 'removed': report}
+
+
+@shared_task(name='management.flush_error_log')
+def flush_error_log(fingerprint):
+    """
+    Fold buffered occurrences of an exception into its ErrorLog row.
+    Scheduled by ErrorLogService.capture (not periodic).
+    """
+    from management.services.error_log_service import ErrorLogService
+    
+    error_log = ErrorLogService.flush(fingerprint)
+    return {'status': 'success', 'occurrences': error_log.occurrences if error_log else 0}
+
+
+@shared_task(name='management.flush_pending_error_logs')
+def flush_pending_error_logs():
+    """
+    Fold occurrences that arrived after their window's flush into ErrorLog
+    (keeps occurrences/last_seen current for errors that stopped recurring).
+    
+    Schedule in settings.py:
+    CELERY_BEAT_SCHEDULE = {
+        'flush-pending-error-logs': {
+            'task': 'management.flush_pending_error_logs',
+            'schedule': crontab(minute='*'),
+        },
+    }
+    """
+    from management.services.error_log_service import ErrorLogService
+    
+    return {'status': 'success', 'flushed': ErrorLogService.flush_pending()}
+
+
+@shared_task(name='management.process_domain_events')
+def process_domain_events():
+    """
+    Run queued asynchronous EventBus deliveries and due retries.
+    Scheduled on commit by EventBus.publish in async mode; the periodic run
+    picks up retries and rows whose scheduling failed.
+
+    Schedule in settings.py:
+    CELERY_BEAT_SCHEDULE = {
+        'process-domain-events': {
+            'task': 'management.process_domain_events',
+            'schedule': crontab(minute='*'),
+        },
+    }
+    """
+    from ibb_guide.events import EventBus
+    
+    return EventBus.process_queue()
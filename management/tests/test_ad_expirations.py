@@ -0,0 +1,158 @@
+"""
+Ad Expiration Tests
+Set-based expiry, bulk notification fan-out and overlapping runs.
+"""
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from interactions.models import Notification, NotificationPreference
+from interactions.notifications.notification_service import NotificationService
+from interactions.notifications.outbox import NotificationOutbox
+from management.models import Advertisement
+from management.services.ad_service import AdService
+from management.tasks import send_ad_expiration_warnings
+
+User = get_user_model()
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class AdExpirationTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.today = timezone.now().date()
+        self.owners = User.objects.bulk_create([User(username=f'owner{i}') for i in range(2)])
+
+    def _ads(self, count, status='active', end=-1, owner=True, **fields):
+        return Advertisement.objects.bulk_create([
+            Advertisement(
+                title=f'Ad {i}', status=status, owner=self.owners[i % 2] if owner else None,
+                start_date=self.today - timedelta(days=30), end_date=self.today + timedelta(days=end),
+                **fields
+            )
+            for i in range(count)
+        ])
+
+
+class CheckExpirationsTest(AdExpirationTestCase):
+    def test_expires_and_notifies_in_bulk(self):
+        expired = self._ads(5)
+        self._ads(1, owner=False)
+        self._ads(2, end=2)
+        self._ads(1, status='paused')
+
+        self.assertEqual(AdService.check_expirations(), 6)
+        self.assertEqual(Advertisement.objects.filter(status='expired').count(), 6)
+        self.assertEqual(Advertisement.objects.filter(status='active').count(), 2)
+        self.assertEqual(Advertisement.objects.filter(status='paused').count(), 1)
+
+        notes = Notification.objects.filter(event_type='AD_EXPIRED')
+        self.assertEqual(notes.count(), 5)
+        self.assertEqual(
+            sorted(notes.values_list('metadata__ad_id', flat=True)), sorted(ad.pk for ad in expired)
+        )
+        note = notes.get(metadata__ad_id=expired[0].pk)
+        self.assertEqual(note.recipient_id, expired[0].owner_id)
+        self.assertEqual(note.notification_type, 'ad_expired')
+        self.assertIn('Ad 0', note.message)
+
+    def test_query_count_does_not_grow_with_ads(self):
+        def statements(count):
+            self._ads(count)
+            with CaptureQueriesContext(connection) as ctx:
+                AdService.check_expirations()
+            # bulk INSERTs are split by the backend's parameter limit
+            return [q['sql'].split()[0] for q in ctx.captured_queries if not q['sql'].startswith('INSERT')]
+
+        few, many = statements(10), statements(200)
+        self.assertEqual(few, many)
+        self.assertEqual(many.count('UPDATE'), 1)
+
+    def test_rerun_is_a_no_op(self):
+        self._ads(4)
+        self.assertEqual(AdService.check_expirations(batch_size=3), 4)
+        self.assertEqual(AdService.check_expirations(batch_size=3), 0)
+        self.assertEqual(Notification.objects.filter(event_type='AD_EXPIRED').count(), 4)
+
+    def test_overlapping_transition_claims_each_ad_once(self):
+        ids = [ad.pk for ad in self._ads(3)]
+        for returning in (True, False):
+            Advertisement.objects.filter(pk__in=ids).update(status='active')
+            with self.subTest(returning=returning), \
+                    patch.object(connection.features, 'can_return_columns_from_insert', returning):
+                first = AdService._transition(ids, 'active', 'expired')
+                second = AdService._transition(ids, 'active', 'expired')
+                self.assertEqual([row[0] for row in first], ids)
+                self.assertEqual(first[0][3], self.today - timedelta(days=1))
+                self.assertEqual(second, [])
+
+    def test_failed_fan_out_keeps_chunk_active(self):
+        self._ads(2)
+        with patch(
+            'interactions.notifications.notification_service.NotificationService.emit_bulk',
+            side_effect=RuntimeError('db down'),
+        ):
+            with self.assertRaises(RuntimeError):
+                AdService.check_expirations()
+        self.assertEqual(Advertisement.objects.filter(status='active').count(), 2)
+        self.assertEqual(AdService.check_expirations(), 2)
+
+
+class ExpirationWarningsTest(AdExpirationTestCase):
+    def test_warns_once_per_day(self):
+        self._ads(3, end=2)
+        self._ads(1, end=5)
+        self.assertEqual(AdService.send_expiration_warnings(), 3)
+        self.assertEqual(AdService.send_expiration_warnings(), 0)
+
+        note = Notification.objects.filter(event_type='AD_EXPIRING_SOON').first()
+        self.assertEqual(note.metadata['days_remaining'], 2)
+        self.assertEqual(Notification.objects.filter(event_type='AD_EXPIRING_SOON').count(), 3)
+
+        # Tomorrow is a new day
+        self.assertEqual(AdService.send_expiration_warnings(today=self.today + timedelta(days=1)), 3)
+
+    def test_overlapping_run_is_skipped(self):
+        self._ads(2, end=1)
+        cache.add(f"ads:expiry_warnings:{self.today}:lock", True)
+        self.assertEqual(send_ad_expiration_warnings(), {'status': 'skipped'})
+        self.assertFalse(Notification.objects.exists())
+
+    def test_interrupted_run_resumes_after_last_chunk(self):
+        self._ads(5, end=1)
+        with patch(
+            'interactions.notifications.notification_service.NotificationService.emit_bulk',
+            side_effect=[2, RuntimeError('boom')],
+        ):
+            with self.assertRaises(RuntimeError):
+                AdService.send_expiration_warnings(batch_size=2)
+        self.assertEqual(AdService.send_expiration_warnings(batch_size=2), 3)
+
+
+class EmitBulkTest(AdExpirationTestCase):
+    def test_preferences_and_outbox_channels(self):
+        owner, other = self.owners
+        User.objects.filter(pk=owner.pk).update(fcm_token='token')
+        NotificationPreference.objects.create(user=other, enable_email=True, enable_push=False)
+        muted = User.objects.create(username='muted')
+        NotificationPreference.objects.create(user=muted, enable_all=False)
+
+        created = NotificationService.emit_bulk('AD_EXPIRED', [
+            (owner.pk, {'ad_id': 1, 'ad_title': 'One'}),
+            (other.pk, {'ad_id': 2, 'ad_title': 'Two'}),
+            (muted.pk, {'ad_id': 3, 'ad_title': 'Three'}),
+        ])
+        self.assertEqual(created, 2)
+        self.assertEqual(
+            set(NotificationOutbox.objects.values_list('recipient_id', 'channel')),
+            {(owner.pk, 'push'), (other.pk, 'email')},
+        )
+        self.assertEqual(
+            NotificationOutbox.objects.get(channel='email').payload['notification_type'], 'ad_expired'
+        )
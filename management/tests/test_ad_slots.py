@@ -0,0 +1,137 @@
+"""
+Ad Slot Tests
+Alias sampler weighting, eligible-ad tables and invalidation.
+"""
+import random
+from collections import Counter
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from management.models import Advertisement
+from management.selectors import get_random_active_ad
+from management.services.ad_slot_service import AdSlotService, AliasSampler
+
+# Chi-square critical values at p = 0.001 by degrees of freedom
+CHI2_CRITICAL = {1: 10.83, 2: 13.82, 3: 16.27, 5: 20.52}
+
+
+def chi_square(counts, weights, draws):
+    total = sum(weights)
+    return sum(
+        (counts[i] - draws * w / total) ** 2 / (draws * w / total)
+        for i, w in enumerate(weights)
+    )
+
+
+class AliasSamplerTest(SimpleTestCase):
+    def test_probabilities_reconstruct_weights(self):
+        weights = [1, 2, 3, 10, 0.5]
+        sampler = AliasSampler(weights)
+        n = len(weights)
+        mass = [0.0] * n
+        for column in range(n):
+            mass[column] += sampler.prob[column] / n
+            mass[sampler.alias[column]] += (1 - sampler.prob[column]) / n
+        for got, weight in zip(mass, weights):
+            self.assertAlmostEqual(got, weight / sum(weights))
+
+    def test_draws_follow_weights(self):
+        for weights in ([1, 1], [1, 2, 3, 4], [50, 1, 1, 1, 1, 20]):
+            with self.subTest(weights=weights):
+                rng = random.Random(42)
+                sampler = AliasSampler(weights)
+                draws = 100_000
+                counts = Counter(sampler.draw(rng) for _ in range(draws))
+                self.assertLess(chi_square(counts, weights, draws), CHI2_CRITICAL[len(weights) - 1])
+
+    def test_single_entry(self):
+        sampler = AliasSampler([7])
+        self.assertEqual({sampler.draw() for _ in range(20)}, {0})
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    AD_SLOT_VERSION_CHECK_SECONDS=0,
+)
+class AdSlotTableTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        AdSlotService.invalidate()
+        self.today = timezone.localdate()
+
+    def _ad(self, title, placement='banner', status='active', priority=1, start=0, end=7, **fields):
+        return Advertisement.objects.create(
+            title=title, placement=placement, status=status, priority=priority,
+            start_date=self.today + timedelta(days=start),
+            end_date=self.today + timedelta(days=end) if end is not None else None,
+            **fields
+        )
+
+    def test_only_eligible_ads_are_in_the_table(self):
+        live = self._ad('Live', target_url='https://example.com', banner_image='ads/banners/a.jpg')
+        open_ended = self._ad('Open ended', end=None)
+        self._ad('Paused', status='paused')
+        self._ad('Future', start=1)
+        self._ad('Ended', start=-10, end=-1)
+        self._ad('Hidden', priority=0)
+        self._ad('Sidebar', placement='sidebar')
+
+        table = AdSlotService.get_table('banner')
+        self.assertEqual([p.pk for p in table.payloads], [live.pk, open_ended.pk])
+        payload = table.payloads[0]
+        self.assertTrue(payload.has_link)
+        self.assertTrue(payload.image_url.endswith('ads/banners/a.jpg'))
+        self.assertFalse(table.payloads[1].has_link)
+        self.assertEqual(table.payloads[1].image_url, '')
+
+    def test_picks_need_no_queries(self):
+        self._ad('A')
+        AdSlotService.get_table('banner')
+        with self.assertNumQueries(0):
+            for _ in range(100):
+                self.assertIsNotNone(get_random_active_ad('banner'))
+        with self.assertNumQueries(1):
+            self.assertIsNone(get_random_active_ad('navbar'))
+        with self.assertNumQueries(0):
+            self.assertIsNone(get_random_active_ad('navbar'))
+
+    def test_priority_weighting(self):
+        ads = [self._ad(f'Ad {p}', priority=p) for p in (1, 3, 6)]
+        rng = random.Random(7)
+        draws = 30_000
+        counts = Counter(get_random_active_ad('banner', rng).pk for _ in range(draws))
+        observed = Counter({i: counts[ad.pk] for i, ad in enumerate(ads)})
+        self.assertLess(chi_square(observed, [1, 3, 6], draws), CHI2_CRITICAL[2])
+
+    def test_saves_rebuild_the_table_on_commit(self):
+        ad = self._ad('A')
+        self.assertEqual(get_random_active_ad('banner').pk, ad.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ad.status = 'expired'
+            ad.save()
+        self.assertIsNone(get_random_active_ad('banner'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            replacement = self._ad('B')
+        self.assertEqual(get_random_active_ad('banner').pk, replacement.pk)
+
+    def test_day_rollover_rebuilds(self):
+        ad = self._ad('Ends today', start=-3, end=0)
+        self.assertEqual(get_random_active_ad('banner').pk, ad.pk)
+        with patch('management.services.ad_slot_service.timezone.localdate',
+                   return_value=self.today + timedelta(days=1)):
+            self.assertIsNone(get_random_active_ad('banner'))
+
+    def test_slot_view_renders_payload(self):
+        ad = self._ad('Summer offer', description='Cold drinks', price='100.00', target_url='https://example.com')
+        response = self.client.get(reverse('ad_slot', args=['banner']))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Summer offer')
+        self.assertContains(response, reverse('ad_click', args=[ad.pk]))
+        self.assertEqual(self.client.get(reverse('ad_slot', args=['navbar'])).status_code, 204)
@@ -0,0 +1,102 @@
+"""
+Admin Dashboard Service Tests
+Query budget and correctness for KPI and chart aggregates.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from interactions.models import Review
+from management.admin_dashboard import AdminDashboardService
+from management.models import Advertisement, Invoice
+from management.services.metrics_service import MetricsService
+from places.models import Category, Place
+from users.models import User
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class AdminDashboardServiceTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        now = timezone.now()
+        self.users = []
+        for i in range(10):
+            user = User.objects.create_user(username=f'u{i}', password='p')
+            User.objects.filter(pk=user.pk).update(date_joined=now - timedelta(days=i))
+            self.users.append(user)
+
+        category = Category.objects.create(name='Nature')
+        self.place = Place.objects.create(name='Lake', category=category)
+        Place.objects.create(name='Closed', category=category, is_active=False)
+
+        for i, user in enumerate(self.users[:5]):
+            Review.objects.create(user=user, place=self.place, rating=i + 1, comment='ok')
+
+        Advertisement.objects.create(owner=self.users[0], title='A', status='active')
+        Advertisement.objects.create(owner=self.users[0], title='B', status='pending')
+        Invoice.objects.create(
+            partner=self.users[0], invoice_number='INV-1', amount=Decimal('50.00'),
+            total_amount=Decimal('50.00'), is_paid=True,
+        )
+
+    def test_kpi_stats_values(self):
+        stats = AdminDashboardService.get_kpi_stats()
+        self.assertEqual(stats['total_users'], 10)
+        self.assertEqual(stats['new_users_week'], 7)
+        self.assertEqual(stats['total_places'], 2)
+        self.assertEqual(stats['active_places'], 1)
+        self.assertEqual(stats['total_reviews'], 5)
+        self.assertEqual(stats['avg_rating'], 3.0)
+        self.assertEqual(stats['active_ads'], 1)
+        self.assertEqual(stats['pending_ads'], 1)
+        self.assertEqual(stats['revenue_month'], Decimal('50.00'))
+
+    def test_chart_data_values(self):
+        # Before the nightly rollup only today's signups are counted (live)
+        data = AdminDashboardService.get_chart_data()
+        self.assertEqual(len(data['user_growth']), 7)
+        self.assertEqual(sum(d['count'] for d in data['user_growth']), 1)
+
+        today = timezone.localdate()
+        MetricsService.rollup(today - timedelta(days=6), today)
+        AdminDashboardService.invalidate_cache()
+        data = AdminDashboardService.get_chart_data()
+        self.assertEqual(sum(d['count'] for d in data['user_growth']), 7)
+        self.assertEqual([r['count'] for r in data['reviews_by_rating']], [1, 1, 1, 1, 1])
+        self.assertEqual(len(data['revenue_trend']), 6)
+        self.assertEqual(data['revenue_trend'][-1]['revenue'], 50.0)
+
+    def test_dashboard_total_query_count(self):
+        """KPIs, pending items and charts together stay within a fixed budget."""
+        # Nightly rollup has run, so the user growth chart reads DailyMetric only
+        today = timezone.localdate()
+        MetricsService.rollup(today - timedelta(days=6), today)
+
+        with CaptureQueriesContext(connection) as cold:
+            AdminDashboardService.get_kpi_stats()
+            AdminDashboardService.get_pending_items()
+            AdminDashboardService.get_chart_data()
+        self.assertLessEqual(len(cold.captured_queries), 15)
+
+        with CaptureQueriesContext(connection) as warm:
+            AdminDashboardService.get_kpi_stats()
+            AdminDashboardService.get_pending_items()
+            AdminDashboardService.get_chart_data()
+        self.assertEqual(len(warm.captured_queries), 0)
+
+    def test_stale_entry_served_while_another_caller_refreshes(self):
+        AdminDashboardService.get_kpi_stats()
+        entry = cache.get('admin_dashboard:kpi')
+        entry['refresh_at'] = 0
+        cache.set('admin_dashboard:kpi', entry)
+        cache.add('admin_dashboard:kpi:lock', 1)
+
+        with CaptureQueriesContext(connection) as ctx:
+            stats = AdminDashboardService.get_kpi_stats()
+        self.assertEqual(len(ctx.captured_queries), 0)
+        self.assertEqual(stats['total_users'], 10)
@@ -0,0 +1,170 @@
+"""
+Error Log Service Tests
+Deduplicated, deferred ErrorLog writes and throttled admin alerts.
+"""
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+
+from ibb_guide.middleware import SystemMonitorMiddleware
+from interactions.models import Notification
+from management.models import ErrorLog
+from management.services.error_log_service import ErrorLogService, fingerprint
+
+User = get_user_model()
+
+
+def _raise(exc_class, message='boom'):
+    try:
+        raise exc_class(message)
+    except exc_class as e:
+        return e
+
+
+def _raise_elsewhere(message='boom'):
+    try:
+        {}['missing']
+    except KeyError as e:
+        return e
+
+
+class WriteCounter:
+    """Count INSERT/UPDATE statements without CaptureQueriesContext's 9000-query cap."""
+
+    def __init__(self):
+        self.writes = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        if sql.lstrip().upper().startswith(('INSERT', 'UPDATE')):
+            self.writes += 1
+        return execute(sql, params, many, context)
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    ERROR_LOG_FLUSH_SECONDS=60,
+    ERROR_ALERT_THROTTLE_SECONDS=900,
+)
+class ErrorLogServiceTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        ErrorLogService._unflushed.clear()
+        self.admin = User.objects.create_superuser(username='admin', password='p', email='a@example.com')
+        self.factory = RequestFactory()
+        self.middleware = SystemMonitorMiddleware(lambda request: None)
+        self.addCleanup(ErrorLogService._unflushed.clear)
+
+    def _request(self, path='/crash/'):
+        request = self.factory.get(path)
+        request.user = AnonymousUser()
+        return request
+
+    def test_fingerprint_ignores_message(self):
+        self.assertEqual(fingerprint(_raise(ValueError, 'a')), fingerprint(_raise(ValueError, 'b')))
+        self.assertNotEqual(fingerprint(_raise(ValueError)), fingerprint(_raise(TypeError)))
+        self.assertNotEqual(fingerprint(_raise(KeyError)), fingerprint(_raise_elsewhere()))
+
+    @patch('management.services.notification_service.send_onesignal_notification', return_value=True)
+    @patch('management.tasks.flush_error_log.apply_async')
+    def test_error_storm_is_bounded(self, apply_async, _push):
+        counter = WriteCounter()
+        exception = _raise(ValueError)
+        with connection.execute_wrapper(counter):
+            for _ in range(10_000):
+                self.middleware.process_exception(self._request(), exception)
+        # Request path: no database writes, one flush scheduled per window
+        self.assertEqual(counter.writes, 0)
+        self.assertEqual(ErrorLog.objects.count(), 0)
+        self.assertEqual(apply_async.call_count, 1)
+
+        fp = apply_async.call_args.kwargs['args'][0]
+        ErrorLogService.flush(fp)
+
+        log = ErrorLog.objects.get()
+        self.assertEqual(log.fingerprint, fp)
+        self.assertEqual(log.occurrences, 10_000)
+        self.assertEqual(log.path, '/crash/')
+        self.assertEqual(Notification.objects.filter(recipient=self.admin).count(), 1)
+
+        # Nothing pending: a second flush is a no-op
+        self.assertIsNone(ErrorLogService.flush(fp))
+
+    @patch('management.services.notification_service.send_onesignal_notification', return_value=True)
+    @patch('management.tasks.flush_error_log.apply_async')
+    def test_later_window_updates_same_row_without_alert(self, apply_async, _push):
+        exception = _raise(ValueError)
+        fp = ErrorLogService.capture(self._request(), exception)
+        ErrorLogService.flush(fp)
+        first_seen = ErrorLog.objects.get().last_seen
+
+        cache.delete(ErrorLogService.SCHEDULED_KEY.format(fp=fp))  # window elapsed
+        for _ in range(3):
+            ErrorLogService.capture(self._request('/other/'), exception)
+        ErrorLogService.flush(fp)
+
+        log = ErrorLog.objects.get()
+        self.assertEqual(log.occurrences, 4)
+        self.assertEqual(log.path, '/other/')
+        self.assertGreaterEqual(log.last_seen, first_seen)
+        self.assertEqual(apply_async.call_count, 2)
+        self.assertEqual(Notification.objects.filter(recipient=self.admin).count(), 1)
+
+    @patch('management.services.notification_service.send_onesignal_notification', return_value=True)
+    @patch('management.tasks.flush_error_log.apply_async')
+    def test_distinct_errors_get_distinct_rows(self, apply_async, _push):
+        fps = {
+            ErrorLogService.capture(self._request(), _raise(ValueError)),
+            ErrorLogService.capture(self._request(), _raise(TypeError)),
+        }
+        for fp in fps:
+            ErrorLogService.flush(fp)
+        self.assertEqual(ErrorLog.objects.count(), 2)
+        self.assertEqual(Notification.objects.filter(recipient=self.admin).count(), 2)
+
+    @patch('management.services.notification_service.send_onesignal_notification', return_value=True)
+    @patch('management.tasks.flush_error_log.apply_async', side_effect=OSError('broker down'))
+    def test_broker_failure_flushes_inline(self, _apply_async, _push):
+        ErrorLogService.capture(self._request(), _raise(ValueError))
+        self.assertEqual(ErrorLog.objects.get().occurrences, 1)
+
+    @patch('management.services.notification_service.send_onesignal_notification', return_value=True)
+    def test_periodic_flush_writes_quiet_errors(self, _push):
+        # Eager Celery flushes the first occurrence at once
+        exception = _raise(ValueError)
+        fp = ErrorLogService.capture(self._request(), exception)
+        other = ErrorLogService.capture(self._request(), _raise(TypeError))
+        for _ in range(4):
+            ErrorLogService.capture(self._request(), exception)
+        self.assertEqual(ErrorLog.objects.get(fingerprint=fp).occurrences, 1)
+
+        from management.tasks import flush_pending_error_logs
+        self.assertEqual(flush_pending_error_logs()['flushed'], 1)
+        self.assertEqual(ErrorLog.objects.get(fingerprint=fp).occurrences, 5)
+        self.assertEqual(ErrorLog.objects.get(fingerprint=other).occurrences, 1)
+        self.assertEqual(ErrorLogService.flush_pending(), 0)
+
+    @patch('management.services.notification_service.send_onesignal_notification', return_value=True)
+    def test_quiet_errors_flush_when_a_request_finishes(self, _push):
+        from django.core.signals import request_finished
+
+        exception = _raise(ValueError)
+        fp = ErrorLogService.capture(self._request(), exception)
+        for _ in range(2):
+            ErrorLogService.capture(self._request(), exception)
+        request_finished.send(sender=self.__class__)
+        self.assertEqual(ErrorLog.objects.get(fingerprint=fp).occurrences, 1)
+
+        # The window has closed and the error has not recurred
+        ErrorLogService._unflushed[fp] -= 60
+        request_finished.send(sender=self.__class__)
+        self.assertEqual(ErrorLog.objects.get(fingerprint=fp).occurrences, 3)
+        self.assertEqual(ErrorLogService._unflushed, {})
+
+    def test_http404_is_ignored(self):
+        from django.http import Http404
+        self.middleware.process_exception(self._request(), Http404())
+        self.assertEqual(ErrorLog.objects.count(), 0)
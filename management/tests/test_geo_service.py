@@ -0,0 +1,88 @@
+"""
+Geo Service Tests
+Bounding boxes, the in-process zone index and safety checks.
+"""
+import random
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from management.models import GeoZone
+from management.services.geo_service import GeoService, ZoneIndex
+
+
+def square(lat, lon, size):
+    return [[lat, lon], [lat + size, lon], [lat + size, lon + size], [lat, lon + size]]
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class GeoZoneIndexTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        GeoService._zone_index.reset()
+        self.flood = GeoZone.objects.create(
+            name='Flood', zone_type='FLOOD', risk_level='HIGH', polygon=square(13.9, 44.1, 0.1)
+        )
+        self.security = GeoZone.objects.create(
+            name='Security', zone_type='SECURITY', risk_level='MEDIUM', polygon=square(13.95, 44.15, 0.1)
+        )
+        GeoZone.objects.create(
+            name='Inactive', zone_type='FLOOD', risk_level='LOW', polygon=square(13.9, 44.1, 0.1), is_active=False
+        )
+
+    def tearDown(self):
+        GeoService._zone_index.reset()
+
+    def test_bbox_computed_on_save(self):
+        self.assertEqual(
+            (self.flood.min_lat, self.flood.max_lat, self.flood.min_lon, self.flood.max_lon),
+            (13.9, 14.0, 44.1, 44.2),
+        )
+
+    def test_index_matches_ray_casting(self):
+        rng = random.Random(7)
+        zones = list(GeoZone.objects.filter(is_active=True))
+        for _ in range(500):
+            lat, lon = rng.uniform(13.85, 14.1), rng.uniform(44.05, 44.3)
+            expected = {z.pk for z in zones if GeoService._is_point_in_polygon(lat, lon, z.polygon)}
+            self.assertEqual(set(GeoService.find_zone_ids(lat, lon)), expected)
+
+    @override_settings(GEO_ZONE_INDEX_ENABLED=False)
+    def test_sql_bbox_path(self):
+        self.assertEqual(set(GeoService.find_zone_ids(13.97, 44.17)), {self.flood.pk, self.security.pk})
+        self.assertEqual(GeoService.find_zone_ids(10.0, 40.0), [])
+
+    def test_checks_need_no_queries_when_index_built(self):
+        GeoService.find_zone_ids(13.95, 44.15)
+        with CaptureQueriesContext(connection) as ctx:
+            for _ in range(100):
+                GeoService.find_zone_ids(15.0, 45.0)
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_zone_change_rebuilds_index(self):
+        self.assertEqual(GeoService.find_zone_ids(15.05, 45.05), [])
+        new_zone = GeoZone.objects.create(
+            name='New', zone_type='RESTRICTED', risk_level='HIGH', polygon=square(15.0, 45.0, 0.1)
+        )
+        self.assertEqual(GeoService.find_zone_ids(15.05, 45.05), [new_zone.pk])
+
+    def test_large_zone_goes_to_scan_list(self):
+        index = ZoneIndex([(1, square(0, 0, 10))], cell_size=0.05)
+        self.assertEqual(len(index.large), 1)
+        self.assertEqual(index.query(5, 5), [1])
+        self.assertEqual(index.query(11, 5), [])
+
+    @patch('management.services.geo_service.GeoService._trigger_zone_alerts')
+    def test_check_user_safety_triggers_alerts(self, mock_alerts):
+        from django.contrib.auth import get_user_model
+        user = get_user_model().objects.create_user(username='tourist', password='p')
+        alerts = GeoService.check_user_safety(user, 13.92, 44.12)
+        self.assertEqual([z.pk for z in alerts], [self.flood.pk])
+        mock_alerts.assert_called_once()
+
+        mock_alerts.reset_mock()
+        self.assertEqual(GeoService.check_user_safety(user, 10.0, 40.0), [])
+        mock_alerts.assert_not_called()
@@ -0,0 +1,127 @@
+"""
+Daily Metrics Rollup Tests
+Idempotent rollup, gap filling in the task and O(days), read-only reads.
+"""
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from management.models import DailyMetric
+from management.services.metrics_service import ROLLUP_LOCK_KEY, MetricsService, owner_dimension
+from management.tasks import rollup_daily_metrics
+from places.models import Category, Establishment, PlaceDailyView
+from users.models import User
+
+
+class MetricsServiceTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.today = timezone.localdate()
+        self.owner = User.objects.create_user(username='owner', password='p')
+        category = Category.objects.create(name='Hotels')
+        self.place = Establishment.objects.create(name='Hotel', category=category, owner=self.owner)
+        for i in range(5):
+            PlaceDailyView.objects.create(
+                place=self.place, date=self.today - timedelta(days=i), views=10 + i, contact_clicks=i
+            )
+
+    def test_rollup_is_idempotent(self):
+        start = self.today - timedelta(days=6)
+        first = MetricsService.rollup(start, self.today, ['place.views'])
+        second = MetricsService.rollup(start, self.today, ['place.views'])
+        self.assertEqual(first, second)
+        self.assertEqual(
+            DailyMetric.objects.filter(metric='place.views', dimension='').count(), 7
+        )
+
+    def test_series_global_and_owner(self):
+        start = self.today - timedelta(days=6)
+        MetricsService.rollup(start, self.today)
+        series = MetricsService.series(['place.views', 'place.contact_clicks'], start, self.today)
+        self.assertEqual(series['place.views'], [0, 0, 14, 13, 12, 11, 10])
+        self.assertEqual(series['place.contact_clicks'], [0, 0, 4, 3, 2, 1, 0])
+
+        owner_series = MetricsService.series(
+            ['place.views'], start, self.today, dimension=owner_dimension(self.owner.pk)
+        )
+        self.assertEqual(owner_series['place.views'], series['place.views'])
+
+    def test_backfill_in_chunks(self):
+        start = self.today - timedelta(days=60)
+        totals = MetricsService.backfill(start, self.today, chunk_days=7, metrics=['users.new'])
+        self.assertEqual(totals['users.new'], 61 + 0)  # one global row per day
+        self.assertEqual(MetricsService.total('users.new', start, self.today), 1)
+        self.assertEqual(MetricsService.total('users.new', start, self.today - timedelta(days=1)), 0)
+
+    def test_past_days_read_without_scanning_raw_tables(self):
+        start = self.today - timedelta(days=29)
+        yesterday = self.today - timedelta(days=1)
+        MetricsService.rollup(start, yesterday, ['place.views'])
+
+        with CaptureQueriesContext(connection) as ctx:
+            series = MetricsService.series(['place.views'], start, yesterday)
+        self.assertEqual(series['place.views'][-4:], [14, 13, 12, 11])
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertNotIn('places_placedailyview', ctx.captured_queries[0]['sql'])
+
+    def test_rollup_recomputes_after_raw_change(self):
+        MetricsService.rollup(self.today, self.today, ['place.views'])
+        PlaceDailyView.objects.filter(place=self.place, date=self.today).update(views=99)
+        MetricsService.rollup(self.today, self.today, ['place.views'])
+        self.assertEqual(MetricsService.total('place.views', self.today, self.today), 99)
+
+    def test_rollup_upserts_over_concurrent_rows(self):
+        # Another run inserted the same keys after this one started
+        DailyMetric.objects.create(metric='place.views', dimension='', date=self.today, value=1)
+        DailyMetric.objects.create(
+            metric='place.views', dimension=owner_dimension(self.owner.pk), date=self.today, value=1
+        )
+        DailyMetric.objects.create(metric='place.views', dimension='owner:0', date=self.today, value=5)
+        MetricsService.rollup(self.today, self.today, ['place.views'])
+        self.assertEqual(
+            dict(DailyMetric.objects.filter(metric='place.views').values_list('dimension', 'value')),
+            {'': 10, owner_dimension(self.owner.pk): 10},
+        )
+
+    def test_reads_never_write(self):
+        start = self.today - timedelta(days=6)
+        with CaptureQueriesContext(connection) as ctx:
+            series = MetricsService.series(['place.views'], start, self.today)
+        # Gaps read as zero; today is counted live
+        self.assertEqual(series['place.views'], [0, 0, 0, 0, 0, 0, 10])
+        self.assertFalse(DailyMetric.objects.exists())
+        for query in ctx.captured_queries:
+            self.assertTrue(query['sql'].startswith('SELECT'), query['sql'])
+
+    def test_today_is_live_even_after_a_rollup(self):
+        MetricsService.rollup(self.today, self.today, ['place.views'])
+        PlaceDailyView.objects.filter(place=self.place, date=self.today).update(views=99)
+        self.assertEqual(MetricsService.total('place.views', self.today, self.today), 99)
+        self.assertEqual(
+            MetricsService.total('place.views', self.today, self.today, owner_dimension(self.owner.pk)), 99
+        )
+
+    @override_settings(METRICS_FILL_GAP_DAYS=3)
+    def test_task_fills_recent_gaps(self):
+        result = rollup_daily_metrics()
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual(
+            sorted(DailyMetric.objects.filter(metric='place.views', dimension='').values_list('date', flat=True)),
+            [self.today - timedelta(days=i) for i in (4, 3, 2, 1, 0)],
+        )
+        start = self.today - timedelta(days=6)
+        self.assertEqual(MetricsService.series(['place.views'], start, self.today)['place.views'],
+                         [0, 0, 14, 13, 12, 11, 10])
+        self.assertIsNone(cache.get(ROLLUP_LOCK_KEY))
+
+        # A complete rollup leaves nothing to fill
+        self.assertEqual(rollup_daily_metrics()['filled'], {})
+
+    def test_task_skips_while_locked(self):
+        cache.add(ROLLUP_LOCK_KEY, 1)
+        self.assertEqual(rollup_daily_metrics()['status'], 'skipped')
+        self.assertFalse(DailyMetric.objects.exists())
@@ -0,0 +1,141 @@
+"""
+Partner Stats Tests
+Grouped-aggregate partner statistics, breakdowns and cache invalidation.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from management.models import AdDailyStats, Advertisement, Invoice
+from management.services.ad_service import AdService
+
+User = get_user_model()
+
+
+def legacy_partner_stats(user):
+    """The pre-aggregate implementation, kept to check the SQL version against."""
+    ads = Advertisement.objects.filter(owner=user)
+    return {
+        'total_ads': ads.count(),
+        'active_ads': ads.filter(status='active').count(),
+        'pending_ads': ads.filter(status='pending').count(),
+        'expired_ads': ads.filter(status='expired').count(),
+        'total_views': sum(ad.views for ad in ads),
+        'total_clicks': sum(ad.clicks for ad in ads),
+        'total_spent': sum(
+            inv.total_amount for inv in Invoice.objects.filter(partner=user, is_paid=True)
+        ),
+    }
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class PartnerStatsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.today = timezone.localdate()
+        self.partner = User.objects.create(username='partner')
+        self.other = User.objects.create(username='other')
+
+        statuses = ['active', 'active', 'pending', 'expired', 'paused']
+        self.ads = [
+            Advertisement.objects.create(
+                owner=self.partner, title=f'Ad {i}', status=status,
+                start_date=self.today - timedelta(days=40), views=100 * (i + 1), clicks=7 * i,
+            )
+            for i, status in enumerate(statuses)
+        ]
+        other_ad = Advertisement.objects.create(owner=self.other, title='Other', status='active', views=999)
+
+        AdDailyStats.objects.bulk_create([
+            AdDailyStats(advertisement=ad, date=self.today - timedelta(days=day), views=10 * (i + 1), clicks=i)
+            for i, ad in enumerate(self.ads[:3])
+            for day in (0, 1, 5, 45)
+        ] + [AdDailyStats(advertisement=other_ad, date=self.today, views=500, clicks=50)])
+
+        for ad, total, paid in ((self.ads[0], '100.50', True), (self.ads[0], '20.00', True),
+                                (self.ads[1], '30.25', True), (self.ads[2], '999.00', False)):
+            Invoice.objects.create(
+                partner=self.partner, advertisement=ad, amount=total, total_amount=Decimal(total), is_paid=paid
+            )
+        Invoice.objects.create(partner=self.other, advertisement=other_ad, amount=5, total_amount=5, is_paid=True)
+
+    def test_totals_match_legacy_implementation(self):
+        stats = AdService.get_partner_stats(self.partner, use_cache=False)
+        for key, value in legacy_partner_stats(self.partner).items():
+            self.assertEqual(stats[key], value, key)
+
+        empty = User.objects.create(username='empty')
+        stats = AdService.get_partner_stats(empty, use_cache=False)
+        for key, value in legacy_partner_stats(empty).items():
+            self.assertEqual(stats[key], value, key)
+
+    def test_range_and_breakdowns(self):
+        stats = AdService.get_partner_stats(
+            self.partner, start_date=self.today - timedelta(days=5), end_date=self.today, use_cache=False
+        )
+        # Three days in range for ads 0-2: views 10/20/30, clicks 0/1/2
+        self.assertEqual(stats['range']['views'], 3 * 60)
+        self.assertEqual(stats['range']['clicks'], 3 * 3)
+        self.assertEqual(stats['range']['ctr'], 5.0)
+        self.assertEqual(
+            [(row['date'], row['views'], row['clicks']) for row in stats['daily']],
+            [(self.today - timedelta(days=d), 60, 3) for d in (5, 1, 0)],
+        )
+
+        per_ad = {row['id']: row for row in stats['per_ad']}
+        self.assertEqual(list(per_ad), [self.ads[2].pk, self.ads[1].pk, self.ads[0].pk,
+                                        self.ads[3].pk, self.ads[4].pk])
+        self.assertEqual(per_ad[self.ads[2].pk]['range_views'], 90)
+        self.assertEqual(per_ad[self.ads[1].pk]['range_clicks'], 3)
+        self.assertEqual(per_ad[self.ads[0].pk]['spent'], Decimal('120.50'))
+        self.assertEqual(per_ad[self.ads[2].pk]['spent'], 0)
+        self.assertEqual(per_ad[self.ads[4].pk]['range_views'], 0)
+
+    def test_query_count_is_constant(self):
+        with self.assertNumQueries(4):
+            AdService.get_partner_stats(self.partner, use_cache=False)
+
+    def test_cached_until_invalidated(self):
+        first = AdService.get_partner_stats(self.partner)
+        with self.assertNumQueries(0):
+            self.assertEqual(AdService.get_partner_stats(self.partner), first)
+
+        AdService.invalidate_partner_stats(self.partner.pk)
+        with self.assertNumQueries(4):
+            AdService.get_partner_stats(self.partner)
+
+    def test_ad_and_invoice_changes_invalidate_on_commit(self):
+        self.assertEqual(AdService.get_partner_stats(self.partner)['active_ads'], 2)
+        with self.captureOnCommitCallbacks(execute=True):
+            ad = self.ads[2]
+            ad.status = 'active'
+            ad.save()
+        self.assertEqual(AdService.get_partner_stats(self.partner)['active_ads'], 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.ads[2].invoices.get().delete()
+        self.assertEqual(AdService.get_partner_stats(self.partner)['per_ad'][0]['spent'], 0)
+
+        before = AdService.get_partner_stats(self.other)
+        with self.captureOnCommitCallbacks(execute=True):
+            Invoice.objects.create(partner=self.partner, amount=1, total_amount=1, is_paid=True)
+        with self.assertNumQueries(0):
+            AdService.get_partner_stats(self.other)
+        self.assertEqual(AdService.get_partner_stats(self.other), before)
+
+    def test_tracked_clicks_keep_the_cache(self):
+        # Views and clicks show up once AD_PARTNER_STATS_CACHE_SECONDS pass
+        ad = self.ads[0]
+        ad.target_url = 'https://example.com'
+        ad.save(update_fields=['target_url'])
+        clicks = AdService.get_partner_stats(self.partner)['total_clicks']
+        self.client.get(reverse('ad_click', args=[ad.pk]))
+        self.client.get(reverse('ad_impression', args=[ad.pk]))
+        with self.assertNumQueries(0):
+            self.assertEqual(AdService.get_partner_stats(self.partner)['total_clicks'], clicks)
+        self.assertEqual(AdService.get_partner_stats(self.partner, use_cache=False)['total_clicks'], clicks + 1)
@@ -0,0 +1,127 @@
+"""
+Retention Engine Tests
+Chunked deletion of expired rows per policy.
+"""
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from interactions.models import Notification
+from interactions.notifications.outbox import NotificationOutbox
+from management.models import AuditLog, ErrorLog
+from management.services.retention_service import RetentionService
+
+User = get_user_model()
+
+
+class RetentionServiceTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='u', password='p')
+        self.old = timezone.now() - timedelta(days=400)
+
+    def _error_logs(self, count, when):
+        logs = ErrorLog.objects.bulk_create([
+            ErrorLog(path='/x', method='GET', error_message='e', traceback='') for _ in range(count)
+        ])
+        ErrorLog.objects.filter(pk__in=[log.pk for log in logs]).update(timestamp=when, last_seen=when)
+
+    def test_removes_only_expired_rows_and_reports_per_policy(self):
+        self._error_logs(25, self.old)
+        self._error_logs(5, timezone.now())
+        report = RetentionService.run(['management.error_logs'], chunk_size=7, sleep=0)
+        self.assertEqual(report, {'management.error_logs': 25})
+        self.assertEqual(ErrorLog.objects.count(), 5)
+
+    def test_expired_rows_above_newest_timestamp_pk_are_removed(self):
+        # pk order differs from last_seen order
+        self._error_logs(1, self.old + timedelta(days=10))
+        self._error_logs(3, self.old)
+        self._error_logs(1, timezone.now())
+        report = RetentionService.run(['management.error_logs'], chunk_size=2, sleep=0)
+        self.assertEqual(report, {'management.error_logs': 4})
+        self.assertEqual(ErrorLog.objects.count(), 1)
+
+    def test_audit_retention_is_opt_in(self):
+        log = AuditLog.objects.create(user=self.user, action='UPDATE', table_name='t', record_id='1')
+        AuditLog.objects.filter(pk=log.pk).update(timestamp=self.old)
+        self.assertNotIn('management.audit_logs', RetentionService.run(sleep=0))
+        self.assertEqual(RetentionService.run(['management.audit_logs']), {})
+        self.assertTrue(AuditLog.objects.exists())
+
+        with override_settings(RETENTION_DAYS={'management.audit_logs': 365}):
+            self.assertEqual(RetentionService.run(['management.audit_logs'], sleep=0), {'management.audit_logs': 1})
+        self.assertFalse(AuditLog.objects.exists())
+
+    def test_dry_run_counts_without_deleting(self):
+        self._error_logs(3, self.old)
+        self.assertEqual(RetentionService.run(['management.error_logs'], dry_run=True), {'management.error_logs': 3})
+        self.assertEqual(ErrorLog.objects.count(), 3)
+
+    @override_settings(RETENTION_DAYS={'management.error_logs': 500})
+    def test_days_can_be_overridden(self):
+        self._error_logs(3, self.old)
+        self.assertEqual(RetentionService.run(['management.error_logs']), {'management.error_logs': 0})
+
+    def test_policy_filters_apply(self):
+        read = Notification.objects.create(recipient=self.user, title='r', message='m', is_read=True)
+        unread = Notification.objects.create(recipient=self.user, title='u', message='m')
+        Notification.objects.filter(pk__in=[read.pk, unread.pk]).update(created_at=self.old)
+        RetentionService.run(['notifications.read'], sleep=0)
+        self.assertEqual(list(Notification.objects.values_list('pk', flat=True)), [unread.pk])
+
+    def test_uuid_primary_keys_use_batches(self):
+        for status in ('sent', 'sent', 'sent', 'failed'):
+            NotificationOutbox.objects.create(
+                recipient=self.user, title='t', body='b', status=status, sent_at=self.old
+            )
+        report = RetentionService.run(['notifications.outbox_sent'], chunk_size=2, sleep=0)
+        self.assertEqual(report, {'notifications.outbox_sent': 3})
+        self.assertEqual(NotificationOutbox.objects.count(), 1)
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            RetentionService.get_policies(['nope'])
+
+
+class RetentionLargeTableTest(TestCase):
+    """Purge half of a 1M-row table in bounded chunks."""
+
+    ROWS = 1_000_000
+    CHUNK = 50_000
+
+    def setUp(self):
+        old = (timezone.now() - timedelta(days=60)).strftime('%Y-%m-%d %H:%M:%S')
+        new = timezone.now().strftime('%Y-%m-%d %H:%M:%S')
+        table = ErrorLog._meta.db_table
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute(
+                    f"INSERT INTO {table} (timestamp, last_seen, occurrences, path, method, error_message, traceback) "
+                    f"SELECT t, t, 1, '/x', 'GET', 'e', '' FROM ("
+                    f"SELECT CASE WHEN n <= %s THEN %s::timestamptz ELSE %s::timestamptz END AS t "
+                    f"FROM generate_series(1, %s) AS n) AS rows",
+                    [self.ROWS // 2, old, new, self.ROWS],
+                )
+            elif connection.vendor == 'sqlite':
+                cursor.execute(
+                    f"WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < %s) "
+                    f"INSERT INTO {table} (timestamp, last_seen, occurrences, path, method, error_message, traceback) "
+                    f"SELECT t, t, 1, '/x', 'GET', 'e', '' FROM ("
+                    f"SELECT CASE WHEN n <= %s THEN %s ELSE %s END AS t FROM seq)",
+                    [self.ROWS, self.ROWS // 2, old, new],
+                )
+            else:
+                self.skipTest(f'No bulk row generator for {connection.vendor}')
+
+    def test_purges_in_chunks(self):
+        with CaptureQueriesContext(connection) as ctx:
+            report = RetentionService.run(['management.error_logs'], chunk_size=self.CHUNK, sleep=0)
+
+        self.assertEqual(report, {'management.error_logs': self.ROWS // 2})
+        self.assertEqual(ErrorLog.objects.count(), self.ROWS // 2)
+        deletes = [q for q in ctx.captured_queries if q['sql'].startswith('DELETE')]
+        self.assertEqual(len(deletes), self.ROWS // 2 // self.CHUNK)
@@ -0,0 +1,116 @@
+"""
+Settings Service Tests
+Tests for the versioned in-process settings snapshot and batch writes.
+"""
+from unittest.mock import patch, MagicMock
+
+from django.core.cache import cache
+from django.core.signals import request_finished, request_started
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+
+from management.models import SystemSetting
+from ibb_guide.services import cache_service
+from management.services.settings_service import SettingsService
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class SettingsServiceTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        SettingsService._snapshot.reset()
+        for i in range(20):
+            SystemSetting.objects.create(key=f'key_{i}', value=str(i), data_type='integer', is_public=i % 2 == 0)
+        SystemSetting.objects.create(key='maintenance_mode', value='false', data_type='boolean', is_public=True)
+
+    def tearDown(self):
+        SettingsService.end_request()
+
+    def _counting_cache(self):
+        return MagicMock(wraps=cache)
+
+    def test_get_casts_values(self):
+        self.assertEqual(SettingsService.get('key_3'), 3)
+        self.assertIs(SettingsService.get('maintenance_mode'), False)
+        self.assertEqual(SettingsService.get('missing', 'fallback'), 'fallback')
+
+    def test_get_all_public(self):
+        public = SettingsService.get_all_public()
+        self.assertIn('key_0', public)
+        self.assertNotIn('key_1', public)
+        self.assertIn('maintenance_mode', public)
+
+    def test_one_cache_read_per_request(self):
+        """A template touching many settings costs a single version check."""
+        SettingsService.get('key_0')  # warm the process snapshot
+        counting = self._counting_cache()
+
+        with patch.object(cache_service, 'cache', counting):
+            request_started.send(sender=self.__class__)
+            context = Context({
+                'system_settings': SettingsService.get_all_public(),
+                **SettingsService.get_many([f'key_{i}' for i in range(20)]),
+            })
+            Template(
+                '{% for k, v in system_settings.items %}{{ k }}={{ v }};{% endfor %}'
+                '{{ key_1 }}{{ key_5 }}{{ key_19 }}'
+            ).render(context)
+            for i in range(20):
+                SettingsService.get(f'key_{i}')
+            request_finished.send(sender=self.__class__)
+
+        self.assertEqual(counting.get.call_count, 1)
+
+    def test_snapshot_needs_no_query_when_version_unchanged(self):
+        SettingsService.get('key_0')
+        request_started.send(sender=self.__class__)
+        with self.assertNumQueries(0):
+            for i in range(20):
+                SettingsService.get(f'key_{i}')
+            SettingsService.get_all_public()
+        request_finished.send(sender=self.__class__)
+
+    def test_version_bump_reloads_snapshot(self):
+        self.assertEqual(SettingsService.get('key_1'), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            SettingsService.set('key_1', 42, 'integer')
+        self.assertEqual(SettingsService.get('key_1'), 42)
+
+    def test_row_changes_bump_version_on_commit(self):
+        SettingsService.get('key_3')
+        version = cache.get(SettingsService.VERSION_KEY)
+        with self.captureOnCommitCallbacks(execute=True):
+            SystemSetting.objects.filter(key='key_3').get().delete()
+            self.assertEqual(cache.get(SettingsService.VERSION_KEY), version)
+        self.assertNotEqual(cache.get(SettingsService.VERSION_KEY), version)
+        self.assertIsNone(SettingsService.get('key_3'))
+
+    def test_other_process_write_is_seen_next_request(self):
+        self.assertEqual(SettingsService.get('key_2'), 2)
+        # Simulate another process writing: DB row and version key change
+        SystemSetting.objects.filter(key='key_2').update(value='7')
+        cache.set(SettingsService.VERSION_KEY, 'other-process', SettingsService.CACHE_TIMEOUT)
+        request_started.send(sender=self.__class__)
+        self.assertEqual(SettingsService.get('key_2'), 7)
+        request_finished.send(sender=self.__class__)
+
+    def test_set_many_bumps_version_once(self):
+        with patch.object(SettingsService, 'invalidate', wraps=SettingsService.invalidate) as mock_invalidate, \
+                self.captureOnCommitCallbacks(execute=True):
+            written = SettingsService.set_many([
+                ('key_0', 100, 'integer', ''),
+                ('key_1', 101, 'integer', ''),
+                ('key_2', '2', 'integer', ''),  # unchanged
+                ('new_key', 'hello'),
+            ])
+        self.assertEqual(written, 3)
+        self.assertEqual(mock_invalidate.call_count, 1)
+        self.assertEqual(SettingsService.get('key_0'), 100)
+        self.assertEqual(SettingsService.get('key_1'), 101)
+        self.assertEqual(SettingsService.get('new_key'), 'hello')
+
+    def test_set_many_noop_does_not_bump_version(self):
+        SettingsService.get('key_0')
+        version = cache.get(SettingsService.VERSION_KEY)
+        self.assertEqual(SettingsService.set_many([('key_0', '0', 'integer', '')]), 0)
+        self.assertEqual(cache.get(SettingsService.VERSION_KEY), version)
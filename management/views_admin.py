@@ -72,26 +72,14 @@ class AdminDashboardView(StaffAdminRequiredMixin, TemplateView):
             partner_stats['needs_info']
         ]
         
-        # B. Weekly Views (Aggregated from PlaceDailyView)
-        from places.models.analytics import PlaceDailyView
-        from django.db.models.functions import TruncDate
+        # B. Weekly Views (read from the DailyMetric rollup)
+        from management.services.metrics_service import MetricsService
         
-        today = timezone.now().date()
+        today = timezone.localdate()
         last_7_days = today - timedelta(days=6)
         
-        daily_views = PlaceDailyView.objects.filter(
-            date__range=[last_7_days, today]
-        ).values('date').annotate(total_views=Sum('views')).order_by('date')
-        
-        # Fill missing dates with 0
-        views_dict = {item['date']: item['total_views'] for item in daily_views}
-        labels = []
-        data = []
-        
-        for i in range(7):
-            d = last_7_days + timedelta(days=i)
-            labels.append(d.strftime('%Y-%m-%d'))
-            data.append(views_dict.get(d, 0))
+        data = MetricsService.series(['place.views'], last_7_days, today)['place.views']
+        labels = [(last_7_days + timedelta(days=i)).strftime('%Y-%m-%d') for i in range(7)]
             
         context['chart_daily_labels'] = labels
         context['chart_daily_data'] = data
@@ -1695,9 +1683,10 @@ class AdminSettingsView(LoginRequiredMixin, UserPassesTestMixin, View):
         from management.models import SystemSetting
         from management.services.settings_service import SettingsService
 
-        # Iterate over all settings and update them
+        # Collect all submitted settings and write them in one batch
         settings = SystemSetting.objects.all()
-        
+        updates = []
+
         for setting in settings:
             # Check if value is in POST
             val = request.POST.get(f'setting_{setting.key}')
@@ -1706,9 +1695,11 @@ class AdminSettingsView(LoginRequiredMixin, UserPassesTestMixin, View):
             if setting.data_type == 'boolean':
                 val = 'true' if val else 'false'
             
-            # Only update if changed (optional optimization, but Service handles cache)
             if val is not None:
-                SettingsService.set(setting.key, val, setting.data_type, setting.description)
+                updates.append((setting.key, val, setting.data_type, setting.description))
+
+        # Unchanged rows are skipped; the snapshot version is bumped once
+        SettingsService.set_many(updates)
         
         messages.success(request, "تم تحديث الإعدادات بنجاح.")
         return redirect('admin_settings')
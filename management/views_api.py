@@ -5,7 +5,7 @@ from django.utils.decorators import method_decorator
 from django.contrib.auth.decorators import login_required
 from datetime import timedelta
 from django.utils import timezone
-from .models.analytics import AdDailyStats
+from .services.metrics_service import MetricsService, owner_dimension
 
 @method_decorator(login_required, name='dispatch')
 class PartnerAnalyticsAPI(View):
@@ -13,39 +13,17 @@ class PartnerAnalyticsAPI(View):
         if not request.user.role or request.user.role.name != 'Partner':
              return JsonResponse({'error': 'Unauthorized'}, status=403)
 
-        # Get data for last 30 days
-        end_date = timezone.now().date()
+        # Get data for last 30 days (from the DailyMetric rollup)
+        end_date = timezone.localdate()
         start_date = end_date - timedelta(days=29)
         
-        # Aggregate clicks/views per day for ALL partner's ads
-        data = AdDailyStats.objects.filter(
-            advertisement__owner=request.user,
-            date__range=[start_date, end_date]
-        ).values('date').annotate(
-            total_clicks=Sum('clicks'),
-            total_views=Sum('views')
-        ).order_by('date')
-        
-        # Prepare response (fill missing dates with 0?)
-        # For simplicity, sending raw data, frontend can fill gaps or ChartJS handles it.
-        # Actually, filling gaps is better for UX.
-        
-        stats_map = {str(d['date']): d for d in data}
-        
-        labels = []
-        clicks = []
-        views = []
-        
-        current = start_date
-        while current <= end_date:
-            date_str = str(current)
-            stat = stats_map.get(date_str, {'total_clicks': 0, 'total_views': 0})
-            
-            labels.append(current.strftime('%d/%m')) # Format DD/MM
-            clicks.append(stat['total_clicks'])
-            views.append(stat['total_views'])
-            
-            current += timedelta(days=1)
+        series = MetricsService.series(
+            ['ad.clicks', 'ad.views'], start_date, end_date,
+            dimension=owner_dimension(request.user.pk)
+        )
+        labels = [(start_date + timedelta(days=i)).strftime('%d/%m') for i in range(30)]  # Format DD/MM
+        clicks = series['ad.clicks']
+        views = series['ad.views']
             
         return JsonResponse({
             'labels': labels,
@@ -6,7 +6,7 @@ from django.http import HttpResponse
 from django.template.loader import render_to_string
 from django.core.cache import cache
 from django.conf import settings
-from .selectors import get_random_active_ad
+from .services.ad_slot_service import AdSlotService
 
 class InvestmentListView(ListView):
     model = InvestmentOpportunity
@@ -78,30 +78,23 @@ class AdSlotView(View):
     }
 
     def get(self, request, placement):
-        cache_key = f"adslot_html:{placement}"
-        cached_html = cache.get(cache_key)
-        
-        if cached_html is not None:
-            if cached_html == "":
-                return HttpResponse('', status=204)
-            return HttpResponse(cached_html)
-
         template = self.TEMPLATE_MAP.get(placement)
         if not template:
             return HttpResponse('', status=204)
 
-        ad = get_random_active_ad(placement)
-        
-        ttl = getattr(settings, 'AD_SLOT_HTML_CACHE_SECONDS', 30)
-        
+        # Weighted pick from the in-memory slot table (no query)
+        table = AdSlotService.get_table(placement)
+        ad = table.pick()
         if not ad:
-            # Cache empty marker to avoid repeated DB hits
-            cache.set(cache_key, "", ttl)
             return HttpResponse('', status=204)
 
-        # Render WITHOUT request to avoid triggering global context processors
-        html = render_to_string(template, {'ad': ad})
-        cache.set(cache_key, html, ttl)
+        # Rendered HTML is shared per ad until the ads change
+        cache_key = f"adslot_html:{placement}:{ad.pk}:{table.version}"
+        html = cache.get(cache_key)
+        if html is None:
+            # Render WITHOUT request to avoid triggering global context processors
+            html = render_to_string(template, {'ad': ad})
+            cache.set(cache_key, html, getattr(settings, 'AD_SLOT_HTML_CACHE_SECONDS', 300))
         return HttpResponse(html)
 
 
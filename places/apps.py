@@ -9,3 +9,5 @@ class PlacesConfig(AppConfig):
     def ready(self):
         # Activate aggregate signals for auto-updating ratings/counts
         from .services import aggregate_signals  # noqa: F401
+        from .services import dashboard_signals  # noqa: F401
+        from .services import route_signals  # noqa: F401
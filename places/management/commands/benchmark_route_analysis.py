@@ -0,0 +1,177 @@
+"""
+Benchmark route analysis: analyses per second for destination routes and
+saved tourist routes, before and after caching.
+
+Seeds places (some mountainous / off-road), users with vehicle profiles
+and tourist routes, then runs N analyses with the legacy per-call path
+(profile + category queries and one RouteLog INSERT per call) and with
+RouteService (cached results, batched logs, precompiled route plans).
+
+Usage:
+    python manage.py benchmark_route_analysis --analyses 1000
+    python manage.py benchmark_route_analysis --cleanup
+"""
+import random
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+PREFIX = 'bench_route_'
+
+
+class QueryCounter:
+    """connection.execute_wrapper that counts queries."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = 'Time N route analyses: per-call queries and logging vs cached RouteService'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--analyses', type=int, default=1000)
+        parser.add_argument('--places', type=int, default=200)
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--routes', type=int, default=20)
+        parser.add_argument('--waypoints', type=int, default=8)
+        parser.add_argument('--cleanup', action='store_true', help='Delete seeded rows and exit')
+
+    def handle(self, *args, **options):
+        from django.contrib.auth import get_user_model
+        from places.models import Category, Place, TouristRoute
+
+        User = get_user_model()
+        TouristRoute.objects.filter(name__startswith=PREFIX).delete()
+        Place.objects.filter(name__startswith=PREFIX).delete()
+        Category.objects.filter(name__startswith=PREFIX).delete()
+        User.objects.filter(username__startswith=PREFIX).delete()
+        if options['cleanup']:
+            self.stdout.write(self.style.SUCCESS("Deleted seeded routes, places and users."))
+            return
+
+        users, places, route_ids = self.seed(options)
+        rng = random.Random(1)
+        n = options['analyses']
+        pairs = [(rng.choice(users), rng.choice(places)) for _ in range(n)]
+        picks = [rng.choice(route_ids) for _ in range(n)]
+
+        from places.services.route_service import RouteLogBuffer, RouteService
+
+        # Fresh user/place objects per call, as a request would have
+        fresh = lambda: [(User(pk=u.pk), Place(pk=p.pk, category_id=p.category_id,
+                                              road_condition=p.road_condition)) for u, p in pairs]
+
+        calls = fresh()
+        self.report('destination, legacy', n, *self.measure(lambda: [self.legacy(u, p) for u, p in calls]))
+        RouteService.invalidate()
+        calls = fresh()
+        self.report('destination, cold cache', n, *self.measure(
+            lambda: [RouteService.analyze_route(u, p) for u, p in calls] and RouteLogBuffer.flush()
+        ))
+        calls = fresh()
+        self.report('destination, warm cache', n, *self.measure(
+            lambda: [RouteService.analyze_route(u, p) for u, p in calls] and RouteLogBuffer.flush()
+        ))
+
+        self.report('saved route, legacy', n, *self.measure(
+            lambda: [self.legacy_saved(route_id) for route_id in picks]
+        ))
+        RouteService.invalidate()
+        self.report('saved route, cold plans', n, *self.measure(
+            lambda: [RouteService.analyze_saved_route(route_id) for route_id in picks]
+        ))
+        self.report('saved route, warm plans', n, *self.measure(
+            lambda: [RouteService.analyze_saved_route(route_id) for route_id in picks]
+        ))
+
+    def seed(self, options):
+        from django.contrib.auth import get_user_model
+        from management.models import VehicleProfile
+        from places.models import Category, Place, RouteWaypoint, TouristRoute
+
+        User = get_user_model()
+        rng = random.Random(0)
+        categories = [Category.objects.create(name=f'{PREFIX}{name}') for name in ('Mountain', 'City')]
+        # The analysis matches category names exactly
+        Category.objects.filter(pk=categories[0].pk).update(name='Mountain')
+        categories[0].name = 'Mountain'
+
+        places = Place.objects.bulk_create([
+            Place(
+                name=f'{PREFIX}{i}', category=categories[i % 2],
+                road_condition='offroad' if i % 3 == 0 else 'paved',
+                latitude=Decimal('13.9') + Decimal(rng.randint(0, 2000)) / 10000,
+                longitude=Decimal('44.1') + Decimal(rng.randint(0, 2000)) / 10000,
+            )
+            for i in range(options['places'])
+        ])
+        users = User.objects.bulk_create([User(username=f'{PREFIX}{i}') for i in range(options['users'])])
+        VehicleProfile.objects.bulk_create([
+            VehicleProfile(user=user, vehicle_type=rng.choice(['SEDAN', 'SUV', '4X4']))
+            for user in users[::2]
+        ])
+
+        route_ids = []
+        for r in range(options['routes']):
+            route = TouristRoute.objects.create(
+                name=f'{PREFIX}{r}', description='', estimated_duration=120, distance_km=Decimal('10'),
+            )
+            RouteWaypoint.objects.bulk_create([
+                RouteWaypoint(route=route, place=place, order=order)
+                for order, place in enumerate(rng.sample(places, options['waypoints']))
+            ])
+            route_ids.append(route.pk)
+        return users, places, route_ids
+
+    def legacy(self, user, place):
+        """The pre-change analyze_route: queries and one INSERT per call."""
+        from management.models import RouteLog
+        from places.services.route_service import evaluate, is_night, place_flags
+
+        try:
+            vehicle_type = user.vehicle_profile.vehicle_type
+        except Exception:
+            vehicle_type = 'SEDAN'
+        status, warnings = evaluate(vehicle_type, is_night(), *place_flags(place.category.name, place.road_condition))
+        RouteLog.objects.create(user=user, destination_place=place, safety_status=status, warnings=warnings)
+        return status, warnings
+
+    def legacy_saved(self, route_id):
+        """A saved route analysed leg by leg from the database."""
+        from places.models import RouteWaypoint
+        from places.services.geo_service import haversine_distance
+        from places.services.route_service import evaluate, is_night, place_flags
+
+        night = is_night()
+        previous = None
+        legs = []
+        for waypoint in RouteWaypoint.objects.filter(route_id=route_id).select_related('place__category'):
+            place = waypoint.place
+            category = place.category.name if place.category else None
+            legs.append(evaluate('SEDAN', night, *place_flags(category, place.road_condition)))
+            if previous is not None:
+                haversine_distance(float(previous.latitude), float(previous.longitude),
+                                   float(place.latitude), float(place.longitude))
+            previous = place
+        return legs
+
+    def measure(self, fn):
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            start = time.perf_counter()
+            fn()
+            elapsed = time.perf_counter() - start
+        return elapsed, counter.count
+
+    def report(self, label, n, elapsed, queries):
+        self.stdout.write(
+            f"{label:<26} {n / elapsed:>10.0f} analyses/s  {elapsed * 1000:>8.1f} ms  {queries:>6} queries"
+        )
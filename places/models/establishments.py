@@ -12,6 +12,7 @@ from django.db.models import Q
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
+from ibb_guide.base_models import FieldTrackerMixin
 from .base import Place, Amenity
 
 User = get_user_model()
@@ -104,9 +105,12 @@ class EstablishmentManager(models.Manager):
         return self.get_queryset().for_list()
 
 
-class Establishment(Place):
+class Establishment(FieldTrackerMixin, Place):
     """Partner-owned establishment extending Place."""
     
+    # Diffed by interactions.signals on save
+    tracked_fields = ('license_status', 'is_active', 'pending_updates')
+    
     SENSITIVE_FIELDS = [
         'name', 'description', 'address_text', 'latitude', 'longitude',
         'category', 'directorate', 'road_condition', 'classification'
@@ -0,0 +1,50 @@
+"""
+Dashboard Signals
+Invalidate cached partner dashboards when their inputs change.
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from places.services.partner_dashboard_service import (
+    invalidate_partner_dashboard,
+    invalidate_all_partner_dashboards,
+)
+
+
+@receiver(post_save, sender='places.Establishment')
+@receiver(post_delete, sender='places.Establishment')
+def invalidate_dashboard_on_establishment_change(sender, instance, **kwargs):
+    invalidate_partner_dashboard(instance.owner_id)
+
+
+@receiver(post_save, sender='places.EstablishmentDraft')
+@receiver(post_delete, sender='places.EstablishmentDraft')
+def invalidate_dashboard_on_draft_change(sender, instance, **kwargs):
+    invalidate_partner_dashboard(instance.user_id)
+
+
+@receiver(post_save, sender='interactions.Review')
+@receiver(post_delete, sender='interactions.Review')
+def invalidate_dashboard_on_review_change(sender, instance, **kwargs):
+    from places.models import Establishment
+
+    owner_id = Establishment.objects.filter(pk=instance.place_id).values_list('owner_id', flat=True).first()
+    invalidate_partner_dashboard(owner_id)
+
+
+@receiver(post_save, sender='surveys.Survey')
+@receiver(post_delete, sender='surveys.Survey')
+@receiver(post_save, sender='management.FeatureToggle')
+@receiver(post_delete, sender='management.FeatureToggle')
+def invalidate_dashboards_on_global_change(sender, instance, **kwargs):
+    invalidate_all_partner_dashboards()
+
+
+@receiver(post_save, sender='surveys.SurveyResponse')
+@receiver(post_delete, sender='surveys.SurveyResponse')
+def invalidate_dashboards_on_survey_response(sender, instance, **kwargs):
+    # Responses only change the open-survey count for capped surveys
+    from surveys.models import Survey
+
+    if Survey.objects.filter(pk=instance.survey_id, max_responses__gt=0).exists():
+        invalidate_all_partner_dashboards()
@@ -0,0 +1,110 @@
+"""Partner Dashboard Service
+
+Builds the statistics shown on the partner dashboard and caches them per
+partner. Partner-specific changes (establishments, reviews, drafts)
+invalidate one partner's entry; site-wide inputs (surveys, feature
+toggles) bump a shared version that is part of every key.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db.models import Avg, Count, Q, Sum
+from django.utils import timezone
+
+from ibb_guide.services.cache_service import bump_version, get_version
+
+logger = logging.getLogger(__name__)
+
+CACHE_TTL = 300
+GLOBAL_VERSION_KEY = 'partner_dashboard:version'
+
+
+def dashboard_cache_key(user_id):
+    return f'partner_dashboard:{user_id}:{get_version(GLOBAL_VERSION_KEY)}'
+
+
+def invalidate_partner_dashboard(user_id):
+    """Drop one partner's cached dashboard."""
+    if user_id:
+        cache.delete(dashboard_cache_key(user_id))
+
+
+def invalidate_all_partner_dashboards():
+    """Invalidate every partner's dashboard (site-wide inputs changed)."""
+    bump_version(GLOBAL_VERSION_KEY)
+
+
+def get_partner_dashboard_stats(user):
+    """Return cached dashboard statistics for a partner."""
+    key = dashboard_cache_key(user.pk)
+    stats = cache.get(key)
+    if stats is None:
+        stats = build_partner_dashboard_stats(user)
+        cache.set(key, stats, CACHE_TTL)
+    return stats
+
+
+def build_partner_dashboard_stats(user):
+    """Compute dashboard statistics with batched aggregates."""
+    from places.models import Establishment
+    from places.models.drafts import EstablishmentDraft
+    from interactions.models import Review
+    from management.models import FeatureToggle
+    from management.services.metrics_service import MetricsService, owner_dimension
+    from surveys.models import Survey
+
+    establishments = Establishment.objects.filter(owner=user)
+
+    # One aggregate for all establishment counters
+    totals = establishments.aggregate(
+        total=Count('pk'),
+        pending=Count('pk', filter=~Q(approval_status='approved')),
+        avg_rating=Avg('avg_rating'),
+        total_views=Sum('view_count'),
+    )
+
+    owner_reviews = Review.objects.filter(place__establishment__owner=user)
+
+    toggles = dict(
+        FeatureToggle.objects.filter(
+            key__in=['enable_place_creation', 'enable_edit_after_approval']
+        ).values_list('key', 'is_enabled')
+    )
+
+    stats = {
+        'places': list(establishments[:5]),  # Show recent 5 for overview
+        'total_places': totals['total'],
+        'drafts_count': EstablishmentDraft.objects.filter(user=user, status='draft').count(),
+        'pending_count': totals['pending'],
+        'avg_rating': totals['avg_rating'] or 0,
+        'total_views': totals['total_views'] or 0,
+        'total_reviews': owner_reviews.count(),
+        'recent_reviews': list(owner_reviews.select_related('user', 'place').order_by('-created_at')[:5]),
+        'toggles': {
+            'enable_place_creation': toggles.get('enable_place_creation', False),
+            'enable_edit_after_approval': toggles.get('enable_edit_after_approval', False),
+        },
+        # Open surveys counted DB-side (no per-survey COUNT)
+        'active_surveys_count': Survey.objects.filter(is_active=True).open().count(),
+        'chart_labels': [],
+        'chart_data': [],
+        'chart_data_clicks': [],
+    }
+
+    if totals['total']:
+        # Analytics Chart Data (Last 7 days, from the DailyMetric rollup)
+        today = timezone.localdate()
+        last_week = today - timedelta(days=6)
+        series = MetricsService.series(
+            ['place.views', 'place.contact_clicks'], last_week, today,
+            dimension=owner_dimension(user.pk)
+        )
+        stats['chart_labels'] = [
+            (last_week + timedelta(days=i)).strftime('%A') for i in range(7)
+        ]
+        stats['chart_data'] = series['place.views']
+        stats['chart_data_clicks'] = series['place.contact_clicks']
+
+    return stats
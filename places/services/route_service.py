@@ -1,65 +1,303 @@
+"""
+Route Service
+Safety analysis of routes before handing off to Maps.
+
+Analysis only reads the vehicle type, the destination's category and road
+condition, and whether it is night. The user's vehicle type and the
+destination's flags are cached for ROUTE_ANALYSIS_CACHE_SECONDS; the rules
+themselves are a few comparisons and run on every call.
+RouteLog rows are buffered in-process and written in batches by the
+places.write_route_logs task; a partial batch goes out with the first
+request to finish after its oldest row is ROUTE_LOG_FLUSH_SECONDS old.
+Saved TouristRoutes are compiled once into per-segment plans (flags and
+leg distances) held in process, so analysing a saved route is a loop over
+its waypoints without database queries.
+"""
+import atexit
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone
+
+from ibb_guide.services.cache_service import VersionedSnapshot
 from management.models import RouteLog, VehicleProfile
+from places.services.geo_service import haversine_distance
+
+logger = logging.getLogger(__name__)
+
+ROUTE_VERSION_KEY = 'routes:version'
+DEFAULT_VEHICLE = 'SEDAN'
+
+MOUNTAIN_CATEGORIES = frozenset(['Jibal', 'Mountain', 'Nature'])
+OFFROAD_CONDITIONS = frozenset(['offroad', 'difficult', 'unpaved'])
+STATUS_RANK = {'SAFE': 0, 'WARNING': 1, 'DANGER': 2}
+
+NIGHT_MOUNTAIN_WARNING = "القيادة في الطرق الجبلية ليلاً قد تكون خطرة. يرجى توخي الحذر الشديد."
+OFFROAD_SEDAN_WARNING = "الطريق لهذا المعلم قد يكون وعراً ولا يناسب السيارات الصغيرة."
+
+# Place fields the analysis reads; saves touching only other fields keep the caches
+ROUTE_PLACE_FIELDS = frozenset(['category', 'road_condition', 'name', 'latitude', 'longitude'])
+
+
+def is_night(now=None):
+    hour = (now or timezone.now()).hour
+    return hour < 5 or hour > 18
+
+
+def evaluate(vehicle_type, night, is_mountain, is_offroad):
+    """
+    Safety rules for one destination.
+    Returns: (status, warnings) with status SAFE, WARNING or DANGER.
+    """
+    warnings = []
+    status = 'SAFE'
+
+    # Night + mountain roads
+    if night and is_mountain:
+        warnings.append(NIGHT_MOUNTAIN_WARNING)
+        status = 'WARNING'
+
+    # Off-road + small car
+    if is_offroad and vehicle_type == 'SEDAN':
+        warnings.append(OFFROAD_SEDAN_WARNING)
+        status = 'DANGER'
+
+    # Weather integration would add a DANGER rule here (rain near wadis)
+    return status, warnings
+
+
+def place_flags(category_name, road_condition):
+    """(is_mountain, is_offroad) for a destination."""
+    return category_name in MOUNTAIN_CATEGORIES, (road_condition or '') in OFFROAD_CONDITIONS
+
+
+@dataclass(frozen=True)
+class RouteSegment:
+    """One waypoint of a saved route, with what analysis needs precomputed."""
+    place_id: int
+    name: str
+    # From the previous waypoint; None for the first one or without coordinates
+    distance_km: Optional[float]
+    is_mountain: bool
+    is_offroad: bool
+
+
+@dataclass(frozen=True)
+class RoutePlan:
+    route_id: int
+    segments: tuple
+    distance_km: float
+    version: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class LegAnalysis:
+    place_id: int
+    name: str
+    distance_km: Optional[float]
+    status: str
+    warnings: tuple
+
+
+class RouteLogBuffer:
+    """
+    Process-local batch of pending RouteLog rows.
+
+    Rows are handed to the write task once ROUTE_LOG_BATCH_SIZE have
+    accumulated, at the end of any request (or add) once the oldest has
+    waited ROUTE_LOG_FLUSH_SECONDS, and when the process exits. A process
+    that serves no further requests keeps its rows until it exits; rows
+    still buffered when a process is killed are lost. Route logs are
+    analytics (see the retention policy).
+    """
+    _rows = []
+    _oldest = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def add(cls, user_id, place_id, status, warnings):
+        now = time.monotonic()
+        with cls._lock:
+            cls._rows.append([user_id, place_id, status, list(warnings)])
+            if cls._oldest is None:
+                cls._oldest = now
+            full = len(cls._rows) >= getattr(settings, 'ROUTE_LOG_BATCH_SIZE', 100)
+        if full or cls.is_stale(now):
+            cls.flush()
+
+    @classmethod
+    def is_stale(cls, now=None):
+        """Whether the oldest buffered row has waited ROUTE_LOG_FLUSH_SECONDS."""
+        oldest = cls._oldest
+        if oldest is None:
+            return False
+        now = time.monotonic() if now is None else now
+        return now - oldest >= getattr(settings, 'ROUTE_LOG_FLUSH_SECONDS', 30)
+
+    @classmethod
+    def flush_if_stale(cls, **kwargs):
+        """request_finished receiver (see route_signals): flush rows that have waited long enough."""
+        if cls.is_stale():
+            cls.flush()
+
+    @classmethod
+    def drain(cls):
+        with cls._lock:
+            rows, cls._rows, cls._oldest = cls._rows, [], None
+        return rows
+
+    @classmethod
+    def pending(cls):
+        return len(cls._rows)
+
+    @classmethod
+    def flush(cls):
+        """Hand buffered rows to the write task. Returns the number of rows."""
+        rows = cls.drain()
+        if not rows:
+            return 0
+        from places.tasks import write_route_logs
+        try:
+            write_route_logs.delay(rows)
+        except Exception as e:
+            # Broker unavailable: write in this process
+            logger.warning(f"[RouteLog] Could not defer write: {e}")
+            write_logs(rows)
+        return len(rows)
+
+
+def write_logs(rows):
+    """Insert buffered [user_id, place_id, status, warnings] rows."""
+    RouteLog.objects.bulk_create([
+        RouteLog(user_id=user_id, destination_place_id=place_id, safety_status=status, warnings=warnings)
+        for user_id, place_id, status, warnings in rows
+    ], batch_size=500)
+    return len(rows)
+
+
+def _flush_at_exit():
+    try:
+        RouteLogBuffer.flush()
+    except Exception as e:
+        logger.warning(f"[RouteLog] Dropped buffered rows at exit: {e}")
+
+
+atexit.register(_flush_at_exit)
+
 
 class RouteService:
     """
     Middleware Service for Smart Routing.
     Analyzes safety before handing off to Maps.
     """
+    VEHICLE_KEY = 'routes:vehicle:{user_id}'
+    DESTINATION_KEY = 'routes:destination:{version}:{place_id}'
+
+    _plans = VersionedSnapshot(
+        ROUTE_VERSION_KEY,
+        lambda version, route_id: RouteService.build_plan(route_id, version),
+        check_setting='ROUTE_VERSION_CHECK_SECONDS',
+    )
 
     @staticmethod
-    def analyze_route(user, place):
+    def analyze_route(user, place, now=None):
         """
         Analyze the route from User -> Place.
         Returns: (status, warnings_list)
         Status: SAFE, WARNING, DANGER
         """
-        warnings = []
-        status = 'SAFE'
+        status, warnings = evaluate(
+            RouteService.get_vehicle_type(user), is_night(now), *RouteService.get_destination_flags(place)
+        )
+        if user.pk is not None:
+            RouteLogBuffer.add(user.pk, place.pk, status, warnings)
+        return status, warnings
 
-        # 1. Get User Profile
-        try:
-            profile = user.vehicle_profile
-            vehicle_type = profile.vehicle_type
-        except Exception:
-            vehicle_type = 'SEDAN' # Default assumption
-
-        # 2. Night Check
-        hour = timezone.now().hour
-        is_night = hour < 5 or hour > 18
-        
-        # Hypothetical Place Attributes (would be in Place model)
-        # place.is_mountainous = True/False
-        # place.road_type = 'PAVED' / 'OFFROAD'
-        
-        # Check 1: Night + Mountain
-        # Assuming we add is_mountainous to Place or infer from category/location
-        # For now, simplistic Category check
-        is_mountain = place.category.name in ['Jibal', 'Mountain', 'Nature']
-        
-        if is_night and is_mountain:
-            warnings.append("القيادة في الطرق الجبلية ليلاً قد تكون خطرة. يرجى توخي الحذر الشديد.")
-            status = 'WARNING'
-
-        # Check 2: Offroad + Sedan
-        # Use place.road_condition if available
-        is_offroad = getattr(place, 'road_condition', '') in ['offroad', 'difficult', 'unpaved']
-        
-        if is_offroad and vehicle_type == 'SEDAN':
-            warnings.append("الطريق لهذا المعلم قد يكون وعراً ولا يناسب السيارات الصغيرة.")
-            status = 'DANGER'
-
-        # Check 3: Weather Integration (Mock)
-        # if WeatherService.is_raining(place.location):
-        #    warnings.append("يوجد تحذير أمطار في المنطقة. تجنب الأودية.")
-        #    status = 'DANGER'
-
-        # Log Request
-        RouteLog.objects.create(
-            user=user,
-            destination_place=place,
-            safety_status=status,
-            warnings=warnings
+    @staticmethod
+    def get_destination_flags(place):
+        """(is_mountain, is_offroad) for a place (cached)."""
+        key = RouteService.DESTINATION_KEY.format(version=RouteService._plans.version(), place_id=place.pk)
+        flags = cache.get(key)
+        if flags is None:
+            category = place.category
+            flags = place_flags(category.name if category else None, getattr(place, 'road_condition', ''))
+            cache.set(key, flags, getattr(settings, 'ROUTE_ANALYSIS_CACHE_SECONDS', 600))
+        return flags
+
+    @staticmethod
+    def get_vehicle_type(user):
+        """The user's vehicle type (cached), SEDAN when they have no profile."""
+        if user.pk is None:
+            return DEFAULT_VEHICLE
+        key = RouteService.VEHICLE_KEY.format(user_id=user.pk)
+        vehicle_type = cache.get(key)
+        if vehicle_type is None:
+            vehicle_type = VehicleProfile.objects.filter(user_id=user.pk).values_list(
+                'vehicle_type', flat=True
+            ).first() or DEFAULT_VEHICLE
+            cache.set(key, vehicle_type, getattr(settings, 'ROUTE_ANALYSIS_CACHE_SECONDS', 600))
+        return vehicle_type
+
+    @staticmethod
+    def invalidate_vehicle(user_id):
+        cache.delete(RouteService.VEHICLE_KEY.format(user_id=user_id))
+
+    @staticmethod
+    def analyze_saved_route(route_id, vehicle_type=DEFAULT_VEHICLE, now=None):
+        """
+        Analyze every leg of a saved TouristRoute.
+        Returns: (status, legs) where status is the worst leg status and
+        legs is a list of LegAnalysis in waypoint order.
+        """
+        night = is_night(now)
+        legs = []
+        worst = 'SAFE'
+        for segment in RouteService.get_plan(route_id).segments:
+            status, warnings = evaluate(vehicle_type, night, segment.is_mountain, segment.is_offroad)
+            if STATUS_RANK[status] > STATUS_RANK[worst]:
+                worst = status
+            legs.append(LegAnalysis(
+                segment.place_id, segment.name, segment.distance_km, status, tuple(warnings)
+            ))
+        return worst, legs
+
+    @staticmethod
+    def get_plan(route_id):
+        """
+        Return the process-wide plan for a route, rebuilding it when the shared
+        route version changes. The version is re-read at most every
+        ROUTE_VERSION_CHECK_SECONDS (default 5s).
+        """
+        return RouteService._plans.get(route_id)
+
+    @staticmethod
+    def build_plan(route_id, version=None):
+        """One query: the route's waypoints with their place attributes."""
+        from places.models import RouteWaypoint
+
+        rows = RouteWaypoint.objects.filter(route_id=route_id).order_by('order', 'pk').values_list(
+            'place_id', 'place__name', 'place__category__name', 'place__road_condition',
+            'place__latitude', 'place__longitude',
         )
+        segments = []
+        total = 0.0
+        previous = None
+        for place_id, name, category_name, road_condition, lat, lon in rows:
+            point = (float(lat), float(lon)) if lat is not None and lon is not None else None
+            distance = None
+            if point and previous:
+                distance = haversine_distance(previous[0], previous[1], point[0], point[1])
+                total += distance
+            segments.append(RouteSegment(place_id, name, distance, *place_flags(category_name, road_condition)))
+            previous = point
+        return RoutePlan(route_id, tuple(segments), total, version=version)
 
-        return status, warnings
+    @staticmethod
+    def invalidate():
+        """Bump the route version: destination flags and plans are rebuilt everywhere."""
+        RouteService._plans.invalidate()
@@ -0,0 +1,49 @@
+"""
+Route Signals
+Invalidate cached route analyses and saved-route plans when the data
+they were computed from changes, and flush buffered RouteLog rows once
+they are old enough.
+"""
+from functools import partial
+from django.apps import apps
+from django.core.signals import request_finished
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from management.models import VehicleProfile
+from places.models import Category, Place, RouteWaypoint
+from places.services.route_service import ROUTE_PLACE_FIELDS, RouteLogBuffer, RouteService
+
+
+def on_place_change(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not ROUTE_PLACE_FIELDS.intersection(update_fields):
+        return
+    transaction.on_commit(RouteService.invalidate)
+
+
+# Signals are sent with the concrete class (Establishment, Landmark, ...).
+# Connected per model: a receiver without a sender would disable fast
+# deletes for every model in the project.
+for model in apps.get_models():
+    if issubclass(model, Place):
+        post_save.connect(on_place_change, sender=model, dispatch_uid=f'route_place_save_{model._meta.label}')
+        post_delete.connect(on_place_change, sender=model, dispatch_uid=f'route_place_delete_{model._meta.label}')
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=RouteWaypoint)
+@receiver(post_delete, sender=RouteWaypoint)
+def on_route_data_change(sender, instance, **kwargs):
+    transaction.on_commit(RouteService.invalidate)
+
+
+@receiver(post_save, sender=VehicleProfile)
+@receiver(post_delete, sender=VehicleProfile)
+def on_vehicle_profile_change(sender, instance, **kwargs):
+    transaction.on_commit(partial(RouteService.invalidate_vehicle, instance.user_id))
+
+
+# Sent after the response: partial batches are written once they are old
+# enough, even when no further analyses arrive to trigger add()
+request_finished.connect(RouteLogBuffer.flush_if_stale, dispatch_uid='route_log_flush_if_stale')
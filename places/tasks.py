@@ -0,0 +1,19 @@
+"""
+Celery Tasks for Places App
+مهام Celery لتطبيق الوجهات
+"""
+from celery import shared_task
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name='places.write_route_logs')
+def write_route_logs(rows):
+    """
+    Insert a batch of RouteLog rows ([user_id, place_id, status, warnings]).
+    Scheduled by RouteLogBuffer.flush (not periodic).
+    """
+    from places.services.route_service import write_logs
+    
+    return {'status': 'success', 'written': write_logs(rows)}
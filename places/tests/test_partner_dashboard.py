@@ -0,0 +1,98 @@
+"""
+Partner Dashboard Tests
+Batched survey status, cached stats and signal-driven invalidation.
+"""
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from interactions.models import Review
+from places.models import Category, Establishment
+from places.services.partner_dashboard_service import get_partner_dashboard_stats
+from surveys.models import Survey, SurveyResponse
+from users.models import PartnerProfile, Role, User
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class SurveyStatusAnnotationTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        today = timezone.now().date()
+        self.users = [User.objects.create_user(username=f'r{i}', password='p') for i in range(3)]
+        self.open_survey = Survey.objects.create(title='Open')
+        self.full_survey = Survey.objects.create(title='Full', max_responses=2)
+        self.future_survey = Survey.objects.create(title='Future', start_date=today + timedelta(days=3))
+        self.ended_survey = Survey.objects.create(title='Ended', end_date=today - timedelta(days=1))
+        self.disabled_survey = Survey.objects.create(title='Disabled', is_active=False)
+        for user in self.users[:2]:
+            SurveyResponse.objects.create(survey=self.full_survey, user=user, answers={})
+        SurveyResponse.objects.create(survey=self.open_survey, user=self.users[0], answers={})
+
+    def test_annotation_matches_python_is_open(self):
+        annotated = {s.pk: s.is_open for s in Survey.objects.with_status()}
+        plain = {s.pk: s.is_open for s in Survey.objects.all()}
+        self.assertEqual(annotated, plain)
+        self.assertEqual(Survey.objects.open().count(), 1)
+
+    def test_status_loop_runs_single_query(self):
+        with CaptureQueriesContext(connection) as ctx:
+            surveys = list(Survey.objects.with_status())
+            counts = [s.response_count for s in surveys]
+            states = [s.is_open for s in surveys]
+            labels = [s.status_info['label'] for s in surveys]
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual(sorted(counts), [0, 0, 0, 1, 2])
+        self.assertEqual(states.count(True), 1)
+        self.assertEqual(len(labels), 5)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class PartnerDashboardCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        role = Role.objects.create(name='partner')
+        self.partner = User.objects.create_user(username='partner', password='p', role=role)
+        PartnerProfile.objects.create(user=self.partner, status='approved', is_approved=True)
+        self.reviewer = User.objects.create_user(username='reviewer', password='p')
+        category = Category.objects.create(name='Hotels')
+        self.place = Establishment.objects.create(
+            name='Hotel', category=category, owner=self.partner, approval_status='approved'
+        )
+        Establishment.objects.create(name='Draft Hotel', category=category, owner=self.partner)
+        for i in range(3):
+            Survey.objects.create(title=f'S{i}')
+
+    def test_stats_values(self):
+        stats = get_partner_dashboard_stats(self.partner)
+        self.assertEqual(stats['total_places'], 2)
+        self.assertEqual(stats['pending_count'], 1)
+        self.assertEqual(stats['active_surveys_count'], 3)
+        self.assertEqual(len(stats['chart_data']), 7)
+
+    def test_second_call_is_cached(self):
+        get_partner_dashboard_stats(self.partner)
+        with CaptureQueriesContext(connection) as ctx:
+            get_partner_dashboard_stats(self.partner)
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_review_invalidates_owner_dashboard(self):
+        self.assertEqual(get_partner_dashboard_stats(self.partner)['total_reviews'], 0)
+        Review.objects.create(user=self.reviewer, place=self.place, rating=5, comment='great')
+        self.assertEqual(get_partner_dashboard_stats(self.partner)['total_reviews'], 1)
+
+    def test_survey_change_invalidates_all_dashboards(self):
+        self.assertEqual(get_partner_dashboard_stats(self.partner)['active_surveys_count'], 3)
+        Survey.objects.filter(title='S0').first().delete()
+        self.assertEqual(get_partner_dashboard_stats(self.partner)['active_surveys_count'], 2)
+
+    def test_dashboard_view_renders(self):
+        self.client.force_login(self.partner)
+        response = self.client.get(reverse('partner_dashboard'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['active_surveys_count'], 3)
+        self.assertEqual(response.context['total_places'], 2)
@@ -0,0 +1,173 @@
+"""
+Route Analysis Tests
+Cached destination data, batched RouteLog writes and saved-route plans.
+"""
+from datetime import datetime
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.signals import request_finished
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from management.models import RouteLog, VehicleProfile
+from places.models import Category, Place, RouteWaypoint, TouristRoute
+from places.services.geo_service import haversine_distance
+from places.services.route_service import (
+    NIGHT_MOUNTAIN_WARNING,
+    OFFROAD_SEDAN_WARNING,
+    RouteLogBuffer,
+    RouteService,
+)
+
+User = get_user_model()
+
+DAY = timezone.make_aware(datetime(2026, 5, 1, 10))
+NIGHT = timezone.make_aware(datetime(2026, 5, 1, 21))
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    ROUTE_VERSION_CHECK_SECONDS=0,
+    ROUTE_LOG_BATCH_SIZE=3,
+    ROUTE_LOG_FLUSH_SECONDS=30,
+)
+class RouteTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        RouteService.invalidate()
+        RouteLogBuffer.drain()
+        self.user = User.objects.create(username='driver')
+        self.mountain = Category.objects.create(name='Mountain')
+        self.city = Category.objects.create(name='City')
+        self.peak = Place.objects.create(
+            name='Jabal Ba\'dan', category=self.mountain, road_condition='offroad',
+            latitude=Decimal('13.950000'), longitude=Decimal('44.250000'),
+        )
+        self.museum = Place.objects.create(
+            name='Ibb Museum', category=self.city, road_condition='paved',
+            latitude=Decimal('13.970000'), longitude=Decimal('44.180000'),
+        )
+
+    def tearDown(self):
+        RouteLogBuffer.drain()
+
+
+class AnalyzeRouteTest(RouteTestCase):
+    def test_rules(self):
+        cases = [
+            (self.museum, 'SEDAN', NIGHT, 'SAFE', []),
+            (self.peak, '4X4', DAY, 'SAFE', []),
+            (self.peak, '4X4', NIGHT, 'WARNING', [NIGHT_MOUNTAIN_WARNING]),
+            (self.peak, 'SEDAN', DAY, 'DANGER', [OFFROAD_SEDAN_WARNING]),
+            (self.peak, 'SEDAN', NIGHT, 'DANGER', [NIGHT_MOUNTAIN_WARNING, OFFROAD_SEDAN_WARNING]),
+        ]
+        for place, vehicle, now, status, warnings in cases:
+            with self.subTest(place=place.name, vehicle=vehicle, night=now is NIGHT):
+                VehicleProfile.objects.update_or_create(user=self.user, defaults={'vehicle_type': vehicle})
+                RouteService.invalidate_vehicle(self.user.pk)
+                self.assertEqual(RouteService.analyze_route(self.user, place, now=now), (status, warnings))
+
+    @override_settings(ROUTE_LOG_BATCH_SIZE=100)
+    def test_repeat_analyses_are_cached(self):
+        place = Place.objects.get(pk=self.peak.pk)
+        self.assertEqual(RouteService.analyze_route(self.user, place, now=DAY)[0], 'DANGER')
+        with self.assertNumQueries(0):
+            self.assertEqual(RouteService.analyze_route(self.user, place, now=DAY)[0], 'DANGER')
+        # Day and night are cached separately
+        with self.assertNumQueries(0):
+            self.assertEqual(RouteService.analyze_route(self.user, place, now=NIGHT)[1],
+                             [NIGHT_MOUNTAIN_WARNING, OFFROAD_SEDAN_WARNING])
+
+    def test_changes_invalidate_on_commit(self):
+        self.assertEqual(RouteService.analyze_route(self.user, self.peak, now=DAY)[0], 'DANGER')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            VehicleProfile.objects.create(user=self.user, vehicle_type='4X4')
+        self.assertEqual(RouteService.analyze_route(self.user, self.peak, now=DAY)[0], 'SAFE')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.peak.road_condition = 'paved'
+            self.peak.category = self.city
+            self.peak.save()
+        self.assertEqual(RouteService.analyze_route(self.user, self.peak, now=NIGHT)[0], 'SAFE')
+
+    def test_unrelated_place_saves_keep_the_cache(self):
+        RouteService.analyze_route(self.user, self.peak, now=DAY)
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.peak.avg_rating = 4.5
+            self.peak.save(update_fields=['avg_rating'])
+        self.assertEqual(callbacks, [])
+
+    def test_logs_are_written_in_batches(self):
+        RouteService.analyze_route(self.user, self.peak, now=DAY)
+        RouteService.analyze_route(self.user, self.museum, now=DAY)
+        self.assertEqual(RouteLog.objects.count(), 0)
+        self.assertEqual(RouteLogBuffer.pending(), 2)
+
+        with self.assertNumQueries(1):
+            RouteService.analyze_route(self.user, self.museum, now=DAY)
+        self.assertEqual(RouteLogBuffer.pending(), 0)
+        self.assertEqual(
+            sorted(RouteLog.objects.values_list('destination_place_id', 'safety_status')),
+            sorted([(self.peak.pk, 'DANGER'), (self.museum.pk, 'SAFE'), (self.museum.pk, 'SAFE')]),
+        )
+        self.assertEqual(RouteLog.objects.get(safety_status='DANGER').warnings, [OFFROAD_SEDAN_WARNING])
+
+    def test_flush_writes_pending_rows(self):
+        RouteService.analyze_route(self.user, self.museum, now=DAY)
+        self.assertEqual(RouteLogBuffer.flush(), 1)
+        self.assertEqual(RouteLogBuffer.flush(), 0)
+        self.assertEqual(RouteLog.objects.filter(user=self.user).count(), 1)
+
+    def test_stale_rows_flush_when_a_request_finishes(self):
+        RouteService.analyze_route(self.user, self.museum, now=DAY)
+        request_finished.send(sender=self.__class__)
+        self.assertEqual(RouteLogBuffer.pending(), 1)
+
+        # The oldest row has now waited ROUTE_LOG_FLUSH_SECONDS
+        RouteLogBuffer._oldest -= 60
+        request_finished.send(sender=self.__class__)
+        self.assertEqual(RouteLogBuffer.pending(), 0)
+        self.assertEqual(RouteLog.objects.filter(user=self.user).count(), 1)
+
+
+class SavedRouteTest(RouteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.route = TouristRoute.objects.create(
+            name='Ibb loop', description='...', estimated_duration=240, distance_km=Decimal('12.00')
+        )
+        self.market = Place.objects.create(name='Old market', category=None)
+        for order, place in enumerate([self.museum, self.peak, self.market]):
+            RouteWaypoint.objects.create(route=self.route, place=place, order=order)
+
+    def test_plan_has_segment_data(self):
+        plan = RouteService.get_plan(self.route.pk)
+        self.assertEqual([s.place_id for s in plan.segments], [self.museum.pk, self.peak.pk, self.market.pk])
+        expected = haversine_distance(13.97, 44.18, 13.95, 44.25)
+        self.assertIsNone(plan.segments[0].distance_km)
+        self.assertAlmostEqual(plan.segments[1].distance_km, expected)
+        # No coordinates, no leg distance
+        self.assertIsNone(plan.segments[2].distance_km)
+        self.assertAlmostEqual(plan.distance_km, expected)
+        self.assertEqual([(s.is_mountain, s.is_offroad) for s in plan.segments],
+                         [(False, False), (True, True), (False, False)])
+
+    def test_analysis_needs_no_queries(self):
+        RouteService.get_plan(self.route.pk)
+        with self.assertNumQueries(0):
+            status, legs = RouteService.analyze_saved_route(self.route.pk, 'SEDAN', now=NIGHT)
+            self.assertEqual(RouteService.analyze_saved_route(self.route.pk, '4X4', now=DAY)[0], 'SAFE')
+        self.assertEqual(status, 'DANGER')
+        self.assertEqual([leg.status for leg in legs], ['SAFE', 'DANGER', 'SAFE'])
+        self.assertEqual(legs[1].warnings, (NIGHT_MOUNTAIN_WARNING, OFFROAD_SEDAN_WARNING))
+
+    def test_waypoint_changes_rebuild_the_plan(self):
+        self.assertEqual(len(RouteService.get_plan(self.route.pk).segments), 3)
+        with self.captureOnCommitCallbacks(execute=True):
+            RouteWaypoint.objects.filter(route=self.route, place=self.peak).get().delete()
+        status, legs = RouteService.analyze_saved_route(self.route.pk, 'SEDAN', now=NIGHT)
+        self.assertEqual(status, 'SAFE')
+        self.assertEqual([leg.place_id for leg in legs], [self.museum.pk, self.market.pk])
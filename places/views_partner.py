@@ -65,83 +65,17 @@ class PartnerDashboardView(ApprovedPartnerRequiredMixin, TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         user = self.request.user
-        # Establishments owned by the user
-        establishments = Establishment.objects.filter(owner=user)
-        
-        from django.db.models import Sum
-        from places.models.drafts import EstablishmentDraft
-        from management.models import FeatureToggle
-
-        context['places'] = establishments[:5] # Show recent 5 for overview
-        context['total_places'] = establishments.count()
-        context['drafts_count'] = EstablishmentDraft.objects.filter(user=user, status='draft').count()
-        context['pending_count'] = establishments.exclude(approval_status='approved').count()  # Fixed: is_approved→approval_status
-        
-        context['avg_rating'] = establishments.aggregate(Avg('avg_rating'))['avg_rating__avg'] or 0
-        context['total_views'] = establishments.aggregate(Sum('view_count'))['view_count__sum'] or 0
-        context['total_reviews'] = Review.objects.filter(place__in=establishments).count()
-        context['recent_reviews'] = Review.objects.filter(place__in=establishments).order_by('-created_at')[:5]
-        
-        # Toggles
-        context['toggles'] = {
-            'enable_place_creation': FeatureToggle.objects.filter(key='enable_place_creation', is_enabled=True).exists(),
-            'enable_edit_after_approval': FeatureToggle.objects.filter(key='enable_edit_after_approval', is_enabled=True).exists(),
-        }
-        
-        # Analytics Chart Data (Last 7 days)
-        from django.utils import timezone
-        from places.models import PlaceDailyView
-        import datetime
-        
-        today = timezone.now().date()
-        last_week = today - datetime.timedelta(days=6)
-        
-        # Get daily views for user's establishments
-        # Note: PlaceDailyView links to Place. Establishment inherits Place.
-        # So we query place__establishment__owner
-        if not establishments.exists():
-             context['chart_labels'] = []
-             context['chart_data'] = []
-             context['chart_data_clicks'] = []
-             return context
-
-        daily_stats = PlaceDailyView.objects.filter(
-            place__establishment__owner=user,
-            date__range=[last_week, today]
-        ).values('date').annotate(
-            total_views=Sum('views'),
-            total_clicks=Sum('contact_clicks')
-        ).order_by('date')
-        
-        # Format for Chart.js
-        chart_labels = []
-        chart_data = []
-        chart_data_clicks = []
-        
-        stats_dict = {stat['date']: stat for stat in daily_stats}
-        
-        for i in range(7):
-            day = last_week + datetime.timedelta(days=i)
-            chart_labels.append(day.strftime('%A')) 
-            stat = stats_dict.get(day, {'total_views': 0, 'total_clicks': 0})
-            chart_data.append(stat['total_views'])
-            chart_data_clicks.append(stat['total_clicks'])
-            
-        context['chart_labels'] = chart_labels
-        context['chart_data'] = chart_data
-        context['chart_data_clicks'] = chart_data_clicks
+
+        # Establishment, review, survey and chart stats (cached per partner)
+        from places.services.partner_dashboard_service import get_partner_dashboard_stats
+        context.update(get_partner_dashboard_stats(user))
         
         # Notifications Widget
         from interactions.models import Notification
         latest_notifications = Notification.objects.filter(recipient=user).order_by('-created_at')[:5]
         context['latest_notifications'] = latest_notifications
-        context['unread_notifications_count'] = Notification.objects.filter(recipient=user, is_read=False).count()
-        
-        # Surveys Integration
-        from surveys.models import Survey
-        # Surveys are and open for participation
-        active_surveys = [s for s in Survey.objects.filter(is_active=True) if s.is_open]
-        context['active_surveys_count'] = len(active_surveys)
+        from interactions.services.unread_service import UnreadCountService
+        context['unread_notifications_count'] = UnreadCountService.get(user)
         
         return context
 
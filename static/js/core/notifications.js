@@ -4,8 +4,9 @@
  */
 
 const Notifications = {
-    pollingInterval: 30000, // 30 seconds
-    intervalId: null,
+    version: null,
+    retryDelay: 30000, // Back-off after a failed poll
+    stopped: false,
 
     init() {
         // Check if user is authenticated (APP.user or similar, but we can check if badge exists)
@@ -35,12 +36,40 @@ const Notifications = {
         });
     },
 
+    /**
+     * Poll the server for a change in the notifications version; the server
+     * either holds the request until something changes (long-polling) or
+     * answers at once with a `retry` delay, and the badge is only re-fetched
+     * when the version moved.
+     */
     startPolling() {
-        this.intervalId = setInterval(() => this.check(), this.pollingInterval);
+        this.stopped = false;
+        this.poll();
     },
 
     stopPolling() {
-        if (this.intervalId) clearInterval(this.intervalId);
+        this.stopped = true;
+    },
+
+    async poll() {
+        while (!this.stopped) {
+            let delay = 0;
+            try {
+                const query = this.version === null ? '' : `?v=${this.version}`;
+                const res = await fetch(`/notifications/api/poll/${query}`);
+                if (!res.ok) throw new Error(res.status);
+                const data = await res.json();
+                if (data.changed && this.version !== null) {
+                    this.check();
+                    document.body.dispatchEvent(new Event('notificationUpdated'));
+                }
+                this.version = data.v;
+                delay = data.retry || 0;
+            } catch (e) {
+                delay = this.retryDelay;
+            }
+            if (delay) await new Promise(resolve => setTimeout(resolve, delay));
+        }
     },
 
     async check() {
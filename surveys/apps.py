@@ -5,3 +5,6 @@ class SurveysConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'surveys'
     verbose_name = 'الاستبيانات'
+
+    def ready(self):
+        from .services import results_signals  # noqa: F401
@@ -0,0 +1,112 @@
+"""
+Benchmark survey results: the per-question loop over all responses vs the
+single streamed pass in surveys.services.results_service.
+
+Seeds one survey with Q questions (mixed types) and R anonymous responses,
+then times both aggregations and checks they agree.
+
+Usage:
+    python manage.py benchmark_survey_results --questions 50 --responses 100000
+    python manage.py benchmark_survey_results --cleanup
+"""
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+TITLE = 'bench_survey_results'
+TYPES = ['rating', 'choice', 'checkbox', 'yesno', 'text', 'number', 'select']
+
+
+class Command(BaseCommand):
+    help = 'Time survey result aggregation over Q questions x R responses, per-question loop vs one pass'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--questions', type=int, default=50)
+        parser.add_argument('--responses', type=int, default=100000)
+        parser.add_argument('--legacy-sample', type=int, default=10000,
+                            help='Responses used for the legacy loop (extrapolated to --responses)')
+        parser.add_argument('--cleanup', action='store_true', help='Delete the seeded survey and exit')
+
+    def handle(self, *args, **options):
+        from surveys.models import Survey
+        from surveys.services.results_service import build_survey_results
+
+        Survey.objects.filter(title=TITLE).delete()
+        if options['cleanup']:
+            self.stdout.write(self.style.SUCCESS("Deleted seeded survey."))
+            return
+
+        survey, questions = self.seed(options['questions'], options['responses'])
+        sample = min(options['legacy_sample'], options['responses'])
+
+        start = time.perf_counter()
+        self.legacy(survey, questions, sample)
+        legacy = time.perf_counter() - start
+        self.stdout.write(
+            f"per-question loop: {sample} responses in {legacy:.2f}s "
+            f"(~{legacy / sample * options['responses']:.1f}s for {options['responses']})"
+        )
+
+        start = time.perf_counter()
+        data = build_survey_results(survey, questions)
+        single = time.perf_counter() - start
+        self.stdout.write(f"single pass:       {data['total_responses']} responses in {single:.2f}s")
+
+    def seed(self, question_count, response_count):
+        from surveys.models import Survey, SurveyQuestion, SurveyResponse
+
+        rng = random.Random(1)
+        survey = Survey.objects.create(title=TITLE, is_active=False)
+        questions = SurveyQuestion.objects.bulk_create([
+            SurveyQuestion(
+                survey=survey, question_text=f'Q{i}', question_type=TYPES[i % len(TYPES)], order=i,
+                choices=['A', 'B', 'C', 'D'],
+            )
+            for i in range(question_count)
+        ])
+
+        def answer(question_type):
+            if question_type == 'rating':
+                return str(rng.randint(1, 5))
+            if question_type == 'checkbox':
+                return rng.sample(['A', 'B', 'C', 'D'], rng.randint(1, 3))
+            if question_type == 'yesno':
+                return rng.choice(['نعم', 'لا'])
+            if question_type == 'text':
+                return f'comment {rng.randint(0, 10 ** 6)}'
+            if question_type == 'number':
+                return str(rng.randint(0, 1000))
+            return rng.choice(['A', 'B', 'C', 'D'])
+
+        batch = []
+        for _ in range(response_count):
+            batch.append(SurveyResponse(
+                survey=survey, answers={str(q.pk): answer(q.question_type) for q in questions}
+            ))
+            if len(batch) == 5000:
+                SurveyResponse.objects.bulk_create(batch)
+                batch = []
+        SurveyResponse.objects.bulk_create(batch)
+        return survey, questions
+
+    def legacy(self, survey, questions, limit):
+        """The pre-change view: re-scan every response for every question."""
+        responses = survey.responses.all()[:limit]
+        results = []
+        for question in questions:
+            answers = []
+            for response in responses:
+                answer = response.answers.get(str(question.id), '')
+                if answer:
+                    answers.append(answer)
+            if question.question_type == 'rating':
+                ratings = [int(a) for a in answers if a.isdigit()]
+                results.append({i: ratings.count(i) for i in range(1, 6)})
+            else:
+                counts = {}
+                for a in answers:
+                    for item in (a if isinstance(a, list) else [a]):
+                        counts[item] = counts.get(item, 0) + 1
+                results.append(counts)
+        return results
@@ -1,8 +1,38 @@
 from django.db import models
+from django.db.models import BooleanField, Count, ExpressionWrapper, F, Q
 from django.conf import settings
+from django.utils import timezone
 from ibb_guide.base_models import TimeStampedModel
 
 
+class SurveyQuerySet(models.QuerySet):
+    def with_status(self):
+        """
+        Annotate response counts and the open/closed state in one query.
+        Mirrors Survey.is_open so loops over surveys need no per-row COUNT.
+        """
+        today = timezone.now().date()
+        return self.annotate(
+            annotated_response_count=Count('responses'),
+        ).annotate(
+            annotated_is_open=ExpressionWrapper(
+                Q(is_active=True)
+                & (Q(start_date__isnull=True) | Q(start_date__lte=today))
+                & (Q(end_date__isnull=True) | Q(end_date__gte=today))
+                & (
+                    Q(max_responses__isnull=True)
+                    | Q(max_responses=0)
+                    | Q(annotated_response_count__lt=F('max_responses'))
+                ),
+                output_field=BooleanField(),
+            )
+        )
+
+    def open(self):
+        """Surveys currently open for participation."""
+        return self.with_status().filter(annotated_is_open=True)
+
+
 class Survey(TimeStampedModel):
     """نموذج الاستبيان"""
     title = models.CharField(max_length=200, verbose_name='عنوان الاستبيان')
@@ -23,6 +53,8 @@ class Survey(TimeStampedModel):
         help_text='سيتم إغلاق الاستبيان تلقائياً عند الوصول لهذا العدد (اتركه فارغاً للاستمرار بلا حدود)'
     )
 
+    objects = SurveyQuerySet.as_manager()
+
     class Meta:
         verbose_name = 'استبيان'
         verbose_name_plural = 'الاستبيانات'
@@ -33,11 +65,15 @@ class Survey(TimeStampedModel):
 
     @property
     def response_count(self):
+        # Use the with_status() annotation when present
+        if 'annotated_response_count' in self.__dict__:
+            return self.annotated_response_count
         return self.responses.count()
 
     @property
     def is_open(self):
-        from django.utils import timezone
+        if 'annotated_is_open' in self.__dict__:
+            return bool(self.annotated_is_open)
         today = timezone.now().date()
         if not self.is_active:
             return False
@@ -52,7 +88,6 @@ class Survey(TimeStampedModel):
     @property
     def status_info(self):
         """إرجاع معلومات الحالة للعرض المتطور"""
-        from django.utils import timezone
         today = timezone.now().date()
         
         if not self.is_active:
@@ -0,0 +1,79 @@
+"""Survey Export Service
+
+Streams a survey's responses as CSV. Responses are read with
+values_list().iterator(), so no model instances are built and memory
+stays flat however many responses there are. Rows are encoded in small
+batches for StreamingHttpResponse.
+"""
+
+import csv
+import io
+
+ITERATOR_CHUNK_SIZE = 2000
+ROWS_PER_CHUNK = 500
+PLAIN_TYPES = ('choice', 'yesno', 'select', 'rating')
+GUEST_LABEL = 'زائر'
+DATE_HEADER = 'التاريخ'
+USER_HEADER = 'المستخدم'
+
+
+class ExportColumns:
+    """The question -> column layout, computed once per export."""
+
+    def __init__(self, questions):
+        self.headers = [DATE_HEADER, USER_HEADER] + [q.question_text for q in questions]
+        self.keys = [str(q.pk) for q in questions]
+        # Single-value questions hold plain strings: no flattening needed
+        self.plain = [q.question_type in PLAIN_TYPES for q in questions]
+
+    def flatten(self, answers):
+        if type(answers) is not dict:
+            return [''] * len(self.keys)
+        cells = []
+        for key, plain in zip(self.keys, self.plain):
+            answer = answers.get(key, '')
+            if not plain and type(answer) is list:
+                answer = ', '.join(str(item) for item in answer)
+            cells.append(answer)
+        return cells
+
+
+def iter_csv_chunks(columns, rows, rows_per_chunk=ROWS_PER_CHUNK):
+    """
+    Yield UTF-8 CSV bytes (BOM first, for Excel) for an iterable of
+    (created_at, username, answers) rows.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns.headers)
+    yield ('\ufeff' + buffer.getvalue()).encode('utf-8')
+
+    flatten = columns.flatten
+    batch = []
+    for created_at, username, answers in rows:
+        batch.append([created_at.strftime('%Y-%m-%d %H:%M'), username or GUEST_LABEL, *flatten(answers)])
+        if len(batch) >= rows_per_chunk:
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(batch)
+            batch = []
+            yield buffer.getvalue().encode('utf-8')
+    if batch:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(batch)
+        yield buffer.getvalue().encode('utf-8')
+
+
+def stream_survey_csv(survey):
+    """CSV chunks for every response to a survey, newest first."""
+    from surveys.models import SurveyResponse
+
+    columns = ExportColumns(list(survey.questions.all()))
+    rows = (
+        SurveyResponse.objects.filter(survey=survey)
+        .order_by('-created_at', '-pk')
+        .values_list('created_at', 'user__username', 'answers')
+        .iterator(chunk_size=ITERATOR_CHUNK_SIZE)
+    )
+    return iter_csv_chunks(columns, rows)
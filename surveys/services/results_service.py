@@ -0,0 +1,176 @@
+"""Survey Results Service
+
+Aggregates a survey's responses in one streamed pass: every response's
+answers are folded into per-question accumulators (choice histograms,
+rating/number statistics, recent text samples) instead of re-scanning
+all responses for each question. Results are cached per survey under a
+version that new responses and question edits bump.
+"""
+
+from collections import deque
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.core.cache import cache
+
+from ibb_guide.services.cache_service import bump_version, get_version
+
+CACHE_TTL = 3600
+ITERATOR_CHUNK_SIZE = 2000
+CHOICE_TYPES = ('choice', 'yesno', 'select', 'checkbox')
+# Types summarised from a histogram of answer values
+COUNTED_TYPES = CHOICE_TYPES + ('rating', 'number')
+# Types whose individual answers are not listed on the results page
+SUMMARY_ONLY_TYPES = CHOICE_TYPES + ('rating',)
+
+
+def rating_stats(histogram):
+    """Average and 1-5 distribution of digit answers."""
+    distribution = {i: 0 for i in range(1, 6)}
+    count = total = 0
+    for answer, n in histogram.items():
+        if isinstance(answer, str) and answer.isdigit():
+            rating = int(answer)
+            count += n
+            total += rating * n
+            if rating in distribution:
+                distribution[rating] += n
+    if not count:
+        return {}
+    return {'avg': total / count, 'count': count, 'distribution': distribution}
+
+
+def number_stats(histogram):
+    """Count/avg/min/max over the answers that parse as numbers."""
+    count = 0
+    total = Decimal(0)
+    minimum = maximum = None
+    for answer, n in histogram.items():
+        try:
+            value = Decimal(str(answer))
+        except InvalidOperation:
+            continue
+        if not value.is_finite():
+            continue
+        count += n
+        total += value * n
+        minimum = value if minimum is None else min(minimum, value)
+        maximum = value if maximum is None else max(maximum, value)
+    if not count:
+        return {}
+    return {'count': count, 'avg': total / count, 'min': minimum, 'max': maximum}
+
+
+class QuestionTally:
+    """
+    Per-question accumulator: a histogram of answer values (list answers
+    count each element) and/or a deque of the most recent answers.
+    """
+
+    def __init__(self, question_type, sample_limit):
+        self.question_type = question_type
+        self.histogram = {} if question_type in COUNTED_TYPES else None
+        self.samples = deque(maxlen=sample_limit) if question_type not in SUMMARY_ONLY_TYPES else None
+
+    def result(self):
+        answers = list(self.samples) if self.samples is not None else []
+        if self.question_type == 'rating':
+            return answers, rating_stats(self.histogram)
+        if self.question_type in CHOICE_TYPES:
+            return answers, {'distribution': self.histogram}
+        if self.question_type == 'number':
+            return answers, number_stats(self.histogram)
+        return answers, {}
+
+
+def results_version_key(survey_id):
+    return f'survey_results:{survey_id}:version'
+
+
+def invalidate_survey_results(survey_id):
+    """Drop a survey's cached results (new response or edited questions)."""
+    if survey_id:
+        bump_version(results_version_key(survey_id))
+
+
+def aggregate_responses(questions, answer_rows, sample_limit=None):
+    """
+    Fold an iterable of answer dicts into per-question results.
+
+    Returns (total_responses, {question_id: {'answers': [...], 'stats': {...}}}).
+    Empty answers are skipped, like the form treats them.
+    """
+    if sample_limit is None:
+        sample_limit = getattr(settings, 'SURVEY_RESULTS_SAMPLE_LIMIT', 500)
+    tallies = {str(q.pk): QuestionTally(q.question_type, sample_limit) for q in questions}
+    # (histogram, samples.append) per question key, so the hot loop is plain dict work
+    slots = {
+        key: (tally.histogram, tally.samples.append if tally.samples is not None else None)
+        for key, tally in tallies.items()
+    }
+
+    total = 0
+    for answers in answer_rows:
+        total += 1
+        if type(answers) is not dict:
+            continue
+        for key, answer in answers.items():
+            if not answer:
+                continue
+            slot = slots.get(key)
+            if slot is None:
+                continue
+            histogram, append = slot
+            if histogram is not None:
+                kind = type(answer)
+                if kind is list:
+                    for item in answer:
+                        if type(item) is not dict and type(item) is not list:
+                            histogram[item] = histogram.get(item, 0) + 1
+                elif kind is not dict:
+                    histogram[answer] = histogram.get(answer, 0) + 1
+            if append is not None:
+                append(answer)
+
+    per_question = {}
+    for key, tally in tallies.items():
+        answers, stats = tally.result()
+        per_question[int(key)] = {'answers': answers, 'stats': stats}
+    return total, per_question
+
+
+def build_survey_results(survey, questions=None):
+    """One streamed query over the survey's responses."""
+    from surveys.models import SurveyResponse
+
+    questions = list(survey.questions.all()) if questions is None else questions
+    rows = (
+        SurveyResponse.objects.filter(survey=survey)
+        .order_by('pk')
+        .values_list('answers', flat=True)
+        .iterator(chunk_size=ITERATOR_CHUNK_SIZE)
+    )
+    total, per_question = aggregate_responses(questions, rows)
+    return {'total_responses': total, 'questions': per_question}
+
+
+def get_survey_results(survey):
+    """
+    Return (total_responses, results) for the results page, where results
+    is a list of {'question', 'answers', 'stats'} dicts in question order.
+    Aggregates are cached per survey version; questions are always loaded
+    fresh so the page shows current wording.
+    """
+    questions = list(survey.questions.all())
+    key = f'survey_results:{survey.pk}:{get_version(results_version_key(survey.pk))}'
+    data = cache.get(key)
+    if data is None:
+        data = build_survey_results(survey, questions)
+        cache.set(key, data, getattr(settings, 'SURVEY_RESULTS_CACHE_SECONDS', CACHE_TTL))
+
+    empty = {'answers': [], 'stats': {}}
+    results = [
+        {'question': question, **data['questions'].get(question.pk, empty)}
+        for question in questions
+    ]
+    return data['total_responses'], results
@@ -0,0 +1,16 @@
+"""
+Survey Results Signals
+Invalidate cached survey results when responses or questions change.
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from surveys.services.results_service import invalidate_survey_results
+
+
+@receiver(post_save, sender='surveys.SurveyResponse')
+@receiver(post_delete, sender='surveys.SurveyResponse')
+@receiver(post_save, sender='surveys.SurveyQuestion')
+@receiver(post_delete, sender='surveys.SurveyQuestion')
+def invalidate_results_on_change(sender, instance, **kwargs):
+    invalidate_survey_results(instance.survey_id)
@@ -0,0 +1,131 @@
+"""
+Survey Results Tests
+Single-pass aggregation, caching and invalidation of survey results.
+"""
+import random
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from surveys.models import Survey, SurveyQuestion, SurveyResponse
+from surveys.services.results_service import aggregate_responses, get_survey_results
+
+User = get_user_model()
+
+
+def legacy_results(questions, responses):
+    """The pre-streaming per-question loop, kept to check against."""
+    results = {}
+    for question in questions:
+        answers = [r.answers.get(str(question.id), '') for r in responses]
+        answers = [a for a in answers if a]
+        stats = {}
+        if question.question_type == 'rating':
+            ratings = [int(a) for a in answers if a.isdigit()]
+            if ratings:
+                stats = {
+                    'avg': sum(ratings) / len(ratings),
+                    'count': len(ratings),
+                    'distribution': {i: ratings.count(i) for i in range(1, 6)},
+                }
+        elif question.question_type in ('choice', 'yesno', 'select', 'checkbox'):
+            counts = {}
+            for a in answers:
+                for item in (a if isinstance(a, list) else [a]):
+                    counts[item] = counts.get(item, 0) + 1
+            stats = {'distribution': counts}
+        results[question.pk] = (answers, stats)
+    return results
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class SurveyResultsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.survey = Survey.objects.create(title='Feedback')
+        types = ['rating', 'choice', 'yesno', 'checkbox', 'text', 'number', 'select']
+        self.questions = [
+            SurveyQuestion.objects.create(survey=self.survey, question_text=t, question_type=t, order=i)
+            for i, t in enumerate(types)
+        ]
+        rng = random.Random(3)
+        self.responses = []
+        for i in range(40):
+            answers = {
+                str(self.questions[0].pk): rng.choice(['1', '2', '3', '4', '5', '', '7']),
+                str(self.questions[1].pk): rng.choice(['A', 'B', 'C']),
+                str(self.questions[2].pk): rng.choice(['نعم', 'لا']),
+                str(self.questions[3].pk): rng.sample(['x', 'y', 'z'], rng.randint(0, 3)),
+                str(self.questions[4].pk): rng.choice(['', f'comment {i}']),
+                str(self.questions[5].pk): str(rng.randint(-5, 50)),
+                '999999': 'stale question',
+            }
+            self.responses.append(SurveyResponse(survey=self.survey, answers=answers))
+        SurveyResponse.objects.bulk_create(self.responses)
+
+    def test_matches_legacy_per_question_loop(self):
+        expected = legacy_results(self.questions, self.responses)
+        total, results = get_survey_results(self.survey)
+        self.assertEqual(total, 40)
+        self.assertEqual([r['question'] for r in results], self.questions)
+        for result in results:
+            question = result['question']
+            answers, stats = expected[question.pk]
+            with self.subTest(question=question.question_type):
+                if question.question_type == 'number':
+                    self.assertEqual(result['answers'], answers)
+                    numbers = [int(a) for a in answers]
+                    self.assertEqual(result['stats']['count'], len(numbers))
+                    self.assertAlmostEqual(float(result['stats']['avg']), sum(numbers) / len(numbers))
+                    self.assertEqual(result['stats']['min'], min(numbers))
+                    self.assertEqual(result['stats']['max'], max(numbers))
+                else:
+                    self.assertEqual(result['stats'], stats)
+                if question.question_type == 'text':
+                    self.assertEqual(result['answers'], answers)
+
+    def test_text_samples_keep_most_recent(self):
+        question = self.questions[4]
+        rows = [{str(question.pk): f'answer {i}'} for i in range(10)]
+        _, results = aggregate_responses([question], rows, sample_limit=3)
+        self.assertEqual(results[question.pk]['answers'], ['answer 7', 'answer 8', 'answer 9'])
+
+    def test_rating_ignores_non_digit_answers(self):
+        question = self.questions[0]
+        rows = [{str(question.pk): value} for value in ('5', 'x', 4, {'a': 1}, '3')]
+        _, results = aggregate_responses([question], rows)
+        self.assertEqual(results[question.pk]['stats']['count'], 2)
+        self.assertEqual(results[question.pk]['stats']['avg'], 4)
+
+    def test_cached_until_a_response_arrives(self):
+        get_survey_results(self.survey)
+        with self.assertNumQueries(1):  # questions only
+            total, _ = get_survey_results(self.survey)
+        self.assertEqual(total, 40)
+
+        user = User.objects.create(username='late')
+        SurveyResponse.objects.create(
+            survey=self.survey, user=user, answers={str(self.questions[1].pk): 'D'}
+        )
+        total, results = get_survey_results(self.survey)
+        self.assertEqual(total, 41)
+        self.assertEqual(results[1]['stats']['distribution']['D'], 1)
+
+    def test_question_changes_invalidate(self):
+        get_survey_results(self.survey)
+        question = self.questions[1]
+        question.question_type = 'text'
+        question.save()
+        _, results = get_survey_results(self.survey)
+        self.assertEqual(results[1]['stats'], {})
+        self.assertEqual(len(results[1]['answers']), 40)
+
+    def test_results_page(self):
+        admin = User.objects.create_superuser(username='admin', email='a@example.com', password='pw')
+        self.client.force_login(admin)
+        response = self.client.get(reverse('survey_results', args=[self.survey.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['total_responses'], 40)
+        self.assertContains(response, 'comment')
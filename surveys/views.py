@@ -8,6 +8,8 @@ from django.db.models import Count, Avg
 from django.contrib.admin.views.decorators import staff_member_required
 from django.views.decorators.http import require_POST
 from .models import Survey, SurveyQuestion, SurveyResponse
+from .services.export_service import stream_survey_csv
+from .services.results_service import get_survey_results
 
 
 class SurveyListView(ListView):
@@ -17,7 +19,7 @@ class SurveyListView(ListView):
     context_object_name = 'surveys'
 
     def get_queryset(self):
-        return Survey.objects.filter(is_active=True)
+        return Survey.objects.filter(is_active=True).with_status()
 
 
 class SurveyDetailView(DetailView):
@@ -98,61 +100,10 @@ class SurveyResultsView(LoginRequiredMixin, DetailView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         
-        survey = self.object
-        questions = survey.questions.all()
-        responses = survey.responses.all()
-        
-        # تحليل النتائج لكل سؤال
-        results = []
-        for question in questions:
-            q_results = {
-                'question': question,
-                'answers': [],
-                'stats': {}
-            }
-            
-            # جمع الإجابات
-            for response in responses:
-                answer = response.answers.get(str(question.id), '')
-                if answer:
-                    q_results['answers'].append(answer)
-            
-            # إحصائيات حسب نوع السؤال
-            if question.question_type == 'rating':
-                try:
-                    ratings = [int(a) for a in q_results['answers'] if a.isdigit()]
-                    if ratings:
-                        q_results['stats']['avg'] = sum(ratings) / len(ratings)
-                        q_results['stats']['count'] = len(ratings)
-                        q_results['stats']['distribution'] = {
-                            i: ratings.count(i) for i in range(1, 6)
-                        }
-                except:
-                    pass
-            
-            elif question.question_type in ['choice', 'yesno', 'select']:
-                # توزيع الإجابات
-                answer_counts = {}
-                for a in q_results['answers']:
-                    answer_counts[a] = answer_counts.get(a, 0) + 1
-                q_results['stats']['distribution'] = answer_counts
-                
-            elif question.question_type == 'checkbox':
-                # توزيع الاختيارات المتعددة
-                answer_counts = {}
-                for a_list in q_results['answers']:
-                    if isinstance(a_list, list):
-                        for a in a_list:
-                            answer_counts[a] = answer_counts.get(a, 0) + 1
-                    else:
-                        # Fallback if just a string
-                        answer_counts[a_list] = answer_counts.get(a_list, 0) + 1
-                q_results['stats']['distribution'] = answer_counts
-            
-            results.append(q_results)
-        
+        # تحليل النتائج لكل سؤال في مرور واحد على الردود (مخزن مؤقتاً)
+        total_responses, results = get_survey_results(self.object)
         context['results'] = results
-        context['total_responses'] = responses.count()
+        context['total_responses'] = total_responses
         
         return context
 
@@ -165,38 +116,13 @@ class SurveyExportCSVView(LoginRequiredMixin, DetailView):
         if not request.user.is_superuser:
             return redirect('survey_list')
             
-        import csv
-        from django.http import HttpResponse
+        from django.http import StreamingHttpResponse
         
         survey = self.get_object()
-        responses = survey.responses.all().order_by('-created_at')
-        questions = survey.questions.all()
         
-        response = HttpResponse(content_type='text/csv; charset=utf-8-sig')
+        # بث الملف صفاً صفاً بدلاً من بنائه كاملاً في الذاكرة
+        response = StreamingHttpResponse(stream_survey_csv(survey), content_type='text/csv; charset=utf-8-sig')
         response['Content-Disposition'] = f'attachment; filename="survey_{survey.id}_responses.csv"'
-        
-        writer = csv.writer(response)
-        
-        # العناوين
-        header = ['التاريخ', 'المستخدم']
-        for q in questions:
-            header.append(q.question_text)
-        writer.writerow(header)
-        
-        # الردود
-        for res in responses:
-            row = [
-                res.created_at.strftime('%Y-%m-%d %H:%M'),
-                res.user.username if res.user else 'زائر'
-            ]
-            for q in questions:
-                answer = res.answers.get(str(q.id), '')
-                # التعامل مع المصفوفات (مثل checkbox)
-                if isinstance(answer, list):
-                    answer = ", ".join(answer)
-                row.append(answer)
-            writer.writerow(row)
-            
         return response
 
 
@@ -1,7 +1,7 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.utils.translation import gettext_lazy as _
-from ibb_guide.base_models import TimeStampedModel
+from ibb_guide.base_models import FieldTrackerMixin, TimeStampedModel
 from ibb_guide.core_utils import get_client_ip
 # الادوار و الصلاخيات
 class Role(models.Model):
@@ -105,9 +105,12 @@ class User(AbstractUser, TimeStampedModel):
         return status_map.get(self.account_status, self.account_status)
 
 
-class PartnerProfile(TimeStampedModel):
+class PartnerProfile(FieldTrackerMixin, TimeStampedModel):
     """ملف الشريك التجاري"""
     
+    # Diffed by interactions.signals on save
+    tracked_fields = ('status',)
+    
     # حالات طلب الشراكة
     PARTNER_STATUS_CHOICES = [
         ('pending', _('قيد المراجعة')),
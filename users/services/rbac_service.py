@@ -1,11 +1,25 @@
 from django.contrib.auth.models import Permission
+from django.core.cache import cache
 from django.db.models import Q
 
+from ibb_guide.services.cache_service import bump_version, get_version
+
+# Memo attribute set on the user object (lives for one request)
+_USER_MEMO_ATTR = '_rbac_perm_memo'
+
+
 class RBACService:
     """
     Role-Based Access Control Service.
     Central Authority for Authorization decisions.
+
+    Role permissions are compiled into a frozenset of ``app_label.codename``
+    and bare ``codename`` strings, cached per role under a global version key
+    (bumped on role or permission changes) and memoised on the user object,
+    so repeated checks during a render are set lookups.
     """
+    VERSION_KEY = 'rbac:version'
+    CACHE_TIMEOUT = 60 * 60 * 24  # 24 hours
 
     @staticmethod
     def user_has_permission(user, permission_codename):
@@ -18,27 +32,26 @@ class RBACService:
         if user.is_superuser:
             return True
 
-        # 1. Check Direct Django Permissions
-        if user.has_perm(permission_codename):
+        # 1. Check Role Permissions (compiled set, no query when warm)
+        if permission_codename in RBACService._get_role_permissions(user):
             return True
 
-        # 2. Check Role Permissions
-        if user.role:
-            # We assume permission_codename is like 'app.action' or just 'action'
-            # Django stores codename as 'add_place', 'change_place', etc.
-            # We look for codename match in the Role's permissions
-            
-            # Split if app_label is provided (e.g., 'places.add_place')
-            if '.' in permission_codename:
-                app_label, codename = permission_codename.split('.', 1)
-                return user.role.permissions.filter(
-                    content_type__app_label=app_label,
-                    codename=codename
-                ).exists()
-            else:
-                return user.role.permissions.filter(codename=permission_codename).exists()
-        
-        return False
+        # 2. Check Direct Django Permissions (memoised on the user object)
+        return permission_codename in RBACService._get_direct_permissions(user)
+
+    @staticmethod
+    def user_has_any_permission(user, permission_codenames):
+        """
+        Check if user has at least one of the given permissions.
+        """
+        return any(RBACService.user_has_permission(user, p) for p in permission_codenames)
+
+    @staticmethod
+    def user_has_all_permissions(user, permission_codenames):
+        """
+        Check if user has every one of the given permissions.
+        """
+        return all(RBACService.user_has_permission(user, p) for p in permission_codenames)
 
     @staticmethod
     def user_has_role(user, role_names):
@@ -48,8 +61,79 @@ class RBACService:
         """
         if not user.is_authenticated or not user.role:
             return False
-            
+
         if isinstance(role_names, str):
             role_names = [role_names]
-            
+
         return user.role.name in role_names
+
+    # ------------------------------------------------------------------
+    # Compiled permission sets
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def get_role_permissions(cls, role_id):
+        """
+        Return the compiled permission set for a role (cached per version).
+        """
+        if not role_id:
+            return frozenset()
+
+        cache_key = f"rbac:role:{role_id}:{get_version(cls.VERSION_KEY, cls.CACHE_TIMEOUT)}"
+        perms = cache.get(cache_key)
+        if perms is None:
+            rows = Permission.objects.filter(role__id=role_id).values_list(
+                'content_type__app_label', 'codename'
+            )
+            perms = cls._compile(rows)
+            cache.set(cache_key, perms, cls.CACHE_TIMEOUT)
+        return perms
+
+    @classmethod
+    def invalidate(cls):
+        """Bump the RBAC version so every compiled role set is rebuilt."""
+        bump_version(cls.VERSION_KEY, cls.CACHE_TIMEOUT)
+
+    @staticmethod
+    def _compile(rows, bare_codenames=True):
+        perms = set()
+        for app_label, codename in rows:
+            perms.add(f"{app_label}.{codename}")
+            if bare_codenames:
+                perms.add(codename)
+        return frozenset(perms)
+
+    @staticmethod
+    def _get_memo(user):
+        memo = getattr(user, _USER_MEMO_ATTR, None)
+        if memo is None:
+            memo = {}
+            setattr(user, _USER_MEMO_ATTR, memo)
+        return memo
+
+    @classmethod
+    def _get_role_permissions(cls, user):
+        memo = cls._get_memo(user)
+        role_id = getattr(user, 'role_id', None)
+        if memo.get('role_id') != role_id or 'role' not in memo:
+            memo['role_id'] = role_id
+            memo['role'] = cls.get_role_permissions(role_id)
+        return memo['role']
+
+    @classmethod
+    def _get_direct_permissions(cls, user):
+        """
+        User and group permissions, equivalent to ModelBackend, in one query.
+        Only loaded when a check misses the role set.
+        """
+        memo = cls._get_memo(user)
+        if 'direct' not in memo:
+            if not user.is_active:
+                memo['direct'] = frozenset()
+            else:
+                rows = Permission.objects.filter(
+                    Q(user=user) | Q(group__user=user)
+                ).values_list('content_type__app_label', 'codename').distinct()
+                # Django perms are always 'app_label.codename'
+                memo['direct'] = cls._compile(rows, bare_codenames=False)
+        return memo['direct']
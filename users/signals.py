@@ -1,7 +1,8 @@
-from django.db.models.signals import post_save, m2m_changed
+from django.db.models.signals import post_save, post_delete, m2m_changed
 from django.dispatch import receiver
-from django.contrib.auth.models import Group
-from .models import User
+from django.contrib.auth.models import Group, Permission
+from .models import User, Role
+from .services.rbac_service import RBACService
 
 @receiver(post_save, sender=User)
 def sync_user_role_to_group(sender, instance, created, **kwargs):
@@ -21,3 +22,21 @@ def sync_user_role_to_group(sender, instance, created, **kwargs):
         # for g in instance.groups.all():
         #     if g.name != group_name and Role.objects.filter(name=g.name).exists():
         #         instance.groups.remove(g)
+
+
+# ==========================================
+# RBAC compiled permission cache invalidation
+# ==========================================
+
+@receiver(m2m_changed, sender=Role.permissions.through)
+def invalidate_rbac_on_role_permissions_change(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        RBACService.invalidate()
+
+
+@receiver(post_save, sender=Role)
+@receiver(post_delete, sender=Role)
+@receiver(post_save, sender=Permission)
+@receiver(post_delete, sender=Permission)
+def invalidate_rbac_on_change(sender, **kwargs):
+    RBACService.invalidate()
@@ -0,0 +1,26 @@
+from django import template
+from users.services.rbac_service import RBACService
+
+register = template.Library()
+
+
+def _split(perms):
+    return [p.strip() for p in perms.split(',') if p.strip()]
+
+
+@register.filter
+def has_perm(user, perm):
+    """Usage: {% if request.user|has_perm:"places.add_place" %}"""
+    return RBACService.user_has_permission(user, perm)
+
+
+@register.filter
+def has_any_perm(user, perms):
+    """Usage: {% if request.user|has_any_perm:"places.add_place,places.change_place" %}"""
+    return RBACService.user_has_any_permission(user, _split(perms))
+
+
+@register.filter
+def has_all_perms(user, perms):
+    """Usage: {% if request.user|has_all_perms:"places.add_place,places.change_place" %}"""
+    return RBACService.user_has_all_permissions(user, _split(perms))
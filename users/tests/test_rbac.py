@@ -0,0 +1,82 @@
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from users.models import User, Role, PartnerProfile
+from users.services.rbac_service import RBACService
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class RBACServiceTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.role = Role.objects.create(name='editor')
+        self.add_place = Permission.objects.get(codename='add_place', content_type__app_label='places')
+        self.change_place = Permission.objects.get(codename='change_place', content_type__app_label='places')
+        self.role.permissions.add(self.add_place, self.change_place)
+        self.user = User.objects.create_user(username='editor', password='p', role=self.role)
+
+    def _fresh_user(self):
+        # Simulates the per-request user loaded by AuthenticationMiddleware
+        return User.objects.get(pk=self.user.pk)
+
+    def test_role_permissions(self):
+        user = self._fresh_user()
+        self.assertTrue(RBACService.user_has_permission(user, 'places.add_place'))
+        self.assertTrue(RBACService.user_has_permission(user, 'change_place'))
+        self.assertFalse(RBACService.user_has_permission(user, 'places.delete_place'))
+
+    def test_direct_permissions(self):
+        delete_place = Permission.objects.get(codename='delete_place', content_type__app_label='places')
+        self.user.user_permissions.add(delete_place)
+        user = self._fresh_user()
+        self.assertTrue(RBACService.user_has_permission(user, 'places.delete_place'))
+
+    def test_has_any_and_has_all(self):
+        user = self._fresh_user()
+        self.assertTrue(RBACService.user_has_any_permission(user, ['places.delete_place', 'places.add_place']))
+        self.assertFalse(RBACService.user_has_any_permission(user, ['places.delete_place']))
+        self.assertTrue(RBACService.user_has_all_permissions(user, ['places.add_place', 'places.change_place']))
+        self.assertFalse(RBACService.user_has_all_permissions(user, ['places.add_place', 'places.delete_place']))
+
+    def test_role_permission_change_bumps_version(self):
+        user = self._fresh_user()
+        self.assertFalse(RBACService.user_has_permission(user, 'places.delete_place'))
+        delete_place = Permission.objects.get(codename='delete_place', content_type__app_label='places')
+        self.role.permissions.add(delete_place)
+        self.assertTrue(RBACService.user_has_permission(self._fresh_user(), 'places.delete_place'))
+
+    @override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+    def test_dashboard_render_performs_at_most_one_permission_query(self):
+        # The admin overview gates its review widgets with has_any_perm / has_all_perms
+        self.role.permissions.add(*Permission.objects.filter(
+            content_type__app_label='users', codename__in=['view_partnerprofile', 'change_partnerprofile']
+        ))
+        User.objects.filter(pk=self.user.pk).update(is_staff=True)
+        partner = User.objects.create_user(username='partner', password='p')
+        PartnerProfile.objects.create(user=partner, organization_name='Pending Org', status='pending')
+        self.client.force_login(self.user)
+        # Warm the compiled role set (as a previous request would)
+        RBACService.user_has_permission(self._fresh_user(), 'places.add_place')
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('custom_admin_dashboard'))
+
+        self.assertEqual(response.status_code, 200)
+        permission_queries = [q for q in ctx.captured_queries if 'auth_permission' in q['sql']]
+        self.assertLessEqual(len(permission_queries), 1)
+        # has_any_perm and has_all_perms pass for partners, has_all_perms fails for establishments
+        self.assertContains(response, 'Pending Org')
+        self.assertContains(response, reverse('admin_pending_partners'))
+        self.assertNotContains(response, 'منشآت بانتظار الاعتماد')
+
+    def test_cold_cache_compiles_role_once(self):
+        users = [self._fresh_user() for _ in range(5)]
+        with CaptureQueriesContext(connection) as ctx:
+            for user in users:
+                for _ in range(10):
+                    RBACService.user_has_permission(user, 'places.add_place')
+        self.assertEqual(len(ctx.captured_queries), 1)
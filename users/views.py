@@ -151,7 +151,7 @@ class SettingsView(LoginRequiredMixin, TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         from interactions.models import NotificationPreference
-        context['prefs'] = NotificationPreference.get_or_create_for_user(self.request.user)
+        context['prefs'] = NotificationPreference.get_for_user(self.request.user)
         return context
 
 